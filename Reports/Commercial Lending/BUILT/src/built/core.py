@@ -2,6 +2,7 @@ import src.config
 from deltalake import DeltaTable
 import pandas as pd
 import cdutils.input_cleansing # type: ignore
+import cdutils.lakehouse # type: ignore
 import src.built.fetch_data
 import cdutils.customer_dim # type: ignore
 
@@ -61,10 +62,8 @@ def fetch_cml():
         "151227983"
     ].copy()
 
-    accts = DeltaTable(src.config.SILVER / "account").to_pandas()
-
-    # Filter to hasan defined acctnbrs for now
-    accts = accts[accts['acctnbr'].isin(acctnbrs)].copy()
+    # Filter to hasan defined acctnbrs for now (only their rows are read)
+    accts = cdutils.lakehouse.read_table(src.config.SILVER / "account", filters=[('acctnbr', 'in', acctnbrs)], dtype_backend='numpy')
     accts['MACRO TYPE'] = 'Commercial'
     accts['holdback_flag'] = None
     accts['holdback_amt'] = None
@@ -75,7 +74,13 @@ def fetch_resi():
     """
     Resi piece of BUILT extract
     """
-    accts = DeltaTable(src.config.SILVER / "account").to_pandas()
+    # Resi Construction candidates only: the exact holdback filter is applied below
+    resi_definite = ["MG01","MG64"]
+    accts = cdutils.lakehouse.read_table(
+        src.config.SILVER / "account",
+        filters=[[('currmiaccttypcd', 'in', resi_definite)], [('mjaccttypcd', '=', 'MTG')]],
+        dtype_backend='numpy'
+    )
 
     # Fetch and process holdbacks
     raw_holdbacks = src.built.fetch_data.fetch_holdbacks()
@@ -88,7 +93,6 @@ def fetch_resi():
     accts = accts.merge(holdbacks, on='acctnbr', how='left')
 
     # Filter to Resi Construction loans with holdback logic
-    resi_definite = ["MG01","MG64"]
     mask = accts['currmiaccttypcd'].isin(resi_definite) | ((accts['mjaccttypcd'] == 'MTG') & (accts['holdback_amt'] > 0))
     accts = accts[mask].copy()
 
@@ -11,6 +11,7 @@ import src.config
 
 import cdutils.input_cleansing # type: ignore
 import cdutils.deduplication # type: ignore
+import cdutils.lakehouse # type: ignore
 import cdutils.loans.calculations # type: ignore
 import cdutils.joining # type: ignore
 import cdutils.input_cleansing # type: ignore
@@ -476,17 +477,19 @@ def final_cml(cml):
     # Other implementation uses loanlimityn
     cml['Terms'] = np.where(cml['loanlimityn'] == 'Y', cml['inactivedate'], cml['datemat'])
 
-    face_value = DeltaTable(src.config.SILVER / "face_value").to_pandas()
-    face_value = face_value[[
-        'acctnbr',
-        'facevalue'
-    ]].copy()
     # Cast type pre merge
     cml_schema = {
         'acctnbr':'str'
     }
     cml = cdutils.input_cleansing.cast_columns(cml, cml_schema)
 
+    # Face value of these accounts only
+    face_value = cdutils.lakehouse.read_table(
+        src.config.SILVER / "face_value",
+        columns=['acctnbr', 'facevalue'],
+        filters=[('acctnbr', 'in', cml['acctnbr'].unique().tolist())]
+    )
+
     cml = cml.merge(face_value, on='acctnbr', how='left')
 
 
@@ -516,17 +519,19 @@ def final_personal(personal):
     # If its a line of credit type product (HELOC, etc...), use inactive date, otherwise maturity date
     personal['Terms'] = np.where(personal['loanlimityn'] == 'Y', personal['inactivedate'], personal['datemat'])
 
-    face_value = DeltaTable(src.config.SILVER / "face_value").to_pandas()
-    face_value = face_value[[
-        'acctnbr',
-        'facevalue'
-    ]].copy()
     # Cast type pre merge
     personal_schema = {
         'acctnbr':'str'
     }
     personal = cdutils.input_cleansing.cast_columns(personal, personal_schema)
 
+    # Face value of these accounts only
+    face_value = cdutils.lakehouse.read_table(
+        src.config.SILVER / "face_value",
+        columns=['acctnbr', 'facevalue'],
+        filters=[('acctnbr', 'in', personal['acctnbr'].unique().tolist())]
+    )
+
     personal = personal.merge(face_value, on='acctnbr', how='left')
 
 
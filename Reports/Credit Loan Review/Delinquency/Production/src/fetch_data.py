@@ -52,18 +52,10 @@ def fetch_data():
         COCCDM.WH_TOTALPAYMENTSDUE a
     """)
 
-    acctstatistichist = text("""
-    SELECT 
-        *
-    FROM 
-        OSIBANK.ACCTSTATISTICHIST
-    """)
-
     queries = [
         {'key':'acctcommon', 'sql':acctcommon, 'engine':2},
         {'key':'acctloan', 'sql':acctloan, 'engine':2},
         {'key':'totalpaymentsdue', 'sql':totalpaymentsdue, 'engine':2},
-        {'key':'acctstatistichist', 'sql':acctstatistichist, 'engine':1},
     ]
 
 
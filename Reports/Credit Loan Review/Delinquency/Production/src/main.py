@@ -14,58 +14,44 @@ from datetime import datetime, timedelta, date
 from typing import List, Optional
 
 import numpy as np # type: ignore
-from openpyxl import load_workbook # type: ignore
-from openpyxl.styles import Font, Border, Side, Alignment # type: ignore
 from sqlalchemy import create_engine, text # type: ignore 
-from pydantic import BaseModel, Field # type: ignore
 from win32com.client import Dispatch # type: ignore
 import pandas as pd # type: ignore
 
 import src.fetch_data
+import cdutils.acctstatistichist # type: ignore
 import cdutils.distribution # type: ignore
+import cdutils.excel_writer # type: ignore
+import cdutils.validation # type: ignore
 from src._version import __version__
 
 
 #################################
-def acctstatistichist_cleaning(df, acctcommon):
+def ytd_pd_counts(acctcommon):
     """ 
-    Cleans acctstatistichist table and adds new fields for filtering
+    YTD past due statistics per account from the local ACCTSTATISTICHIST store
     
     Args:
-        df: ACCTSTATISTICHIST table (COCC)
         acctcommon: WH_ACCTCOMMON table (COCC)
             - Used for current date
     
     Returns:
-        df: ACCSTATISTICHIST with new calculated date fields
-            - 'event_date': date (month) of event occurance
-            - 'current_date': current_date
-            - 'year_start': First day of year (used for YTD calculations)
-            - 'year_ago_date': Today's date minus 1 year (for TTM calculations)
+        df: acctnbr index, one column per PD code (PD30, PD60, PD90, PD12)
+            - NaN where the account has no statistics of that code
         
     Operations:
-        - monthcd zero fill 2 digits
-        - monthcd to string type
-        - yearnbr to string type
-        - event_date field = df['yearnbr'] + "-" + df['monthcd'] + "-01"
+        - Refresh the store (only the open months are pulled from COCC)
         - current_date == First record in EFFDATE field from acctcommon table
-            -> this is appended to the dataframe as 'current_date' column
         - year_start = current_date year + '01-01'
-        - year_ago_date = current_date - 1 year
+        - Sum statisticcount from year_start onward (memoized until the next refresh)
     """
-    df['monthcd'] = df['monthcd'].str.zfill(2)
-    df['monthcd'] = df['monthcd'].astype(str)
-    df['yearnbr'] = df['yearnbr'].astype(str)
-    df['event_date'] = df['yearnbr'] + "-" + df['monthcd'] + "-01"
-    df['event_date'] = pd.to_datetime(df['event_date'])
+    store = cdutils.acctstatistichist.get_store()
+    store.refresh()
     
     current_date = acctcommon['effdate'][0]
-    df['current_date'] = current_date
+    year_start = datetime(current_date.year, 1, 1)
     
-    df['year_start'] = pd.to_datetime(df['current_date'].dt.year.astype(str) + '-01-01')
-    df['year_ago_date'] = df['current_date'] - pd.DateOffset(years=1)
-    
-    return df
+    return store.window_counts(year_start, None, codes=['PD30', 'PD60', 'PD90', 'PD12'])
 
 
 #################################
@@ -73,12 +59,12 @@ def acctstatistichist_cleaning(df, acctcommon):
 
 
 #################################
-def count_pd(df, flag):
+def count_pd(counts, flag):
     """
     This will count past due flags on the account
     
     Args:
-        df: ACCTSTATISTICHIST table (COCC)
+        counts: YTD statistic counts (see ytd_pd_counts)
         flag (str): code to filter on (PD30, PD60, etc...)
         
     Returns:
@@ -87,23 +73,15 @@ def count_pd(df, flag):
             - flag (PD30/60/90/120)
     
     Operations:
-        - Filter to only YTD statistics
-        - Filter to specified code (ie: PD30 or PD60)
-        - Group by acctnbr and sum the number of PD flags for set interval
-        - Rename column to match PD Flag
+        - Keep accounts with statistics for the specified code (ie: PD30 or PD60)
+        - acctnbr back to numeric to match acctcommon
 
     """
-    # Filter to only YTD statistics
-    ytd_df = df[df['event_date'] >= df['year_start']]
-    
-    # Filter to specified code (ie: PD30 or PD60)
-    df = ytd_df[ytd_df['statistictypcd'].isin([flag])]
+    # Keep accounts with statistics for the specified code (ie: PD30 or PD60)
+    df = counts.loc[counts[flag].notna(), [flag]].reset_index()
     
-    # Group by acctnbr and sum the number of PD flags for set interval
-    df = df.groupby('acctnbr')['statisticcount'].sum().reset_index()
-    
-    # Rename column to match PD Flag
-    df = df.rename(columns={'statisticcount': flag})
+    # Store keys are str
+    df['acctnbr'] = pd.to_numeric(df['acctnbr'])
 
     
     return df
@@ -217,62 +195,33 @@ def append_pd_stats(df, pd30, pd60, pd90, pd120):
 
 
 #################################
-def create_validation_model(df):
+# Explicit data types and fields that will be used in this report (output name: spec)
+REPORT_SCHEMA = {
+    'acctnbr': {'dtype': int},
+    'product': {'dtype': str},
+    'ownersortname': {'dtype': str},
+    'loanofficer': {'dtype': str, 'nullable': True},
+    'ytd_30': {'dtype': int, 'alias': 'YTD Over 30'},
+    'ytd_60': {'dtype': int, 'alias': 'YTD Over 60'},
+    'ytd_90': {'dtype': int, 'alias': 'YTD Over 90'},
+    'ytd_120': {'dtype': int, 'alias': 'YTD Over 120'},
+    'ndpd': {'dtype': int},
+    'bookbalance': {'dtype': float},
+    'cobal': {'dtype': float, 'nullable': True},
+    'netbalance': {'dtype': float, 'alias': 'net balance', 'nullable': True},
+    'riskratingcd': {'dtype': str},
+    'nonaccrual': {'dtype': str},
+    'totaldue': {'dtype': float, 'nullable': True},
+    'nextpaymentdate': {'dtype': 'date', 'alias': 'currduedate', 'nullable': True},
+    'mjaccttypcd': {'dtype': str},
+}
+
+def validate_report_data(df):
     """
     Here we explicitly validate all data types and fields that will be used in this report.
+    Column-wise checks; raises ValueError listing every violation.
     """
-    class DelinquencyReport(BaseModel):
-        acctnbr: int
-        product: str
-        ownersortname: str
-        loanofficer: Optional[str] = Field(default=None)
-        ytd_30: int = Field(alias='YTD Over 30')
-        ytd_60: int = Field(alias='YTD Over 60')
-        ytd_90: int = Field(alias='YTD Over 90')
-        ytd_120: int = Field(alias='YTD Over 120')
-        ndpd: int
-        bookbalance: float
-        cobal: float
-        netbalance: float = Field(alias='net balance')
-        riskratingcd: str
-        nonaccrual: str
-        totaldue: float
-        nextpaymentdate: Optional[date] = Field(default=None, alias='currduedate')
-        mjaccttypcd: str
-    
-    class DelinquencyDataFrame(BaseModel):
-        data: List[DelinquencyReport]
-    
-    data_dicts = df[[
-        'acctnbr',
-        'product',
-        'ownersortname',
-        'loanofficer',
-        'YTD Over 30',
-        'YTD Over 60',
-        'YTD Over 90',
-        'YTD Over 120',
-        'ndpd',
-        'bookbalance',
-        'cobal',
-        'net balance',
-        'riskratingcd',
-        'nonaccrual',
-        'totaldue',
-        'currduedate',
-        'mjaccttypcd'
-    ]].to_dict('records')
-    
-    pydantic_model = DelinquencyDataFrame(data=[DelinquencyReport(**row) for row in data_dicts])
-    
-    return pydantic_model
-
-def unpack_validation_model(x):
-    """
-    Post-validation, ready to unpack the model and use data to generate report
-    """
-    temp_dict = x.model_dump()
-    df = pd.DataFrame(temp_dict['data'])
+    df, _ = cdutils.validation.validate(df, REPORT_SCHEMA, raise_on_violation=True)
     return df
 
 
@@ -320,18 +269,17 @@ def section_creation(df, condition, subtitle, title=None):
 
 def main():
     data = src.fetch_data.fetch_data()
-    cleaned_acctstats = acctstatistichist_cleaning(data['acctstatistichist'], data['acctcommon'])
-    pd30 = count_pd(cleaned_acctstats, 'PD30')
-    pd60 = count_pd(cleaned_acctstats, 'PD60')
-    pd90 = count_pd(cleaned_acctstats, 'PD90')
-    pd120 = count_pd(cleaned_acctstats, 'PD12')
+    pd_counts = ytd_pd_counts(data['acctcommon'])
+    pd30 = count_pd(pd_counts, 'PD30')
+    pd60 = count_pd(pd_counts, 'PD60')
+    pd90 = count_pd(pd_counts, 'PD90')
+    pd120 = count_pd(pd_counts, 'PD12')
     totalpayments = isolate_total_past_due(data['totalpaymentsdue'])
     merged_df = merging_tables(data['acctcommon'], data['acctloan'], totalpayments)
     df = append_pd_stats(merged_df, pd30, pd60, pd90, pd120)
 
     
-    validation_model = create_validation_model(df)
-    df = unpack_validation_model(validation_model)
+    df = validate_report_data(df)
 
 
 
@@ -691,139 +639,67 @@ def main():
     filename = f"Delinquency_{me_date_no_slash}.xlsx"
     output_file = os.path.join(output_dir,filename)
 
-    with pd.ExcelWriter(output_file, engine='openpyxl', mode='w') as writer:
-        completed_df.to_excel(writer, index=False, sheet_name='Sheet1', startrow=4)
-
-    wb = load_workbook(output_file)
-    ws = wb.active
-
     ## Define Formatting
-    # Dimensions
-    ws.row_dimensions[5].height = 44
-
-    ws.column_dimensions['A'].width = 13
-    ws.column_dimensions['B'].width = 29
-    ws.column_dimensions['C'].width = 32
-    ws.column_dimensions['D'].width = 24
-    ws.column_dimensions['E'].width = 5
-    ws.column_dimensions['F'].width = 5
-    ws.column_dimensions['G'].width = 5
-    ws.column_dimensions['H'].width = 5
-    ws.column_dimensions['I'].width = 6
-    ws.column_dimensions['J'].width = 12
-    ws.column_dimensions['K'].width = 10
-    ws.column_dimensions['L'].width = 12
-    ws.column_dimensions['M'].width = 29
-    ws.column_dimensions['N'].width = 8
-    ws.column_dimensions['O'].width = 13
-    ws.column_dimensions['P'].width = 10
-    ws.column_dimensions['Q'].width = 46
-
-
-
     # Font
-    upper_section_font = Font(size=14, name='Calibri', bold=True, italic=True)
-    title_font = Font(size=12, name='Arial', bold=True)
-    subtitle_font = Font(size=10, name='Arial', bold=True)
-    data_font = Font(size=10, name='Arial')
-    sum_font = Font(size=10, name='Arial', bold=True)
-    wrap_alignment = Alignment(wrap_text=True, vertical='bottom', horizontal='center')
-    comma_format = '#,##0.00'
-    short_date_format = 'MM/DD/YYYY'
-
+    upper_section_font = {'font_size': 14, 'font_name': 'Calibri', 'bold': True, 'italic': True}
+    title_font = {'font_size': 12, 'font_name': 'Arial', 'bold': True}
+    subtitle_font = {'font_size': 10, 'font_name': 'Arial', 'bold': True}
+    data_font = {'font_size': 10, 'font_name': 'Arial'}
+    sum_font = {'font_size': 10, 'font_name': 'Arial', 'bold': True}
+    wrap_alignment = {'text_wrap': True, 'valign': 'bottom', 'align': 'center'}
+    center_alignment = {'align': 'center'}
+    comma_format = {'num_format': '#,##0.00'}
+    short_date_format = {'num_format': 'MM/DD/YYYY'}
 
     # Border
-    double_border = Border(bottom=Side(style='double'))
-
-    # Header
-    ws['A1'] = "BRISTOL COUNTY SAVINGS BANK"
-    ws['A1'].font = upper_section_font
-    ws['A2'] = "MONTHLY DELINQUENCY REPORT"
-    ws['A2'].font = upper_section_font
-    ws['A3'] = f"AS OF {most_recent_month_end_str}"
-    ws['A3'].font = upper_section_font
-
-
-
-    # Clean out Column Q
-    for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=17, max_col=17):
-        for cell in row:
-            cell.value = None
-            
-
-    # Center Align Columns E:I
-    for col in range(5,10):
-        for cell in ws.iter_cols(min_col=col, max_col=col, min_row=1, max_row=ws.max_row):
-            for c in cell:
-                c.alignment = Alignment(horizontal='center')
-                
-    # Center Align Columns M:N
-    for col in range(13,15):
-        for cell in ws.iter_cols(min_col=col, max_col=col, min_row=1, max_row=ws.max_row):
-            for c in cell:
-                c.alignment = Alignment(horizontal='center')
-
-    # for cell in ws['P']:
-    #     cell.number_format = NumberFormat('%m/%d/%y')
-
-    ## Iterate over rows and apply formatting
-    for cell in ws[5]:
-        cell.alignment = wrap_alignment
-        
-    start_row = 6 # This is a counter variable
-
-    for idx, row in completed_df.iterrows():
-        row_type = row['Tag Type']
-        current_row = start_row + idx
-        
-        if row_type == 'title':
-            for cell in ws[current_row]:
-                cell.font = title_font
-                
-        elif row_type == 'subtitle':
-            for cell in ws[current_row]:
-                cell.font = subtitle_font
-                
-        elif row_type == 'data':
-            for cell in ws[current_row]:
-                cell.font = data_font
-                
-        elif row_type == 'sum':
-            for cell in ws[current_row]:
-                cell.font = sum_font
-                cell.border = double_border
-                
-    # Adding commas to columns J:L
-    for col in range(10, 13):
-        for row in range(1, ws.max_row + 1):
-            cell = ws.cell(row=row, column=col)
-            cell.number_format = comma_format
-            
-    # Adding commas to column O
-    for col in range(15, 16):
-        for row in range(1, ws.max_row + 1):
-            cell = ws.cell(row=row, column=col)
-            cell.number_format = comma_format
-            
-    # Short date format for column P
-    for col in range(16, 17):
-        for row in range(1, ws.max_row + 1):
-            cell = ws.cell(row=row, column=col)
-            cell.number_format = short_date_format
-
-    # Final formatting
-    # Clean out Column R
-    for row in ws.iter_rows(min_row=1, max_row=ws.max_row, min_col=18, max_col=18):
-        for cell in row:
-            cell.value = None
-            cell.border = None
-            
-    ws['Q5'] = "Comments"
-    temp_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-    ws['Q5'].border = temp_border
-                
-    # Saving
-    wb.save(output_file)
+    double_border = {'bottom': 6}
+    thin_border = {'border': 1}
+
+    # Column Q is left blank for comments (replaces mjaccttypcd); Tag Type only drives the row styles
+    completed_df['Comments'] = None
+    row_type = completed_df['Tag Type']
+
+    spec = {
+        'start_row': 4,
+        # Header
+        'preamble': [
+            {'row': 0, 'col': 0, 'value': "BRISTOL COUNTY SAVINGS BANK", 'format': upper_section_font},
+            {'row': 1, 'col': 0, 'value': "MONTHLY DELINQUENCY REPORT", 'format': upper_section_font},
+            {'row': 2, 'col': 0, 'value': f"AS OF {most_recent_month_end_str}", 'format': upper_section_font},
+        ],
+        'header': {'format': {'bold': True, **thin_border, **wrap_alignment}, 'height': 44},
+        'exclude': ['mjaccttypcd', 'Tag Type'],
+        # Dimensions, center align E:I and M:N, commas J:L and O, short date P
+        'columns': {
+            'Account Number': {'width': 13},
+            'Product Name': {'width': 29},
+            'Customer Name': {'width': 32},
+            'Responsibility Officer': {'width': 24},
+            'YTD Over 30': {'width': 5, 'format': center_alignment},
+            'YTD Over 60': {'width': 5, 'format': center_alignment},
+            'YTD Over 90': {'width': 5, 'format': center_alignment},
+            'YTD Over 120': {'width': 5, 'format': center_alignment},
+            'NDPD': {'width': 6, 'format': center_alignment},
+            'Current Balance': {'width': 12, 'format': comma_format},
+            'Charged Off': {'width': 10, 'format': comma_format},
+            'Net Balance': {'width': 12, 'format': comma_format},
+            'Risk': {'width': 29, 'format': center_alignment},
+            'Non Accrual': {'width': 8, 'format': center_alignment},
+            'Total Past Due': {'width': 13, 'format': comma_format},
+            'Next Payment Date': {'width': 10, 'format': short_date_format},
+            'Comments': {'width': 46},
+        },
+        # Row fonts by row type
+        'row_formats': [
+            (row_type.eq('title'), title_font),
+            (row_type.eq('subtitle'), subtitle_font),
+            (row_type.eq('data'), data_font),
+            (row_type.eq('sum'), {**sum_font, **double_border}),
+        ],
+    }
+
+    # Single pass write (no reopen to format)
+    cdutils.excel_writer.write_excel(output_file, completed_df, spec)
 
     print(f"Report saved to {output_file}")
 
@@ -0,0 +1,44 @@
+"""
+Unit tests for the Delinquency report schema validation.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the project root to path so src.main and its src.* imports resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.main
+
+
+def report_row(**overrides):
+    row = {
+        'acctnbr': 1001, 'product': 'Unsecured Loans', 'ownersortname': 'SMITH JOHN',
+        'loanofficer': 'DOE JANE', 'YTD Over 30': 0, 'YTD Over 60': 0, 'YTD Over 90': 0,
+        'YTD Over 120': 0, 'ndpd': 0, 'bookbalance': 2500.0, 'cobal': 0.0, 'net balance': 2500.0,
+        'riskratingcd': 'Unknown', 'nonaccrual': 'No', 'totaldue': 150.0,
+        'currduedate': '2025-10-15', 'mjaccttypcd': 'CNS',
+    }
+    row.update(overrides)
+    return row
+
+
+class TestValidateReportData:
+    def test_current_account_without_amounts_due(self):
+        """A current loan has no past-due payments or charge-off, so those amounts are missing."""
+        df = pd.DataFrame([
+            report_row(),
+            report_row(acctnbr=1002, totaldue=np.nan, cobal=np.nan, **{'net balance': np.nan}),
+        ])
+        result = src.main.validate_report_data(df)
+        assert len(result) == 2
+        assert result['totaldue'].isna().tolist() == [False, True]
+
+    def test_missing_book_balance_still_rejected(self):
+        df = pd.DataFrame([report_row(bookbalance=np.nan)])
+        with pytest.raises(ValueError):
+            src.main.validate_report_data(df)
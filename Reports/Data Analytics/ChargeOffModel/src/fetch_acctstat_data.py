@@ -2,21 +2,19 @@
 Using the lookup query to inspect the DB tables
 """
 
+import cdutils.acctstatistichist # type: ignore
 import cdutils.database.connect # type: ignore
 from sqlalchemy import text # type: ignore
 
 def fetch_acctstat_data():
     """
     Main data query
+
+    'acctstatistichist_counts' holds lifetime statisticcount sums per account (acctnbr index,
+    one column per statistictypcd) from the local ACCTSTATISTICHIST store, so only the open
+    months are pulled from COCC.
     """
     # Engine 1
-    acctstatistichist = text("""
-    SELECT 
-        *
-    FROM 
-        OSIBANK.ACCTSTATISTICHIST
-    """)
-
     doc = text("""
     SELECT 
         *
@@ -26,10 +24,13 @@ def fetch_acctstat_data():
 
     queries = [
         # {'key':'acctcommon', 'sql':acctcommon, 'engine':2},
-        {'key':'acctstatistichist', 'sql':acctstatistichist, 'engine':1},
         {'key':'doc', 'sql':doc, 'engine':1}
     ]
 
 
     data = cdutils.database.connect.retrieve_data(queries)
+
+    store = cdutils.acctstatistichist.get_store()
+    store.refresh()
+    data['acctstatistichist_counts'] = store.window_counts()
     return data
\ No newline at end of file
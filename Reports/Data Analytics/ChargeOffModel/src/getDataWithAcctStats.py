@@ -1,9 +1,8 @@
 import pandas as pd
 import numpy as np
-from tqdm import tqdm
+from cdutils.database.batch_lookup import lookup_many # type: ignore
 import src.fetch_acctstat_data as fetch_acctstat_data
 import src.pkey as pkey
-import src.fetch_data_historical_acctcommon as fetch_data_historical_acctcommon
 
 def getDataWithAcctStats():
 
@@ -14,14 +13,8 @@ def getDataWithAcctStats():
 
     print("Querying database...")
     accstat_data = fetch_acctstat_data.fetch_acctstat_data()
-    acctstatistichist = accstat_data['acctstatistichist']
-    acctstatistichist = pd.pivot_table(acctstatistichist,   # Gets lifetime delinquency from historical data
-                            index='acctnbr',
-                            columns='statistictypcd',
-                            values='statisticcount',
-                            aggfunc='sum',
-                            fill_value=0
-                            ).reset_index()
+    acctstatistichist = accstat_data['acctstatistichist_counts']   # Lifetime delinquency from historical data
+    acctstatistichist = acctstatistichist.fillna(0).astype('int64').reset_index()
     
     data = pkey.pkey()
     data = data.dropna(subset=['Category']) # Removing all rows where category is empty, meaning it is not a loan
@@ -47,13 +40,16 @@ def getDataWithAcctStats():
     # Preventing data leakage by changing all rows labeled 'Repossessed Collateral' to their original product type
     # or removing the row altogether if we don't have enough historical data.
     print("Preprocessing data...")
-    for index, row in tqdm(data_with_acct_stats.iterrows()):
-        if row['product'] == 'Repossessed Collateral':
-            acct = row['acctnbr']
-            acct_data = fetch_data_historical_acctcommon.fetch_data_historical_acctcommon(acct)
-            acct_df = acct_data['wh_acctcommon']
-            new_product = acct_df.iloc[0]['product']
-            data_with_acct_stats.at[index, 'product'] = new_product
+    repo_mask = data_with_acct_stats['product'] == 'Repossessed Collateral'
+    acct_history = lookup_many('COCCDM.WH_ACCTCOMMON', 'ACCTNBR', data_with_acct_stats.loc[repo_mask, 'acctnbr'], ['PRODUCT', 'EFFDATE'], engine=2)
+
+    # Original product = product on the earliest snapshot for the account
+    acct_history = acct_history.sort_values(by=['acctnbr', 'effdate'])
+    original_product = acct_history.drop_duplicates(subset='acctnbr', keep='first').set_index('acctnbr')['product']
+
+    # Accounts without history keep 'Repossessed Collateral' and are dropped below
+    repo_products = data_with_acct_stats.loc[repo_mask, 'acctnbr'].map(original_product)
+    data_with_acct_stats.loc[repo_mask, 'product'] = repo_products.fillna(data_with_acct_stats.loc[repo_mask, 'product'])
 
     data_without_repo = data_with_acct_stats[(data_with_acct_stats['product'] != "Repossessed Collateral")]
 
@@ -16,6 +16,10 @@ OWNER = "Chad Doorley"
 # Status
 PROD_READY = True
 
+# Report runner scheduling: reports importing these modules read DailyDeposit_staging.xlsx,
+# so testing/run_reports.py runs them after this report in the same batch
+PROVIDES = ['cdutils.daily_deposit_staging']
+
 # Environment
 ENV = os.getenv('REPORT_ENV', 'dev')
 
@@ -7,6 +7,7 @@ from dateutil.relativedelta import relativedelta
 
 import pandas as pd # type: ignore
 
+import cdutils.acctstatistichist
 import src.deposit_file.create_deposit_dataset
 
 def deposit_dataset_execution():
@@ -14,11 +15,13 @@ def deposit_dataset_execution():
 
     # Unpack data
     acctcommon = data['acctcommon'].copy()
-    acctstatistichist = data['acctstatistichist'].copy()
     wh_deposits = data['wh_deposit'].copy()
     historical_acctcommon = data['historical_acctcommon'].copy()
     househldacct = data['househldacct']
 
+    # Pull the open ACCTSTATISTICHIST months into the local store
+    cdutils.acctstatistichist.get_store().refresh()
+
 
     three_month_df = src.deposit_file.create_deposit_dataset.filter_on_trailing_months(historical_acctcommon, 3)
     # three_month_df.to_excel(Path('ThreeMonthCheck.xlsx',index=False))
@@ -37,12 +40,12 @@ def deposit_dataset_execution():
     # TTM: Trailing Twelve Months
     start_date_ttm = (current_date - relativedelta(years=1)).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     end_date_ttm = current_date
-    dod_ttm, nsf_ttm = src.deposit_file.create_deposit_dataset.filter_acctstatistic(acctstatistichist, start_date_ttm, end_date_ttm, prefix="TTM")
+    dod_ttm, nsf_ttm = src.deposit_file.create_deposit_dataset.filter_acctstatistic(start_date_ttm, end_date_ttm, prefix="TTM")
     
     # YTD: Year-to-Date
     start_date_ytd = datetime(current_date.year, 1, 1)
     end_date_ytd = current_date
-    dod_ytd, nsf_ytd = src.deposit_file.create_deposit_dataset.filter_acctstatistic(acctstatistichist, start_date_ytd, end_date_ytd, prefix="YTD")
+    dod_ytd, nsf_ytd = src.deposit_file.create_deposit_dataset.filter_acctstatistic(start_date_ytd, end_date_ytd, prefix="YTD")
     
 
     df = src.deposit_file.create_deposit_dataset.quality_control_and_merging(
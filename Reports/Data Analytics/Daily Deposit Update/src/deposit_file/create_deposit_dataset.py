@@ -10,6 +10,7 @@ from typing import Tuple
 from sqlalchemy import text # type: ignore
 import pandas as pd # type: ignore 
 
+import cdutils.acctstatistichist
 import cdutils.database.connect
 import src.deposit_file
 
@@ -65,13 +66,6 @@ def fetch_data():
         OSIBANK.WH_DEPOSIT a
     """)
 
-    acctstatistichist = text("""
-    SELECT 
-        *
-    FROM 
-        OSIBANK.ACCTSTATISTICHIST
-    """)
-
     househldacct = text("""
     SELECT 
         a.ACCTNBR,
@@ -85,7 +79,6 @@ def fetch_data():
         {'key':'acctcommon', 'sql':acctcommon, 'engine':1},
         {'key':'historical_acctcommon', 'sql':historical_acctcommon, 'engine':2},
         {'key':'wh_deposit', 'sql':wh_deposit, 'engine':1},
-        {'key':'acctstatistichist', 'sql':acctstatistichist, 'engine':1},
         {'key':'househldacct', 'sql':househldacct, 'engine':1},
     ]
 
@@ -165,14 +158,15 @@ def average_balance_over_period(df: pd.DataFrame, col_output_name: str) -> pd.Da
     grouped_df = grouped_df.rename(columns={'notemtdavgbal': col_output_name})
     return grouped_df
 
-def filter_acctstatistic(acctstatistic: pd.DataFrame, start_date: datetime, end_date: datetime, prefix: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+def filter_acctstatistic(start_date: datetime, end_date: datetime, prefix: str) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
-    Filters the account statistics DataFrame for a given date range and computes
-    the sum of statistic_count for DOD and NSF statistic types, grouped by account number.
+    Computes the sum of statistic_count for DOD and NSF statistic types over the months
+    from start_date to end_date, grouped by account number.
+
+    Reads the local ACCTSTATISTICHIST store (cdutils.acctstatistichist), which only
+    pulls the open months from COCC; the window sums are memoized until its next refresh.
     
     Parameters:
-    - acctstatistic: pd.DataFrame - Input DataFrame with account statistics (columns: 'acctnbr', 'yearnbr', 
-      'monthcd', 'statistictypecd', 'statistic_count').
     - start_date: datetime - Start date of the period (inclusive).
     - end_date: datetime - End date of the period (inclusive).
     - prefix: str - Prefix for output column names (e.g., 'TTM' for trailing twelve months, 'YTD' for year-to-date).
@@ -182,27 +176,19 @@ def filter_acctstatistic(acctstatistic: pd.DataFrame, start_date: datetime, end_
         - DOD DataFrame with columns 'acctnbr' and '{prefix}_DAYS_OVERDRAWN'.
         - NSF DataFrame with columns 'acctnbr' and '{prefix}_NSF_COUNT'.
     """
-    # Create a copy to avoid modifying the input DataFrame
-    df = acctstatistic.copy()
-    
-    # Create statistic_date from yearnbr and monthcd (first day of the month)
-    df['statistic_date'] = pd.to_datetime(
-        df['yearnbr'].astype(str) + '-' +
-        df['monthcd'].astype(str).str.zfill(2) + '-01'
-    )
-    
-    # Filter for rows within the specified date range
-    df = df[(df['statistic_date'] >= start_date) & (df['statistic_date'] <= end_date)].copy()
+    # Months are compared by year/month, so a window starting on the 1st includes that month
+    counts = cdutils.acctstatistichist.get_store().window_counts(start_date, end_date, codes=['DOD', 'NSF'])
+    counts = counts.reset_index()
+    # Store keys are str; acctcommon comes back numeric
+    counts['acctnbr'] = pd.to_numeric(counts['acctnbr'])
     
-    # DOD: Filter, group, and sum statistic_count
-    dod = df[df['statistictypcd'] == "DOD"].copy()
-    dod_grouped = dod.groupby('acctnbr')['statisticcount'].sum().reset_index()
-    dod_grouped = dod_grouped.rename(columns={'statisticcount': f"{prefix}_DAYS_OVERDRAWN"})
+    # DOD: accounts with DOD rows in the window
+    dod_grouped = counts.loc[counts['DOD'].notna(), ['acctnbr', 'DOD']].reset_index(drop=True)
+    dod_grouped = dod_grouped.rename(columns={'DOD': f"{prefix}_DAYS_OVERDRAWN"})
     
-    # NSF: Filter, group, and sum statistic_count
-    nsf = df[df['statistictypcd'] == "NSF"].copy()
-    nsf_grouped = nsf.groupby('acctnbr')['statisticcount'].sum().reset_index()
-    nsf_grouped = nsf_grouped.rename(columns={'statisticcount': f"{prefix}_NSF_COUNT"})
+    # NSF: accounts with NSF rows in the window
+    nsf_grouped = counts.loc[counts['NSF'].notna(), ['acctnbr', 'NSF']].reset_index(drop=True)
+    nsf_grouped = nsf_grouped.rename(columns={'NSF': f"{prefix}_NSF_COUNT"})
     
     # Return the two DataFrames
     return dod_grouped, nsf_grouped
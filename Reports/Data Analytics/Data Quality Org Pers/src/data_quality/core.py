@@ -1,6 +1,8 @@
 import pandas as pd
 from pathlib import Path
 
+import cdutils.input_cleansing # type: ignore
+
 def merge_org_with_view_taxid(wh_org, vieworgtaxid):
     """
     Merge WH_ORG with VIEWORGTAXID to update tax information.
@@ -47,8 +49,8 @@ def merge_org_with_view_taxid(wh_org, vieworgtaxid):
         try:
             vieworgtaxid_copy = vieworgtaxid.copy()
             # Convert both to string for reliable joining
-            wh_org_updated['orgnbr'] = wh_org_updated['orgnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
-            vieworgtaxid_copy['orgnbr'] = vieworgtaxid_copy['orgnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
+            wh_org_updated = cdutils.input_cleansing.normalize_key_columns(wh_org_updated, 'orgnbr', inplace=True)
+            vieworgtaxid_copy = cdutils.input_cleansing.normalize_key_columns(vieworgtaxid_copy, 'orgnbr', inplace=True)
         except Exception as e:
             raise ValueError(f"Cannot convert orgnbr dtypes for join: {e}")
     else:
@@ -124,8 +126,8 @@ def merge_pers_with_view_taxid(wh_pers, viewperstaxid):
         try:
             viewperstaxid_copy = viewperstaxid.copy()
             # Convert both to string for reliable joining
-            wh_pers_updated['persnbr'] = wh_pers_updated['persnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
-            viewperstaxid_copy['persnbr'] = viewperstaxid_copy['persnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
+            wh_pers_updated = cdutils.input_cleansing.normalize_key_columns(wh_pers_updated, 'persnbr', inplace=True)
+            viewperstaxid_copy = cdutils.input_cleansing.normalize_key_columns(viewperstaxid_copy, 'persnbr', inplace=True)
         except Exception as e:
             raise ValueError(f"Cannot convert persnbr dtypes for join: {e}")
     else:
@@ -181,8 +183,8 @@ def create_org_table_with_address(wh_org, orgaddruse, wh_addr):
             wh_org = wh_org.copy()
             
             # Convert both to string, handling floats by removing decimal points
-            wh_org['orgnbr'] = wh_org['orgnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
-            orgaddruse['orgnbr'] = orgaddruse['orgnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
+            wh_org = cdutils.input_cleansing.normalize_key_columns(wh_org, 'orgnbr', inplace=True)
+            orgaddruse = cdutils.input_cleansing.normalize_key_columns(orgaddruse, 'orgnbr', inplace=True)
                 
             print(f"Successfully converted both orgnbr columns to string")
         except Exception as e:
@@ -197,8 +199,8 @@ def create_org_table_with_address(wh_org, orgaddruse, wh_addr):
             wh_addr = wh_addr.copy()
             
             # Convert both to string, handling floats by removing decimal points
-            orgaddruse['addrnbr'] = orgaddruse['addrnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
-            wh_addr['addrnbr'] = wh_addr['addrnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
+            orgaddruse = cdutils.input_cleansing.normalize_key_columns(orgaddruse, 'addrnbr', inplace=True)
+            wh_addr = cdutils.input_cleansing.normalize_key_columns(wh_addr, 'addrnbr', inplace=True)
                 
             print(f"Successfully converted both addrnbr columns to string")
         except Exception as e:
@@ -249,8 +251,8 @@ def create_pers_table_with_address(wh_pers, persaddruse, wh_addr):
             wh_pers = wh_pers.copy()
             
             # Convert both to string, handling floats by removing decimal points
-            wh_pers['persnbr'] = wh_pers['persnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
-            persaddruse['persnbr'] = persaddruse['persnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
+            wh_pers = cdutils.input_cleansing.normalize_key_columns(wh_pers, 'persnbr', inplace=True)
+            persaddruse = cdutils.input_cleansing.normalize_key_columns(persaddruse, 'persnbr', inplace=True)
                 
             print(f"Successfully converted both persnbr columns to string")
         except Exception as e:
@@ -265,8 +267,8 @@ def create_pers_table_with_address(wh_pers, persaddruse, wh_addr):
             wh_addr = wh_addr.copy()
             
             # Convert both to string, handling floats by removing decimal points
-            persaddruse['addrnbr'] = persaddruse['addrnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
-            wh_addr['addrnbr'] = wh_addr['addrnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
+            persaddruse = cdutils.input_cleansing.normalize_key_columns(persaddruse, 'addrnbr', inplace=True)
+            wh_addr = cdutils.input_cleansing.normalize_key_columns(wh_addr, 'addrnbr', inplace=True)
                 
             print(f"Successfully converted both addrnbr columns to string")
         except Exception as e:
@@ -335,8 +337,8 @@ def filter_to_active_accounts(acct_df, wh_allroles, pers_with_address=None, org_
                 target_df = target_df.copy()
                 
                 # Convert both to string, handling floats by removing decimal points
-                target_df['persnbr'] = target_df['persnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
-                wh_allroles['persnbr'] = wh_allroles['persnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
+                target_df = cdutils.input_cleansing.normalize_key_columns(target_df, 'persnbr', inplace=True)
+                wh_allroles = cdutils.input_cleansing.normalize_key_columns(wh_allroles, 'persnbr', inplace=True)
                     
                 print(f"Successfully converted both persnbr columns to string")
             except Exception as e:
@@ -358,8 +360,8 @@ def filter_to_active_accounts(acct_df, wh_allroles, pers_with_address=None, org_
                 target_df = target_df.copy()
                 
                 # Convert both to string, handling floats by removing decimal points
-                target_df['orgnbr'] = target_df['orgnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
-                wh_allroles['orgnbr'] = wh_allroles['orgnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else x)
+                target_df = cdutils.input_cleansing.normalize_key_columns(target_df, 'orgnbr', inplace=True)
+                wh_allroles = cdutils.input_cleansing.normalize_key_columns(wh_allroles, 'orgnbr', inplace=True)
                     
                 print(f"Successfully converted both orgnbr columns to string")
             except Exception as e:
@@ -374,8 +376,8 @@ def filter_to_active_accounts(acct_df, wh_allroles, pers_with_address=None, org_
             acct_df = acct_df.copy()
             
             # Convert both to string, handling floats by removing decimal points
-            acct_df['acctnbr'] = acct_df['acctnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else str(x))
-            wh_allroles['acctnbr'] = wh_allroles['acctnbr'].apply(lambda x: str(int(float(x))) if pd.notnull(x) else str(x))
+            acct_df = cdutils.input_cleansing.normalize_key_columns(acct_df, 'acctnbr', inplace=True)
+            wh_allroles = cdutils.input_cleansing.normalize_key_columns(wh_allroles, 'acctnbr', inplace=True)
                 
             print(f"Successfully converted both acctnbr columns to string")
         except Exception as e:
@@ -467,8 +469,8 @@ def merge_with_input_file(my_df, input_folder, entity_type):
         print("Converting both columns to string for reliable joining...")
         try:
             # Convert both to string, handling floats by removing decimal points
-            my_df_upper[join_key] = my_df_upper[join_key].apply(lambda x: str(int(float(x))) if pd.notnull(x) else str(x))
-            janet_df[join_key] = janet_df[join_key].apply(lambda x: str(int(float(x))) if pd.notnull(x) else str(x))
+            my_df_upper = cdutils.input_cleansing.normalize_key_columns(my_df_upper, join_key, inplace=True)
+            janet_df = cdutils.input_cleansing.normalize_key_columns(janet_df, join_key, inplace=True)
             print(f"Successfully converted both {join_key} columns to string")
         except Exception as e:
             raise ValueError(f"Cannot convert {join_key} dtypes for join: {e}")
@@ -0,0 +1,222 @@
+"""
+Incremental (watermark + MERGE) bronze loads
+
+Tables with keys in src.bronze.tables only pull rows changed since the last load: rows with
+watermark column >= the stored watermark (or no watermark value at all) are MERGEd into the
+Delta table on the table's keys (matched rows updated, new rows inserted). Tables with
+'deletes' also pull their key columns and delete bronze rows that are gone from the source.
+
+The watermark (largest watermark column value loaded so far) is recorded in the
+custom metadata of every commit a load makes, next to the data, and read back from the
+table's latest commit. A table without one (first load, watermark column changed, or an
+explicit full reload) is pulled in full and overwritten. Commit metadata rather than
+table properties: a set_table_properties call running while another thread writes a
+Delta table can deadlock deltalake, and bronze tables are written in parallel.
+
+Re-pulling from the watermark itself (>=) is safe: the MERGE is an upsert, so rows
+seen twice are simply updated again.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+from deltalake import CommitProperties, DeltaTable, write_deltalake
+
+import src.config
+import src.bronze.fetch_data
+from src.utils.parquet_io import add_load_timestamp, cast_all_null_columns_to_string
+
+WATERMARK_PROPERTY = 'bronze.watermark'
+WATERMARK_COLUMN_PROPERTY = 'bronze.watermark_column'
+
+
+def read_watermark(path: Path, column: str) -> Optional[pd.Timestamp]:
+    """
+    Watermark recorded on the latest commit of the Delta table at path, or None (no table, no watermark, or a different column)
+    """
+    if not DeltaTable.is_deltatable(str(path)):
+        return None
+    commit = DeltaTable(path).history(1)[0]
+    if commit.get(WATERMARK_COLUMN_PROPERTY) != column or not commit.get(WATERMARK_PROPERTY):
+        return None
+    return pd.Timestamp(commit[WATERMARK_PROPERTY])
+
+
+def watermark_commit(column: str, value) -> CommitProperties:
+    """
+    Commit properties recording the watermark on a load's commit (None clears it, forcing a full load next run)
+    """
+    return CommitProperties(custom_metadata={
+        WATERMARK_COLUMN_PROPERTY: column,
+        WATERMARK_PROPERTY: '' if value is None or pd.isna(value) else pd.Timestamp(value).isoformat(),
+    })
+
+
+def spec_problem(df: pd.DataFrame, spec: Dict) -> Optional[str]:
+    """
+    Why df cannot be loaded incrementally with spec (missing columns, non-unique keys, no watermark), or None
+    """
+    missing = [column for column in spec['keys'] + [spec['watermark']] if column not in df.columns]
+    if missing:
+        return f"missing columns {missing}"
+    if df.duplicated(subset=spec['keys']).any():
+        return f"{spec['keys']} is not unique"
+    if df[spec['watermark']].isna().all():
+        return f"{spec['watermark']} is empty"
+    return None
+
+
+def _match_predicate(keys: List[str]) -> str:
+    # Null-safe, so nullable key columns (e.g. persnbr/orgnbr on roles) still match
+    return " AND ".join(f"(t.{key} IS NOT DISTINCT FROM s.{key})" for key in keys)
+
+
+def _as_table_schema(df: pd.DataFrame, dt: DeltaTable, fill_missing: bool = False) -> pa.Table:
+    """
+    Arrow table of df with columns the Delta table has cast to its types (small batches
+    often have all-null columns of the wrong type). fill_missing adds the table's other
+    columns as nulls.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for field in pa.schema(dt.schema().to_arrow()):
+        if field.name in table.column_names:
+            index = table.schema.get_field_index(field.name)
+            if table.schema.field(index).type != field.type:
+                table = table.set_column(index, field.name, table.column(index).cast(field.type))
+        elif fill_missing:
+            table = table.append_column(field.name, pa.nulls(len(table), field.type))
+    return table
+
+
+def apply_changes(path: Path, changes: pd.DataFrame, keys: List[str], commit_properties: Optional[CommitProperties] = None) -> Dict:
+    """
+    MERGE changes into the Delta table at path: update rows matching on keys, insert the rest.
+
+    Returns:
+        dict: deltalake merge metrics
+    """
+    dt = DeltaTable(path)
+    return (
+        dt.merge(
+            source=_as_table_schema(changes, dt, fill_missing=True),
+            predicate=_match_predicate(keys),
+            source_alias='s',
+            target_alias='t',
+            merge_schema=True,
+            commit_properties=commit_properties,
+        )
+        .when_matched_update_all()
+        .when_not_matched_insert_all()
+        .execute()
+    )
+
+
+def apply_deletes(path: Path, current_keys: pd.DataFrame, keys: List[str], commit_properties: Optional[CommitProperties] = None) -> int:
+    """
+    Delete rows of the Delta table at path whose keys are not in current_keys.
+
+    Returns:
+        int: rows deleted
+    """
+    dt = DeltaTable(path)
+    if current_keys.empty:
+        print(f"[WARNING] No source keys returned for {path.name}; skipping deletes")
+        return 0
+    metrics = (
+        dt.merge(
+            source=_as_table_schema(current_keys[keys].drop_duplicates(), dt),
+            predicate=_match_predicate(keys),
+            source_alias='s',
+            target_alias='t',
+            commit_properties=commit_properties,
+        )
+        .when_not_matched_by_source_delete()
+        .execute()
+    )
+    return metrics['num_target_rows_deleted']
+
+
+def extract(name: str, spec: Dict, full_reload: bool = False) -> Dict:
+    """
+    Pull what one incremental table needs: everything (no watermark or full_reload) or
+    the rows changed since the watermark (plus the current keys when spec has deletes).
+    """
+    path = src.config.BRONZE / name
+    column = spec['watermark']
+    watermark = None if full_reload else read_watermark(path, column)
+
+    if watermark is None:
+        df = src.bronze.fetch_data.fetch_table(spec['source'], spec.get('columns', '*'), spec.get('engine', 1))['table']
+        return {'mode': 'full', 'df': df}
+
+    changes = src.bronze.fetch_data.fetch_table_changes(spec['source'], column, watermark, spec.get('columns', '*'), spec.get('engine', 1))['changes']
+    current_keys = None
+    if spec.get('deletes'):
+        current_keys = src.bronze.fetch_data.fetch_table_keys(spec['source'], spec['keys'], spec.get('engine', 1))['keys']
+    return {'mode': 'incremental', 'df': changes, 'current_keys': current_keys, 'watermark': watermark}
+
+
+def write(name: str, spec: Dict, extracted: Dict) -> Dict:
+    """
+    Apply an extract() result: overwrite for a full pull, MERGE (and deletes) for changes.
+
+    Returns:
+        dict: table, mode ('full' / 'incremental'), rows pulled, inserted, updated, deleted, watermark
+    """
+    path = src.config.BRONZE / name
+    path.mkdir(parents=True, exist_ok=True)
+    column = spec['watermark']
+    df = extracted['df']
+
+    if extracted['mode'] == 'full':
+        print(f"{name}: full load")
+        df = cast_all_null_columns_to_string(df)
+        df = add_load_timestamp(df)
+        problem = spec_problem(df, spec)
+        new_watermark = None if problem else df[column].max()
+        write_deltalake(path, df, mode='overwrite', schema_mode=spec.get('schema_mode', 'merge'), commit_properties=watermark_commit(column, new_watermark))
+        if problem:
+            print(f"[WARNING] {name} cannot be loaded incrementally ({problem}); it will be loaded in full again next run")
+        return {'table': name, 'mode': 'full', 'rows': len(df), 'inserted': len(df), 'updated': 0, 'deleted': 0, 'watermark': new_watermark}
+
+    watermark = extracted['watermark']
+    missing = [c for c in spec['keys'] + [column] if c not in df.columns]
+    if missing:
+        raise ValueError(f"{name} changes are missing {missing}; run a full reload of {name}")
+
+    result = {'table': name, 'mode': 'incremental', 'rows': len(df), 'inserted': 0, 'updated': 0, 'deleted': 0, 'watermark': watermark}
+    new_watermark = df[column].max() if not df.empty else None
+    if new_watermark is not None and pd.notna(new_watermark) and pd.Timestamp(new_watermark) > watermark:
+        result['watermark'] = pd.Timestamp(new_watermark)
+    # Every commit of this load carries the watermark in effect after it, whichever ends up latest
+    commit_properties = watermark_commit(column, result['watermark'])
+
+    if not df.empty:
+        df = df.sort_values(column).drop_duplicates(subset=spec['keys'], keep='last')
+        df = add_load_timestamp(df)
+        metrics = apply_changes(path, df, spec['keys'], commit_properties)
+        result['inserted'] = metrics['num_target_rows_inserted']
+        result['updated'] = metrics['num_target_rows_updated']
+
+    if extracted.get('current_keys') is not None:
+        result['deleted'] = apply_deletes(path, extracted['current_keys'], spec['keys'], commit_properties)
+
+    print(f"{name}: {result['inserted']} inserted, {result['updated']} updated, {result['deleted']} deleted (changes since {watermark})")
+    return result
+
+
+def load_table(name: str, spec: Dict, full_reload: bool = False) -> Dict:
+    """
+    Load one bronze table incrementally, or in full when it has no watermark or full_reload is set.
+
+    Args:
+        name (str): bronze table name (folder under src.config.BRONZE)
+        spec (Dict): src.bronze.tables entry with keys and watermark
+        full_reload (bool): ignore the watermark and overwrite the table from a full pull
+
+    Returns:
+        dict: see write()
+    """
+    return write(name, spec, extract(name, spec, full_reload))
@@ -0,0 +1,232 @@
+"""
+Bronze extraction pipeline
+
+Runs src.bronze.tables.BRONZE_TABLES, one source query per table:
+- extractions run concurrently (cdutils' engine registry still caps how many
+  queries run at once on each engine, across threads)
+- each table is written to Delta by a writer thread as soon as its extraction
+  finishes, so writes overlap the remaining extractions
+- at most extract_workers + write_workers tables are held in memory at once
+  (extracting, or extracted and waiting for / being written): a table's frame is
+  dropped once written, and finished futures are released as they complete
+
+Full-load tables are only overwritten when their content changed: the row count and a
+content hash are recorded in the custom metadata of each overwrite commit, and a pull
+matching the latest commit's is not written (mode 'unchanged'), so the Delta version stays
+put and silver steps reading the table are skipped (src.silver.build).
+
+A manifest with rows, bytes, durations and watermark for every table is written to
+src.config.MANIFEST_DIR after each run, including runs where a table failed.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from deltalake import CommitProperties, DeltaTable, write_deltalake
+
+import src.config
+import src.bronze.fetch_data
+import src.bronze.incremental
+from src.bronze.tables import BRONZE_TABLES
+import src.utils.manifest
+from src.utils.parquet_io import add_load_timestamp, cast_all_null_columns_to_string
+
+ROWS_PROPERTY = 'bronze.rows'
+CONTENT_HASH_PROPERTY = 'bronze.content_hash'
+
+
+def extract_table(spec: Dict, full_reload: bool = False) -> Dict:
+    """
+    Run the source query for one table (changes only for incremental tables with a watermark)
+    """
+    if spec.get('keys'):
+        return src.bronze.incremental.extract(spec['name'], spec, full_reload)
+    df = src.bronze.fetch_data.fetch_table(spec['source'], spec.get('columns', '*'), spec.get('engine', 1))['table']
+    return {'mode': 'full', 'df': df}
+
+
+def content_hash(df: pd.DataFrame) -> str:
+    """
+    Hash of a frame's columns, dtypes and rows, ignoring row order (source queries have no ORDER BY)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([[str(column), str(dtype)] for column, dtype in df.dtypes.items()]).encode())
+    digest.update(np.sort(pd.util.hash_pandas_object(df, index=False).to_numpy()).tobytes())
+    return digest.hexdigest()
+
+
+def read_fingerprint(path: Path) -> Optional[Dict[str, str]]:
+    """
+    Row count and content hash recorded on the latest commit of the Delta table at path, None if missing
+    """
+    if not DeltaTable.is_deltatable(str(path)):
+        return None
+    commit = DeltaTable(path).history(1)[0]
+    if not commit.get(CONTENT_HASH_PROPERTY):
+        return None
+    return {ROWS_PROPERTY: commit.get(ROWS_PROPERTY), CONTENT_HASH_PROPERTY: commit[CONTENT_HASH_PROPERTY]}
+
+
+def write_table(spec: Dict, extracted: Dict) -> Dict:
+    """
+    Write one extract_table() result to its Delta table (full loads: only when the content changed)
+
+    Returns:
+        dict: table, mode, rows, inserted, updated, deleted, watermark
+    """
+    if spec.get('keys'):
+        return src.bronze.incremental.write(spec['name'], spec, extracted)
+
+    path = src.config.BRONZE / spec['name']
+    path.mkdir(parents=True, exist_ok=True)
+    df = extracted['df']
+    if spec.get('cast_nulls', True):
+        df = cast_all_null_columns_to_string(df)
+
+    fingerprint = {ROWS_PROPERTY: str(len(df)), CONTENT_HASH_PROPERTY: content_hash(df)}
+    if read_fingerprint(path) == fingerprint:
+        return {'table': spec['name'], 'mode': 'unchanged', 'rows': len(df), 'inserted': 0, 'updated': 0, 'deleted': 0, 'watermark': None}
+
+    df = add_load_timestamp(df)
+    # Commit metadata, not table properties: set_table_properties while another writer thread
+    # is writing can deadlock deltalake (see src.bronze.incremental)
+    write_deltalake(path, df, mode='overwrite', schema_mode=spec.get('schema_mode', 'merge'), commit_properties=CommitProperties(custom_metadata=fingerprint))
+    return {'table': spec['name'], 'mode': 'full', 'rows': len(df), 'inserted': len(df), 'updated': 0, 'deleted': 0, 'watermark': None}
+
+
+def table_bytes(path: Path) -> Optional[int]:
+    """
+    Size on disk of the current version of a Delta table, None if unreadable
+    """
+    try:
+        return sum(Path(uri).stat().st_size for uri in DeltaTable(path).file_uris())
+    except Exception:
+        return None
+
+
+def write_manifest(entries: List[Dict], started: datetime, finished: datetime, full_reload) -> Path:
+    """
+    Write the run manifest (bronze_<timestamp>.json and bronze_latest.json) to src.config.MANIFEST_DIR
+    """
+    manifest = {
+        'started': started.isoformat(timespec='seconds'),
+        'finished': finished.isoformat(timespec='seconds'),
+        'seconds': round((finished - started).total_seconds(), 1),
+        'full_reload': full_reload if isinstance(full_reload, bool) else sorted(full_reload),
+        'tables': entries,
+    }
+    return src.utils.manifest.write_manifest('bronze', manifest, started)
+
+
+def run_bronze(tables: List[Dict] = BRONZE_TABLES, full_reload: Union[bool, Iterable[str]] = False, extract_workers: Optional[int] = None, write_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Extract and write every table, then write the manifest.
+
+    Args:
+        tables (List[Dict]): src.bronze.tables entries
+        full_reload: True (or table names) to reload incremental tables in full
+        extract_workers (int): concurrent extractions (default src.config.BRONZE_EXTRACT_WORKERS)
+        write_workers (int): concurrent Delta writes (default src.config.BRONZE_WRITE_WORKERS)
+
+    Returns:
+        List[Dict]: manifest entry per table, in table order
+
+    Raises:
+        The first table error, after every other table has finished and the manifest is written
+    """
+    extract_workers = extract_workers or src.config.BRONZE_EXTRACT_WORKERS
+    write_workers = write_workers or src.config.BRONZE_WRITE_WORKERS
+    if not isinstance(full_reload, bool):
+        full_reload = set(full_reload)
+
+    names = [spec['name'] for spec in tables]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate bronze table names: {sorted({name for name in names if names.count(name) > 1})}")
+
+    entries = {
+        spec['name']: {
+            'table': spec['name'], 'source': spec['source'], 'engine': spec.get('engine', 1),
+            'status': 'pending', 'mode': None, 'rows': None, 'inserted': None, 'updated': None, 'deleted': None,
+            'bytes': None, 'extract_seconds': None, 'write_seconds': None, 'watermark': None, 'error': None,
+        }
+        for spec in tables
+    }
+    errors = []
+    in_flight = threading.Semaphore(extract_workers + write_workers)
+
+    def extract(spec):
+        in_flight.acquire()
+        start = time.perf_counter()
+        try:
+            reload_table = full_reload if isinstance(full_reload, bool) else spec['name'] in full_reload
+            return extract_table(spec, reload_table)
+        except BaseException:
+            in_flight.release()
+            raise
+        finally:
+            entries[spec['name']]['extract_seconds'] = round(time.perf_counter() - start, 2)
+
+    def write(spec, extracted):
+        start = time.perf_counter()
+        try:
+            return write_table(spec, extracted)
+        finally:
+            extracted.pop('df', None)
+            extracted.pop('current_keys', None)
+            in_flight.release()
+            entries[spec['name']]['write_seconds'] = round(time.perf_counter() - start, 2)
+
+    def record_failure(spec, error):
+        entries[spec['name']].update({'status': 'failed', 'error': f"{type(error).__name__}: {error}"})
+        print(f"[WARNING] Bronze table {spec['name']} failed: {error}")
+        errors.append(error)
+
+    started = datetime.now()
+    print(f"Start bronze table generation ({len(tables)} tables, {extract_workers} extract / {write_workers} write workers)")
+    with ThreadPoolExecutor(extract_workers, thread_name_prefix='bronze-extract') as extractor, \
+            ThreadPoolExecutor(write_workers, thread_name_prefix='bronze-write') as writer:
+        extract_futures = {extractor.submit(extract, spec): spec for spec in tables}
+        write_futures = {}
+        while extract_futures or write_futures:
+            done, _ = wait([*extract_futures, *write_futures], return_when=FIRST_COMPLETED)
+            for future in done:
+                # Popped so a finished future (and the frame it holds) is not kept until the run ends
+                if future in extract_futures:
+                    spec = extract_futures.pop(future)
+                    try:
+                        extracted = future.result()
+                    except Exception as e:
+                        record_failure(spec, e)
+                        continue
+                    write_futures[writer.submit(write, spec, extracted)] = spec
+                    del extracted
+                    continue
+
+                spec = write_futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    record_failure(spec, e)
+                    continue
+                entry = entries[spec['name']]
+                entry.update({key: result[key] for key in ('mode', 'rows', 'inserted', 'updated', 'deleted', 'watermark')})
+                entry['status'] = 'ok'
+                entry['bytes'] = table_bytes(src.config.BRONZE / spec['name'])
+                print(f"{spec['name']}: {entry['rows']} rows ({entry['mode']}) in {entry['extract_seconds']}s + {entry['write_seconds']}s")
+            del done, future
+
+    ordered = [entries[name] for name in names]
+    manifest_path = write_manifest(ordered, started, datetime.now(), full_reload)
+    print(f"Bronze manifest: {manifest_path}")
+
+    if errors:
+        raise errors[0]
+    return ordered
@@ -0,0 +1,75 @@
+"""
+Bronze tables, one entry per source query (run by src.bronze.pipeline)
+
+Keys per entry:
+    name:        bronze table (folder under src.config.BRONZE)
+    source:      table or view to select from
+    engine:      cdutils engine (1: R1625, 2: COCC DataMart), default 1
+    columns:     '*' (default) or the columns to select
+    schema_mode: write_deltalake schema_mode for full loads, default 'merge'
+    cast_nulls:  cast all-null columns to string before writing, default True
+    keys, watermark, deletes: incremental loads (src.bronze.incremental); tables
+                 without keys are pulled in full every run and overwritten when their
+                 content changed (src.bronze.pipeline)
+
+A table is only loaded incrementally when every change to a row moves its watermark:
+- WH_ALLROLES / WH_ORG / WH_PERS: DATELASTMAINT is stamped by every maintenance of
+  the role, org or person row, which is the only way those rows change. Rows are
+  also removed (roles ended, orgs/persons purged), so they use deletes.
+- WH_RTXN: transactions arrive with the RUNDATE they posted on and the source purges
+  old ones, so it uses deletes too. A transaction edited after its run date is only
+  picked up by a full reload (BRONZE_FULL_RELOAD=wh_rtxn).
+Rows with no watermark value are pulled again on every run.
+The account warehouse tables (WH_ACCTCOMMON, WH_ACCTLOAN, WH_LOANS) stay on full
+loads: they are rebuilt nightly and balances, due amounts and days past due change
+through posting and accrual without DATELASTMAINT moving.
+"""
+
+BRONZE_TABLES = [
+    # Address
+    {'name': 'wh_addr', 'source': 'OSIBANK.WH_ADDR', 'cast_nulls': False, 'columns': [
+        'addrnbr', 'text1', 'addrlinetypcd1', 'addrlinetypdesc1', 'text2', 'addrlinetypcd2', 'addrlinetypdesc2',
+        'text3', 'addrlinetypcd3', 'addrlinetypdesc3', 'cityname', 'statecd', 'zipcd',
+    ]},
+
+    # Roles, org/pers
+    {'name': 'wh_allroles', 'source': 'OSIBANK.WH_ALLROLES', 'keys': ['acctnbr', 'acctrolecd', 'persnbr', 'orgnbr'], 'watermark': 'datelastmaint', 'deletes': True},
+    {'name': 'wh_org', 'source': 'OSIBANK.WH_ORG', 'keys': ['orgnbr'], 'watermark': 'datelastmaint', 'deletes': True},
+    {'name': 'wh_pers', 'source': 'OSIBANK.WH_PERS', 'keys': ['persnbr'], 'watermark': 'datelastmaint', 'deletes': True},
+
+    # DB metadata lookup
+    {'name': 'metadata_lookup_engine1', 'source': 'sys.all_tab_columns', 'engine': 1, 'cast_nulls': False, 'columns': ['owner', 'table_name', 'column_name', 'data_type']},
+    {'name': 'metadata_lookup_engine2', 'source': 'sys.all_tab_columns', 'engine': 2, 'cast_nulls': False, 'columns': ['owner', 'table_name', 'column_name', 'data_type']},
+
+    # Property
+    {'name': 'wh_prop', 'source': 'OSIBANK.WH_PROP'},
+    {'name': 'wh_prop2', 'source': 'OSIBANK.WH_PROP2'},
+
+    # Insurance
+    {'name': 'acctpropins', 'source': 'OSIBANK.ACCTPROPINS'},
+    {'name': 'wh_inspolicy', 'source': 'OSIBANK.WH_INSPOLICY'},
+
+    # Account data
+    {'name': 'wh_acctcommon', 'source': 'OSIBANK.WH_ACCTCOMMON'},
+    {'name': 'wh_acctloan', 'source': 'OSIBANK.WH_ACCTLOAN', 'schema_mode': 'overwrite'},
+    {'name': 'wh_loans', 'source': 'OSIBANK.WH_LOANS'},
+
+    # Address linking
+    {'name': 'persaddruse', 'source': 'OSIBANK.PERSADDRUSE'},
+    {'name': 'orgaddruse', 'source': 'OSIBANK.ORGADDRUSE'},
+
+    # Transactions
+    {'name': 'wh_rtxn', 'source': 'OSIBANK.WH_RTXN', 'keys': ['acctnbr', 'rtxnnbr'], 'watermark': 'rundate', 'deletes': True},
+    {'name': 'wh_rtxnbal', 'source': 'OSIBANK.WH_RTXNBAL'},
+
+    # User fields
+    {'name': 'wh_acctuserfields', 'source': 'OSIBANK.WH_ACCTUSERFIELDS'},
+    {'name': 'wh_orguserfields', 'source': 'OSIBANK.WH_ORGUSERFIELDS'},
+    {'name': 'wh_persuserfields', 'source': 'OSIBANK.WH_PERSUSERFIELDS'},
+
+    # WH_INVR / ACCTGRPINVR: TODO
+
+    # Phone
+    {'name': 'persphone', 'source': 'OSIBANK.PERSPHONE', 'schema_mode': 'overwrite'},
+    {'name': 'orgphone', 'source': 'OSIBANK.ORGPHONE', 'schema_mode': 'overwrite'},
+]
@@ -31,9 +31,32 @@ BRONZE = BASE_PATH / "bronze"
 # Silver
 SILVER = BASE_PATH / "silver"
 
+# Silver history: every silver build kept as an effdate partition (src.silver.snapshots)
+SILVER_HISTORY = BASE_PATH / "silver_history"
+SILVER_RETENTION_DAYS = 45  # keep every snapshot this many days
+SILVER_RETENTION_MONTH_ENDS = 25  # and the last snapshot of each month for this many months
+
 # Gold
 GOLD = BASE_PATH / "gold"
 
+# Bronze full reloads (fallback): BRONZE_FULL_RELOAD=all, or comma-separated table names,
+# ignores the stored watermarks and reloads those incremental tables in full
+_full_reload = os.getenv('BRONZE_FULL_RELOAD', '').strip()
+BRONZE_FULL_RELOAD = True if _full_reload.lower() == 'all' else [name.strip() for name in _full_reload.split(',') if name.strip()]
+
+# Bronze pipeline: concurrent extractions (cdutils still caps queries per engine) and Delta writer threads
+BRONZE_EXTRACT_WORKERS = 4
+BRONZE_WRITE_WORKERS = 2
+
+# Silver build: steps built at once, and forced rebuilds (SILVER_FORCE_REBUILD=all, or
+# comma-separated step names) regardless of recorded lineage
+SILVER_WORKERS = 3
+_force_rebuild = os.getenv('SILVER_FORCE_REBUILD', '').strip()
+SILVER_FORCE_REBUILD = True if _force_rebuild.lower() == 'all' else [name.strip() for name in _force_rebuild.split(',') if name.strip()]
+
+# Run manifests (rows, bytes, durations, watermarks per table)
+MANIFEST_DIR = BASE_PATH / "manifests"
+
 # Email Recipients
 EMAIL_TO = []  # List of primary recipients for production
 EMAIL_CC = []  # List of CC recipients for production
@@ -24,11 +24,11 @@ def main():
 
     # == Bronze ==
     src.config.BRONZE.mkdir(parents=True, exist_ok=True)
-    src.bronze.core.generate_bronze_tables()
+    src.bronze.core.generate_bronze_tables(full_reload=src.config.BRONZE_FULL_RELOAD)
 
     # == Silver ==
     src.config.SILVER.mkdir(parents=True, exist_ok=True)
-    src.silver.core.generate_silver_tables()
+    src.silver.core.generate_silver_tables(force=src.config.SILVER_FORCE_REBUILD)
 
     # == Gold ==
 
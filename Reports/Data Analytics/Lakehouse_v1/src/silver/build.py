@@ -0,0 +1,287 @@
+"""
+Silver build graph
+
+Each silver build step (src.silver.core.SILVER_TABLES) declares the lakehouse tables it
+reads ('bronze/wh_pers', 'silver/account', ...). Steps reading another step's output run
+after it; independent steps run in parallel.
+
+A step is only rebuilt when it is stale:
+- it has never been built (or an output table is missing)
+- the Delta version of one of its inputs differs from the one recorded at its last build
+- it reads sources outside the lakehouse or stamps an effdate, and the effdate (last
+  business day) moved on
+- the project version changed
+
+A skipped step's outputs are still added to the snapshot history for the effdate
+(src.silver.snapshots.carry_forward), so month-end reads find them.
+
+After a build, the input versions are recorded on each output table (silver.lineage in
+the custom metadata of its write commit; src.bronze.incremental explains why not table
+properties), and a manifest of what was built or skipped and why is written to
+src.config.MANIFEST_DIR.
+"""
+
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+from deltalake import CommitProperties, DeltaTable
+
+import cdutils.acct_file_creation.core # type: ignore
+import src._version
+import src.config
+import src.silver.snapshots
+import src.utils.manifest
+
+LINEAGE_PROPERTY = 'silver.lineage'
+LAYERS = ('bronze', 'silver')
+
+
+def input_path(name: str) -> Path:
+    """
+    Location of a 'bronze/<table>' or 'silver/<table>' input
+    """
+    parts = name.split('/')
+    if len(parts) != 2 or parts[0] not in LAYERS or not parts[1]:
+        raise ValueError(f"Silver input must look like 'bronze/wh_pers' or 'silver/account', got {name!r}")
+    return (src.config.BRONZE if parts[0] == 'bronze' else src.config.SILVER) / parts[1]
+
+
+def graph_nodes(tables: List[Dict]) -> Dict[str, dict]:
+    """
+    Validate build steps and index them by name, adding the upstream steps each one waits for.
+
+    Raises:
+        ValueError: duplicate step or output names, bad or unknown inputs, or a cycle
+    """
+    nodes = {}
+    producers = {}
+    for spec in tables:
+        if spec['name'] in nodes:
+            raise ValueError(f"Duplicate silver step name: {spec['name']}")
+        for output in spec['outputs']:
+            if output in producers:
+                raise ValueError(f"Silver table {output} is built by both {producers[output]} and {spec['name']}")
+            producers[output] = spec['name']
+        nodes[spec['name']] = {**spec, 'inputs': list(spec.get('inputs', []))}
+
+    for name, node in nodes.items():
+        for input_name in node['inputs']:
+            input_path(input_name)
+        silver_inputs = [input_name.split('/')[1] for input_name in node['inputs'] if input_name.startswith('silver/')]
+        unknown = [table for table in silver_inputs if table not in producers]
+        if unknown:
+            raise ValueError(f"Silver step {name} reads tables no step builds: {unknown}")
+        node['upstream'] = sorted({producers[table] for table in silver_inputs})
+
+    # Cycle check: repeatedly remove steps whose upstreams are all removed
+    remaining = dict(nodes)
+    while remaining:
+        removable = [name for name, node in remaining.items() if not any(upstream in remaining for upstream in node['upstream'])]
+        if not removable:
+            raise ValueError(f"Silver build graph has a cycle between steps: {sorted(remaining)}")
+        for name in removable:
+            del remaining[name]
+
+    return nodes
+
+
+def table_version(path: Path) -> Optional[int]:
+    """
+    Current Delta version of the table at path, None if there is no table
+    """
+    if not DeltaTable.is_deltatable(str(path)):
+        return None
+    return DeltaTable(path).version()
+
+
+def read_lineage(output: str) -> Optional[Dict]:
+    """
+    Lineage recorded on the latest commit of a silver table (its last build), None if missing
+    """
+    path = src.config.SILVER / output
+    if not DeltaTable.is_deltatable(str(path)):
+        return None
+    lineage = DeltaTable(path).history(1)[0].get(LINEAGE_PROPERTY)
+    return json.loads(lineage) if lineage else None
+
+
+def lineage_commit(lineage: Dict) -> CommitProperties:
+    return CommitProperties(custom_metadata={LINEAGE_PROPERTY: json.dumps(lineage, sort_keys=True)})
+
+
+def current_lineage(node: Dict, effdate: str) -> Dict:
+    """
+    What a build of node now would record: its inputs' Delta versions, the effdate (steps
+    with sources or effdate only) and the project version
+    """
+    return {
+        'inputs': {input_name: table_version(input_path(input_name)) for input_name in node['inputs']},
+        'effdate': effdate if node.get('sources') or node.get('effdate') else None,
+        'code_version': src._version.__version__,
+    }
+
+
+def stale_reason(node: Dict, lineage: Dict) -> Optional[str]:
+    """
+    Why node needs rebuilding given its current lineage, None if every output is up to date
+    """
+    missing = [input_name for input_name, version in lineage['inputs'].items() if version is None]
+    if missing:
+        raise ValueError(f"Silver step {node['name']} inputs do not exist: {missing}")
+
+    for output in node['outputs']:
+        recorded = read_lineage(output)
+        if recorded is None:
+            return f"{output} has no build record"
+        changed = [
+            f"{input_name} v{recorded['inputs'].get(input_name)} -> v{version}"
+            for input_name, version in lineage['inputs'].items()
+            if recorded['inputs'].get(input_name) != version
+        ]
+        if changed:
+            return f"inputs changed: {', '.join(changed)}"
+        if recorded.get('effdate') != lineage['effdate']:
+            return f"effdate {recorded.get('effdate')} -> {lineage['effdate']}"
+        if recorded.get('code_version') != lineage['code_version']:
+            return f"code version {recorded.get('code_version')} -> {lineage['code_version']}"
+    return None
+
+
+def build_node(node: Dict, lineage: Dict) -> Dict[str, int]:
+    """
+    Run one build step and write its outputs (src.silver.snapshots), recording lineage on each write.
+
+    Returns:
+        dict: rows written per output table
+    """
+    tables = node['build']()
+    unexpected = sorted(set(tables) ^ set(node['outputs']))
+    if unexpected:
+        raise ValueError(f"Silver step {node['name']} returned {sorted(tables)}, declared {sorted(node['outputs'])}")
+
+    rows = {}
+    for output, df in tables.items():
+        commit_properties = lineage_commit({**lineage, 'step': node['name'], 'built': datetime.now().isoformat(timespec='seconds')})
+        src.silver.snapshots.write_snapshot(output, df, schema_mode=node['outputs'][output], commit_properties=commit_properties)
+        rows[output] = len(df)
+    return rows
+
+
+def run_silver(tables: List[Dict], force: Union[bool, Iterable[str]] = False, workers: Optional[int] = None) -> List[Dict]:
+    """
+    Rebuild the stale silver steps, in dependency order and in parallel where independent,
+    then write the manifest.
+
+    Args:
+        tables (List[Dict]): build steps (src.silver.core.SILVER_TABLES)
+        force: True (or step names) to rebuild regardless of lineage; their downstream steps
+            then rebuild because their input versions changed
+        workers (int): steps built at once (default src.config.SILVER_WORKERS)
+
+    Returns:
+        List[Dict]: manifest entry per step, in step order
+
+    Raises:
+        The first step error, after every step that does not depend on it has run and the manifest is written
+    """
+    nodes = graph_nodes(tables)
+    workers = workers or src.config.SILVER_WORKERS
+    if not isinstance(force, bool):
+        force = set(force)
+        unknown = sorted(force - set(nodes))
+        if unknown:
+            raise ValueError(f"Unknown silver steps to force: {unknown}")
+    effdate = pd.Timestamp(cdutils.acct_file_creation.core.get_last_business_day()).strftime('%Y-%m-%d')
+
+    entries = {
+        name: {
+            'step': name, 'outputs': list(node['outputs']), 'status': 'pending', 'reason': None,
+            'rows': None, 'seconds': None, 'inputs': None, 'sources': node.get('sources', []), 'error': None,
+        }
+        for name, node in nodes.items()
+    }
+    errors = []
+
+    def build(node, lineage):
+        start = time.perf_counter()
+        try:
+            return build_node(node, lineage)
+        finally:
+            entries[node['name']]['seconds'] = round(time.perf_counter() - start, 2)
+
+    started = datetime.now()
+    print(f"Start silver build ({len(nodes)} steps, {workers} workers, effdate {effdate})")
+    with ThreadPoolExecutor(workers, thread_name_prefix='silver-build') as pool:
+        running = {}
+        while True:
+            # Resolve every step whose upstream steps are finished: skip, fail or submit it
+            progressed = True
+            while progressed:
+                progressed = False
+                for name, node in nodes.items():
+                    entry = entries[name]
+                    if entry['status'] != 'pending' or any(entries[upstream]['status'] in ('pending', 'running') for upstream in node['upstream']):
+                        continue
+                    progressed = True
+                    failed = [upstream for upstream in node['upstream'] if entries[upstream]['status'] in ('failed', 'upstream_failed')]
+                    if failed:
+                        entry.update({'status': 'upstream_failed', 'reason': f"upstream failed: {failed}"})
+                        print(f"[WARNING] Silver step {name} not built: upstream {failed} failed")
+                        continue
+                    try:
+                        lineage = current_lineage(node, effdate)
+                        entry['inputs'] = lineage['inputs']
+                        forced = force if isinstance(force, bool) else name in force
+                        reason = 'forced' if forced else stale_reason(node, lineage)
+                    except Exception as e:
+                        entry.update({'status': 'failed', 'error': f"{type(e).__name__}: {e}"})
+                        print(f"[WARNING] Silver step {name} failed: {e}")
+                        errors.append(e)
+                        continue
+                    if reason is None:
+                        entry.update({'status': 'skipped', 'reason': 'up to date'})
+                        carried = [output for output in node['outputs'] if src.silver.snapshots.carry_forward(output, pd.Timestamp(effdate))]
+                        print(f"{name}: up to date, skipped" + (f" (history carried forward: {carried})" if carried else ""))
+                        continue
+                    entry.update({'status': 'running', 'reason': reason})
+                    print(f"{name}: building ({reason})")
+                    running[pool.submit(build, node, lineage)] = name
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                entry = entries[name]
+                try:
+                    entry['rows'] = future.result()
+                except Exception as e:
+                    entry.update({'status': 'failed', 'error': f"{type(e).__name__}: {e}"})
+                    print(f"[WARNING] Silver step {name} failed: {e}")
+                    errors.append(e)
+                    continue
+                entry['status'] = 'built'
+                print(f"{name}: built {entry['rows']} in {entry['seconds']}s")
+
+    ordered = [entries[name] for name in nodes]
+    finished = datetime.now()
+    manifest = {
+        'started': started.isoformat(timespec='seconds'),
+        'finished': finished.isoformat(timespec='seconds'),
+        'seconds': round((finished - started).total_seconds(), 1),
+        'effdate': effdate,
+        'force': force if isinstance(force, bool) else sorted(force),
+        'steps': ordered,
+    }
+    manifest_path = src.utils.manifest.write_manifest('silver', manifest, started)
+    built = sum(entry['status'] == 'built' for entry in ordered)
+    print(f"Silver build: {built} built, {sum(entry['status'] == 'skipped' for entry in ordered)} skipped. Manifest: {manifest_path}")
+
+    if errors:
+        raise errors[0]
+    return ordered
@@ -3,8 +3,8 @@ import cdutils.acct_file_creation.core # type: ignore
 from datetime import datetime
 import pandas as pd
 from pathlib import Path
-from deltalake import write_deltalake
 import src.silver.address
+import src.silver.build
 import src.silver.property
 import src.utils.parquet_io
 import src.silver.insurance
@@ -14,14 +14,10 @@ import src.silver.customer_address_link.core
 from src.utils.parquet_io import add_load_timestamp
 import cdutils.orig_face_amt.core # type: ignore
 import cdutils.customer_dim # type: ignore
+from typing import Dict, Iterable, List, Union
 
-def generate_silver_tables():
-
-    # Account
-    print("Start account")
-    ACCOUNT_PATH = src.config.SILVER / "account"
-    ACCOUNT_PATH.mkdir(parents=True, exist_ok=True)
 
+def build_account():
     df = cdutils.acct_file_creation.core.query_df_on_date()
     # Pull in Active Accounts (create a clean customer_id for joining)
     # This is only build like this to provide compatability with exisiting reports
@@ -52,123 +48,103 @@ def generate_silver_tables():
     # Set ACH manager products to other, they don't count as loans
     df.loc[df['currmiaccttypcd'] == 'CI07', 'Macro Account Type'] = 'Other'
 
-    df = add_load_timestamp(df)
-
-    write_deltalake(ACCOUNT_PATH, df, mode='overwrite', schema_mode='overwrite')
-    print("Successfully wrote account data")
-
-    
+    return {'account': add_load_timestamp(df)}
 
-    # Address
-    print("Starting address ...")
-    ADDRESS_PATH = src.config.SILVER / "address"
-    ADDRESS_PATH.mkdir(parents=True, exist_ok=True)
 
+def build_address():
     df = src.silver.address.generate_address()
-    df = add_load_timestamp(df)
+    return {'address': add_load_timestamp(df)}
 
-    write_deltalake(ADDRESS_PATH, df, mode='overwrite', schema_mode='merge')
-    print("Successfully wrote address data")
-
-    # Property
-    print("Starting property ...")
-    PROPERTY_PATH = src.config.SILVER / "property"
-    PROPERTY_PATH.mkdir(parents=True, exist_ok=True)
-    ACCT_PROP_LINK_PATH = src.config.SILVER / "account_property_link"
-    ACCT_PROP_LINK_PATH.mkdir(parents=True, exist_ok=True)
 
+def build_property():
     acct_prop_link, property = src.silver.property.create_silver_prop_tables()
 
     ## Handle null columns
     property = src.utils.parquet_io.cast_all_null_columns_to_string(property)
     acct_prop_link = src.utils.parquet_io.cast_all_null_columns_to_string(acct_prop_link)
-    
-    property = add_load_timestamp(property)
-    acct_prop_link = add_load_timestamp(acct_prop_link)
-    
-    write_deltalake(PROPERTY_PATH, property, mode='overwrite', schema_mode='merge')
-    write_deltalake(ACCT_PROP_LINK_PATH, acct_prop_link, mode='overwrite', schema_mode='merge')
-    print("Successfully wrote property data")
 
-    # Insurance 
-    print("Starting property ...")
-    INSURANCE_PATH = src.config.SILVER / "insurance"
-    INSURANCE_PATH.mkdir(parents=True, exist_ok=True)
-    ACCT_PROP_INS_LINK_PATH = src.config.SILVER / "acct_prop_ins_link"
-    ACCT_PROP_INS_LINK_PATH.mkdir(parents=True, exist_ok=True)
+    return {
+        'property': add_load_timestamp(property),
+        'account_property_link': add_load_timestamp(acct_prop_link),
+    }
 
+
+def build_insurance():
     insurance, acct_prop_ins_link = src.silver.insurance.generate_insurance_table()
-    
-    insurance = add_load_timestamp(insurance)
-    acct_prop_ins_link = add_load_timestamp(acct_prop_ins_link)
-    
-    write_deltalake(INSURANCE_PATH, insurance, mode='overwrite', schema_mode='merge')
-    write_deltalake(ACCT_PROP_INS_LINK_PATH, acct_prop_ins_link, mode='overwrite', schema_mode='merge')
-    print("Successfully wrote insurance data")
+    return {
+        'insurance': add_load_timestamp(insurance),
+        'acct_prop_ins_link': add_load_timestamp(acct_prop_ins_link),
+    }
 
-    # Face Value
-    print("Starting face value table generation ...")
-    FACE_VALUE_PATH = src.config.SILVER / "face_value"
-    FACE_VALUE_PATH.mkdir(parents=True, exist_ok=True)
 
+def build_face_value():
     face_value = cdutils.orig_face_amt.core.query_orig_face_amt()
-    
-    face_value = add_load_timestamp(face_value)
-    
-    write_deltalake(FACE_VALUE_PATH, face_value, mode='overwrite', schema_mode='merge')
-    print("Successfully wrote orig face value data")
-
-    # Customer Dim 
-    print("Starting customer dim (base) table generation ...")
-    BASE_CUSTOMER_DIM = src.config.SILVER / "base_customer_dim"
-    BASE_CUSTOMER_DIM.mkdir(parents=True, exist_ok=True)
-
-    base_customer_dim = src.silver.customer_dim.core.generate_base_customer_dim_table()    
-    base_customer_dim = add_load_timestamp(base_customer_dim)
-    
-    write_deltalake(BASE_CUSTOMER_DIM, base_customer_dim, mode='overwrite', schema_mode='overwrite')
-    print("Successfully wrote base customer dim")
-
-    # Customer Address Link 
-    print("Starting customer address link table generation ...")
-    CUSTOMER_ADDRESS_LINK = src.config.SILVER / "customer_address_link"
-    CUSTOMER_ADDRESS_LINK.mkdir(parents=True, exist_ok=True)
-
-    customer_address_link = src.silver.customer_address_link.core.generate_customer_address_link()    
-    customer_address_link = add_load_timestamp(customer_address_link)
-    
-    write_deltalake(CUSTOMER_ADDRESS_LINK, customer_address_link, mode='overwrite', schema_mode='overwrite')
-    print("Successfully wrote customer address link")
-
-    # Pers Dim
-    print("Starting pers dim table generation ...")
-    PERS_DIM = src.config.SILVER / "pers_dim"
-    PERS_DIM.mkdir(parents=True, exist_ok=True)
-
-    pers_dim = src.silver.customer_dim.core.generate_pers_dim()    
-    pers_dim = add_load_timestamp(pers_dim)
-    
-    write_deltalake(PERS_DIM, pers_dim, mode='overwrite', schema_mode='overwrite')
-    print("Successfully wrote pers dim")
-
-    # Org Dim
-    print("Starting org dim table generation ...")
-    ORG_DIM = src.config.SILVER / "org_dim"
-    ORG_DIM.mkdir(parents=True, exist_ok=True)
-
-    org_dim = src.silver.customer_dim.core.generate_org_dim()    
-    org_dim = add_load_timestamp(org_dim)
-    
-    write_deltalake(ORG_DIM, org_dim, mode='overwrite', schema_mode='overwrite')
-    print("Successfully wrote org dim")
-
-    # Account Role Linking Table
-    print("Starting acct role linking table generation ...")
-    ACCT_ROLE_LINK = src.config.SILVER / "acct_role_link"
-    ACCT_ROLE_LINK.mkdir(parents=True, exist_ok=True)
-
-    acct_role_link = src.silver.acct_role_link.core.generate_acct_role_link()    
-    acct_role_link = add_load_timestamp(acct_role_link)
-    
-    write_deltalake(ACCT_ROLE_LINK, acct_role_link, mode='overwrite', schema_mode='overwrite')
-    print("Successfully wrote acct role link")
+    return {'face_value': add_load_timestamp(face_value)}
+
+
+def build_base_customer_dim():
+    base_customer_dim = src.silver.customer_dim.core.generate_base_customer_dim_table()
+    return {'base_customer_dim': add_load_timestamp(base_customer_dim)}
+
+
+def build_customer_address_link():
+    customer_address_link = src.silver.customer_address_link.core.generate_customer_address_link()
+    return {'customer_address_link': add_load_timestamp(customer_address_link)}
+
+
+def build_pers_dim():
+    pers_dim = src.silver.customer_dim.core.generate_pers_dim()
+    return {'pers_dim': add_load_timestamp(pers_dim)}
+
+
+def build_org_dim():
+    org_dim = src.silver.customer_dim.core.generate_org_dim()
+    return {'org_dim': add_load_timestamp(org_dim)}
+
+
+def build_acct_role_link():
+    acct_role_link = src.silver.acct_role_link.core.generate_acct_role_link()
+    return {'acct_role_link': add_load_timestamp(acct_role_link)}
+
+
+# Silver build steps (run by src.silver.build)
+#   build:   function returning {table name: df}
+#   outputs: silver tables written, with their write_deltalake schema_mode
+#   inputs:  lakehouse tables read ('bronze/<table>' / 'silver/<table>'); a step reading
+#            another step's output runs after it
+#   sources: tables read outside the lakehouse; these steps rebuild once per effdate
+#   effdate: output depends on the business date (add_effdate); rebuild once per effdate
+SILVER_TABLES = [
+    {'name': 'account', 'build': build_account, 'outputs': {'account': 'overwrite'}, 'inputs': [],
+     'sources': ['COCCDM.WH_ACCTCOMMON', 'COCCDM.WH_LOANS', 'COCCDM.WH_ACCTLOAN', 'OSIEXTN.HOUSEHLDACCT']},
+    {'name': 'address', 'build': build_address, 'outputs': {'address': 'merge'}, 'inputs': ['bronze/wh_addr']},
+    {'name': 'property', 'build': build_property, 'outputs': {'property': 'merge', 'account_property_link': 'merge'},
+     'inputs': ['bronze/wh_prop', 'bronze/wh_prop2']},
+    {'name': 'insurance', 'build': build_insurance, 'outputs': {'insurance': 'merge', 'acct_prop_ins_link': 'merge'},
+     'inputs': ['bronze/acctpropins', 'bronze/wh_inspolicy']},
+    {'name': 'face_value', 'build': build_face_value, 'outputs': {'face_value': 'merge'}, 'inputs': [],
+     'sources': ['COCCDM.WH_ACCTCOMMON', 'COCCDM.WH_ACCTLOAN', 'COCCDM.WH_LOANS']},
+    {'name': 'base_customer_dim', 'build': build_base_customer_dim, 'outputs': {'base_customer_dim': 'overwrite'},
+     'inputs': ['bronze/wh_pers', 'bronze/wh_org', 'silver/account'],
+     'sources': ['OSIBANK.VIEWORGTAXID', 'OSIBANK.VIEWPERSTAXID'], 'effdate': True},
+    {'name': 'customer_address_link', 'build': build_customer_address_link, 'outputs': {'customer_address_link': 'overwrite'},
+     'inputs': ['bronze/persaddruse', 'bronze/orgaddruse'], 'effdate': True},
+    {'name': 'pers_dim', 'build': build_pers_dim, 'outputs': {'pers_dim': 'overwrite'},
+     'inputs': ['bronze/wh_pers', 'bronze/wh_persuserfields', 'bronze/persphone'],
+     'sources': ['OSIBANK.PERS'], 'effdate': True},
+    {'name': 'org_dim', 'build': build_org_dim, 'outputs': {'org_dim': 'overwrite'},
+     'inputs': ['bronze/wh_org', 'bronze/wh_orguserfields', 'bronze/orgphone'],
+     'sources': ['OSIBANK.ORG'], 'effdate': True},
+    {'name': 'acct_role_link', 'build': build_acct_role_link, 'outputs': {'acct_role_link': 'overwrite'},
+     'inputs': ['bronze/wh_allroles'], 'effdate': True},
+]
+
+
+def generate_silver_tables(force: Union[bool, Iterable[str]] = False) -> List[Dict]:
+    """
+    Rebuild the silver tables whose inputs changed since their last build (src.silver.build).
+
+    Args:
+        force: True (or a list of step names) to rebuild those steps regardless
+    """
+    return src.silver.build.run_silver(SILVER_TABLES, force=force)
@@ -1,6 +1,6 @@
 """
-Upstream dependencies: Needs to run after silver account table (because that gets fed into create calculated columns). Portfolio key also needs
-to run before this (that is an upstream of the silver account table).
+Upstream dependencies are declared in src.silver.core.SILVER_TABLES (base_customer_dim reads the silver account table
+for its calculated columns, so it is built after account; portfolio key is an upstream of the silver account table).
 
 Stucture for Customer Dimensional Modeling
 
@@ -0,0 +1,177 @@
+"""
+Silver snapshot history
+
+Every silver table is written twice:
+- src.config.SILVER / name: the current snapshot, overwritten each build (what reports
+  read today, unchanged)
+- src.config.SILVER_HISTORY / name: every build kept as an effdate partition, so
+  "month-end N and N-1" is a partition-pruned local read, e.g.
+
+    cdutils.lakehouse.read_snapshots('account', [n, n_minus_1], columns=[...])
+
+Re-running a build for the same effdate replaces that partition. A table whose build is
+skipped (inputs unchanged) has its current snapshot carried forward as the new effdate,
+so every business day, month ends included, has a partition. After each write the
+history is trimmed to the retention policy (every snapshot for SILVER_RETENTION_DAYS,
+plus the last snapshot of each month for SILVER_RETENTION_MONTH_ENDS months) and the
+new partition is compacted.
+"""
+
+from typing import List, Optional
+
+import pandas as pd
+from deltalake import CommitProperties, DeltaTable, write_deltalake
+
+import cdutils.add_effdate # type: ignore
+import src.config
+
+SNAPSHOT_COLUMN = 'effdate'
+
+
+def snapshot_effdate(df: pd.DataFrame) -> pd.Timestamp:
+    """
+    The single effdate of a silver build
+
+    Raises:
+        ValueError: df has rows without an effdate, no effdate, or more than one
+    """
+    effdates = pd.to_datetime(df[SNAPSHOT_COLUMN])
+    missing = int(effdates.isna().sum())
+    if missing:
+        raise ValueError(f"Silver snapshot has {missing} rows without a {SNAPSHOT_COLUMN}")
+    effdates = effdates.unique()
+    if len(effdates) != 1:
+        raise ValueError(f"Silver snapshot needs exactly one {SNAPSHOT_COLUMN}, got {len(effdates)}")
+    return pd.Timestamp(effdates[0])
+
+
+def snapshot_dates(name: str) -> List[pd.Timestamp]:
+    """
+    Effdates kept in the history of a silver table, oldest first
+    """
+    path = src.config.SILVER_HISTORY / name
+    if not DeltaTable.is_deltatable(str(path)):
+        return []
+    return sorted(pd.Timestamp(partition[SNAPSHOT_COLUMN]) for partition in DeltaTable(path).partitions())
+
+
+def retained_dates(dates: List[pd.Timestamp], days: int, month_ends: int) -> List[pd.Timestamp]:
+    """
+    Snapshots the retention policy keeps: everything within days of the newest snapshot,
+    plus the last snapshot of each of the newest month_ends months.
+    """
+    if not dates:
+        return []
+    dates = sorted(pd.Timestamp(date) for date in dates)
+    latest = dates[-1]
+    keep = {date for date in dates if date > latest - pd.Timedelta(days=days)}
+
+    last_in_month = {}
+    for date in dates:
+        last_in_month[date.to_period('M')] = date
+    oldest_month = latest.to_period('M') - (month_ends - 1)
+    keep.update(date for month, date in last_in_month.items() if month >= oldest_month)
+    return sorted(keep)
+
+
+def _sql_dates(dates: List[pd.Timestamp]) -> str:
+    return ", ".join(f"'{date:%Y-%m-%d}'" for date in dates)
+
+
+def apply_retention(name: str, days: Optional[int] = None, month_ends: Optional[int] = None) -> List[pd.Timestamp]:
+    """
+    Delete history snapshots the retention policy no longer keeps (whole partitions, so
+    no data files are rewritten).
+
+    Returns:
+        List[pd.Timestamp]: effdates deleted
+    """
+    days = src.config.SILVER_RETENTION_DAYS if days is None else days
+    month_ends = src.config.SILVER_RETENTION_MONTH_ENDS if month_ends is None else month_ends
+
+    dates = snapshot_dates(name)
+    expired = sorted(set(dates) - set(retained_dates(dates, days, month_ends)))
+    if expired:
+        DeltaTable(src.config.SILVER_HISTORY / name).delete(f"{SNAPSHOT_COLUMN} IN ({_sql_dates(expired)})")
+    return expired
+
+
+def compact_snapshot(name: str, effdate: pd.Timestamp):
+    """
+    Compact one effdate partition of a silver history table into as few files as possible
+    """
+    dt = DeltaTable(src.config.SILVER_HISTORY / name)
+    for partition in dt.partitions():
+        if pd.Timestamp(partition[SNAPSHOT_COLUMN]) == effdate:
+            return dt.optimize.compact(partition_filters=[(SNAPSHOT_COLUMN, '=', partition[SNAPSHOT_COLUMN])])
+    return None
+
+
+def write_history(name: str, df: pd.DataFrame) -> pd.Timestamp:
+    """
+    Write df as the effdate partition of the silver history table (replacing that partition
+    if it exists), then apply retention, compact the partition and vacuum.
+
+    Returns:
+        pd.Timestamp: effdate written
+    """
+    path = src.config.SILVER_HISTORY / name
+    path.mkdir(parents=True, exist_ok=True)
+    effdate = snapshot_effdate(df)
+
+    if not DeltaTable.is_deltatable(str(path)):
+        write_deltalake(path, df, mode='append', partition_by=[SNAPSHOT_COLUMN])
+    else:
+        write_deltalake(path, df, mode='overwrite', predicate=f"{SNAPSHOT_COLUMN} = '{effdate:%Y-%m-%d}'", schema_mode='merge')
+
+    expired = apply_retention(name)
+    if expired:
+        print(f"{name} history: dropped {len(expired)} snapshots past retention")
+    compact_snapshot(name, effdate)
+    DeltaTable(path).vacuum(dry_run=False)
+    return effdate
+
+
+def carry_forward(name: str, effdate: pd.Timestamp) -> bool:
+    """
+    Add the current snapshot of a silver table to its history as effdate, for a table that
+    was not rebuilt for effdate (its effdate column, if any, is set to effdate)
+
+    Returns:
+        bool: whether a partition was written (False: already in history, or no current snapshot)
+    """
+    effdate = pd.Timestamp(effdate)
+    path = src.config.SILVER / name
+    if effdate in snapshot_dates(name) or not DeltaTable.is_deltatable(str(path)):
+        return False
+    try:
+        write_history(name, DeltaTable(path).to_pandas().assign(**{SNAPSHOT_COLUMN: effdate}))
+    except Exception as e:
+        print(f"[WARNING] {name} snapshot not carried forward to {effdate:%Y-%m-%d}: {e}")
+        return False
+    return True
+
+
+def write_snapshot(name: str, df: pd.DataFrame, schema_mode: str = 'merge', commit_properties: Optional[CommitProperties] = None):
+    """
+    Write a silver table: overwrite the current snapshot and keep it in the history.
+
+    History rows of tables built without an effdate get the build's effdate (last
+    business day); the current snapshot is written as is.
+
+    Args:
+        name (str): silver table name
+        df (pd.DataFrame): the table
+        schema_mode (str): write_deltalake schema_mode for the current snapshot
+        commit_properties (CommitProperties): commit properties of the current snapshot write
+    """
+    path = src.config.SILVER / name
+    path.mkdir(parents=True, exist_ok=True)
+    write_deltalake(path, df, mode='overwrite', schema_mode=schema_mode, commit_properties=commit_properties)
+
+    try:
+        write_history(name, df if SNAPSHOT_COLUMN in df.columns else cdutils.add_effdate.add_effdate(df))
+    except Exception as e:
+        # The current snapshot is already written, so reports are unaffected; an incompatible
+        # column type change needs the history table rewritten (or moved aside) by hand
+        print(f"[WARNING] {name} snapshot not added to history: {e}")
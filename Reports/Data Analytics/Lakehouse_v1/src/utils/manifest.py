@@ -0,0 +1,37 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict
+
+import pandas as pd
+
+import src.config
+
+
+def json_value(value):
+    """
+    Plain JSON value for a manifest field (timestamps as ISO strings, numpy scalars unwrapped, NaN/NaT as None)
+    """
+    if isinstance(value, dict):
+        return {key: json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_value(item) for item in value]
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def write_manifest(prefix: str, manifest: Dict, started: datetime) -> Path:
+    """
+    Write a run manifest as <prefix>_<timestamp>.json and <prefix>_latest.json in src.config.MANIFEST_DIR
+    """
+    src.config.MANIFEST_DIR.mkdir(parents=True, exist_ok=True)
+    manifest_path = src.config.MANIFEST_DIR / f"{prefix}_{started:%Y%m%d_%H%M%S}.json"
+    text = json.dumps(json_value(manifest), indent=2)
+    manifest_path.write_text(text, encoding='utf-8')
+    (src.config.MANIFEST_DIR / f"{prefix}_latest.json").write_text(text, encoding='utf-8')
+    return manifest_path
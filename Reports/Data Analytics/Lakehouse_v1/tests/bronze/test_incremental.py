@@ -0,0 +1,106 @@
+import pandas as pd
+import pytest
+from deltalake import DeltaTable
+
+import src.config
+import src.bronze.fetch_data
+import src.bronze.incremental
+
+SPEC = {'source': 'OSIBANK.WH_ALLROLES', 'keys': ['acctnbr', 'persnbr'], 'watermark': 'datelastmaint', 'deletes': True}
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    """
+    In-memory source table behind the fetch functions, with bronze in tmp_path
+    """
+    monkeypatch.setattr(src.config, 'BRONZE', tmp_path)
+    state = {'df': pd.DataFrame({
+        'acctnbr': ['1', '2', '3'],
+        'persnbr': [10.0, None, 30.0],
+        'acctrolecd': ['OWN', 'OWN', 'SIGN'],
+        'datelastmaint': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03']),
+    })}
+    calls = []
+
+    def fetch_table(table_source, columns='*', engine=1):
+        calls.append('full')
+        return {'table': state['df'].copy()}
+
+    def fetch_table_changes(table_source, watermark_column, since, columns='*', engine=1):
+        calls.append('changes')
+        df = state['df']
+        return {'changes': df[(df[watermark_column] >= since) | df[watermark_column].isna()].copy()}
+
+    def fetch_table_keys(table_source, keys, engine=1):
+        return {'keys': state['df'][keys].copy()}
+
+    monkeypatch.setattr(src.bronze.fetch_data, 'fetch_table', fetch_table)
+    monkeypatch.setattr(src.bronze.fetch_data, 'fetch_table_changes', fetch_table_changes)
+    monkeypatch.setattr(src.bronze.fetch_data, 'fetch_table_keys', fetch_table_keys)
+    return state, calls, tmp_path / 'wh_allroles'
+
+
+def _bronze(path):
+    return DeltaTable(path).to_pandas().sort_values('acctnbr').reset_index(drop=True)
+
+
+def test_first_load_is_full_and_sets_watermark(source):
+    state, calls, path = source
+    result = src.bronze.incremental.load_table('wh_allroles', SPEC)
+    assert result['mode'] == 'full'
+    assert calls == ['full']
+    assert src.bronze.incremental.read_watermark(path, 'datelastmaint') == pd.Timestamp('2024-01-03')
+
+
+def test_changes_are_merged_and_deletes_applied(source):
+    state, calls, path = source
+    src.bronze.incremental.load_table('wh_allroles', SPEC)
+
+    # Account 2 (null persnbr) updated, account 3 deleted, account 4 added
+    state['df'] = pd.DataFrame({
+        'acctnbr': ['1', '2', '4'],
+        'persnbr': [10.0, None, 40.0],
+        'acctrolecd': ['OWN', 'JOINT', 'OWN'],
+        'datelastmaint': pd.to_datetime(['2024-01-01', '2024-01-05', '2024-01-04']),
+    })
+    result = src.bronze.incremental.load_table('wh_allroles', SPEC)
+
+    assert calls == ['full', 'changes']
+    assert (result['inserted'], result['updated'], result['deleted']) == (1, 1, 1)
+    bronze = _bronze(path)
+    assert bronze['acctnbr'].tolist() == ['1', '2', '4']
+    assert bronze['acctrolecd'].tolist() == ['OWN', 'JOINT', 'OWN']
+    assert src.bronze.incremental.read_watermark(path, 'datelastmaint') == pd.Timestamp('2024-01-05')
+
+
+def test_full_reload_ignores_watermark(source):
+    state, calls, path = source
+    src.bronze.incremental.load_table('wh_allroles', SPEC)
+    result = src.bronze.incremental.load_table('wh_allroles', SPEC, full_reload=True)
+    assert result['mode'] == 'full'
+    assert calls == ['full', 'full']
+
+
+def test_non_unique_keys_stay_on_full_loads(source):
+    state, calls, path = source
+    state['df'].loc[2, 'acctnbr'] = '1'
+    state['df'].loc[2, 'persnbr'] = 10.0
+    src.bronze.incremental.load_table('wh_allroles', SPEC)
+    assert src.bronze.incremental.read_watermark(path, 'datelastmaint') is None
+    src.bronze.incremental.load_table('wh_allroles', SPEC)
+    assert calls == ['full', 'full']
+
+
+def test_rows_without_watermark_refreshed(source):
+    state, calls, path = source
+    state['df']['datelastmaint'] = pd.to_datetime(['2024-01-01', None, '2024-01-03'])
+    src.bronze.incremental.load_table('wh_allroles', SPEC)
+
+    # Account 2 changes but still has no datelastmaint
+    state['df'].loc[1, 'acctrolecd'] = 'JOINT'
+    result = src.bronze.incremental.load_table('wh_allroles', SPEC)
+
+    assert result['mode'] == 'incremental'
+    assert _bronze(path)['acctrolecd'].tolist() == ['OWN', 'JOINT', 'SIGN']
+    assert src.bronze.incremental.read_watermark(path, 'datelastmaint') == pd.Timestamp('2024-01-03')
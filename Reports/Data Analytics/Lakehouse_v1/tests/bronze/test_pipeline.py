@@ -0,0 +1,131 @@
+import gc
+import json
+import threading
+import time
+import weakref
+
+import pandas as pd
+import pytest
+from deltalake import DeltaTable
+
+import src.config
+import src.bronze.fetch_data
+import src.bronze.pipeline
+
+TABLES = [
+    {'name': 'wh_org', 'source': 'OSIBANK.WH_ORG', 'keys': ['orgnbr'], 'watermark': 'datelastmaint'},
+    {'name': 'wh_prop', 'source': 'OSIBANK.WH_PROP'},
+    {'name': 'lookup', 'source': 'sys.all_tab_columns', 'engine': 2, 'cast_nulls': False, 'columns': ['owner', 'table_name']},
+    {'name': 'broken', 'source': 'OSIBANK.MISSING'},
+]
+
+
+@pytest.fixture
+def bronze(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.config, 'BRONZE', tmp_path / 'bronze')
+    monkeypatch.setattr(src.config, 'MANIFEST_DIR', tmp_path / 'manifests')
+    queries = []
+    running = {'now': 0, 'max': 0}
+    lock = threading.Lock()
+
+    def fetch_table(source, columns='*', engine=1):
+        with lock:
+            queries.append((source, engine))
+            running['now'] += 1
+            running['max'] = max(running['max'], running['now'])
+        time.sleep(0.05)
+        with lock:
+            running['now'] -= 1
+        if source == 'OSIBANK.MISSING':
+            raise ValueError("ORA-00942: table or view does not exist")
+        if source == 'OSIBANK.WH_ORG':
+            return {'table': pd.DataFrame({'orgnbr': [1, 2], 'orgname': ['A', 'B'], 'datelastmaint': pd.to_datetime(['2024-01-01', '2024-02-01'])})}
+        if source == 'OSIBANK.WH_PROP':
+            return {'table': pd.DataFrame({'propnbr': [1, 2, 3], 'empty': [None, None, None]})}
+        return {'table': pd.DataFrame({'owner': ['OSIBANK'], 'table_name': ['WH_ORG']})}
+
+    monkeypatch.setattr(src.bronze.fetch_data, 'fetch_table', fetch_table)
+    return tmp_path, queries, running
+
+
+def test_each_table_extracted_once_concurrently(bronze):
+    tmp_path, queries, running = bronze
+    with pytest.raises(ValueError, match='ORA-00942'):
+        src.bronze.pipeline.run_bronze(TABLES, extract_workers=4, write_workers=1)
+
+    assert sorted(queries) == sorted([('OSIBANK.WH_ORG', 1), ('OSIBANK.WH_PROP', 1), ('sys.all_tab_columns', 2), ('OSIBANK.MISSING', 1)])
+    assert running['max'] > 1
+    assert len(DeltaTable(tmp_path / 'bronze' / 'wh_prop').to_pandas()) == 3
+    assert 'load_timestamp_utc' in DeltaTable(tmp_path / 'bronze' / 'lookup').to_pandas().columns
+
+
+def test_manifest_records_every_table(bronze):
+    tmp_path, queries, running = bronze
+    with pytest.raises(ValueError):
+        src.bronze.pipeline.run_bronze(TABLES)
+
+    manifest = json.loads((tmp_path / 'manifests' / 'bronze_latest.json').read_text())
+    entries = {entry['table']: entry for entry in manifest['tables']}
+    assert [entry['table'] for entry in manifest['tables']] == [spec['name'] for spec in TABLES]
+    assert entries['wh_org']['status'] == 'ok'
+    assert entries['wh_org']['rows'] == 2
+    assert entries['wh_org']['watermark'] == '2024-02-01T00:00:00'
+    assert entries['wh_prop']['bytes'] > 0
+    assert entries['wh_prop']['extract_seconds'] is not None
+    assert entries['broken']['status'] == 'failed'
+    assert 'ORA-00942' in entries['broken']['error']
+
+
+def test_duplicate_table_names_rejected(bronze):
+    with pytest.raises(ValueError, match='Duplicate'):
+        src.bronze.pipeline.run_bronze([TABLES[1], TABLES[1]])
+
+
+def test_tables_released_once_written(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.config, 'BRONZE', tmp_path / 'bronze')
+    monkeypatch.setattr(src.config, 'MANIFEST_DIR', tmp_path / 'manifests')
+    frames = []
+    held = []
+
+    def fetch_table(source, columns='*', engine=1):
+        gc.collect()
+        held.append(sum(frame() is not None for frame in frames))
+        df = pd.DataFrame({'n': range(1000), 'source': source})
+        frames.append(weakref.ref(df))
+        return {'table': df}
+
+    monkeypatch.setattr(src.bronze.fetch_data, 'fetch_table', fetch_table)
+    tables = [{'name': f"t{i}", 'source': f"OSIBANK.T{i}"} for i in range(8)]
+    src.bronze.pipeline.run_bronze(tables, extract_workers=1, write_workers=1)
+
+    # Counting the table being extracted, never more than extract_workers + write_workers
+    assert max(held) + 1 <= 2
+    gc.collect()
+    assert not any(frame() is not None for frame in frames)
+
+
+def test_unchanged_full_load_not_rewritten_day_over_day(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.config, 'BRONZE', tmp_path / 'bronze')
+    monkeypatch.setattr(src.config, 'MANIFEST_DIR', tmp_path / 'manifests')
+    source = {'df': pd.DataFrame({'propnbr': [1, 2, 3], 'value': [100.0, 250.0, None], 'empty': [None, None, None]})}
+    monkeypatch.setattr(src.bronze.fetch_data, 'fetch_table', lambda source_name, columns='*', engine=1: {'table': source['df'].copy()})
+    tables = [{'name': 'wh_prop', 'source': 'OSIBANK.WH_PROP'}]
+    path = tmp_path / 'bronze' / 'wh_prop'
+
+    first = src.bronze.pipeline.run_bronze(tables)
+    version = DeltaTable(path).version()
+    assert first[0]['mode'] == 'full'
+
+    # Next day, same rows (in a different order): nothing written
+    source['df'] = source['df'].iloc[::-1].reset_index(drop=True)
+    second = src.bronze.pipeline.run_bronze(tables)
+    assert second[0]['mode'] == 'unchanged'
+    assert second[0]['rows'] == 3
+    assert DeltaTable(path).version() == version
+
+    # A changed value is written
+    source['df'].loc[0, 'value'] = 300.0
+    third = src.bronze.pipeline.run_bronze(tables)
+    assert third[0]['mode'] == 'full'
+    assert DeltaTable(path).version() > version
+    assert 300.0 in DeltaTable(path).to_pandas()['value'].tolist()
@@ -0,0 +1,166 @@
+import json
+
+import pandas as pd
+import pytest
+from deltalake import DeltaTable, write_deltalake
+
+import cdutils.acct_file_creation.core # type: ignore
+import cdutils.lakehouse # type: ignore
+import src.bronze.fetch_data
+import src.bronze.pipeline
+import src.config
+import src.silver.build
+import src.silver.snapshots
+
+
+@pytest.fixture
+def lakehouse(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.config, 'BRONZE', tmp_path / 'bronze')
+    monkeypatch.setattr(src.config, 'SILVER', tmp_path / 'silver')
+    monkeypatch.setattr(src.config, 'SILVER_HISTORY', tmp_path / 'silver_history')
+    monkeypatch.setattr(src.config, 'MANIFEST_DIR', tmp_path / 'manifests')
+    monkeypatch.setattr(cdutils.acct_file_creation.core, 'get_last_business_day', lambda: '2025-10-01 00:00:00')
+    for name in ['wh_pers', 'wh_prop']:
+        write_deltalake(tmp_path / 'bronze' / name, pd.DataFrame({'nbr': [1, 2]}))
+    return tmp_path
+
+
+def read_bronze(name):
+    return DeltaTable(src.config.BRONZE / name).to_pandas()
+
+
+def steps(calls, fail=()):
+    def build(name, reads):
+        def run():
+            calls.append(name)
+            if name in fail:
+                raise ValueError(f"{name} broke")
+            df = pd.concat([reads_fn() for reads_fn in reads], ignore_index=True)
+            return {name: df.assign(effdate=pd.Timestamp(cdutils.acct_file_creation.core.get_last_business_day()).normalize())}
+        return run
+
+    read_account = lambda: DeltaTable(src.config.SILVER / 'account').to_pandas()[['nbr']]
+    return [
+        {'name': 'account', 'build': build('account', [lambda: read_bronze('wh_pers')]), 'outputs': {'account': 'overwrite'},
+         'inputs': ['bronze/wh_pers']},
+        {'name': 'customer_dim', 'build': build('customer_dim', [read_account]), 'outputs': {'customer_dim': 'overwrite'},
+         'inputs': ['silver/account'], 'sources': ['OSIBANK.VIEWORGTAXID']},
+        {'name': 'property', 'build': build('property', [lambda: read_bronze('wh_prop')]), 'outputs': {'property': 'merge'},
+         'inputs': ['bronze/wh_prop']},
+    ]
+
+
+def statuses(entries):
+    return {entry['step']: entry['status'] for entry in entries}
+
+
+def test_second_run_skips_everything(lakehouse):
+    calls = []
+    first = src.silver.build.run_silver(steps(calls))
+    assert statuses(first) == {'account': 'built', 'customer_dim': 'built', 'property': 'built'}
+    assert calls.index('account') < calls.index('customer_dim')
+
+    calls.clear()
+    second = src.silver.build.run_silver(steps(calls))
+    assert calls == []
+    assert statuses(second) == {'account': 'skipped', 'customer_dim': 'skipped', 'property': 'skipped'}
+
+    lineage = json.loads(DeltaTable(lakehouse / 'silver' / 'customer_dim').history(1)[0]['silver.lineage'])
+    assert lineage['step'] == 'customer_dim'
+    assert lineage['effdate'] == '2025-10-01'
+    assert lineage['inputs'] == {'silver/account': DeltaTable(lakehouse / 'silver' / 'account').version()}
+
+
+def test_changed_input_rebuilds_it_and_downstream(lakehouse):
+    src.silver.build.run_silver(steps([]))
+    write_deltalake(lakehouse / 'bronze' / 'wh_pers', pd.DataFrame({'nbr': [3]}), mode='append')
+
+    calls = []
+    entries = src.silver.build.run_silver(steps(calls))
+    assert sorted(calls) == ['account', 'customer_dim']
+    assert statuses(entries)['property'] == 'skipped'
+    assert 'bronze/wh_pers v0 -> v1' in entries[0]['reason']
+    assert len(DeltaTable(lakehouse / 'silver' / 'customer_dim').to_pandas()) == 3
+
+
+def test_new_effdate_rebuilds_steps_with_sources(lakehouse, monkeypatch):
+    src.silver.build.run_silver(steps([]))
+    monkeypatch.setattr(cdutils.acct_file_creation.core, 'get_last_business_day', lambda: '2025-10-02 00:00:00')
+
+    calls = []
+    src.silver.build.run_silver(steps(calls))
+    assert calls == ['customer_dim']
+
+
+def test_quiet_day_rebuilds_only_steps_with_sources(lakehouse, monkeypatch):
+    """Day over day with an unchanged source: bronze full loads are not rewritten, so silver steps reading them skip"""
+    monkeypatch.setattr(src.bronze.fetch_data, 'fetch_table', lambda source, columns='*', engine=1: {'table': pd.DataFrame({'nbr': [1, 2]})})
+    bronze_tables = [{'name': 'wh_pers', 'source': 'OSIBANK.WH_PERS'}, {'name': 'wh_prop', 'source': 'OSIBANK.WH_PROP'}]
+    src.bronze.pipeline.run_bronze(bronze_tables)
+    src.silver.build.run_silver(steps([]))
+
+    monkeypatch.setattr(cdutils.acct_file_creation.core, 'get_last_business_day', lambda: '2025-10-02 00:00:00')
+    entries = src.bronze.pipeline.run_bronze(bronze_tables)
+    assert [entry['mode'] for entry in entries] == ['unchanged', 'unchanged']
+
+    calls = []
+    src.silver.build.run_silver(steps(calls))
+    assert calls == ['customer_dim']
+
+
+def test_quiet_month_end_still_in_history(lakehouse, monkeypatch):
+    """A step skipped on a month end (inputs unchanged) still gets that month end in its history"""
+    monkeypatch.setattr(cdutils.acct_file_creation.core, 'get_last_business_day', lambda: '2025-09-29 00:00:00')
+    src.silver.build.run_silver(steps([]))
+
+    monkeypatch.setattr(cdutils.acct_file_creation.core, 'get_last_business_day', lambda: '2025-09-30 00:00:00')
+    calls = []
+    entries = src.silver.build.run_silver(steps(calls))
+    assert calls == ['customer_dim']
+    assert statuses(entries)['property'] == 'skipped'
+
+    month_ends = cdutils.lakehouse.read_snapshots('property', ['2025-09-30'], root=lakehouse)
+    assert sorted(month_ends['nbr']) == [1, 2]
+    assert src.silver.snapshots.snapshot_dates('property') == [pd.Timestamp('2025-09-29'), pd.Timestamp('2025-09-30')]
+
+    # A rerun for the same effdate adds nothing
+    src.silver.build.run_silver(steps([]))
+    assert len(src.silver.snapshots.snapshot_dates('account')) == 2
+
+
+def test_failure_skips_downstream_and_writes_manifest(lakehouse):
+    calls = []
+    with pytest.raises(ValueError, match='account broke'):
+        src.silver.build.run_silver(steps(calls, fail={'account'}))
+    assert 'customer_dim' not in calls
+
+    manifest = json.loads((lakehouse / 'manifests' / 'silver_latest.json').read_text())
+    assert statuses(manifest['steps']) == {'account': 'failed', 'customer_dim': 'upstream_failed', 'property': 'built'}
+    assert manifest['steps'][2]['rows'] == {'property': 2}
+
+
+def test_force(lakehouse):
+    src.silver.build.run_silver(steps([]))
+    calls = []
+    src.silver.build.run_silver(steps(calls), force=['property'])
+    assert calls == ['property']
+    with pytest.raises(ValueError, match='Unknown'):
+        src.silver.build.run_silver(steps([]), force=['nope'])
+
+
+def test_graph_validation():
+    base = {'build': None, 'outputs': {}}
+    with pytest.raises(ValueError, match='cycle'):
+        src.silver.build.graph_nodes([
+            {**base, 'name': 'a', 'outputs': {'a': 'merge'}, 'inputs': ['silver/b']},
+            {**base, 'name': 'b', 'outputs': {'b': 'merge'}, 'inputs': ['silver/a']},
+        ])
+    with pytest.raises(ValueError, match='no step builds'):
+        src.silver.build.graph_nodes([{**base, 'name': 'a', 'outputs': {'a': 'merge'}, 'inputs': ['silver/missing']}])
+    with pytest.raises(ValueError, match='built by both'):
+        src.silver.build.graph_nodes([
+            {**base, 'name': 'a', 'outputs': {'x': 'merge'}},
+            {**base, 'name': 'b', 'outputs': {'x': 'merge'}},
+        ])
+    with pytest.raises(ValueError, match='must look like'):
+        src.silver.build.graph_nodes([{**base, 'name': 'a', 'outputs': {'a': 'merge'}, 'inputs': ['gold/a']}])
@@ -0,0 +1,70 @@
+import pandas as pd
+import pytest
+from deltalake import DeltaTable
+
+import src.config
+import src.silver.snapshots
+
+
+@pytest.fixture
+def lakehouse(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.config, 'SILVER', tmp_path / 'silver')
+    monkeypatch.setattr(src.config, 'SILVER_HISTORY', tmp_path / 'silver_history')
+    monkeypatch.setattr(src.config, 'SILVER_RETENTION_DAYS', 10)
+    monkeypatch.setattr(src.config, 'SILVER_RETENTION_MONTH_ENDS', 2)
+    return tmp_path
+
+
+def account(effdate, acctnbrs):
+    return pd.DataFrame({'acctnbr': acctnbrs, 'notebal': [1.0] * len(acctnbrs), 'effdate': pd.Timestamp(effdate)})
+
+
+def test_snapshots_append_and_replace(lakehouse):
+    src.silver.snapshots.write_snapshot('account', account('2025-09-30', ['1', '2']))
+    src.silver.snapshots.write_snapshot('account', account('2025-10-01', ['1']))
+    src.silver.snapshots.write_snapshot('account', account('2025-10-01', ['1', '3']))
+
+    current = DeltaTable(lakehouse / 'silver' / 'account').to_pandas()
+    assert sorted(current['acctnbr']) == ['1', '3']
+
+    history = DeltaTable(lakehouse / 'silver_history' / 'account')
+    assert history.metadata().partition_columns == ['effdate']
+    assert src.silver.snapshots.snapshot_dates('account') == [pd.Timestamp('2025-09-30'), pd.Timestamp('2025-10-01')]
+    rows = history.to_pandas()
+    assert sorted(rows.loc[rows['effdate'] == '2025-10-01', 'acctnbr']) == ['1', '3']
+
+
+def test_table_without_effdate_gets_build_effdate_in_history_only(lakehouse):
+    src.silver.snapshots.write_snapshot('address', pd.DataFrame({'addrnbr': ['1']}))
+
+    assert 'effdate' not in DeltaTable(lakehouse / 'silver' / 'address').to_pandas().columns
+    assert len(src.silver.snapshots.snapshot_dates('address')) == 1
+
+
+def test_retention_keeps_recent_days_and_month_ends():
+    dates = [pd.Timestamp(d) for d in ['2025-07-31', '2025-08-28', '2025-08-29', '2025-09-29', '2025-09-30', '2025-10-01', '2025-10-02']]
+    kept = src.silver.snapshots.retained_dates(dates, days=10, month_ends=2)
+    assert kept == [pd.Timestamp(d) for d in ['2025-09-29', '2025-09-30', '2025-10-01', '2025-10-02']]
+    kept = src.silver.snapshots.retained_dates(dates, days=3, month_ends=3)
+    assert kept == [pd.Timestamp(d) for d in ['2025-08-29', '2025-09-30', '2025-10-01', '2025-10-02']]
+
+
+def test_write_applies_retention(lakehouse):
+    for effdate in ['2025-07-31', '2025-08-29', '2025-09-30', '2025-10-01']:
+        src.silver.snapshots.write_snapshot('account', account(effdate, ['1']))
+
+    assert src.silver.snapshots.snapshot_dates('account') == [pd.Timestamp('2025-09-30'), pd.Timestamp('2025-10-01')]
+
+
+def test_multiple_effdates_rejected(lakehouse):
+    df = pd.concat([account('2025-09-30', ['1']), account('2025-10-01', ['1'])])
+    with pytest.raises(ValueError, match='exactly one'):
+        src.silver.snapshots.write_history('account', df)
+
+
+def test_missing_effdate_rejected(lakehouse):
+    df = account('2025-10-01', ['1', '2'])
+    df.loc[1, 'effdate'] = pd.NaT
+    with pytest.raises(ValueError, match='without'):
+        src.silver.snapshots.write_history('account', df)
+    assert src.silver.snapshots.snapshot_dates('account') == []
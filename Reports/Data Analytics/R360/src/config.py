@@ -32,6 +32,11 @@ BASE_PATH = Path(r"\\00-da1\Home\Share\Data & Analytics Initiatives\Project Mana
 OUTPUT_DIR = BASE_PATH / "output"
 INPUT_DIR = BASE_PATH / "input"
 
+# Report runner scheduling: reports importing these modules (directly, or through cdutils
+# modules such as cdutils.acct_file_creation) read this report's key databases, so
+# testing/run_reports.py runs them after R360 in the same batch
+PROVIDES = ['cdutils.pkey_sqlite']
+
 # No email distribution - this is a data pipeline that feeds other systems
 EMAIL_TO = []
 EMAIL_CC = []
@@ -89,6 +94,12 @@ HISTORICAL_DB_CONFIG = {
     'ownership': False,    # Default: Generate fresh keys in dev, change to True to use historical
 }
 
+# Incremental key resolution: only re-group accounts whose address/ownership changed since the
+# last saved run (and the groups they touch); every other account keeps its key.
+# Needs the state file written by a run with database saving enabled, otherwise runs in full.
+INCREMENTAL_KEYS = False
+STATE_PATH = DB_DIR / 'r360_state.parquet'
+
 # Override historical config for production (can be customized as needed)
 if ENV == 'prod':
     HISTORICAL_DB_CONFIG = {
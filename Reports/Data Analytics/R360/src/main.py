@@ -65,6 +65,10 @@ def main():
     
     results = {}
     
+    # All enabled key types come from one data fetch and one set of relationship edges
+    enabled = [key_type for key_type, enabled in keys_to_generate.items() if enabled]
+    generated = src.r360.all_keys(enabled, save_to_db=output_config['save_to_database'])
+    
     # Generate Portfolio Key (address OR ownership grouping)
     if keys_to_generate['portfolio']:
         print("\n=== Generating Portfolio Key (Address OR Ownership) ===")
@@ -73,8 +77,7 @@ def main():
         hist_setting = historical_config['portfolio']
         print(f"Historical DB Setting: {hist_setting} - {src.config.HISTORICAL_DB_HELP[hist_setting]}")
         
-        # Pass database save setting (historical setting will be handled within the function based on config)
-        portfolio_df = src.r360.portfolio_key(save_to_db=output_config['save_to_database'])
+        portfolio_df = generated['portfolio']
         results['portfolio'] = portfolio_df
         
         # Save detailed output
@@ -101,8 +104,7 @@ def main():
         hist_setting = historical_config['address']
         print(f"Historical DB Setting: {hist_setting} - {src.config.HISTORICAL_DB_HELP[hist_setting]}")
         
-        # Pass database save setting (historical setting will be handled within the function based on config)
-        address_df = src.r360.address_key(save_to_db=output_config['save_to_database'])
+        address_df = generated['address']
         results['address'] = address_df
         
         # Save detailed output
@@ -129,8 +131,7 @@ def main():
         hist_setting = historical_config['ownership']
         print(f"Historical DB Setting: {hist_setting} - {src.config.HISTORICAL_DB_HELP[hist_setting]}")
         
-        # Pass database save setting (historical setting will be handled within the function based on config)
-        ownership_df = src.r360.ownership_key(save_to_db=output_config['save_to_database'])
+        ownership_df = generated['ownership']
         results['ownership'] = ownership_df
         
         # Save detailed output  
@@ -13,6 +13,9 @@ Usage:
     portfolio_data = src.r360.portfolio_key()
     address_data = src.r360.address_key() 
     ownership_data = src.r360.ownership_key()
+
+    # Or several key types from one data fetch
+    results = src.r360.all_keys(['portfolio', 'ownership'])
 """
 
 import src.r360.core
@@ -28,3 +31,7 @@ def address_key(save_to_db=True):
 def ownership_key(save_to_db=True):
     """Generate ownership key (groups by ownership only)"""
     return src.r360.core.generate_ownership_key(save_to_db=save_to_db)
+
+def all_keys(key_types=('portfolio', 'address', 'ownership'), save_to_db=True):
+    """Generate several key types from one data fetch (dict of key type -> dataframe)"""
+    return src.r360.core.generate_keys(list(key_types), save_to_db=save_to_db)
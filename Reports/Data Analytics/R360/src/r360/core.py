@@ -3,6 +3,10 @@ R360 Core Implementation
 
 Contains the main logic for generating relationship keys based on different grouping criteria.
 All business logic is consolidated here for clean modular structure.
+
+Grouping works on edge arrays: every account is linked to the address and ownership (CIF)
+tokens it carries, and connected components over those links give the relationship groups.
+All three key types are resolved from one fetch with vectorized NumPy/pandas operations.
 """
 
 from datetime import datetime
@@ -12,73 +16,258 @@ import numpy as np
 import hashlib
 import base64
 import os
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from .fetch_data import fetch_data
+import cdutils.input_cleansing # type: ignore
 import cdutils.pkey_sqlite # type: ignore
 from .._version import __version__
 
 
+# Token edges each key type groups on
+KEY_TYPES = {
+    'portfolio': ('address', 'ownership'),   # address OR ownership
+    'address': ('address',),                 # address only
+    'ownership': ('ownership',),             # ownership only
+}
+
+# Account column holding each edge type's tokens
+EDGE_COLUMNS = {
+    'address': 'address_key',
+    'ownership': 'CIF',
+}
+
+# SQLite database (under config.DB_DIR) holding each key type's current and historical keys
+KEY_DATABASES = {
+    'portfolio': 'assets/current.db',
+    'address': 'address.db',
+    'ownership': 'ownership.db',
+}
+
+
 # ============================================================================
-# UNION FIND IMPLEMENTATION
+# CONNECTED COMPONENTS (ARRAY-BACKED UNION FIND)
 # ============================================================================
 
-class UnionFind:
+def connected_components(n: int, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """
+    Connected components of an undirected graph given as edge arrays.
+
+    Union-find over a NumPy parent array: each round hooks the larger root of every
+    edge under the smaller one, then pointer jumping flattens every node onto its root.
+    Rounds repeat until no edge spans two roots.
+
+    Args:
+        n (int): number of nodes (0 .. n-1)
+        left / right (np.ndarray): edge endpoints, same length
+
+    Returns:
+        np.ndarray: component label per node, the smallest node index in its component
     """
-    Implements the Union-Find (disjoint set union) data structure to manage disjoint sets efficiently
+    labels = np.arange(n, dtype=np.int64)
+    left = np.asarray(left, dtype=np.int64)
+    right = np.asarray(right, dtype=np.int64)
+
+    while True:
+        left_roots, right_roots = labels[left], labels[right]
+        spanning = left_roots != right_roots
+        if not spanning.any():
+            return labels
+        low = np.minimum(left_roots[spanning], right_roots[spanning])
+        high = np.maximum(left_roots[spanning], right_roots[spanning])
+        np.minimum.at(labels, high, low) # Union: larger root points at the smaller one
+
+        # Path compression
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+
+def token_memberships(tokens: pd.Series, excluded=()) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (account position, token code) pairs for a column of comma separated tokens.
+
+    Args:
+        tokens (pd.Series): one entry per account, e.g. address_key or CIF ('P123,O45')
+        excluded: tokens that must not link accounts (IOLTA addresses and CIFs)
 
-    Attributes:
-        parent (list): Parent pointer for each element in the set
-        rank (list): Rank of the element, used fo runion by rank optimization
+    Returns:
+        positions, codes (np.ndarray): codes number the distinct tokens from 0
     """
+    tokens = tokens.reset_index(drop=True)
+    # Only multi-token entries need splitting
+    multiple = tokens.str.contains(',', regex=False, na=False)
+    exploded = pd.concat([tokens[~multiple], tokens[multiple].str.split(',').explode()]).sort_index(kind='stable')
+    exploded = exploded[exploded.notna() & ~exploded.isin(list(excluded))]
+    codes, _ = pd.factorize(exploded)
+    return exploded.index.to_numpy(dtype=np.int64), codes.astype(np.int64)
 
-    def __init__(self, n):
-        """
-        Initializes the Union-Find structure.
 
-        Args:
-            n (int): The number of elements in the set
-        """
-        self.parent = [i for i in range(n)]
-        self.rank = [1] * n
+def relationship_edges(df: pd.DataFrame) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Account-to-token memberships for each edge type ('address', 'ownership').
 
-    def find(self, x):
-        """
-        Finds the root of the set containing x with path compression.
+    Args:
+        df (pd.DataFrame): accounts with address_key and CIF
 
-        Args:
-            x (int): The element to find the set for.
+    Returns:
+        dict: edge type -> (account positions, token codes)
+    """
+    from .. import config
+    return {
+        'address': token_memberships(df[EDGE_COLUMNS['address']], config.EXCLUDED_ADDRESSES),
+        'ownership': token_memberships(df[EDGE_COLUMNS['ownership']], config.EXCLUDED_CIFS),
+    }
 
-        Returns:
-            int: The root of the set containing x.
-        """
-        res = x
-        while res != self.parent[res]:
-            self.parent[res] = self.parent[self.parent[res]] # path compression
-            res = self.parent[res]
-        return res
-    
-    def union(self, x1, x2):
-        """
-        Unions two sets containing x1 and x2, with union by rank (the set with more children gets parent status)
-
-        Args:
-            x1 (int): An element from the first set
-            x2 (int): An element from the second set
-        
-        Returns:
-            int: 0 if x1 and x2 are already in the same set, otherwise 1
-        """
-        p1, p2 = self.find(x1), self.find(x2)
-        if p1 == p2:
-            return 0 # No union occurs
-        if self.rank[p1] >= self.rank[p2]:
-            self.parent[p2] = p1 # Union by rank
-            self.rank[p1] += self.rank[p2]
-        else:
-            self.parent[p1] = p2
-            self.rank[p2] += self.rank[p1]
-        return 1
+
+def component_labels(n: int, edges: Dict[str, Tuple[np.ndarray, np.ndarray]], edge_types) -> np.ndarray:
+    """
+    Component label per account when grouping on the given edge types.
+
+    Accounts are nodes 0 .. n-1 and each distinct token of each edge type is a node after
+    them, so an account's label is the first account position of its group.
+    """
+    left, right = [], []
+    offset = n
+    for edge_type in edge_types:
+        positions, codes = edges[edge_type]
+        left.append(positions)
+        right.append(codes + offset)
+        offset += int(codes.max()) + 1 if len(codes) else 0
+    labels = connected_components(offset, np.concatenate(left), np.concatenate(right))
+    return labels[:n]
+
+
+def assign_component_keys(labels: np.ndarray, history: Optional[np.ndarray] = None, reserved: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Persistent integer key per account from its component label.
+
+    A component takes the historical key most of its accounts carried (ties go to the
+    smallest key). Components with no history get the smallest unused keys, in order of
+    their first account.
+
+    Args:
+        labels (np.ndarray): component label per account
+        history (np.ndarray): previous key per account (NaN when new), or None
+        reserved (np.ndarray): keys held by accounts outside labels that must not be reused
+
+    Returns:
+        np.ndarray (int64): key per account
+    """
+    if history is not None:
+        hist = pd.DataFrame({'component': labels, 'key': pd.to_numeric(pd.Series(history), errors='coerce').to_numpy()}).dropna()
+        hist['key'] = hist['key'].astype(np.int64)
+        counts = hist.value_counts().reset_index(name='count')
+        counts = counts.sort_values(['component', 'count', 'key'], ascending=[True, False, True])
+        chosen = counts.drop_duplicates('component').set_index('component')['key']
+    else:
+        chosen = pd.Series(dtype=np.int64)
+
+    unkeyed = np.setdiff1d(np.unique(labels), chosen.index.to_numpy())
+    used = np.union1d(chosen.to_numpy(dtype=np.int64), reserved if reserved is not None else np.array([], dtype=np.int64))
+    candidates = np.arange(1, len(used) + len(unkeyed) + 1, dtype=np.int64)
+    new_keys = candidates[~np.isin(candidates, used)][:len(unkeyed)]
+
+    key_by_component = pd.concat([chosen, pd.Series(new_keys, index=unkeyed)])
+    return key_by_component.reindex(labels).to_numpy(dtype=np.int64)
+
+
+def _account_changes(df: pd.DataFrame, previous: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray, pd.DataFrame]:
+    """
+    Compare accounts with the last run's state.
+
+    Returns:
+        matched (pd.DataFrame): previous state rows aligned with df (NaN for new accounts)
+        changed (np.ndarray): mask of accounts that are new or whose address/CIF changed
+        closed (pd.DataFrame): previous state rows of accounts no longer present
+    """
+    current_ids = df.index.astype(str)
+    matched = previous.reindex(current_ids)
+
+    changed = ~current_ids.isin(previous.index)
+    for column in EDGE_COLUMNS.values():
+        before = matched[column].fillna('').to_numpy(dtype=object)
+        now = df[column].fillna('').to_numpy(dtype=object)
+        changed |= before != now
+
+    closed = previous[~previous.index.isin(current_ids)]
+    return matched, changed, closed
+
+
+def _affected_accounts(edges: dict, edge_types, matched: pd.DataFrame, changed: np.ndarray, closed: pd.DataFrame, key_column: str) -> np.ndarray:
+    """
+    Mask of accounts whose group may differ from the previous run.
+
+    Starts from the changed accounts, adds every account that shared a previous group with
+    them or with a closed account, then follows the current address/CIF links until the
+    set is closed.
+    """
+    touched_keys = pd.concat([matched.loc[changed, key_column], closed[key_column]]).dropna().unique()
+    affected = changed | matched[key_column].isin(touched_keys).to_numpy()
+
+    while True:
+        grown = affected.copy()
+        for edge_type in edge_types:
+            positions, codes = edges[edge_type]
+            touched_tokens = np.zeros(int(codes.max()) + 1 if len(codes) else 0, dtype=bool)
+            touched_tokens[codes[affected[positions]]] = True
+            grown[positions[touched_tokens[codes]]] = True
+        if grown.sum() == affected.sum():
+            return affected
+        affected = grown
+
+
+def assign_keys(df: pd.DataFrame, key_types, histories: Optional[dict] = None, previous: Optional[pd.DataFrame] = None) -> Dict[str, np.ndarray]:
+    """
+    Resolve several key types over one set of edge arrays.
+
+    Args:
+        df (pd.DataFrame): accounts indexed by acctnbr with address_key and CIF (see _get_processed_data)
+        key_types: names from KEY_TYPES
+        histories (dict): key type -> previous key per account (aligned with df) for persistence
+        previous (pd.DataFrame): state of the last run (see load_state). When it has a key
+            type, only the groups touched by changed accounts are re-resolved and every other
+            account keeps its key; the last run's keys are then the history.
+
+    Returns:
+        dict: key type -> key per account
+    """
+    histories = histories or {}
+    edges = relationship_edges(df)
+    n = len(df)
+    if previous is not None:
+        matched, changed, closed = _account_changes(df, previous)
+
+    keys = {}
+    for key_type in key_types:
+        edge_types = KEY_TYPES[key_type]
+        key_column = state_key_column(key_type)
+
+        if previous is None or key_column not in previous.columns:
+            labels = component_labels(n, edges, edge_types)
+            keys[key_type] = assign_component_keys(labels, histories.get(key_type))
+            continue
+
+        affected = _affected_accounts(edges, edge_types, matched, changed, closed, key_column)
+        print(f"Re-resolving {affected.sum():,} of {n:,} accounts for {key_type} key")
+        prior_keys = matched[key_column].to_numpy()
+        result = prior_keys.copy()
+
+        positions = np.flatnonzero(affected)
+        if len(positions):
+            subset = {}
+            for edge_type in edge_types:
+                members, codes = edges[edge_type]
+                keep = affected[members]
+                subset[edge_type] = (np.searchsorted(positions, members[keep]), pd.factorize(codes[keep])[0].astype(np.int64))
+            labels = component_labels(len(positions), subset, edge_types)
+            reserved = np.unique(prior_keys[~affected].astype(np.int64))
+            result[positions] = assign_component_keys(labels, prior_keys[positions], reserved)
+        keys[key_type] = result.astype(np.int64)
+
+    return keys
 
 
 # ============================================================================
@@ -130,8 +319,8 @@ def clean_ownership_data(wh_allroles):
     Clean the data, changing data types, creating CIFNBR and a concatenation of roles associated with each acctnbr
     """
     # Change data types
-    wh_allroles['persnbr'] = wh_allroles['persnbr'].apply(lambda x: str(int(x)) if not np.isnan(x) else '')
-    wh_allroles['orgnbr'] = wh_allroles['orgnbr'].apply(lambda x: str(int(x)) if not np.isnan(x) else '')
+    wh_allroles['persnbr'] = cdutils.input_cleansing.normalize_key(wh_allroles['persnbr']).fillna('')
+    wh_allroles['orgnbr'] = cdutils.input_cleansing.normalize_key(wh_allroles['orgnbr']).fillna('')
 
     # Create CIFNBR
     wh_allroles['CIFNBR'] = np.where(wh_allroles['orgnbr'] == '', 'P' + wh_allroles['persnbr'], 'O' + wh_allroles['orgnbr'])
@@ -143,17 +332,16 @@ def clean_ownership_data(wh_allroles):
     return df
 
 
-def address_ownership_consolidation(address_df: pd.DataFrame, ownership_df: pd.DataFrame) -> dict:
+def address_ownership_consolidation(address_df: pd.DataFrame, ownership_df: pd.DataFrame) -> pd.DataFrame:
     """
     Series of merging and additional cleaning steps applied, such as adjusting column data types.
-    This outputs a dictionary.
 
-    Args: 
+    Args:
         address_df (pd.DataFrame): Address dataframe
         ownership_df (pd.DataFrame): Ownership dataframe
 
     Returns:
-        data_dict (dict): Dataframe is transformed to a dictionary with acctnbr as the key
+        df (pd.DataFrame): one row per account, indexed by acctnbr
     """
     # Merging
     merged_df = pd.merge(address_df, ownership_df, how='outer',on='acctnbr')
@@ -162,35 +350,33 @@ def address_ownership_consolidation(address_df: pd.DataFrame, ownership_df: pd.D
     columns_to_str = ['address_concat','CIF']
     merged_df[columns_to_str] = merged_df[columns_to_str].astype(str)
 
-    # Convert to a dictionary
-    data_dict = merged_df.set_index('acctnbr').to_dict(orient='index')
+    df = merged_df.set_index('acctnbr')
+    if not df.index.is_unique:
+        raise ValueError("acctnbr must be unique after address/ownership consolidation")
 
-    return data_dict
+    return df
 
 
-def post_grouping_cleanup(updated_data: dict, acctcommon: pd.DataFrame) -> pd.DataFrame:
+def post_grouping_cleanup(df: pd.DataFrame, acctcommon: pd.DataFrame) -> pd.DataFrame:
     """
-    After grouping and assigning keys, final cleaning steps for putting back into a dataframe and appending extra fields
+    After grouping and assigning keys, final cleaning steps for putting acctnbr back as a column and appending extra fields
 
     Args:
-        updated_data (dict): dictionary with acctnbr as the key
+        df (pd.DataFrame): accounts indexed by acctnbr, with keys assigned
         acctcommon (pd.DataFrame): OSIBANK.WH_ACCTCOMMON (R1625)
-    
+
     Returns:
-        df (pd.DataFrame): final dataframe 
+        df (pd.DataFrame): final dataframe
     """
-    # Convert dictionary to dataframe
-    df = pd.DataFrame.from_dict(updated_data, orient='index')
-    df['acctnbr'] = df.index
-    df = df[['acctnbr'] + [col for col in df.columns if col != 'acctnbr']]
+    df = df.rename_axis('acctnbr').reset_index()
 
     # Append additional fields
     additional_fields = acctcommon[['acctnbr','ownersortname','product','curracctstatcd','bookbalance','noteintrate','mjaccttypcd']].copy()
     df = pd.merge(df, additional_fields, how='left', on='acctnbr')
-    
+
     # Change datatype
     df['acctnbr'] = df['acctnbr'].astype(str)
-    
+
     return df
 
 
@@ -198,75 +384,45 @@ def post_grouping_cleanup(updated_data: dict, acctcommon: pd.DataFrame) -> pd.Da
 # HASHING FUNCTIONS
 # ============================================================================
 
-def hash_key(data: dict, key_field: str, new_key_field: Optional[str]=None) -> dict:
+def hash_values(values: pd.Series) -> pd.Series:
     """
-    Hashes the specified key field in the data dictionary and optionally writes the hashed value to a new key.
+    BLAKE2b hash (8 bytes, urlsafe base64) of each value, computed once per distinct value.
 
     Args:
-        data (dict): A dictionary where each entry contains the key_field to hash
-        key_field (str): The name of the field to hash(e.g., 'concatenated_address')
-        new_key_field (str, optional): The name of the field to write the hashed value to. If None, overwrite original key
+        values (pd.Series): strings to hash (e.g. address_concat); 'None', 'nan' and missing hash to None
 
     Returns:
-        dict: The updated dictionary with hashed values for the specified field.
+        pd.Series: hashed values, same index as values
     """
-
-    for _, details in data.items():
-        if key_field in details and details[key_field]:
-            original_value = details[key_field]
-            if original_value in ('None','nan'):
-                write_key = new_key_field if new_key_field else key_field
-                details[write_key] = None
-                continue
-            # Generate hash key (BLAKE2b algorithm) and truncate to 10 digits
-            hashed_value = hashlib.blake2b(original_value.encode(), digest_size=8).digest()
-            hashed_value = base64.urlsafe_b64encode(hashed_value).decode('utf-8')
-            # Write the new key or overwrite existing key
-            write_key = new_key_field if new_key_field else key_field
-            details[write_key] = hashed_value
-    return data
+    values = values.where(~values.isin(['None', 'nan', '']))
+    codes, uniques = pd.factorize(values)
+    hashed = [
+        base64.urlsafe_b64encode(hashlib.blake2b(str(value).encode(), digest_size=8).digest()).decode('utf-8')
+        for value in uniques
+    ]
+    # Code -1 (missing) picks the trailing None
+    hashed = np.array(hashed + [None], dtype=object)
+    return pd.Series(hashed[codes], index=values.index, dtype=object)
 
 
 # ============================================================================
 # KEY ASSIGNMENT FUNCTIONS
 # ============================================================================
 
-def assign_helper_keys(data: dict) -> dict:
+def assign_helper_keys(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Groups accounts into disjoint sets based on shared CIFs and assigns helper keys.
+    Groups accounts into disjoint sets based on shared CIFs and assigns helper keys (1, 2, ... in account order).
 
     Args:
-        data (dict): A dictionary where each account contains the attribute 'CIF' which is a concatenated list of ownership entities
-    
-    Returns:
-        dict: The updated data with assigned helper key
-    """
-    cif_map = {}
-    account_ids = list(data.keys())
-    n = len(account_ids)
-
-    # Initialize Union-Find
-    uf = UnionFind(n)
-
-    # Perform union operations based on shared CIFs
-    for i, acct in enumerate(account_ids):
-        cifs = data[acct]['CIF'].split(',')
-        cifs = [cif for cif in cifs if cif not in ('O500','O501','nan')] # Excluding IOLTA shared ownership & nan (for no roles)
-        for cif in cifs:
-            if cif in cif_map:
-                uf.union(i, cif_map[cif])
-            else:
-                cif_map[cif] = i
-
-    # Assign unique helper keys to disjoint sets
-    helper_keys = {}
-    for i, acct in enumerate(account_ids):
-        root = uf.find(i)
-        if root not in helper_keys:
-            helper_keys[root] = len(helper_keys) + 1
-        data[acct]['helper_key'] = helper_keys[root]
+        df (pd.DataFrame): accounts with 'CIF', a concatenated list of ownership entities
 
-    return data
+    Returns:
+        pd.DataFrame: df with helper_key
+    """
+    edges = relationship_edges(df)
+    labels = component_labels(len(df), edges, KEY_TYPES['ownership'])
+    df['helper_key'] = pd.factorize(labels)[0] + 1
+    return df
 
 
 # ============================================================================
@@ -309,412 +465,185 @@ def retrieve_historical_keys(history_path):
         return history
     
 
-def append_historical_keys(data, history=None):
+def historical_key_values(df: pd.DataFrame, history: Optional[pd.DataFrame]) -> Optional[np.ndarray]:
+    """
+    Historical portfolio_key per account in df (NaN for accounts without one), or None without history
+    """
     if history is None:
-        return data
-    else:
-        data = pd.DataFrame.from_dict(data, orient='index').copy()
-        data = data.reset_index().copy()
-        data = data.rename(columns={'index':'acctnbr'})
-        history_subset = history[['acctnbr','portfolio_key']]
-        assert history_subset['acctnbr'].is_unique, "Duplicates found"
-        data = pd.merge(data, history_subset, on='acctnbr', how='left')
-        data = data.set_index('acctnbr')
-        data = data.to_dict(orient='index').copy()
-        return data
-
+        return None
+    history_subset = history[['acctnbr','portfolio_key']]
+    assert history_subset['acctnbr'].is_unique, "Duplicates found"
+    return history_subset.set_index('acctnbr')['portfolio_key'].reindex(df.index).to_numpy()
 
-# ============================================================================
-# PORTFOLIO KEY ASSIGNMENT FUNCTIONS
-# ============================================================================
 
-def assign_portfolio_keys(data):
+def state_key_column(key_type: str) -> str:
+    """
+    Column holding a key type's keys in the state file (address_key / ownership_key there are the hashes)
     """
-    Groups accounts into disjoint sets based on shared address or helper keys (shared ownership) and assigns unique portfolio keys.
+    return f"{key_type}_portfolio_key"
 
-    Args:
-        data (dict): A dictionary where each account contains the attributes including address_key and helper_key.
 
-    Returns:
-        dict: The updated data with assigned portfolio keys.
+def load_state(state_path: Path) -> Optional[pd.DataFrame]:
     """
+    Accounts, their address/CIF and keys from the last run (indexed by acctnbr as str), or None
+    """
+    if not state_path.exists():
+        return None
+    try:
+        state = pd.read_parquet(state_path)
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] Could not read R360 state, resolving all accounts: {e}")
+        return None
+    return state.set_index(state['acctnbr'].astype(str)).drop(columns='acctnbr')
 
-    address_map = {}
-    helper_map = {}
-    account_ids = list(data.keys())
-    n = len(account_ids)
-
-    # Initialize Union-Find
-    uf = UnionFind(n)
 
-    # Perform union operations based on address_key and helper_key
-    for i, acct in enumerate(account_ids):
-        attributes = data[acct]
-        address = attributes['address_key']
-        helper = attributes['helper_key']
+def save_state(df: pd.DataFrame, keys: Dict[str, np.ndarray], state_path: Path, previous: Optional[pd.DataFrame] = None):
+    """
+    Store this run's accounts, address/CIF and keys for the next incremental run.
 
-        if address not in (None, 'None', 'nan','-grcQPptQrw=','ShNDlbk0gXo=','uA9lf4xIAz8='): # These are IOLTA addresses & 29 Broadway respectively
-            if address in address_map:
-                uf.union(i, address_map[address])
+    The address/CIF stored are this run's, so a key type not generated this run is only
+    carried over from previous when its inputs are unchanged: same accounts, and the same
+    tokens for each edge type it groups on. Otherwise the next run would see no change for
+    the accounts that moved and keep their stale keys; without the column it runs in full.
+    """
+    state = pd.DataFrame({'acctnbr': df.index.astype(str), 'address_key': df['address_key'].to_numpy(), 'CIF': df['CIF'].to_numpy()})
+    for key_type, values in keys.items():
+        state[state_key_column(key_type)] = values
+    if previous is not None:
+        same_accounts = len(previous) == len(state) and previous.index.isin(state['acctnbr']).all()
+        for key_type in KEY_TYPES:
+            column = state_key_column(key_type)
+            if column in state.columns or column not in previous.columns or not same_accounts:
+                continue
+            matched = previous.reindex(state['acctnbr'])
+            unchanged = all(
+                np.array_equal(matched[EDGE_COLUMNS[edge_type]].fillna('').to_numpy(dtype=object), df[EDGE_COLUMNS[edge_type]].fillna('').to_numpy(dtype=object))
+                for edge_type in KEY_TYPES[key_type]
+            )
+            if unchanged:
+                state[column] = matched[column].to_numpy()
             else:
-                address_map[address] = i
-
-        if helper in helper_map:
-            uf.union(i, helper_map[helper])
-        else:
-            helper_map[helper] = i
-
-    # Assign unique portfolio keys to disjoint sets
-    portfolio_keys = {}
-    sets_by_root = {}
-
-    for i, acct in enumerate(account_ids):
-        root = uf.find(i)
-        sets_by_root.setdefault(root, []).append(acct)
-
-    portfolio_keys = {}
-    sets_with_no_keys = []
-
-    for root, accounts in sets_by_root.items():
-        hist_keys = [
-            int(data[acct].get('portfolio_key'))
-            for acct in accounts
-            if pd.notna(data[acct].get('portfolio_key'))
-            ]
-        if len(hist_keys) > 0:
-            hist_key_counts = pd.Series(hist_keys).value_counts()
-            # print(hist_key_counts)
-            pkey = hist_key_counts[hist_key_counts == hist_key_counts.max()].index.min()
-            # print(pkey)
-        else:
-            pkey = None
-            sets_with_no_keys.append((root, accounts))
-        for acct in accounts:
-            if pkey is not None:
-                if pkey not in portfolio_keys:
-                    portfolio_keys[pkey] = []
-                portfolio_keys[pkey].append(acct)
-
-    used_keys = set(portfolio_keys.keys())
-    new_key = 1
+                print(f"{key_type} keys not generated this run and their inputs changed; next {key_type} run resolves all accounts")
 
-    for root, accounts in sets_with_no_keys:
-        while new_key in used_keys:
-            new_key += 1
-        pkey = new_key
-        portfolio_keys[pkey] = accounts
-        used_keys.add(pkey)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_path.with_suffix(f'.{os.getpid()}.tmp')
+    state.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, state_path)
 
-    for pkey, accounts in portfolio_keys.items():
-        for acct in accounts:
-            data[acct]['portfolio_key'] = pkey
-        
-    return data
 
+# ============================================================================
+# KEY GENERATION
+# ============================================================================
 
-def assign_address_only_keys(data):
+def generate_keys(key_types: List[str], save_to_db=True, incremental: Optional[bool]=None) -> Dict[str, pd.DataFrame]:
     """
-    Groups accounts into disjoint sets based on shared address only and assigns unique portfolio keys.
+    Generate several key types from one data fetch and one set of edge arrays.
 
     Args:
-        data (dict): A dictionary where each account contains the attributes including address_key and helper_key.
+        key_types (List[str]): any of 'portfolio', 'address', 'ownership'
+        save_to_db (bool): write each key type to its SQLite database (and save the incremental state)
+        incremental (bool): only re-resolve groups touched by accounts that changed since the
+            last saved run (defaults to config.INCREMENTAL_KEYS). Falls back to a full run
+            when there is no state for a key type.
 
     Returns:
-        dict: The updated data with assigned portfolio keys.
+        dict: key type -> final dataframe (key in 'portfolio_key')
     """
+    # Import config to check historical database settings
+    from .. import config
+    if incremental is None:
+        incremental = config.INCREMENTAL_KEYS
+    unknown = [key_type for key_type in key_types if key_type not in KEY_TYPES]
+    if unknown:
+        raise ValueError(f"Unknown key types: {unknown}")
 
-    address_map = {}
-    account_ids = list(data.keys())
-    n = len(account_ids)
-
-    # Initialize Union-Find
-    uf = UnionFind(n)
-
-    # Perform union operations based on address_key only
-    for i, acct in enumerate(account_ids):
-        attributes = data[acct]
-        address = attributes['address_key']
-
-        if address not in (None, 'None', 'nan','-grcQPptQrw=','ShNDlbk0gXo=','uA9lf4xIAz8='): # These are IOLTA addresses & 29 Broadway respectively
-            if address in address_map:
-                uf.union(i, address_map[address])
-            else:
-                address_map[address] = i
-
-    # Assign unique portfolio keys to disjoint sets
-    portfolio_keys = {}
-    sets_by_root = {}
-
-    for i, acct in enumerate(account_ids):
-        root = uf.find(i)
-        sets_by_root.setdefault(root, []).append(acct)
-
-    portfolio_keys = {}
-    sets_with_no_keys = []
-
-    for root, accounts in sets_by_root.items():
-        hist_keys = [
-            int(data[acct].get('portfolio_key'))
-            for acct in accounts
-            if pd.notna(data[acct].get('portfolio_key'))
-            ]
-        if len(hist_keys) > 0:
-            hist_key_counts = pd.Series(hist_keys).value_counts()
-            pkey = hist_key_counts[hist_key_counts == hist_key_counts.max()].index.min()
-        else:
-            pkey = None
-            sets_with_no_keys.append((root, accounts))
-        for acct in accounts:
-            if pkey is not None:
-                if pkey not in portfolio_keys:
-                    portfolio_keys[pkey] = []
-                portfolio_keys[pkey].append(acct)
-
-    used_keys = set(portfolio_keys.keys())
-    new_key = 1
+    # Get and process data
+    acctcommon, df = _get_processed_data()
 
-    for root, accounts in sets_with_no_keys:
-        while new_key in used_keys:
-            new_key += 1
-        pkey = new_key
-        portfolio_keys[pkey] = accounts
-        used_keys.add(pkey)
+    previous = load_state(config.STATE_PATH) if incremental else None
 
-    for pkey, accounts in portfolio_keys.items():
-        for acct in accounts:
-            data[acct]['portfolio_key'] = pkey
-        
-    return data
+    engines = {}
+    histories = {}
+    for key_type in key_types:
+        use_historical = config.HISTORICAL_DB_CONFIG.get(key_type, True)
+        if save_to_db:
+            db_path = config.DB_DIR / KEY_DATABASES[key_type]
+            engines[key_type] = cdutils.pkey_sqlite.create_sqlite_engine(str(db_path))
 
+        if previous is not None and state_key_column(key_type) in previous.columns:
+            print(f"🔁 Using last run's {key_type} keys (incremental)")
+            continue
 
-def assign_ownership_only_keys(data):
-    """
-    Groups accounts into disjoint sets based on shared ownership only and assigns unique portfolio keys.
+        # Get historical keys for persistence based on config
+        if use_historical and engines.get(key_type):
+            print(f"📊 Loading historical {key_type} keys for persistence...")
+            history = cdutils.pkey_sqlite.get_most_recent_historical_key(engine=engines[key_type])
+            histories[key_type] = historical_key_values(df, history)
+        elif use_historical is False:
+            print(f"🔄 Generating fresh {key_type} keys (no historical data)")
+        else:
+            print("⏭️  Skipping historical database operations entirely")
 
-    Args:
-        data (dict): A dictionary where each account contains the attributes including address_key and helper_key.
+    # Assign keys for every key type over the same edges
+    keys = assign_keys(df, key_types, histories, previous)
 
-    Returns:
-        dict: The updated data with assigned portfolio keys.
-    """
+    results = {}
+    for key_type in key_types:
+        keyed = df.copy()
+        keyed['portfolio_key'] = keys[key_type]
 
-    helper_map = {}
-    account_ids = list(data.keys())
-    n = len(account_ids)
+        # Clean up
+        results[key_type] = post_grouping_cleanup(keyed, acctcommon)
 
-    # Initialize Union-Find
-    uf = UnionFind(n)
+        if save_to_db and engines.get(key_type):
+            _save_to_database(results[key_type], engines[key_type])
 
-    # Perform union operations based on helper_key only (ownership)
-    for i, acct in enumerate(account_ids):
-        attributes = data[acct]
-        helper = attributes['helper_key']
+    if save_to_db:
+        save_state(df, keys, config.STATE_PATH, previous)
 
-        if helper in helper_map:
-            uf.union(i, helper_map[helper])
-        else:
-            helper_map[helper] = i
-
-    # Assign unique portfolio keys to disjoint sets
-    portfolio_keys = {}
-    sets_by_root = {}
-
-    for i, acct in enumerate(account_ids):
-        root = uf.find(i)
-        sets_by_root.setdefault(root, []).append(acct)
-
-    portfolio_keys = {}
-    sets_with_no_keys = []
-
-    for root, accounts in sets_by_root.items():
-        hist_keys = [
-            int(data[acct].get('portfolio_key'))
-            for acct in accounts
-            if pd.notna(data[acct].get('portfolio_key'))
-            ]
-        if len(hist_keys) > 0:
-            hist_key_counts = pd.Series(hist_keys).value_counts()
-            pkey = hist_key_counts[hist_key_counts == hist_key_counts.max()].index.min()
-        else:
-            pkey = None
-            sets_with_no_keys.append((root, accounts))
-        for acct in accounts:
-            if pkey is not None:
-                if pkey not in portfolio_keys:
-                    portfolio_keys[pkey] = []
-                portfolio_keys[pkey].append(acct)
-
-    used_keys = set(portfolio_keys.keys())
-    new_key = 1
-
-    for root, accounts in sets_with_no_keys:
-        while new_key in used_keys:
-            new_key += 1
-        pkey = new_key
-        portfolio_keys[pkey] = accounts
-        used_keys.add(pkey)
-
-    for pkey, accounts in portfolio_keys.items():
-        for acct in accounts:
-            data[acct]['portfolio_key'] = pkey
-        
-    return data
+    return results
 
 
 def generate_portfolio_key(save_to_db=True):
     """Generate portfolio key that groups by address OR ownership"""
-    # Import config to check historical database settings
-    from .. import config
-    use_historical = config.HISTORICAL_DB_CONFIG.get('portfolio', True)
-    
-    if save_to_db:
-        db_path = config.DB_DIR / 'assets/current.db'
-        current_engine = cdutils.pkey_sqlite.create_sqlite_engine(str(db_path))
-    else:
-        current_engine = None
-    
-    # Get and process data
-    data = _get_processed_data()
-    
-    # Get historical keys for persistence based on config
-    if use_historical and current_engine:
-        print("📊 Loading historical portfolio keys for persistence...")
-        history = cdutils.pkey_sqlite.get_most_recent_historical_key(engine=current_engine)
-        data = append_historical_keys(data, history)
-    elif use_historical is False:
-        print("🔄 Generating fresh portfolio keys (no historical data)")
-        data = append_historical_keys(data, None)
-    else:
-        print("⏭️  Skipping historical database operations entirely")
-        data = append_historical_keys(data, None)
-    
-    # Assign portfolio key (groups by address OR ownership)
-    data = assign_portfolio_keys(data)
-    
-    # Clean up and return
-    df = _finalize_data(data)
-    
-    if save_to_db and current_engine:
-        _save_to_database(df, current_engine)
-    
-    return df
+    return generate_keys(['portfolio'], save_to_db=save_to_db)['portfolio']
 
 
 def generate_address_key(save_to_db=True):
     """Generate address key that groups by address only"""
-    # Import config to check historical database settings
-    from .. import config
-    use_historical = config.HISTORICAL_DB_CONFIG.get('address', True)
-    
-    if save_to_db:
-        db_path = config.DB_DIR / 'address.db'
-        current_engine = cdutils.pkey_sqlite.create_sqlite_engine(str(db_path))
-    else:
-        current_engine = None
-    
-    # Get and process data
-    data = _get_processed_data()
-    
-    # Get historical keys for persistence based on config
-    if use_historical and current_engine:
-        print("📊 Loading historical address keys for persistence...")
-        history = cdutils.pkey_sqlite.get_most_recent_historical_key(engine=current_engine)
-        data = append_historical_keys(data, history)
-    elif use_historical is False:
-        print("🔄 Generating fresh address keys (no historical data)")
-        data = append_historical_keys(data, None)
-    else:
-        print("⏭️  Skipping historical database operations entirely")
-        data = append_historical_keys(data, None)
-    
-    # Assign address-only portfolio key
-    data = assign_address_only_keys(data)
-    
-    # Clean up and return
-    df = _finalize_data(data)
-    
-    if save_to_db and current_engine:
-        _save_to_database(df, current_engine)
-    
-    return df
+    return generate_keys(['address'], save_to_db=save_to_db)['address']
 
 
 def generate_ownership_key(save_to_db=True):
     """Generate ownership key that groups by ownership only"""
-    # Import config to check historical database settings
-    from .. import config
-    use_historical = config.HISTORICAL_DB_CONFIG.get('ownership', True)
-    
-    if save_to_db:
-        db_path = config.DB_DIR / 'ownership.db'
-        current_engine = cdutils.pkey_sqlite.create_sqlite_engine(str(db_path))
-    else:
-        current_engine = None
-    
-    # Get and process data
-    data = _get_processed_data()
-    
-    # Get historical keys for persistence based on config
-    if use_historical and current_engine:
-        print("📊 Loading historical ownership keys for persistence...")
-        history = cdutils.pkey_sqlite.get_most_recent_historical_key(engine=current_engine)
-        data = append_historical_keys(data, history)
-    elif use_historical is False:
-        print("🔄 Generating fresh ownership keys (no historical data)")
-        data = append_historical_keys(data, None)
-    else:
-        print("⏭️  Skipping historical database operations entirely")
-        data = append_historical_keys(data, None)
-    
-    # Assign ownership-only portfolio key
-    data = assign_ownership_only_keys(data)
-    
-    # Clean up and return
-    df = _finalize_data(data)
-    
-    if save_to_db and current_engine:
-        _save_to_database(df, current_engine)
-    
-    return df
+    return generate_keys(['ownership'], save_to_db=save_to_db)['ownership']
 
 
 def _get_processed_data():
-    """Common data processing steps"""
+    """Common data processing steps, returns (acctcommon, accounts indexed by acctnbr)"""
     # Fetch raw data
     data = fetch_data()
-    
+
     # Unpack data
     acctcommon = data['acctcommon'].copy()
     persaddruse = data['persaddruse'].copy()
     orgaddruse = data['orgaddruse'].copy()
     wh_addr = data['wh_addr'].copy()
     wh_allroles = data['wh_allroles'].copy()
-    
+
     # Merge & Clean Data
     address_df = merging_and_data_cleaning(acctcommon, persaddruse, orgaddruse, wh_addr)
     ownership_df = clean_ownership_data(wh_allroles)
-    data_dict = address_ownership_consolidation(address_df, ownership_df)
-    
+    df = address_ownership_consolidation(address_df, ownership_df)
+
     # Create hash keys
-    data_dict = hash_key(data_dict, 'address_concat', 'address_key')
-    data_dict = hash_key(data_dict, 'CIF', 'ownership_key')
-    
-    # Assign helper key (shared ownership grouping)
-    data_dict = assign_helper_keys(data_dict)
-    
-    return data_dict
+    df['address_key'] = hash_values(df['address_concat'])
+    df['ownership_key'] = hash_values(df['CIF'])
 
+    # Assign helper key (shared ownership grouping)
+    df = assign_helper_keys(df)
 
-def _finalize_data(data_dict):
-    """Common data finalization steps"""
-    # Get fresh acctcommon data for additional fields
-    fresh_data = fetch_data()
-    acctcommon = fresh_data['acctcommon'].copy()
-    
-    # Final cleanup and field addition
-    df = post_grouping_cleanup(data_dict, acctcommon)
-    
-    return df
+    return acctcommon, df
 
 
 def _save_to_database(df, engine):
@@ -0,0 +1,174 @@
+"""
+Unit tests for R360 key resolution on synthetic accounts.
+
+Full runs are compared with the dict-based union-find grouping the package used before
+the edge array rewrite (legacy_keys below), and incremental runs with full runs that use
+the last run's keys as history.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the project root to path so src.r360 and src.config resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.config
+import src.r360.core
+
+
+def synthetic_accounts(n=300, seed=0):
+    """Accounts indexed by acctnbr with address_key and CIF, some without an address or roles"""
+    rng = np.random.default_rng(seed)
+    addresses = np.array([f"addr{i}" for i in range(n // 3)] + [None] * 10, dtype=object)
+    cifs = []
+    for _ in range(n):
+        owners = rng.choice(n // 2, size=rng.integers(1, 3), replace=False)
+        cifs.append(','.join(f"P{owner}" for owner in owners) if rng.random() > 0.05 else 'nan')
+    return pd.DataFrame(
+        {'address_key': rng.choice(addresses, size=n), 'CIF': cifs},
+        index=pd.Index(np.arange(1000, 1000 + n), name='acctnbr'),
+    )
+
+
+def legacy_keys(df, key_type, history=None):
+    """Keys as the dict-based implementation assigned them (helper keys, then address/helper unions)"""
+    def union_find(links):
+        parent = list(range(len(df)))
+
+        def find(x):
+            while x != parent[x]:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        first = {}
+        for i, tokens in enumerate(links):
+            for token in tokens:
+                if token in first:
+                    parent[find(i)] = find(first[token])
+                else:
+                    first[token] = i
+        return [find(i) for i in range(len(df))]
+
+    cif_links = [[cif for cif in cifs.split(',') if cif not in src.config.EXCLUDED_CIFS] for cifs in df['CIF']]
+    helper_roots = union_find(cif_links)
+    address_links = [[] if address is None or address in src.config.EXCLUDED_ADDRESSES else [address] for address in df['address_key']]
+    helper_links = [[('helper', root)] for root in helper_roots]
+    links = {
+        'portfolio': [a + h for a, h in zip(address_links, helper_links)],
+        'address': address_links,
+        'ownership': helper_links,
+    }[key_type]
+    roots = union_find(links)
+
+    sets_by_root = {}
+    for i, root in enumerate(roots):
+        sets_by_root.setdefault(root, []).append(i)
+    keys = np.zeros(len(df), dtype=np.int64)
+    unkeyed = []
+    for members in sets_by_root.values():
+        hist_keys = [int(history[i]) for i in members if history is not None and pd.notna(history[i])]
+        if hist_keys:
+            counts = pd.Series(hist_keys).value_counts()
+            keys[members] = counts[counts == counts.max()].index.min()
+        else:
+            unkeyed.append(members)
+    used = set(keys[keys > 0].tolist())
+    new_key = 1
+    for members in unkeyed:
+        while new_key in used:
+            new_key += 1
+        keys[members] = new_key
+        used.add(new_key)
+    return keys
+
+
+def run(df, key_types, state_path, incremental, histories=None):
+    """One generate_keys run on df (no fetch, no databases), saving the incremental state"""
+    previous = src.r360.core.load_state(state_path) if incremental else None
+    keys = src.r360.core.assign_keys(df, key_types, histories, previous)
+    src.r360.core.save_state(df, keys, state_path, previous)
+    return keys
+
+
+def change_accounts(df, seed=1):
+    """Move some addresses, change some owners, close some accounts and open new ones"""
+    rng = np.random.default_rng(seed)
+    df = df.copy()
+    moved = rng.choice(df.index, size=15, replace=False)
+    df.loc[moved, 'address_key'] = rng.choice(df['address_key'].dropna().unique(), size=15)
+    reowned = rng.choice(df.index, size=10, replace=False)
+    df.loc[reowned, 'CIF'] = [f"P{owner}" for owner in rng.integers(0, 150, size=10)]
+    df = df.drop(rng.choice(df.index, size=5, replace=False))
+    opened = synthetic_accounts(n=8, seed=seed + 100)
+    opened.index = pd.Index(np.arange(5000, 5008), name='acctnbr')
+    return pd.concat([df, opened])
+
+
+@pytest.mark.parametrize('key_type', list(src.r360.core.KEY_TYPES))
+def test_full_run_matches_legacy(key_type):
+    df = synthetic_accounts()
+    keys = src.r360.core.assign_keys(df, [key_type])[key_type]
+    np.testing.assert_array_equal(keys, legacy_keys(df, key_type))
+
+
+@pytest.mark.parametrize('key_type', list(src.r360.core.KEY_TYPES))
+def test_full_run_with_history_matches_legacy(key_type):
+    df = synthetic_accounts()
+    history = src.r360.core.assign_keys(df, [key_type])[key_type].astype(float)
+    later = change_accounts(df)
+    history = pd.Series(history, index=df.index).reindex(later.index).to_numpy()
+    keys = src.r360.core.assign_keys(later, [key_type], {key_type: history})[key_type]
+    np.testing.assert_array_equal(keys, legacy_keys(later, key_type, history))
+
+
+def test_incremental_matches_full(tmp_path):
+    state_path = tmp_path / 'r360_state.parquet'
+    key_types = list(src.r360.core.KEY_TYPES)
+    df = synthetic_accounts()
+    first = run(df, key_types, state_path, incremental=False)
+
+    later = change_accounts(df)
+    incremental = run(later, key_types, state_path, incremental=True)
+    for key_type in key_types:
+        history = pd.Series(first[key_type], index=df.index).reindex(later.index).to_numpy()
+        full = src.r360.core.assign_keys(later, [key_type], {key_type: history})[key_type]
+        np.testing.assert_array_equal(incremental[key_type], full)
+
+
+def test_key_type_skipped_while_its_inputs_changed(tmp_path):
+    """portfolio + address run, address moves during a portfolio only run, then an address run"""
+    state_path = tmp_path / 'r360_state.parquet'
+    df = pd.DataFrame(
+        {'address_key': ['addrA', 'addrA', 'addrC'], 'CIF': ['P1', 'P2', 'P3']},
+        index=pd.Index([1, 2, 3], name='acctnbr'),
+    )
+    first = run(df, ['portfolio', 'address'], state_path, incremental=False)
+    np.testing.assert_array_equal(first['address'], [1, 1, 2])
+
+    moved = df.copy()
+    moved.loc[2, 'address_key'] = 'addrC'
+    run(moved, ['portfolio'], state_path, incremental=True)
+    assert 'address_portfolio_key' not in src.r360.core.load_state(state_path).columns
+
+    incremental = run(moved, ['address'], state_path, incremental=True, histories={'address': first['address'].astype(float)})
+    full = src.r360.core.assign_keys(moved, ['address'], {'address': first['address'].astype(float)})['address']
+    np.testing.assert_array_equal(incremental['address'], full)
+    assert incremental['address'][1] == incremental['address'][2]
+
+
+def test_unchanged_key_type_carried_over(tmp_path):
+    state_path = tmp_path / 'r360_state.parquet'
+    df = synthetic_accounts()
+    first = run(df, ['portfolio', 'ownership'], state_path, incremental=False)
+
+    # Only addresses change, so the ownership keys stay valid
+    moved = df.copy()
+    moved.iloc[:10, moved.columns.get_loc('address_key')] = 'addr0'
+    run(moved, ['portfolio'], state_path, incremental=True)
+    state = src.r360.core.load_state(state_path)
+    np.testing.assert_array_equal(state['ownership_portfolio_key'].to_numpy(), first['ownership'])
@@ -46,12 +46,11 @@ from pathlib import Path
 import pandas as pd
 import re
 import warnings
-from openpyxl import load_workbook, Workbook
-from openpyxl.utils import get_column_letter
-from openpyxl import styles
 from shutil import copy2
 from datetime import datetime
 import src.config
+import cdutils.excel_writer # type: ignore
+import cdutils.reconciliation # type: ignore
 
 warnings.filterwarnings("ignore", category=UserWarning, module="openpyxl")
 warnings.filterwarnings("ignore", category=FutureWarning)
@@ -198,86 +197,35 @@ def main():
         # Reset index after filtering
         routeone_df.reset_index(drop=True, inplace=True)
 
-    # Match logic
-    routeone_resolved, dt_resolved, routeone_errors, dt_errors = [], [], [], []
-    funding_indices_to_drop, routeone_indices_to_drop, dtvault_indices_to_drop = [], [], []
-    
-    # Debug counters
-    routeone_matches_found = 0
-    dt_matches_found = 0
-
-    # Debug: Print some sample data to understand the matching issue
-
-    
-    # Debug: Check RouteOne Econtracts in funding data
-    routeone_funding = funding_df[funding_df.iloc[:, 5] == 'Route One']  # Portal column
-
-    
-    # Debug: Check which RouteOne Econtracts are missing from vault
-    routeone_app_nums = set(routeone_funding.iloc[:, 0].astype(str))
-    vault_app_nums = set(routeone_df.iloc[:, 15].astype(str).str.replace('.0', ''))
-    missing_from_vault = routeone_app_nums - vault_app_nums
-
-    
-    for i, fund_row in funding_df.iterrows():
-        app_num = str(fund_row.iloc[0]).strip()
-        fund_amt = fund_row.iloc[12]
-
-        matched_ro = routeone_df[routeone_df.iloc[:, 15].astype(str).str.strip().str.replace('.0', '') == app_num]
-        if not matched_ro.empty:
-            routeone_matches_found += 1
-            for j, ro_row in matched_ro.iterrows():
-                ro_amt = ro_row.iloc[16]
-                if pd.notna(ro_amt) and pd.notna(fund_amt) and float(ro_amt) == float(fund_amt):
-                    combined = pd.concat([fund_row, ro_row]).to_frame().T # type: ignore
-                    combined.insert(1, "Reconciled", "Yes")
-                    routeone_resolved.append(combined)
-                    funding_indices_to_drop.append(i)
-                    routeone_indices_to_drop.append(j)
-                    break
-                else:
-                    error_row = pd.concat([fund_row, ro_row]).to_frame().T # type: ignore
-                    routeone_errors.append(error_row)
-                    funding_indices_to_drop.append(i)
-                    routeone_indices_to_drop.append(j)
-                    break
-            continue
+    # Match logic: keys are normalized once per frame and funding is hash-joined to each vault
+    # - RouteOne: funding application number == vault application number (column P)
+    # - DT: vault ID ends with "<application number>_DT_BCS"; only tried for funding rows RouteOne did not match
+    # The first vault row carrying a key is used, and amounts must agree for the row to count as reconciled
+    funding_keys = cdutils.reconciliation.normalize_key(funding_df.iloc[:, 0])
+    routeone_keys = cdutils.reconciliation.normalize_key(routeone_df.iloc[:, 15], remove=['.0'])
+    dt_keys = cdutils.reconciliation.normalize_key(dtvault_df.iloc[:, 0], strip=False, suffix='_DT_BCS')
 
-        pattern = f"{app_num}_DT_BCS"
-        matched_dt = dtvault_df[dtvault_df.iloc[:, 0].astype(str).str.endswith(pattern)]
-        if not matched_dt.empty:
-            dt_matches_found += 1
-            for j, dt_row in matched_dt.iterrows():
-                dt_amt = dt_row.iloc[9]
-                if pd.notna(dt_amt) and pd.notna(fund_amt) and float(dt_amt) == float(fund_amt):
-                    combined = pd.concat([fund_row, dt_row]).to_frame().T # type: ignore
-                    combined.insert(1, "Reconciled", "Yes")
-                    dt_resolved.append(combined)
-                    funding_indices_to_drop.append(i)
-                    dtvault_indices_to_drop.append(j)
-                    break
-                else:
-                    error_row = pd.concat([fund_row, dt_row]).to_frame().T # type: ignore
-                    dt_errors.append(error_row)
-                    funding_indices_to_drop.append(i)
-                    dtvault_indices_to_drop.append(j)
-                    break
-            continue
-
-    # Build resolved/error DFs
+    routeone_recon = cdutils.reconciliation.reconcile(
+        funding_df, routeone_df, funding_keys, routeone_keys, left_amount=12, right_amount=16
+    )
+    funding_after_routeone = routeone_recon['unmatched_left']
+    dt_recon = cdutils.reconciliation.reconcile(
+        funding_after_routeone, dtvault_df, funding_keys[funding_after_routeone.index], dt_keys, left_amount=12, right_amount=9, match='suffix'
+    )
 
-    
-    routeone_resolved_df = pd.concat(routeone_resolved, ignore_index=True) if routeone_resolved else pd.DataFrame()
-    dt_resolved_df = pd.concat(dt_resolved, ignore_index=True) if dt_resolved else pd.DataFrame()
-    routeone_error_df = pd.concat(routeone_errors, ignore_index=True) if routeone_errors else pd.DataFrame()
-    dt_error_df = pd.concat(dt_errors, ignore_index=True) if dt_errors else pd.DataFrame()
+    # Build resolved/error DFs (object columns and column-less when empty, as the row-by-row version produced)
+    routeone_resolved_df, dt_resolved_df, routeone_error_df, dt_error_df = [
+        frame.astype(object) if not frame.empty else pd.DataFrame()
+        for frame in (routeone_recon['matched'], dt_recon['matched'], routeone_recon['mismatched'], dt_recon['mismatched'])
+    ]
+    for resolved_df in (routeone_resolved_df, dt_resolved_df):
+        if not resolved_df.empty:
+            resolved_df.insert(1, "Reconciled", "Yes")
 
     # Unmatched cleanup
-    funding_df.drop(index=funding_indices_to_drop, inplace=True)
-    routeone_df.drop(index=routeone_indices_to_drop, inplace=True)
-    dtvault_df.drop(index=dtvault_indices_to_drop, inplace=True)
-    routeone_df.reset_index(drop=True, inplace=True)
-    dtvault_df.reset_index(drop=True, inplace=True)
+    funding_df = dt_recon['unmatched_left'].copy()
+    routeone_df = routeone_recon['unmatched_right'].reset_index(drop=True)
+    dtvault_df = dt_recon['unmatched_right'].reset_index(drop=True)
     
 
     # Insert reconciled = No + drop blanks
@@ -303,22 +251,22 @@ def main():
 
     
     # Calculate summary data and print to command line
-    total_funding_records = len(funding_df) + len(funding_indices_to_drop)
-    total_routeone_vault_original = len(routeone_df) + len(routeone_indices_to_drop)
-    total_dt_vault_original = len(dtvault_df) + len(dtvault_indices_to_drop)
+    total_funding_records = len(funding_df) + len(routeone_resolved_df) + len(routeone_error_df) + len(dt_resolved_df) + len(dt_error_df)
+    total_routeone_vault_original = len(routeone_df) + len(routeone_resolved_df) + len(routeone_error_df)
+    total_dt_vault_original = len(dtvault_df) + len(dt_resolved_df) + len(dt_error_df)
     
     # Calculate all subtotals in Python
     # Note: We'll need to adjust these after filtering Paper contracts
-    routeone_reconciled = len(routeone_resolved)
+    routeone_reconciled = len(routeone_resolved_df)
     routeone_not_reconciled = len(routeone_df)
     routeone_missing = len(unmatched_routeone_econtracts)
-    routeone_errors_count = len(routeone_errors)
+    routeone_errors_count = len(routeone_error_df)
     routeone_subtotal = routeone_reconciled + routeone_not_reconciled + routeone_missing + routeone_errors_count
     
-    dt_reconciled = len(dt_resolved)
+    dt_reconciled = len(dt_resolved_df)
     dt_not_reconciled = len(dtvault_df)
     dt_missing = len(unmatched_dt_econtracts)
-    dt_errors_count = len(dt_errors)
+    dt_errors_count = len(dt_error_df)
     dt_subtotal = dt_reconciled + dt_not_reconciled + dt_missing + dt_errors_count
     
     paper_total = len(unmatched_paper_contracts)
@@ -782,277 +730,85 @@ def main():
         f"{month_year} DL Paper contract Report": unmatched_paper_contracts,
     }
 
-    # Create new workbook manually - no pandas ExcelWriter
-    wb = Workbook()
-    # Remove default sheet
-    if wb.active:
-        wb.remove(wb.active)
-    
-    # Create Summary sheet first - write data in most basic way
-    summary_sheet_name = f"Summary {suffix}"
-    ws_summary = wb.create_sheet(title=summary_sheet_name[:31])
-    
-    # Write summary data one cell at a time - no loops
-    ws_summary.cell(row=1, column=1, value="Category")
-    ws_summary.cell(row=1, column=2, value="Count")
-    
-    ws_summary.cell(row=2, column=1, value="INPUT RECORDS ")
-    ws_summary.cell(row=3, column=1, value="Funding Records (Total)")
-    ws_summary.cell(row=3, column=2, value=str(total_funding_records))
-    ws_summary.cell(row=4, column=1, value="RouteOne Vault Records (After Filtering)")
-    ws_summary.cell(row=4, column=2, value=str(total_routeone_vault_original))
-    ws_summary.cell(row=5, column=1, value="DT Vault Records (Total)")
-    ws_summary.cell(row=5, column=2, value=str(total_dt_vault_original))
-    
-    ws_summary.cell(row=7, column=1, value="ROUTEONE ECONTRACTS ")
-    ws_summary.cell(row=8, column=1, value="  Reconciled (Matched + Amount Match)")
-    ws_summary.cell(row=8, column=2, value=str(routeone_reconciled))
-    ws_summary.cell(row=9, column=1, value="  Not Reconciled (In Vault, No Match)")
-    ws_summary.cell(row=9, column=2, value=str(routeone_not_reconciled))
-    ws_summary.cell(row=10, column=1, value="  Missing from Vault (In Funding Only)")
-    ws_summary.cell(row=10, column=2, value=str(routeone_missing))
-    ws_summary.cell(row=11, column=1, value="  Errors (Matched, Amount Mismatch)")
-    ws_summary.cell(row=11, column=2, value=str(routeone_errors_count))
-    ws_summary.cell(row=12, column=1, value="  RouteOne Econtracts Subtotal")
-    ws_summary.cell(row=12, column=2, value=str(routeone_subtotal))
-    
-    ws_summary.cell(row=14, column=1, value="DT ECONTRACTS ")
-    ws_summary.cell(row=15, column=1, value="  Reconciled (Matched + Amount Match)")
-    ws_summary.cell(row=15, column=2, value=str(dt_reconciled))
-    ws_summary.cell(row=16, column=1, value="  Not Reconciled (In Vault, No Match)")
-    ws_summary.cell(row=16, column=2, value=str(dt_not_reconciled))
-    ws_summary.cell(row=17, column=1, value="  Missing from Vault (In Funding Only)")
-    ws_summary.cell(row=17, column=2, value=str(dt_missing))
-    ws_summary.cell(row=18, column=1, value="  Errors (Matched, Amount Mismatch)")
-    ws_summary.cell(row=18, column=2, value=str(dt_errors_count))
-    ws_summary.cell(row=19, column=1, value="  DT Econtracts Subtotal")
-    ws_summary.cell(row=19, column=2, value=str(dt_subtotal))
-    
-    ws_summary.cell(row=21, column=1, value=" PAPER CONTRACTS ")
-    ws_summary.cell(row=22, column=1, value="  Paper Contracts (All Types)")
-    ws_summary.cell(row=22, column=2, value=str(paper_total))
-    
-    ws_summary.cell(row=24, column=1, value="VERIFICATION ")
-    ws_summary.cell(row=25, column=1, value="  Total Processed (Should Equal Funding Total)")
-    ws_summary.cell(row=25, column=2, value=str(total_processed))
-    ws_summary.cell(row=26, column=1, value="  Funding Total (Original)")
-    ws_summary.cell(row=26, column=2, value=str(total_funding_records))
-    
-    # Set column widths
-    ws_summary.column_dimensions['A'].width = 45
-    ws_summary.column_dimensions['B'].width = 15
-
+    # Formats (xlsxwriter format properties)
+    bold_border = {'bold': True, 'border': 1}
+    section_format = {'bold': True, 'font_size': 12, 'bg_color': '#D3D3D3', 'pattern': 1, 'border': 1}
+    highlight_format = {'bg_color': '#FFFF00', 'pattern': 1}
+    section_headers = ["IN VAULT BUT NOT IN FUNDING", "IN FUNDING BUT NOT IN VAULT"]
+
+    # Summary sheet first
+    summary_rows = [
+        ["INPUT RECORDS ", None],
+        ["Funding Records (Total)", str(total_funding_records)],
+        ["RouteOne Vault Records (After Filtering)", str(total_routeone_vault_original)],
+        ["DT Vault Records (Total)", str(total_dt_vault_original)],
+        [None, None],
+        ["ROUTEONE ECONTRACTS ", None],
+        ["  Reconciled (Matched + Amount Match)", str(routeone_reconciled)],
+        ["  Not Reconciled (In Vault, No Match)", str(routeone_not_reconciled)],
+        ["  Missing from Vault (In Funding Only)", str(routeone_missing)],
+        ["  Errors (Matched, Amount Mismatch)", str(routeone_errors_count)],
+        ["  RouteOne Econtracts Subtotal", str(routeone_subtotal)],
+        [None, None],
+        ["DT ECONTRACTS ", None],
+        ["  Reconciled (Matched + Amount Match)", str(dt_reconciled)],
+        ["  Not Reconciled (In Vault, No Match)", str(dt_not_reconciled)],
+        ["  Missing from Vault (In Funding Only)", str(dt_missing)],
+        ["  Errors (Matched, Amount Mismatch)", str(dt_errors_count)],
+        ["  DT Econtracts Subtotal", str(dt_subtotal)],
+        [None, None],
+        [" PAPER CONTRACTS ", None],
+        ["  Paper Contracts (All Types)", str(paper_total)],
+        [None, None],
+        ["VERIFICATION ", None],
+        ["  Total Processed (Should Equal Funding Total)", str(total_processed)],
+        ["  Funding Total (Original)", str(total_funding_records)],
+    ]
+    summary_df = pd.DataFrame(summary_rows, columns=["Category", "Count"])
+    sheets = {
+        f"Summary {suffix}"[:31]: (summary_df, {
+            'header': {'format': {'bold': True}},
+            'columns': {'Category': {'width': 45}, 'Count': {'width': 15}},
+        })
+    }
 
-    # Write each sheet manually
+    # Every cell is written as text
     for sheet_name, df in dfs_to_export.items():
-        # Create new sheet
-        ws = wb.create_sheet(title=sheet_name[:31])  # Excel sheet names limited to 31 chars
-        
-        # Convert DataFrame to list of lists for manual writing
-        if not df.empty:
-            # Check if this is a NOT RECONCILED sheet (has generic column names)
-            if "NOT RECONCILED" in sheet_name and df.columns[0].startswith("Column_"):
-                # Skip the generic column headers, just write the data
-                df_str = df.astype(str)
-                data = df_str.values.tolist()
-            else:
-                # Normal sheet - include column headers
-                df_str = df.astype(str)
-                data = [df_str.columns.tolist()] + df_str.values.tolist()
+        not_reconciled = "NOT RECONCILED" in sheet_name
+        if df.empty:
+            # Empty DataFrame - single 'No Data' cell
+            df_str = pd.DataFrame(columns=['No Data'])
         else:
-            # Empty DataFrame - just write headers
-            data = [df.columns.tolist()] if not df.empty else [['No Data']]
-        
-        # Write data row by row, cell by cell
-        for row_idx, row_data in enumerate(data, 1):
-            for col_idx, cell_value in enumerate(row_data, 1):
-                cell = ws.cell(row=row_idx, column=col_idx, value=str(cell_value))
-                
-                # Format header row (only for non-NOT RECONCILED sheets)
-                if row_idx == 1 and "NOT RECONCILED" not in sheet_name:
-                    cell.font = styles.Font(bold=True)
-                    cell.border = styles.Border(
-                        left=styles.Side(style='thin'),
-                        right=styles.Side(style='thin'),
-                        top=styles.Side(style='thin'),
-                        bottom=styles.Side(style='thin')
-                    )
-        
-        # Set column widths
-        for col in range(1, len(data[0]) + 1):
-            col_letter = get_column_letter(col)
-            ws.column_dimensions[col_letter].width = 15
-    
-    # Save the workbook
-    wb.save(output_path)
-    print(f"Excel file created: {output_path}")
-    
-    # Now apply specific formatting for certain sheets
-    def format_specific_sheets(filepath):
-        wb = load_workbook(filepath)
-        
-        for sheet in wb.worksheets:
-            sheet_name = sheet.title
-            
-            # Special handling for Route One Vault sheet (reconciled)
-            if "Route One Vault" in sheet_name and "NOT RECONCILED" not in sheet_name and "Errors" not in sheet_name:
-                print(f"Formatting {sheet_name}...")
-                
-                # Get the data range
-                max_row = sheet.max_row
-                max_col = sheet.max_column
-                
-                # Make header row bold with borders
-                for col in range(1, max_col + 1):
-                    cell = sheet.cell(row=1, column=col)
-                    cell.font = styles.Font(bold=True)
-                    cell.border = styles.Border(
-                        left=styles.Side(style='thin'),
-                        right=styles.Side(style='thin'),
-                        top=styles.Side(style='thin'),
-                        bottom=styles.Side(style='thin')
-                    )
-                
-                # Highlight Paper contracts (check column Q for "Paper")
-                for row in range(2, max_row + 1):  # Skip header row
-                    if max_col >= 17:  # Make sure column Q exists
-                        contract_type = sheet.cell(row=row, column=17).value  # Column Q (17th column)
-                        if contract_type == "Paper":
-                            for col in range(1, sheet.max_column + 1):
-                                cell = sheet.cell(row=row, column=col)
-                                cell.fill = styles.PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-            
-            # Special handling for Route One Vault NOT RECONCILED sheet
-            elif "Route One Vault NOT RECONCILED" in sheet_name:
-                print(f"Formatting {sheet_name}...")
-                
-                # Get the data range
-                max_row = sheet.max_row
-                max_col = sheet.max_column
-                
-                # Track which rows are column headers (rows immediately after section headers)
-                column_header_rows = []
-                
-                # First pass: identify section headers and column header rows
-                for row in range(1, max_row + 1):
-                    first_cell_value = str(sheet.cell(row=row, column=1).value)
-                    
-                    if first_cell_value in ["IN VAULT BUT NOT IN FUNDING", "IN FUNDING BUT NOT IN VAULT"]:
-                        # The next row will be column headers
-                        if row + 1 <= max_row:
-                            column_header_rows.append(row + 1)
-                
-                # Second pass: format all rows
-                for row in range(1, max_row + 1):
-                    first_cell_value = str(sheet.cell(row=row, column=1).value)
-                    
-                    # Check if this is a section header
-                    if first_cell_value in ["IN VAULT BUT NOT IN FUNDING", "IN FUNDING BUT NOT IN VAULT"]:
-                        # Style section header row
-                        for col in range(1, max_col + 1):
-                            cell = sheet.cell(row=row, column=col)
-                            cell.font = styles.Font(bold=True, size=12)
-                            cell.fill = styles.PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
-                            cell.border = styles.Border(
-                                left=styles.Side(style='thin'),
-                                right=styles.Side(style='thin'),
-                                top=styles.Side(style='thin'),
-                                bottom=styles.Side(style='thin')
-                            )
-                    elif row in column_header_rows:
-                        # Style column headers
-                        for col in range(1, max_col + 1):
-                            cell = sheet.cell(row=row, column=col)
-                            cell.font = styles.Font(bold=True)
-                            cell.border = styles.Border(
-                                left=styles.Side(style='thin'),
-                                right=styles.Side(style='thin'),
-                                top=styles.Side(style='thin'),
-                                bottom=styles.Side(style='thin')
-                            )
-                    else:
-                        # Check for E Contract highlighting if column Q exists
-                        if max_col >= 17:
-                            contract_type = sheet.cell(row=row, column=17).value  # Column Q
-                            if contract_type == "E Contract":
-                                for col in range(1, max_col + 1):
-                                    cell = sheet.cell(row=row, column=col)
-                                    cell.fill = styles.PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-            
-            # Special handling for DT Vault NOT RECONCILED sheet
-            elif "DT Vault NOT RECONCILED" in sheet_name:
-                print(f"Formatting {sheet_name}...")
-                
-                # Get the data range
-                max_row = sheet.max_row
-                max_col = sheet.max_column
-                
-                # Track which rows are column headers (rows immediately after section headers)
-                column_header_rows = []
-                
-                # First pass: identify section headers and column header rows
-                for row in range(1, max_row + 1):
-                    first_cell_value = str(sheet.cell(row=row, column=1).value)
-                    
-                    if first_cell_value in ["IN VAULT BUT NOT IN FUNDING", "IN FUNDING BUT NOT IN VAULT"]:
-                        # The next row will be column headers
-                        if row + 1 <= max_row:
-                            column_header_rows.append(row + 1)
-                
-                # Second pass: format all rows
-                for row in range(1, max_row + 1):
-                    first_cell_value = str(sheet.cell(row=row, column=1).value)
-                    
-                    # Check if this is a section header
-                    if first_cell_value in ["IN VAULT BUT NOT IN FUNDING", "IN FUNDING BUT NOT IN VAULT"]:
-                        # Style section header row
-                        for col in range(1, max_col + 1):
-                            cell = sheet.cell(row=row, column=col)
-                            cell.font = styles.Font(bold=True, size=12)
-                            cell.fill = styles.PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
-                            cell.border = styles.Border(
-                                left=styles.Side(style='thin'),
-                                right=styles.Side(style='thin'),
-                                top=styles.Side(style='thin'),
-                                bottom=styles.Side(style='thin')
-                            )
-                    elif row in column_header_rows:
-                        # Style column headers
-                        for col in range(1, max_col + 1):
-                            cell = sheet.cell(row=row, column=col)
-                            cell.font = styles.Font(bold=True)
-                            cell.border = styles.Border(
-                                left=styles.Side(style='thin'),
-                                right=styles.Side(style='thin'),
-                                top=styles.Side(style='thin'),
-                                bottom=styles.Side(style='thin')
-                            )
-                    else:
-                        # Check for E Contract highlighting if column Q exists
-                        if max_col >= 17:
-                            contract_type = sheet.cell(row=row, column=17).value  # Column Q
-                            if contract_type == "E Contract":
-                                for col in range(1, max_col + 1):
-                                    cell = sheet.cell(row=row, column=col)
-                                    cell.fill = styles.PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-            
-            # Special handling for Summary sheet
-            elif "Summary" in sheet_name:
-                print(f"Formatting {sheet_name}...")
-                
-                # Just make headers bold and set column widths
-                for col in range(1, sheet.max_column + 1):
-                    cell = sheet.cell(row=1, column=col)
-                    cell.font = styles.Font(bold=True)
-                
-                # Set column widths
-                sheet.column_dimensions['A'].width = 45
-                sheet.column_dimensions['B'].width = 15
-        
-        wb.save(filepath)
-        print(f"Formatting completed for: {filepath}")
-
-    format_specific_sheets(output_path)
+            df_str = df.astype(str)
+        # NOT RECONCILED sheets have generic column names and carry their own section headers
+        write_header = df_str.empty or not (not_reconciled and str(df_str.columns[0]).startswith("Column_"))
+        spec = {
+            'header': {'format': None if not_reconciled else bold_border} if write_header else False,
+            'default_width': 15,
+            'row_formats': [],
+        }
+
+        has_column_q = df_str.shape[1] >= 17
+        contract_type = df_str.iloc[:, 16] if has_column_q else pd.Series(None, index=df_str.index)
+
+        if "Route One Vault" in sheet_name and not not_reconciled and "Errors" not in sheet_name:
+            # Highlight Paper contracts (column Q)
+            spec['row_formats'].append((contract_type.eq("Paper"), highlight_format))
+        elif not_reconciled and not df_str.empty:
+            # Section headers, the column header row under each, E Contracts (column Q) elsewhere
+            is_section = df_str.iloc[:, 0].isin(section_headers)
+            is_column_header = is_section.shift(1, fill_value=False) & ~is_section
+            is_e_contract = contract_type.eq("E Contract") & ~is_section & ~is_column_header
+            spec['row_formats'] += [
+                (is_e_contract, highlight_format),
+                (is_column_header, bold_border),
+                (is_section, section_format),
+            ]
+
+        sheets[sheet_name[:31]] = (df_str, spec)  # Excel sheet names limited to 31 chars
+
+    # Single pass write (no reopen to format)
+    cdutils.excel_writer.write_sheets(output_path, sheets)
     print(f"Final Excel written and formatted: {output_path}")
    
     def archive_and_delete():
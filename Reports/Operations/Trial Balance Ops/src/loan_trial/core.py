@@ -4,6 +4,7 @@ import src.config
 import pandas as pd
 from deltalake import DeltaTable
 import cdutils.deduplication # type: ignore
+import cdutils.lakehouse # type: ignore
 import src.loan_trial.fetch_data
 import numpy as np
 
@@ -119,8 +120,7 @@ def main_pipeline():
     accts = accts.merge(merged_investor, on='acctnbr', how='left')
 
     # acctloan
-    acctloan = DeltaTable(src.config.BRONZE / "wh_acctloan").to_pandas()
-    acctloan = acctloan[[
+    acctloan = cdutils.lakehouse.read_table(src.config.BRONZE / "wh_acctloan", columns=[
         'acctnbr',
         'currduedate',
         'totalpaymentsdue',
@@ -144,7 +144,7 @@ def main_pipeline():
         'esccompmth',
         'creditreporttypcd',
         'purpcd'
-    ]].copy()
+    ])
 
     acctloan['acctnbr'] = acctloan['acctnbr'].astype(str)
     assert acctloan['acctnbr'].is_unique, "Duplicates premerge accts & acctloan"
@@ -152,27 +152,25 @@ def main_pipeline():
     accts = accts.merge(acctloan, how='left', on='acctnbr')
 
     # wh_loans 
-    wh_loans = DeltaTable(src.config.BRONZE / "wh_loans").to_pandas()
-    wh_loans = wh_loans[[
+    wh_loans = cdutils.lakehouse.read_table(src.config.BRONZE / "wh_loans", columns=[
         'acctnbr',
         'rcf',
         'ratechangeleaddays',
         'revolveloanyn'
-    ]].copy()
+    ])
 
     wh_loans['acctnbr'] = wh_loans['acctnbr'].astype(str)
     assert wh_loans['acctnbr'].is_unique, "Duplicates premerge accts & wh_loans"
     accts = accts.merge(wh_loans, how='left', on='acctnbr')
 
     # wh_acctcommon 
-    wh_acctcommon = DeltaTable(src.config.BRONZE / "wh_acctcommon").to_pandas()
-    wh_acctcommon = wh_acctcommon[[
+    wh_acctcommon = cdutils.lakehouse.read_table(src.config.BRONZE / "wh_acctcommon", columns=[
         'acctnbr',
         'intbase',
         'intmethcd',
         'ratetypcd',
         'daysmethcd'
-    ]].copy()
+    ])
 
     wh_acctcommon['acctnbr'] = wh_acctcommon['acctnbr'].astype(str)
     assert wh_acctcommon['acctnbr'].is_unique, "Duplicates premerge accts & wh_acctcommon"
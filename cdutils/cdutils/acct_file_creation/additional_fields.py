@@ -4,11 +4,11 @@ Fetching data module. Aim is import all necessary fields up front, but if needed
 Usage:
     import src.cdutils.database
 
-You need to set your own date that you want to see in effective date embedded in the SQL Query
+The effective date is passed to Oracle as a bind parameter (see cdutils.database.query_template)
 """
 
 import cdutils.database.connect # type: ignore
-from sqlalchemy import text # type: ignore
+from cdutils.database.query_template import QueryTemplate # type: ignore
 from typing import Optional
 from datetime import datetime
 
@@ -16,7 +16,7 @@ def fetch_data(specified_date: Optional[datetime] = None):
     """
     Main data query
     """
-    wh_acctcommon = text(f"""
+    wh_acctcommon = QueryTemplate("""
     SELECT
         a.ACCTNBR,
         a.BRANCHNAME,
@@ -26,12 +26,12 @@ def fetch_data(specified_date: Optional[datetime] = None):
     FROM
         COCCDM.WH_ACCTCOMMON a
     WHERE
-        (a.CURRACCTSTATCD IN ('ACT','NPFM','DORM')) AND
-        (a.EFFDATE = TO_DATE('{specified_date}', 'YYYY-MM-DD HH24:MI:SS'))
+        (a.CURRACCTSTATCD IN :statuses) AND
+        (a.EFFDATE = :effdate)
     """)
 
     queries = [
-        {'key':'wh_acctcommon', 'sql':wh_acctcommon, 'engine':2},
+        {'key':'wh_acctcommon', 'sql':wh_acctcommon, 'engine':2, 'params':{'effdate':specified_date, 'statuses':['ACT','NPFM','DORM']}},
     ]
 
 
@@ -27,9 +27,7 @@ def create_daily_acct_table():
     raw_data = cdutils.acct_lookup.src.core_transform.main_pipeline(data)
 
     # Raw data with pkey appended
-    raw_data = cdutils.pkey_sqlite.add_pkey(raw_data)
-    raw_data = cdutils.pkey_sqlite.add_ownership_key(raw_data)
-    raw_data = cdutils.pkey_sqlite.add_address_key(raw_data)
+    raw_data = cdutils.pkey_sqlite.add_keys(raw_data)
 
     # %%
     househldacct = data['househldacct'].copy()
@@ -0,0 +1,256 @@
+# Local incremental store of OSIBANK.ACCTSTATISTICHIST
+"""
+ACCTSTATISTICHIST holds one row per account, statistic type and month. Closed
+months do not change, so the full history only has to be pulled once. After
+that each refresh re-pulls the most recent stored months (the open month keeps
+counting) and anything newer, and rewrites just those month partitions.
+
+Layout under STORE_DIR:
+    months/YYYYMM.parquet     acctnbr, statistictypcd, yearnbr, monthcd, statisticcount
+    aggregates/<hash>.parquet memoized window_counts results (cleared on refresh)
+    state.json                last refresh time and version
+
+Usage:
+    store = cdutils.acctstatistichist.get_store()
+    store.refresh()                                        # no-op if refreshed in the last REFRESH_MAX_AGE_SECONDS
+    ytd = store.window_counts(datetime(2025, 1, 1), datetime.now(), codes=['DOD', 'NSF'])
+    # -> acctnbr index, one column per code (NaN where the account has no rows of that code)
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+import cdutils.database.connect # type: ignore
+import cdutils.input_cleansing # type: ignore
+from cdutils.database.query_template import QueryTemplate # type: ignore
+
+STORE_DIR = Path(os.getenv('CDUTILS_ACCTSTAT_DIR', Path.home() / '.cdutils' / 'acctstatistichist'))
+
+# Latest stored months re-pulled on every refresh (the open month, plus the prior month for late postings)
+RELOAD_MONTHS = 2
+
+# A refresh within this many seconds of the last one is skipped
+REFRESH_MAX_AGE_SECONDS = 15 * 60
+
+COLUMNS = ['acctnbr', 'statistictypcd', 'yearnbr', 'monthcd', 'statisticcount']
+
+
+def fetch_from_period(from_period: int) -> pd.DataFrame:
+    """
+    Rows for YEARNBR/MONTHCD at or after from_period (YYYYMM), projected to COLUMNS
+    """
+    acctstatistichist = QueryTemplate("""
+    SELECT
+        a.ACCTNBR,
+        a.STATISTICTYPCD,
+        a.YEARNBR,
+        a.MONTHCD,
+        a.STATISTICCOUNT
+    FROM
+        OSIBANK.ACCTSTATISTICHIST a
+    WHERE
+        TO_NUMBER(a.YEARNBR) * 100 + TO_NUMBER(a.MONTHCD) >= :from_period
+    """)
+
+    queries = [
+        {'key':'acctstatistichist', 'sql':acctstatistichist, 'engine':1, 'params':{'from_period':from_period}, 'cache':False},
+    ]
+
+    data = cdutils.database.connect.retrieve_data(queries, stream=True)
+    return data['acctstatistichist']
+
+
+def to_period(value) -> int:
+    """
+    datetime / date / Timestamp -> YYYYMM
+    """
+    value = pd.Timestamp(value)
+    return value.year * 100 + value.month
+
+
+def _add_months(period: int, months: int) -> int:
+    index = (period // 100) * 12 + (period % 100 - 1) + months
+    return (index // 12) * 100 + index % 12 + 1
+
+
+class AcctStatStore:
+    """
+    Month-partitioned Parquet copy of ACCTSTATISTICHIST with window aggregates.
+    """
+    def __init__(self, store_dir: Path = STORE_DIR, reload_months: int = RELOAD_MONTHS, fetch=fetch_from_period):
+        """
+        Args:
+            store_dir (Path): local directory for partitions, aggregates and state
+            reload_months (int): latest stored months re-pulled on each refresh
+            fetch: callable(from_period) -> DataFrame, the database pull
+        """
+        self.store_dir = Path(store_dir)
+        self.months_dir = self.store_dir / 'months'
+        self.aggregates_dir = self.store_dir / 'aggregates'
+        self.state_path = self.store_dir / 'state.json'
+        self.reload_months = reload_months
+        self.fetch = fetch
+
+    def _state(self) -> dict:
+        try:
+            return json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return {'refreshed': None, 'version': 0}
+
+    def periods(self) -> List[int]:
+        """
+        Stored months as YYYYMM, ascending
+        """
+        if not self.months_dir.exists():
+            return []
+        return sorted(int(path.stem) for path in self.months_dir.glob('*.parquet'))
+
+    def _write(self, path: Path, df: pd.DataFrame):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        Pull new and recently changed months from COCC and rewrite their partitions.
+
+        The first run pulls the full history. Later runs pull from the reload_months
+        latest stored months onward.
+
+        Returns:
+            number of rows pulled (0 when skipped because the store is fresh)
+        """
+        state = self._state()
+        if not force and state['refreshed'] is not None and time.time() - state['refreshed'] < REFRESH_MAX_AGE_SECONDS:
+            return 0
+
+        periods = self.periods()
+        from_period = _add_months(periods[-1], 1 - self.reload_months) if periods else 0
+
+        df = self.fetch(from_period)
+        df.columns = [column.lower() for column in df.columns]
+        df = cdutils.input_cleansing.enforce_schema(df[COLUMNS], {'acctnbr': str})
+        row_periods = pd.to_numeric(df['yearnbr']).astype('int64') * 100 + pd.to_numeric(df['monthcd']).astype('int64')
+
+        fetched = set()
+        for period, month_df in df.groupby(row_periods, sort=True):
+            self._write(self.months_dir / f"{period}.parquet", month_df.reset_index(drop=True))
+            fetched.add(int(period))
+
+        # Months in the reloaded range that no longer have rows in COCC
+        for period in periods:
+            if period >= from_period and period not in fetched:
+                (self.months_dir / f"{period}.parquet").unlink(missing_ok=True)
+
+        self._clear_aggregates()
+        self._write_state({'refreshed': time.time(), 'version': state['version'] + 1})
+        return len(df)
+
+    def _write_state(self, state: dict):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps(state))
+        os.replace(tmp_path, self.state_path)
+
+    def _clear_aggregates(self):
+        if self.aggregates_dir.exists():
+            for path in self.aggregates_dir.glob('*.parquet'):
+                path.unlink(missing_ok=True)
+
+    def read(self, start=None, end=None, codes: Optional[List[str]] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Stored rows for months between start and end (inclusive, either may be None)
+
+        Args:
+            start / end: dates; only their year and month are used
+            codes (List[str]): statistictypcd values to keep (None keeps all)
+            columns (List[str]): subset of COLUMNS to load
+        """
+        start_period = to_period(start) if start is not None else 0
+        end_period = to_period(end) if end is not None else 999999
+        columns = columns or COLUMNS
+        load_columns = columns if codes is None or 'statistictypcd' in columns else columns + ['statistictypcd']
+
+        frames = []
+        for period in self.periods():
+            if start_period <= period <= end_period:
+                month_df = pd.read_parquet(self.months_dir / f"{period}.parquet", columns=load_columns)
+                if codes is not None:
+                    month_df = month_df[month_df['statistictypcd'].isin(codes)]
+                frames.append(month_df[columns])
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def window_counts(self, start=None, end=None, codes: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Per-account sum of statisticcount by code over the months from start to end (inclusive).
+
+        Results are memoized under aggregates/ until the next refresh, so repeated daily
+        calls read only the small aggregate file.
+
+        Returns:
+            pd.DataFrame indexed by acctnbr, one column per code. NaN where an account has no rows of that code.
+        """
+        start_period = to_period(start) if start is not None else 0
+        end_period = to_period(end) if end is not None else 999999
+        codes = sorted(codes) if codes is not None else None
+
+        key = hashlib.sha256(json.dumps([start_period, end_period, codes, self._state()['version']]).encode()).hexdigest()
+        aggregate_path = self.aggregates_dir / f"{key}.parquet"
+        if aggregate_path.exists():
+            try:
+                return pd.read_parquet(aggregate_path).set_index('acctnbr')
+            except (OSError, ValueError):
+                pass
+
+        df = self.read(start, end, codes, columns=['acctnbr', 'statistictypcd', 'statisticcount'])
+        if df.empty:
+            counts = pd.DataFrame(index=pd.Index([], name='acctnbr'))
+        else:
+            counts = df.pivot_table(index='acctnbr', columns='statistictypcd', values='statisticcount', aggfunc='sum')
+            counts.columns.name = None
+        for code in codes or []:
+            if code not in counts.columns:
+                counts[code] = float('nan')
+
+        try:
+            self._write(aggregate_path, counts.reset_index())
+        except OSError as e:
+            print(f"[WARNING] Could not store acctstatistichist aggregate: {e}")
+        return counts
+
+    def ttm_counts(self, as_of=None, codes: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Trailing twelve months: the as_of month and the 12 months before it
+        """
+        as_of = pd.Timestamp(as_of if as_of is not None else datetime.now())
+        return self.window_counts(as_of - pd.DateOffset(years=1), as_of, codes)
+
+    def ytd_counts(self, as_of=None, codes: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Year to date: January of the as_of year through the as_of month
+        """
+        as_of = pd.Timestamp(as_of if as_of is not None else datetime.now())
+        return self.window_counts(date(as_of.year, 1, 1), as_of, codes)
+
+
+_store = None
+
+
+def get_store() -> AcctStatStore:
+    """
+    Return the process-wide store, creating it on first use.
+    """
+    global _store
+    if _store is None:
+        _store = AcctStatStore()
+    return _store
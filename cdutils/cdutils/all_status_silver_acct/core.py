@@ -12,6 +12,7 @@ import cdutils.all_status_silver_acct.fetch_data # type: ignore
 import cdutils.all_status_silver_acct.core_transform # type: ignore
 import cdutils.pkey_sqlite # type: ignore
 import cdutils.hhnbr # type: ignore
+import cdutils.enrichment # type: ignore
 import cdutils.loans.calculations # type: ignore
 import cdutils.inactive_date # type: ignore
 import cdutils.input_cleansing # type: ignore
@@ -57,63 +58,33 @@ def query_df_on_date(specified_date: Optional[datetime] = None):
     # # # Core transformation pipeline
     raw_data = cdutils.all_status_silver_acct.core_transform.main_pipeline(data)
 
-    # Raw data with pkey appended
-    raw_data = cdutils.pkey_sqlite.add_pkey(raw_data)
-    raw_data = cdutils.pkey_sqlite.add_ownership_key(raw_data)
-    raw_data = cdutils.pkey_sqlite.add_address_key(raw_data)
+    # Key is normalized once; every enrichment below contributes an acctnbr-keyed lookup
+    # and they are all attached in a single join at the end
+    enrichment = cdutils.enrichment.AcctEnrichment(raw_data)
 
-    # %%
-    househldacct = data['househldacct'].copy()
-    raw_data = cdutils.hhnbr.add_hh_nbr(raw_data, househldacct)
-
-    # %%
-    raw_data
-
-    # %%
-
-    # %%
-    loan_category_df = cdutils.loans.calculations.categorize_loans(raw_data)
-
-    # %%
-    loan_category_df = loan_category_df[['acctnbr','Category']].copy()
-
-    # %%
-    df = pd.merge(raw_data, loan_category_df, on='acctnbr', how='left')
+    # pkey, ownership key, address key (cached per process, see cdutils.pkey_sqlite.KeyStore)
+    enrichment.add(cdutils.pkey_sqlite.get_key_store().lookup())
 
     # %%
-    df
-
-    # %%
-
-    df = cdutils.inactive_date.append_inactive_date(df)
+    househldacct = data['househldacct'].copy()
+    enrichment.add(cdutils.hhnbr.household_lookup(househldacct))
 
     # %%
-    df
+    loan_category_df = cdutils.loans.calculations.categorize_loans(enrichment.df)
 
     # %%
-    # pers = data['wh_pers'].copy()
+    enrichment.add(loan_category_df[['acctnbr','Category']])
 
     # %%
-    # df.info()
+    enrichment.add(cdutils.inactive_date.inactive_date_lookup(enrichment.keys()))
 
     # %%
 
     additional_fields = cdutils.all_status_silver_acct.additional_fields.fetch_data(specified_date)
 
     # %%
-    additional_fields_to_append = additional_fields['wh_acctcommon'].copy()
-
-    # %%
-
-    additional_fields_to_append_schema = {
-        'acctnbr':'str'
-    }
-
-    additional_fields_to_append = cdutils.input_cleansing.enforce_schema(additional_fields_to_append, additional_fields_to_append_schema)
-
-    # %%
-    df = pd.merge(df, additional_fields_to_append, how='left', on='acctnbr')
+    enrichment.add(additional_fields['wh_acctcommon'])
 
     # %%
+    df = enrichment.apply()
     return df
-
@@ -4,10 +4,11 @@ Fetching data module. Aim is import all necessary fields up front, but if needed
 Usage:
     import src.cdutils.database
 
-You need to set your own date that you want to see in effective date embedded in the SQL Query
+The effective date is passed to Oracle as a bind parameter (see cdutils.database.query_template)
 """
 
 import cdutils.database.connect # type: ignore
+from cdutils.database.query_template import QueryTemplate # type: ignore
 from sqlalchemy import text # type: ignore
 from typing import Optional
 from datetime import datetime, timedelta
@@ -18,7 +19,7 @@ def fetch_data(specified_date: Optional[datetime] = None):
     Main data query
     """
     
-    wh_acctcommon = text(f"""
+    wh_acctcommon = QueryTemplate("""
     SELECT
         a.EFFDATE,
         a.ACCTNBR,
@@ -41,10 +42,10 @@ def fetch_data(specified_date: Optional[datetime] = None):
     FROM
         COCCDM.WH_ACCTCOMMON a
     WHERE
-        (a.EFFDATE = TO_DATE('{specified_date}', 'YYYY-MM-DD HH24:MI:SS'))
+        (a.EFFDATE = :effdate)
     """)
 
-    wh_loans = text(f"""
+    wh_loans = QueryTemplate("""
     SELECT
         a.ACCTNBR,
         a.ORIGDATE,
@@ -59,10 +60,10 @@ def fetch_data(specified_date: Optional[datetime] = None):
     FROM
         COCCDM.WH_LOANS a
     WHERE
-        a.RUNDATE = TO_DATE('{specified_date}', 'YYYY-MM-DD HH24:MI:SS')
+        a.RUNDATE = :effdate
     """)
 
-    wh_acctloan = text(f"""
+    wh_acctloan = QueryTemplate("""
     SELECT
         a.ACCTNBR,
         a.CREDITLIMITAMT,
@@ -77,7 +78,7 @@ def fetch_data(specified_date: Optional[datetime] = None):
     FROM
         COCCDM.WH_ACCTLOAN a
     WHERE
-        a.EFFDATE = TO_DATE('{specified_date}', 'YYYY-MM-DD HH24:MI:SS')
+        a.EFFDATE = :effdate
     """)
 
     househldacct = text("""
@@ -91,9 +92,9 @@ def fetch_data(specified_date: Optional[datetime] = None):
 
 
     queries = [
-        {'key':'wh_acctcommon', 'sql':wh_acctcommon, 'engine':2},
-        {'key':'wh_loans', 'sql':wh_loans, 'engine':2},
-        {'key':'wh_acctloan', 'sql':wh_acctloan, 'engine':2},
+        {'key':'wh_acctcommon', 'sql':wh_acctcommon, 'engine':2, 'params':{'effdate':specified_date}},
+        {'key':'wh_loans', 'sql':wh_loans, 'engine':2, 'params':{'effdate':specified_date}},
+        {'key':'wh_acctloan', 'sql':wh_acctloan, 'engine':2, 'params':{'effdate':specified_date}},
         {'key':'househldacct', 'sql':househldacct, 'engine':1},
     ]
 
@@ -1,31 +1,35 @@
 import pandas as pd
-from sqlalchemy import text # type: ignore
 import cdutils.database.connect # type: ignore
 import cdutils.input_cleansing # type: ignore
+from cdutils.database.query_template import QueryTemplate, key_filter # type: ignore
 
 def append_tax_id_to_pers(df: pd.DataFrame) -> pd.DataFrame:
     """
     Append table with SSN. 
+
+    Pulls only PERSNBR/TAXID, and only for df's persnbrs when df is small.
     """
-    def fetch_data():
-        # acctcommon
-        viewperstaxid = text("""
+    def fetch_data(persnbrs=None):
+        persnbr_filter, params = key_filter('a.PERSNBR', persnbrs, name='persnbrs')
+
+        viewperstaxid = QueryTemplate(f"""
         SELECT 
-            *
+            a.PERSNBR,
+            a.TAXID
         FROM 
-            OSIBANK.VIEWPERSTAXID
+            OSIBANK.VIEWPERSTAXID a
+        WHERE
+            1=1
+            {persnbr_filter}
         """)
 
         queries = [
-            {'key':'viewperstaxid', 'sql':viewperstaxid, 'engine':1},
+            {'key':'viewperstaxid', 'sql':viewperstaxid, 'engine':1, 'params':params},
         ]
 
         data = cdutils.database.connect.retrieve_data(queries)
         return data
 
-    data = fetch_data()
-    viewperstaxid = data['viewperstaxid'].copy()
-
     schema_viewperstaxid = {
         'persnbr':'str'
     }
@@ -34,12 +38,19 @@ def append_tax_id_to_pers(df: pd.DataFrame) -> pd.DataFrame:
         'persnbr':'str'
     }
 
-    viewperstaxid = cdutils.input_cleansing.enforce_schema(viewperstaxid, schema_viewperstaxid)
     df = cdutils.input_cleansing.enforce_schema(df, schema_df)
 
+    data = fetch_data(df['persnbr'])
+    viewperstaxid = data['viewperstaxid'].copy()
+
+    if viewperstaxid.empty:
+        viewperstaxid = pd.DataFrame(columns=['persnbr','taxid'])
+
+    viewperstaxid = cdutils.input_cleansing.enforce_schema(viewperstaxid, schema_viewperstaxid)
+
     assert df['persnbr'].is_unique, "Duplicates exist"
     assert viewperstaxid['persnbr'].is_unique, "Duplicates exist"
 
     df = pd.merge(df, viewperstaxid, on='persnbr', how='left')
 
-    return df
\ No newline at end of file
+    return df
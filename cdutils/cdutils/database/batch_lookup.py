@@ -0,0 +1,82 @@
+"""
+Batched key lookups.
+
+Looping over a frame and querying one key at a time costs a round-trip (and a
+hard parse) per row. lookup_many collects the keys, splits them into chunks of
+at most chunk_size, and submits one bind-parameter IN query per chunk in a
+single retrieve_data call, so the chunks share the engine pool and run
+concurrently. The result is one frame to merge back on the key.
+
+Usage:
+    from cdutils.database.batch_lookup import lookup_many
+
+    history = lookup_many('COCCDM.WH_ACCTCOMMON', 'ACCTNBR', df['acctnbr'], ['PRODUCT', 'EFFDATE'], engine=2)
+    df = pd.merge(df, history, on='acctnbr', how='left')
+"""
+import re
+from typing import List, Optional
+
+import pandas as pd
+
+import cdutils.database.connect # type: ignore
+import cdutils.input_cleansing # type: ignore
+from cdutils.database.query_template import ORACLE_IN_LIMIT, QueryTemplate, normalize_keys # type: ignore
+
+# Schema-qualified table / plain column names only; these are interpolated into the SQL text
+_IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][\w$#]*(\.[A-Za-z_][\w$#]*)?$')
+
+
+def _check_identifier(name: str) -> str:
+    if not _IDENTIFIER_PATTERN.match(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return name
+
+
+def lookup_many(table: str, key_col: str, keys, columns: Optional[List[str]] = None, engine: int = 1, chunk_size: int = ORACLE_IN_LIMIT, where: str = "", params: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Fetch rows of table whose key_col is in keys, in chunked set-based queries.
+
+    Args:
+        table (str): schema-qualified table, e.g. 'COCCDM.WH_ACCTCOMMON'
+        key_col (str): numeric key column, e.g. 'ACCTNBR'
+        keys: any iterable of keys (str / float / int; duplicates and blanks are dropped)
+        columns (List[str]): columns to return besides the key (None returns every column)
+        engine (int): 1 or 2, as in retrieve_data
+        chunk_size (int): keys per query (at most Oracle's 1000 item IN limit keeps one IN list per query)
+        where (str): extra SQL condition on alias a, e.g. "a.EFFDATE >= :start" (values go in params)
+        params (dict): bind values used by where
+
+    Returns:
+        pd.DataFrame with the lowercased key column (as str, like the rest of cdutils) and the
+        requested columns. Keys with no rows are simply absent, and keys with several rows
+        return all of them.
+    """
+    _check_identifier(table)
+    _check_identifier(key_col)
+    columns = [_check_identifier(column) for column in (columns or [])]
+    key_name = key_col.lower()
+
+    keys = normalize_keys(keys)
+    if not keys:
+        return pd.DataFrame(columns=[key_name] + [column.lower() for column in columns])
+
+    select_list = ', '.join(f"a.{column}" for column in [key_col] + columns) if columns else "a.*"
+    template = QueryTemplate(f"""
+    SELECT
+        {select_list}
+    FROM
+        {table} a
+    WHERE
+        a.{key_col} IN :lookup_keys
+        {f"AND ({where})" if where else ""}
+    """)
+
+    queries = [
+        {'key':f"{table}_{start}", 'sql':template, 'engine':engine, 'params':{**(params or {}), 'lookup_keys':keys[start:start + chunk_size]}}
+        for start in range(0, len(keys), chunk_size)
+    ]
+    data = cdutils.database.connect.retrieve_data(queries)
+
+    frames = [data[query['key']] for query in queries]
+    result = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    return cdutils.input_cleansing.enforce_schema(result, {key_name: str})
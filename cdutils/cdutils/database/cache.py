@@ -0,0 +1,269 @@
+"""
+Local query-result cache for retrieve_data. Off unless asked for: pass
+retrieve_data(..., cache=True), or set CDUTILS_QUERY_CACHE=1 to turn it on for a
+whole process. Results are written unencrypted to local disk, so only opt in on a
+machine where customer data may be kept at rest.
+
+Results are stored as Parquet files on local disk, keyed on the normalized SQL
+text + bind parameters + engine. How long an entry lives depends on what the
+query reads:
+
+    - COCCDM snapshot for a closed month-end EFFDATE/RUNDATE -> kept forever
+      (a closed month never changes)
+    - OSIBANK / OSIEXTN live tables -> not cached, unless CDUTILS_CACHE_LIVE_TTL
+      (seconds) is set; results may then be that stale
+    - anything else -> not cached, including statements with a table reference that is
+      not a plain SCHEMA.TABLE (unqualified tables, table functions)
+
+The cache directory is bounded by CACHE_MAX_BYTES; least recently used entries
+are evicted first.
+
+Usage:
+    data = cdutils.database.connect.retrieve_data(queries)                            # no cache (default)
+    data = cdutils.database.connect.retrieve_data(queries, cache=True)                # cached where safe
+    data = cdutils.database.connect.retrieve_data(queries, cache=True, refresh=True)  # re-query and overwrite
+"""
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+import pandas as pd
+
+CACHE_DIR = Path(os.getenv('CDUTILS_CACHE_DIR', Path.home() / '.cdutils' / 'query_cache'))
+CACHE_MAX_BYTES = 5 * 1024 ** 3
+# Opt-in switches (see module docstring)
+CACHE_ENABLED = os.getenv('CDUTILS_QUERY_CACHE', '').strip().lower() in ('1', 'true', 'yes')
+LIVE_TTL_SECONDS = int(os.getenv('CDUTILS_CACHE_LIVE_TTL', '0'))
+
+LIVE_SCHEMAS = ('OSIBANK', 'OSIEXTN')
+SNAPSHOT_SCHEMAS = ('COCCDM',)
+
+# A FROM list runs to the next clause keyword, JOIN or closing parenthesis; comma joins are split from it
+_FROM_LIST_PATTERN = re.compile(
+    r'\bFROM\s+(.+?)(?=\b(?:WHERE|GROUP|ORDER|HAVING|UNION|INTERSECT|MINUS|CONNECT|START|FETCH'
+    r'|INNER|LEFT|RIGHT|FULL|CROSS|NATURAL|JOIN)\b|\)|;|$)',
+    re.IGNORECASE | re.DOTALL,
+)
+_JOIN_TABLE_PATTERN = re.compile(r'\bJOIN\s+(\S+)', re.IGNORECASE)
+_TABLE_REFERENCE_PATTERN = re.compile(r'([A-Z][A-Z0-9_]*)\.[A-Z][A-Z0-9_$#]*(?:\s+(?:AS\s+)?[A-Z][A-Z0-9_]*)?', re.IGNORECASE)
+_QUALIFIER_PATTERN = re.compile(r'\b([A-Z][A-Z0-9_]*)\.', re.IGNORECASE)
+_DATE_LITERAL_PATTERN = re.compile(r"\b(?:EFFDATE|RUNDATE)\s*=\s*TO_DATE\(\s*'(\d{4}-\d{2}-\d{2})", re.IGNORECASE)
+_DATE_PARAM_PATTERN = re.compile(r'effdate|rundate|monthend', re.IGNORECASE)
+
+
+def normalize_sql(sql_text: str) -> str:
+    """
+    Collapse whitespace so formatting differences do not produce new cache keys.
+
+    Case is left alone because it is significant inside string literals.
+    """
+    return ' '.join(sql_text.split())
+
+
+def is_closed_month_end(value) -> bool:
+    """
+    True if value is the last day of a month that ended before the current month.
+    Strings that do not parse as a date are not month ends.
+    """
+    if isinstance(value, str):
+        value = pd.to_datetime(value, errors='coerce')
+        if pd.isna(value):
+            return False
+    if isinstance(value, datetime):
+        value = value.date()
+    if not isinstance(value, date):
+        return False
+    first_of_current_month = date.today().replace(day=1)
+    return (value + timedelta(days=1)).day == 1 and value < first_of_current_month
+
+
+def table_schemas(sql_text: str) -> Optional[Set[str]]:
+    """
+    Schemas of every table a statement reads: each FROM list (comma joins included) and JOIN.
+
+    Returns:
+        Set[str]: upper-case schema names, or None when a table reference is not a plain
+        SCHEMA.TABLE [alias] and the statement cannot be classified. Subqueries are
+        classified through their own FROM lists.
+    """
+    references = []
+    for from_list in _FROM_LIST_PATTERN.findall(sql_text):
+        references += from_list.split(',')
+    references += _JOIN_TABLE_PATTERN.findall(sql_text)
+
+    schemas = set()
+    for reference in references:
+        reference = reference.strip()
+        if reference.startswith('('):
+            continue
+        match = _TABLE_REFERENCE_PATTERN.fullmatch(reference)
+        if match is None:
+            return None
+        schemas.add(match.group(1).upper())
+    return schemas
+
+
+def _sql_text_and_params(sql_query):
+    """
+    Render a sqlalchemy clause to (text, params). Plain strings pass through.
+    """
+    if isinstance(sql_query, str):
+        return sql_query, {}
+    compiled = sql_query.compile()
+    return str(compiled), dict(compiled.params)
+
+
+class QueryCache:
+    """
+    Parquet-on-disk cache of query results with TTL and LRU eviction.
+
+    Each entry is two files in cache_dir: <key>.parquet with the data and
+    <key>.json with its metadata (expiry, engine, sql). The parquet file's
+    mtime is bumped on every hit and drives least-recently-used eviction.
+    """
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES, live_ttl: int = LIVE_TTL_SECONDS):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.live_ttl = live_ttl
+
+    def make_key(self, sql_query, engine: int, **variant) -> str:
+        """
+        Hash normalized SQL text + bind params + engine (+ any fetch options that change the result shape).
+        """
+        sql_text, params = _sql_text_and_params(sql_query)
+        payload = json.dumps({
+            'sql': normalize_sql(sql_text),
+            'params': {name: repr(value) for name, value in sorted(params.items())},
+            'engine': engine,
+            'variant': {name: repr(value) for name, value in sorted(variant.items())},
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def ttl_for(self, sql_query) -> Optional[float]:
+        """
+        Decide how long a query result may be cached.
+
+        Returns:
+            float('inf') for closed month-end snapshots, live_ttl seconds for live
+            tables (when live_ttl > 0), or None when the query should not be cached.
+        """
+        sql_text, params = _sql_text_and_params(sql_query)
+        # A live schema named anywhere in the statement makes the result live
+        qualifiers = {qualifier.upper() for qualifier in _QUALIFIER_PATTERN.findall(sql_text)}
+        if qualifiers & set(LIVE_SCHEMAS):
+            return self.live_ttl if self.live_ttl > 0 else None
+
+        schemas = table_schemas(sql_text)
+        if schemas and schemas <= set(SNAPSHOT_SCHEMAS):
+            snapshot_dates = _DATE_LITERAL_PATTERN.findall(sql_text)
+            snapshot_dates += [value for name, value in params.items() if _DATE_PARAM_PATTERN.search(name)]
+            if snapshot_dates and all(is_closed_month_end(value) for value in snapshot_dates):
+                return float('inf')
+
+        return None
+
+    def _paths(self, key: str):
+        return self.cache_dir / f"{key}.parquet", self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Return the cached DataFrame for key, or None if missing or expired.
+        """
+        data_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            if meta['expires'] is not None and meta['expires'] < time.time():
+                self.delete(key)
+                return None
+            df = pd.read_parquet(data_path)
+            os.utime(data_path)
+            return df
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, df: pd.DataFrame, ttl: float, engine: int = None, sql_query=None):
+        """
+        Store df under key. Write failures are reported and otherwise ignored.
+        """
+        data_path, meta_path = self._paths(key)
+        expires = None if ttl == float('inf') else time.time() + ttl
+        meta = {
+            'created': time.time(),
+            'expires': expires,
+            'engine': engine,
+            'sql': normalize_sql(_sql_text_and_params(sql_query)[0]) if sql_query is not None else None,
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            meta_path.write_text(json.dumps(meta))
+            tmp_path = data_path.with_suffix(f'.{os.getpid()}.tmp')
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, data_path)
+        except Exception as e:
+            print(f"[WARNING] Could not cache query result: {e}")
+            return
+        self.evict()
+
+    def delete(self, key: str):
+        for path in self._paths(key):
+            path.unlink(missing_ok=True)
+
+    def evict(self):
+        """
+        Drop expired entries, then least recently used entries until under max_bytes.
+        """
+        if not self.cache_dir.exists():
+            return
+        now = time.time()
+        entries = []
+        for data_path in self.cache_dir.glob('*.parquet'):
+            key = data_path.stem
+            meta_path = data_path.with_suffix('.json')
+            try:
+                meta = json.loads(meta_path.read_text())
+                if meta['expires'] is not None and meta['expires'] < now:
+                    self.delete(key)
+                    continue
+                stat = data_path.stat()
+            except (OSError, ValueError, KeyError):
+                self.delete(key)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, key))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self.delete(key)
+            total -= size
+
+    def clear(self):
+        """
+        Remove every cache entry.
+        """
+        if not self.cache_dir.exists():
+            return
+        for path in list(self.cache_dir.glob('*.parquet')) + list(self.cache_dir.glob('*.json')):
+            path.unlink(missing_ok=True)
+
+
+_default_cache = QueryCache()
+
+
+def get_cache() -> QueryCache:
+    """
+    Return the process-wide cache used by retrieve_data.
+    """
+    return _default_cache
+
+
+def clear_cache():
+    """
+    Remove every entry from the default cache directory.
+    """
+    _default_cache.clear()
@@ -1,25 +1,26 @@
 # Async Connector
 # Developed by CD
-# v2.0.1-prod
+# v2.1.0-prod
 
 from io import StringIO
-import time
-import numpy as np
+import atexit
 import os
-from datetime import datetime, timedelta, date
+import threading
+import time
 from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy import text
-from typing import List
-from collections import defaultdict, Counter
 import pandas as pd
+import pyarrow as pa
 from cryptography.fernet import Fernet
 from dotenv import load_dotenv
-from io import StringIO
 from pathlib import Path
 import asyncio
 import nest_asyncio
 import sys
-from typing import Dict, Union, List
+from typing import Dict, Union, List, Optional
+import cdutils.database.cache
+from cdutils.database.cache import get_cache
+from cdutils.database.query_template import bind_query
 nest_asyncio.apply()
 
 if sys.platform == "win32":
@@ -29,136 +30,481 @@ if sys.platform == "win32":
 this_dir = Path(__file__).parent
 env_admin_path = this_dir / "env_admin"
 
-def retrieve_data(queries: List[Dict[str, Union[str, pd.DataFrame, int]]]) -> Dict[str, pd.DataFrame]:
+# Connection pool settings applied to every engine in the registry.
+#   pool_size     -> connections kept open per engine between calls (pool minimum)
+#   max_overflow  -> extra connections allowed under load (pool maximum = pool_size + max_overflow)
+#   pool_pre_ping -> validate a pooled connection before handing it out (drops dead TCPS sessions)
+#   pool_recycle  -> seconds before a pooled connection is closed and re-opened
+#   pool_timeout  -> seconds to wait for a free connection before raising
+POOL_SETTINGS = {
+    'pool_size': 2,
+    'max_overflow': 6,
+    'pool_pre_ping': True,
+    'pool_recycle': 1800,
+    'pool_timeout': 60,
+}
+
+# Rows per fetch round-trip / Arrow record batch in streaming mode. Also used
+# as the cursor arraysize for the Oracle driver.
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Maximum number of queries retrieve_data runs at once against each engine.
+# Further queries in the same call wait their turn in priority order.
+ENGINE_CONCURRENCY = {
+    1: 4,
+    2: 4,
+}
+
+
+class EngineRegistry:
+    """
+    Process-wide registry of pooled async engines.
+
+    Credentials are decrypted once and each engine is created lazily on first
+    use, then reused by every subsequent retrieve_data call. All queries run on
+    a single background event loop so pooled connections stay bound to the loop
+    that opened them, regardless of whether the caller is a script or a notebook
+    with its own running loop.
+
+    Engines:
+        1 -> R1625
+        2 -> COCC DataMart
+    """
+    def __init__(self, tns_admin_path: Path, connection_strings: Optional[Dict[int, str]] = None, pool_settings: Optional[Dict] = None, concurrency: Optional[Dict[int, int]] = None):
+        """
+        Args:
+            tns_admin_path (Path): Oracle driver path
+            connection_strings (Dict): Optional override of engine number -> connection string.
+                When omitted, credentials are decrypted from env_admin on first use.
+            pool_settings (Dict): Optional override of POOL_SETTINGS
+            concurrency (Dict): Optional override of ENGINE_CONCURRENCY
+        """
+        self.tns_admin_path = tns_admin_path
+        self.pool_settings = dict(POOL_SETTINGS if pool_settings is None else pool_settings)
+        self.concurrency = dict(ENGINE_CONCURRENCY if concurrency is None else concurrency)
+        self._connection_strings = connection_strings
+        self._engines = {}
+        self._semaphores = {}
+        self._loop = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _load_connection_strings(self) -> Dict[int, str]:
+        """
+        Decrypt .env.enc and build the connection strings for both engines.
+        """
+        os.environ['TNS_ADMIN'] = str(self.tns_admin_path)
+
+        # Load private key
+        key_key_path = env_admin_path / "key.key"
+        with open(key_key_path, "rb") as key_file:
+            key = key_file.read()
+
+        cipher = Fernet(key)
+
+        # Load encrypted data
+        encoded_env_path = env_admin_path / ".env.enc"
+        with open(encoded_env_path, "rb") as encrypted_file:
+            encrypted_data = encrypted_file.read()
+
+        decrypted_data = cipher.decrypt(encrypted_data).decode()
+
+        env_file = StringIO(decrypted_data)
+        load_dotenv(stream=env_file)
+
+        username1 = os.getenv('main_username')
+        password1 = os.getenv('main_password')
+        dsn1 = os.getenv('main_dsn')
+
+        username2 = os.getenv('datamart_username')
+        password2 = os.getenv('datamart_password')
+        dsn2 = os.getenv('datamart_dsn')
+
+        return {
+            1: f'oracle+oracledb://{username1}:{password1}@{dsn1}',
+            2: f'oracle+oracledb://{username2}:{password2}@{dsn2}',
+        }
+
+    def _loop_usable(self) -> bool:
+        """
+        True if the background loop was started by this process and its thread is still running.
+
+        A forked child (e.g. a prefork Celery worker) inherits the loop object but not its thread.
+        """
+        return (
+            self._loop is not None and not self._loop.is_closed()
+            and self._pid == os.getpid()
+            and self._thread is not None and self._thread.is_alive()
+        )
+
+    def _abandon(self):
+        """
+        Forget the loop, semaphores and engines without touching them.
+
+        Used when they belong to another process (after a fork) or the loop thread died: the
+        pooled connections are de-referenced without being closed, so a parent's connections
+        are never closed from the child. Everything is rebuilt lazily on next use.
+        """
+        for selected_engine in self._engines.values():
+            selected_engine.sync_engine.dispose(close=False)
+        self._engines.clear()
+        self._semaphores.clear()
+        self._loop = None
+        self._thread = None
+        self._pid = None
+
+    def _after_fork_in_child(self):
+        # The lock may have been held by another parent thread at fork time
+        self._lock = threading.Lock()
+        self._abandon()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Start the background event loop thread on first use (and again in a forked child,
+        or if the loop thread has died).
+        """
+        with self._lock:
+            if not self._loop_usable():
+                if self._loop is not None:
+                    self._abandon()
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="cdutils-db-loop", daemon=True)
+                self._thread.start()
+                self._pid = os.getpid()
+            return self._loop
+
+    def run(self, coro):
+        """
+        Run a coroutine on the registry loop and block until it completes.
+        """
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return future.result()
+
+    def get_engine(self, engine: int = 1):
+        """
+        Return the pooled engine for the given engine number, creating it on first use.
+        """
+        with self._lock:
+            if engine in self._engines:
+                return self._engines[engine]
+
+            if self._connection_strings is None:
+                self._connection_strings = self._load_connection_strings()
+
+            if engine not in self._connection_strings:
+                raise ValueError("Engine must be 1 or 2")
+
+            connection_string = self._connection_strings[engine]
+            engine_kwargs = dict(self.pool_settings)
+            if connection_string.startswith('oracle'):
+                engine_kwargs.update({
+                    'max_identifier_length': 128,
+                    'connect_args': {"protocol": "tcps"},
+                })
+
+            self._engines[engine] = create_async_engine(
+                connection_string,
+                echo=False,
+                hide_parameters=True,
+                **engine_kwargs
+            )
+            return self._engines[engine]
+
+    def get_semaphore(self, engine: int = 1) -> asyncio.Semaphore:
+        """
+        Return the semaphore capping concurrent queries on an engine.
+
+        Shared by every retrieve_data call in the process, so two threads
+        calling retrieve_data at once still respect the per-engine limit.
+        Must be called from the registry loop.
+        """
+        if engine not in self._semaphores:
+            self._semaphores[engine] = asyncio.Semaphore(self.concurrency.get(engine, 1))
+        return self._semaphores[engine]
+
+    async def query(self, sql_query, engine=1):
+        """
+        This allows abstraction of the connection and the class
+        so the developer can query a single table as a dataframe
+
+        Args:
+            sql_query (str): The query to SQL database is passed as a string
+            engine (int): This selects the database. There are two engines:
+                1 -> R1625
+                2 -> COCC DataMart
+
+        Returns:
+            df: The SQL query is returned as a pandas DataFrame
+
+        Usage:
+            df = registry.run(registry.query(text("SELECT * FROM DB.TABLE"), engine=1))
+        """
+        selected_engine = self.get_engine(engine)
+
+        async with selected_engine.connect() as connection:
+            result = await connection.execute(sql_query)
+            rows = result.fetchall()
+            if not rows:
+                return pd.DataFrame()
+            df = pd.DataFrame(rows, columns=result.keys())
+        return df
+
+    async def query_arrow(self, sql_query, engine=1, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """
+        Streaming variant of query that lands the result as an Arrow-backed DataFrame.
+
+        Rows are fetched in chunks of chunk_rows through a server-side cursor and
+        accumulated as Arrow record batches, so the full result never exists as a
+        list of Python Row objects. On Oracle this uses the driver's native
+        fetch_df_batches (its size, i.e. the cursor arraysize, is chunk_rows;
+        prefetchrows is left at the driver default, fetch_df_batches does not take
+        it); other drivers fall back to SQLAlchemy's streamed partitions.
+
+        Args:
+            sql_query: The query to SQL database (sqlalchemy text or select)
+            engine (int): 1 -> R1625, 2 -> COCC DataMart
+            chunk_rows (int): rows per round-trip / record batch
+
+        Returns:
+            df: pandas DataFrame with pd.ArrowDtype columns
+        """
+        selected_engine = self.get_engine(engine)
+
+        tables = []
+        async with selected_engine.connect() as connection:
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+
+            if hasattr(driver_connection, 'fetch_df_batches'):
+                compiled = sql_query.compile(dialect=selected_engine.dialect)
+                batches = driver_connection.fetch_df_batches(
+                    statement=str(compiled),
+                    parameters=compiled.params or None,
+                    size=chunk_rows
+                )
+                async for batch in batches:
+                    table = pa.table(batch)
+                    table = table.rename_columns([selected_engine.dialect.normalize_name(name) for name in table.column_names])
+                    tables.append(table)
+            else:
+                result = await connection.stream(sql_query.execution_options(yield_per=chunk_rows))
+                columns = list(result.keys())
+                async for partition in result.partitions(chunk_rows):
+                    arrays = [pa.array(values) for values in zip(*partition)]
+                    tables.append(pa.Table.from_arrays(arrays, names=columns))
+
+        tables = [table for table in tables if table.num_rows]
+        if not tables:
+            return pd.DataFrame()
+        table = pa.concat_tables(tables, promote_options='permissive')
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    async def _dispose_engines(self):
+        for selected_engine in list(self._engines.values()):
+            await selected_engine.dispose()
+        self._engines.clear()
+
+    def dispose(self):
+        """
+        Close every pooled connection and stop the background loop.
+
+        Registered with atexit, but safe to call manually (e.g. after a fork or
+        credential rotation); the next query will rebuild the engines. In a forked
+        child, or when the loop thread has died, the inherited state is dropped
+        without running anything on the dead loop.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        if not self._loop_usable():
+            self._abandon()
+            return
+        try:
+            if self._engines:
+                self.run(self._dispose_engines())
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=10)
+            loop.close()
+            self._semaphores.clear()
+            self._loop = None
+            self._thread = None
+
+
+# Database Connection Configuration
+tns_admin_path = env_admin_path / "tns_admin"
+_registry = EngineRegistry(tns_admin_path)
+atexit.register(_registry.dispose)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=lambda: _registry._after_fork_in_child())
+
+
+def get_registry() -> EngineRegistry:
+    """
+    Return the process-wide engine registry used by retrieve_data.
+    """
+    return _registry
+
+
+def dispose_engines():
+    """
+    Dispose all pooled engines. They are recreated lazily on the next retrieve_data call.
+    """
+    _registry.dispose()
+
+
+def retrieve_data(queries: List[Dict[str, Union[str, pd.DataFrame, int]]], stream: bool = False, chunk_rows: int = DEFAULT_CHUNK_ROWS, timeout: Optional[float] = None, return_timings: bool = False, cache: Optional[bool] = None, refresh: bool = False) -> Dict[str, pd.DataFrame]:
     """
    Retrieve data from Oracle Database (COCC)
 
+    Engines and their connection pools are shared across calls for the life of
+    the process (see EngineRegistry), so repeated calls do not re-decrypt
+    credentials or re-open TCPS sessions.
+
+    Queries are scheduled rather than all fired at once: at most
+    ENGINE_CONCURRENCY[engine] run concurrently per engine, lower 'priority'
+    values start first (ties keep list order), and if any query fails or times
+    out the remaining queries are cancelled and the error is raised.
+
+    With cache=True (or CDUTILS_QUERY_CACHE=1), results are served from the local
+    query cache (cdutils.database.cache) when safe: closed month-end COCCDM snapshots
+    are kept forever. Live OSIBANK/OSIEXTN tables are only cached when
+    CDUTILS_CACHE_LIVE_TTL is set. Otherwise every query goes to the database.
+
     Args:
         queries (List): pass list of queries in specific format
             - List[Dict[str, Union[str, pd.DataFrame, int]]]
-    
+            - 'sql' may be a QueryTemplate (cdutils.database.query_template) or text() with :binds
+            - Optional per-query keys:
+                'params' (Dict): bind values for 'sql'. Lists become chunked IN lists.
+                'priority' (int): lower runs first, default 0. Give small lookups a negative priority.
+                'timeout' (float): seconds allowed for this query once it starts running
+                'stream' (bool): override the call-level stream setting
+                'cache' (bool): set False to never cache this query
+        stream (bool): Fetch through a server-side cursor in chunks and return
+            Arrow-backed DataFrames. Use for full-table pulls (WH_ALLROLES, WH_RTXN, ...).
+        chunk_rows (int): Rows per fetch round-trip when streaming
+        timeout (float): Default per-query timeout in seconds (None = no limit)
+        return_timings (bool): Also return a timing record per key
+        cache (bool): Read/write the local query cache. Default None: off unless
+            CDUTILS_QUERY_CACHE=1 is set.
+        refresh (bool): Skip cache reads but still store the fresh results.
+
     Returns:
-        data (Dict): Returns a dictionary with df name and the df attached as key/value pair.  
-    
-    """
-    class DatabaseHandler:
-        """
-        This class abstracts the connection to the database and allows a clean
-        interface for the developer to use.
-
-        This connector can handle async queries
-
-        """
-        def __init__(self, tns_admin_path):
-            """
-            Args:
-                tns_admin_path (str): Oracle driver path
-                credentials_path_db1 (str): Database 1 credentials path
-                credentials_path_db1 (str): Databsae 2 credentials path
-            """
-            os.environ['TNS_ADMIN'] = str(tns_admin_path)
-            
-            # Load private key
-            key_key_path = env_admin_path / "key.key"
-            with open(key_key_path, "rb") as key_file:
-                key = key_file.read()
-
-            cipher = Fernet(key)
-            
-            # Load encrypted data
-            encoded_env_path = env_admin_path / ".env.enc"
-            with open(encoded_env_path, "rb") as encrypted_file:
-                encrypted_data = encrypted_file.read()
-
-            decrypted_data = cipher.decrypt(encrypted_data).decode()
-
-            env_file = StringIO(decrypted_data)
-            load_dotenv(stream=env_file)
-
-            self.username1 = os.getenv('main_username')
-            self.password1 = os.getenv('main_password')
-            self.dsn1 = os.getenv('main_dsn')
-
-            self.username2 = os.getenv('datamart_username')
-            self.password2 = os.getenv('datamart_password')
-            self.dsn2 = os.getenv('datamart_dsn')
-
-            self.connection_string1 = f'oracle+oracledb://{self.username1}:{self.password1}@{self.dsn1}'
-            self.connection_string2 = f'oracle+oracledb://{self.username2}:{self.password2}@{self.dsn2}'
-
-            self.engine1 = create_async_engine(self.connection_string1, max_identifier_length=128, echo=False, future=True, connect_args={"protocol":"tcps"})
-            self.engine1.dialect.hide_parameters = True
-            self.engine2 = create_async_engine(self.connection_string2, max_identifier_length=128, echo=False, future=True, connect_args={"protocol":"tcps"})
-            self.engine1.dialect.hide_parameters = True
-
-
-        async def query(self, sql_query, engine=1):
-            """
-            This allows abstraction of the connection and the class
-            so the developer can query a single table as a dataframe
-
-            Args:
-                sql_query (str): The query to SQL database is passed as a string
-                engine (int): This selects the database. There are two engines:
-                    1 -> R1625
-                    2 -> COCC DataMart
-
-            Returns:
-                df: The SQL query is returned as a pandas DataFrame
-
-            Usage:
-                df = db_handler.query("SELECT * FROM DB.TABLE", engine=1)
-
-                In this example, db_handler = DatabaseHandler(args)
-            """
-            if engine == 1:
-                selected_engine = self.engine1
-            elif engine == 2:
-                selected_engine = self.engine2
-            else:
-                raise ValueError("Engine must be 1 or 2")
+        data (Dict): Returns a dictionary with df name and the df attached as key/value pair.
+        timings (Dict): Only when return_timings=True. key -> {'engine', 'priority', 'status',
+            'wait_seconds', 'query_seconds', 'rows'}. Cache hits have status 'cached'.
 
-            async with selected_engine.connect() as connection:
-                result = await connection.execute(sql_query)
-                rows = result.fetchall()
-                if not rows:
-                    return pd.DataFrame()
-                df = pd.DataFrame(rows, columns=result.keys())
-            return df
+    Usage:
+        data, timings = cdutils.database.connect.retrieve_data(queries, return_timings=True)
+        pd.DataFrame.from_dict(timings, orient='index').sort_values('query_seconds')
+    """
+    db_handler = get_registry()
+    query_cache = get_cache()
+    if cache is None:
+        cache = cdutils.database.cache.CACHE_ENABLED
+    timings = {}
 
-        async def close(self):
-            if self.engine1:
-                await self.engine1.dispose()
-            if self.engine2:
-                await self.engine2.dispose()
+    # Resolve bind parameters up front so the cache keys on SQL text + bind values
+    queries = [{**query, 'sql': bind_query(query['sql'], query.get('params'))} for query in queries]
 
+    # Serve what we can from the local cache; only the misses are scheduled
+    cached = {}
+    cache_plan = {}
+    if cache:
+        for query in queries:
+            if not query.get('cache', True):
+                continue
+            ttl = query_cache.ttl_for(query['sql'])
+            if ttl is None:
+                continue
+            cache_key = query_cache.make_key(query['sql'], query['engine'], stream=bool(query.get('stream', stream)))
+            cache_plan[query['key']] = (cache_key, ttl)
+            df = None if refresh else query_cache.get(cache_key)
+            if df is not None:
+                cached[query['key']] = df
+                timings[query['key']] = {
+                    'engine': query['engine'],
+                    'priority': query.get('priority', 0),
+                    'status': 'cached',
+                    'wait_seconds': 0.0,
+                    'query_seconds': 0.0,
+                    'rows': len(df),
+                }
 
-    # Database Connection Configuration
-    tns_admin_path = env_admin_path / "tns_admin"
-    db_handler = DatabaseHandler(tns_admin_path)
+    def run_query(query):
+        if query.get('stream', stream):
+            return db_handler.query_arrow(query['sql'], query['engine'], chunk_rows=chunk_rows)
+        return db_handler.query(query['sql'], query['engine'])
 
-    async def fetch_data(queries):
+    async def run_scheduled(query):
+        key = query['key']
+        query_timeout = query.get('timeout', timeout)
+        record = {
+            'engine': query['engine'],
+            'priority': query.get('priority', 0),
+            'status': 'queued',
+            'wait_seconds': None,
+            'query_seconds': None,
+            'rows': None,
+        }
+        timings[key] = record
+        queued_at = time.perf_counter()
+        started_at = None
         try:
-            tasks = {query['key']: asyncio.create_task(db_handler.query(query['sql'], query['engine'])) for query in queries}
-            results = await asyncio.gather(*tasks.values())
-            return {key: df for key, df in zip(tasks.keys(), results)}
-        except Exception as e:
-            print(f"Error")
+            async with db_handler.get_semaphore(query['engine']):
+                started_at = time.perf_counter()
+                record['wait_seconds'] = started_at - queued_at
+                record['status'] = 'running'
+                try:
+                    df = await asyncio.wait_for(run_query(query), query_timeout)
+                except asyncio.TimeoutError:
+                    record['status'] = 'timeout'
+                    raise TimeoutError(f"Query '{key}' exceeded {query_timeout} seconds")
+        except asyncio.CancelledError:
+            record['status'] = 'cancelled'
+            raise
+        except Exception:
+            if record['status'] != 'timeout':
+                record['status'] = 'failed'
             raise
         finally:
-            await db_handler.close()
-
-    def run_sql_queries(queries):
-
-        async def run_queries():
-            return await fetch_data(queries)
-        
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            return loop.run_until_complete(run_queries())
-        else:
-            return asyncio.run(run_queries())
-        
-    data = run_sql_queries(queries)
-    
-    return data
\ No newline at end of file
+            if started_at is not None:
+                record['query_seconds'] = time.perf_counter() - started_at
+        record['status'] = 'ok'
+        record['rows'] = len(df)
+        return df
+
+    async def fetch_data(queries):
+        if not queries:
+            return {}
+        ordered = sorted(enumerate(queries), key=lambda item: (item[1].get('priority', 0), item[0]))
+        tasks = {query['key']: asyncio.create_task(run_scheduled(query)) for _, query in ordered}
+        done, pending = await asyncio.wait(tasks.values(), return_when=asyncio.FIRST_EXCEPTION)
+        if pending:
+            # A query failed: cancel its siblings so they release their connections
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        for key, task in tasks.items():
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                print(f"Error in query '{key}'")
+                raise task.exception()
+        return {query['key']: tasks[query['key']].result() for query in queries}
+
+    to_fetch = [query for query in queries if query['key'] not in cached]
+    fetched = db_handler.run(fetch_data(to_fetch)) if to_fetch else {}
+
+    for key, df in fetched.items():
+        if key in cache_plan:
+            cache_key, ttl = cache_plan[key]
+            query = next(query for query in to_fetch if query['key'] == key)
+            query_cache.put(cache_key, df, ttl, engine=query['engine'], sql_query=query['sql'])
+
+    data = {query['key']: cached[query['key']] if query['key'] in cached else fetched[query['key']] for query in queries}
+
+    if return_timings:
+        return data, timings
+    return data
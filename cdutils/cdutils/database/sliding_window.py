@@ -4,14 +4,16 @@ Fetching data module. Aim is import all necessary fields up front, but if needed
 This uses a sliding window for the trailing 2 months, current and prior.
 
 Usage:
-    import src.cdutils.database
+    import cdutils.database.sliding_window
 """
 import datetime
 from typing import Dict
 
 from sqlalchemy import text # type: ignore
 
-import src.cdutils.database.connect
+from cdutils.database.query_template import QueryTemplate # type: ignore
+
+import cdutils.database.connect # type: ignore
 
 def fetch_data() -> Dict:
     """
@@ -31,7 +33,7 @@ def fetch_data() -> Dict:
         {'key':'effdates', 'sql':effdates, 'engine':2},
     ]
 
-    data = src.cdutils.database.connect.retrieve_data(queries)
+    data = cdutils.database.connect.retrieve_data(queries)
 
     effdates = data['effdates'].copy()
 
@@ -42,7 +44,7 @@ def fetch_data() -> Dict:
         """
         Takes in a date to query on and returns a dictionary with dataframes for each table.
         """
-        wh_acctcommon = text(f"""
+        wh_acctcommon = QueryTemplate("""
         SELECT
             a.EFFDATE,
             a.ACCTNBR,
@@ -59,11 +61,11 @@ def fetch_data() -> Dict:
         FROM
             COCCDM.WH_ACCTCOMMON a
         WHERE
-            (a.CURRACCTSTATCD IN ('ACT','NPFM')) AND
-            (a.EFFDATE = TO_DATE('{monthend_date}', 'yyyy-mm-dd hh24:mi:ss'))
+            (a.CURRACCTSTATCD IN :statuses) AND
+            (a.EFFDATE = :effdate)
         """)
 
-        wh_loans = text(f"""
+        wh_loans = QueryTemplate("""
         SELECT
             a.ACCTNBR,
             a.ORIGDATE,
@@ -76,10 +78,10 @@ def fetch_data() -> Dict:
         FROM
             COCCDM.WH_LOANS a
         WHERE
-            (a.RUNDATE = TO_DATE('{monthend_date}', 'yyyy-mm-dd hh24:mi:ss'))
+            (a.RUNDATE = :effdate)
         """)
 
-        wh_acctloan = text(f"""
+        wh_acctloan = QueryTemplate("""
         SELECT
             a.ACCTNBR,
             a.CREDITLIMITAMT,
@@ -93,27 +95,27 @@ def fetch_data() -> Dict:
         FROM
             COCCDM.WH_ACCTLOAN a
         WHERE
-            (a.EFFDATE = TO_DATE('{monthend_date}', 'yyyy-mm-dd hh24:mi:ss'))
+            (a.EFFDATE = :effdate)
         """)
 
-        wh_acct = text(f"""
+        wh_acct = QueryTemplate("""
         SELECT
             a.ACCTNBR,
             a.DATEMAT
         FROM
             COCCDM.WH_ACCT a
         WHERE
-            (a.RUNDATE = TO_DATE('{monthend_date}', 'yyyy-mm-dd hh24:mi:ss'))
+            (a.RUNDATE = :effdate)
         """)
 
         queries = [
-            {'key':'wh_acctcommon', 'sql':wh_acctcommon, 'engine':2},
-            {'key':'wh_loans', 'sql':wh_loans, 'engine':2},
-            {'key':'wh_acctloan', 'sql':wh_acctloan, 'engine':2},
-            {'key':'wh_acct', 'sql':wh_acct, 'engine':2},
+            {'key':'wh_acctcommon', 'sql':wh_acctcommon, 'engine':2, 'params':{'effdate':monthend_date, 'statuses':['ACT','NPFM']}},
+            {'key':'wh_loans', 'sql':wh_loans, 'engine':2, 'params':{'effdate':monthend_date}},
+            {'key':'wh_acctloan', 'sql':wh_acctloan, 'engine':2, 'params':{'effdate':monthend_date}},
+            {'key':'wh_acct', 'sql':wh_acct, 'engine':2, 'params':{'effdate':monthend_date}},
         ]
 
-        data = src.cdutils.database.connect.retrieve_data(queries)
+        data = cdutils.database.connect.retrieve_data(queries)
         return data
 
     prior_data = main_query(prior_me)
@@ -2,22 +2,33 @@
 import cdutils.deduplication # type: ignore
 import cdutils.database.connect # type: ignore
 import cdutils.input_cleansing # type: ignore
-from sqlalchemy import text # type: ignore
+from cdutils.database.query_template import QueryTemplate, key_filter # type: ignore
 import pandas as pd
 
-def fetch_from_acctuserfield():
+def fetch_from_acctuserfield(acctnbrs=None):
         """
-        Gets data from COCC
+        Gets the SPLT user field from COCC
+
+        Only the columns used downstream are selected. Pass acctnbrs to restrict
+        the pull to those accounts (ignored for very large key sets).
         """
-        wh_acctuserfields = text(f"""
+        acctnbr_filter, params = key_filter('a.ACCTNBR', acctnbrs, name='acctnbrs')
+
+        wh_acctuserfields = QueryTemplate(f"""
         SELECT
-            *
+            a.ACCTNBR,
+            a.ACCTUSERFIELDCD,
+            a.ACCTUSERFIELDVALUE,
+            a.DATELASTMAINT
         FROM 
             OSIBANK.WH_ACCTUSERFIELDS a
+        WHERE
+            a.ACCTUSERFIELDCD = 'SPLT'
+            {acctnbr_filter}
         """)
 
         queries = [
-            {'key':'wh_acctuserfields', 'sql':wh_acctuserfields, 'engine':1},
+            {'key':'wh_acctuserfields', 'sql':wh_acctuserfields, 'engine':1, 'params':params},
         ]
 
         data = cdutils.database.connect.retrieve_data(queries)
@@ -29,10 +40,19 @@ def append_dealersplit(df: pd.DataFrame):
     Attach secondary lending officer to any dataframe
     """
     
-    data = fetch_from_acctuserfield()
+    schema_df = {
+                'acctnbr': str,
+            }
+
+    df = cdutils.input_cleansing.enforce_schema(df, schema_df)
+
+    data = fetch_from_acctuserfield(df['acctnbr'])
 
     wh_acctuserfields = data['wh_acctuserfields'].copy()
 
+    if wh_acctuserfields.empty:
+        wh_acctuserfields = pd.DataFrame(columns=['acctnbr','acctuserfieldcd','acctuserfieldvalue','datelastmaint'])
+
     splt = wh_acctuserfields[wh_acctuserfields['acctuserfieldcd'] == 'SPLT'].copy()
 
     splt = splt.sort_values(by='datelastmaint', ascending=False).copy()
@@ -48,12 +68,6 @@ def append_dealersplit(df: pd.DataFrame):
     splt = splt.rename(columns={'acctuserfieldvalue':'SPLT'}).copy()
     splt['SPLT'] = pd.to_numeric(splt['SPLT'], errors="coerce").fillna(0.0)
 
-    schema_df = {
-                'acctnbr': str,
-            }
-
-    df = cdutils.input_cleansing.enforce_schema(df, schema_df)
-
     schema_splt = {
                 'acctnbr': str,
                 'SPLT': float
@@ -0,0 +1,111 @@
+# Keyed enrichment pipeline
+"""
+Attach several acctnbr-keyed lookups to a base frame in one pass.
+
+Chaining add_pkey -> add_ownership_key -> add_hh_nbr -> append_inactive_date
+re-cleans acctnbr on the whole frame and copies every column at each merge.
+AcctEnrichment normalizes the base key once, collects the small lookup tables
+each enrichment produces, and joins them all at the end.
+
+Usage:
+    enrichment = cdutils.enrichment.AcctEnrichment(raw_data)
+    enrichment.add(cdutils.pkey_sqlite.pkey_lookup())
+    enrichment.add(cdutils.hhnbr.household_lookup(househldacct))
+    enrichment.add(cdutils.inactive_date.inactive_date_lookup(enrichment.keys()))
+    df = enrichment.apply()
+"""
+from typing import List, Optional, Union
+
+import pandas as pd
+
+import cdutils.input_cleansing # type: ignore
+
+
+def to_lookup(lookup: Union[pd.DataFrame, pd.Series], key: str = 'acctnbr') -> pd.DataFrame:
+    """
+    Normalize a lookup to a frame indexed by the string key.
+
+    Accepts a frame with the key as a column or as its index, or a named Series indexed by key.
+    """
+    if isinstance(lookup, pd.Series):
+        assert lookup.name is not None, "Lookup series must be named"
+        lookup = lookup.to_frame()
+    if key not in lookup.columns:
+        assert lookup.index.name == key, f"Lookup must have '{key}' as a column or index"
+        lookup = lookup.reset_index()
+    lookup = cdutils.input_cleansing.enforce_schema(lookup, {key: str})
+    return lookup.set_index(key)
+
+
+class AcctEnrichment:
+    """
+    Base frame plus the keyed lookups to attach to it.
+
+    Lookups are joined left, in the order they were added, so the column order
+    matches the equivalent chain of pd.merge calls.
+    """
+    def __init__(self, df: pd.DataFrame, key: str = 'acctnbr'):
+        """
+        Args:
+            df (pd.DataFrame): base frame, must contain key
+            key (str): join key (normalized to string once here)
+        """
+        assert df is not None, "Dataframe must not be none"
+        assert key in df.columns, f"{key} not in dataframe"
+        self.key = key
+        self.df = cdutils.input_cleansing.enforce_schema(df, {key: str})
+        # pd.merge returns a fresh RangeIndex; keep that for callers switching over
+        self.df.reset_index(drop=True, inplace=True)
+        self.lookups: List[pd.DataFrame] = []
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        Columns the result will have once apply() runs.
+        """
+        columns = list(self.df.columns)
+        for lookup in self.lookups:
+            columns += list(lookup.columns)
+        return columns
+
+    def keys(self) -> pd.Series:
+        """
+        Distinct keys in the base frame, for pushing filters into lookup queries.
+        """
+        return pd.Series(self.df[self.key].dropna().unique(), name=self.key)
+
+    def add(self, lookup: Optional[Union[pd.DataFrame, pd.Series]]) -> 'AcctEnrichment':
+        """
+        Queue a lookup table keyed on key. None is ignored so optional enrichments can be chained.
+        """
+        if lookup is None:
+            return self
+        lookup = to_lookup(lookup, self.key)
+        overlap = set(lookup.columns) & set(self.columns)
+        if overlap:
+            raise ValueError(f"Lookup columns already present: {sorted(overlap)}")
+        self.lookups.append(lookup)
+        return self
+
+    def apply(self) -> pd.DataFrame:
+        """
+        Join every queued lookup onto the base frame.
+
+        Lookups unique on key are combined and attached with a single join. A lookup
+        with repeated keys is joined on its own afterwards and fans out rows the same
+        way pd.merge would.
+        """
+        unique = [lookup for lookup in self.lookups if lookup.index.is_unique]
+        repeated = [lookup for lookup in self.lookups if not lookup.index.is_unique]
+
+        df = self.df
+        if unique:
+            combined = unique[0] if len(unique) == 1 else pd.concat(unique, axis=1, sort=False)
+            df = df.join(combined, on=self.key)
+        for lookup in repeated:
+            df = df.join(lookup, on=self.key)
+
+        if repeated:
+            # Restore add() order, since repeated-key lookups were joined after the unique ones
+            df = df[self.columns].reset_index(drop=True)
+        return df
@@ -0,0 +1,253 @@
+# Styled Excel output in one pass
+"""
+Write DataFrames to .xlsx with their formatting, without reopening the file.
+
+Writing with pandas and then looping over every cell with openpyxl to set fonts,
+fills and number formats costs a full second pass over the workbook. Here the
+style of each cell is resolved up front from a declarative spec and every cell
+is written once, with xlsxwriter in constant_memory mode (rows are flushed to
+disk as they are written, so memory stays flat on large reports).
+
+Formats are plain dicts of xlsxwriter format properties, e.g.
+{'bold': True, 'font_name': 'Arial', 'font_size': 10, 'num_format': '#,##0.00',
+ 'bg_color': '#FFFF00', 'border': 1, 'bottom': 6, 'align': 'center', 'text_wrap': True}.
+For a cell the dicts are merged in this order (later keys win):
+    spec['format'] -> date default (datetime columns) -> column 'format' -> band -> row rules in order
+
+Spec (every key optional):
+    'format': base format for all cells
+    'start_row': 0-based row of the header (rows above it are free for 'preamble')
+    'preamble': [{'row': 0, 'col': 0, 'value': 'TITLE', 'format': {...}}, ...] cells above start_row
+    'header': {'format': {...}, 'height': 44}, or False to write data only
+    'columns': {column name: {'width': 12, 'format': {...}, 'header_format': {...}}}
+    'exclude': [columns used for rules but not written]
+    'default_width': width for columns without one
+    'autofit': True to size columns without a width from their longest value
+    'date_format': num_format for datetime columns (default 'mm/dd/yyyy')
+    'bands': {'format': {...}} applied to every other data row
+    'row_formats': [(mask, {...}), ...] where mask is a boolean array / Series aligned with the rows,
+        or a callable(df) returning one. Use these for section, title and total rows.
+    'totals': {'columns': [...], 'label': 'Total', 'format': {...}} SUM row after the data
+    'freeze_panes': (row, col)
+
+Usage:
+    import cdutils.excel_writer
+
+    spec = {
+        'header': {'format': {'bold': True, 'border': 1}},
+        'columns': {'Balance': {'width': 14, 'format': {'num_format': '#,##0.00'}}},
+        'row_formats': [(df['Tag Type'].eq('sum'), {'bold': True, 'bottom': 6})],
+        'exclude': ['Tag Type'],
+        'freeze_panes': (1, 0),
+    }
+    cdutils.excel_writer.write_excel(output_path, df, spec)
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import xlsxwriter # type: ignore
+from xlsxwriter.utility import xl_rowcol_to_cell # type: ignore
+
+DEFAULT_DATE_FORMAT = 'mm/dd/yyyy'
+
+WORKBOOK_OPTIONS = {
+    'constant_memory': True,
+    'remove_timezone': True,
+    'nan_inf_to_errors': True,
+    # Write text as text, even when it looks like a formula or a URL
+    'strings_to_formulas': False,
+    'strings_to_urls': False,
+}
+
+
+class _FormatCache:
+    """
+    One xlsxwriter Format per distinct property set
+    """
+    def __init__(self, workbook):
+        self.workbook = workbook
+        self.formats = {}
+
+    def get(self, *props: Optional[dict]):
+        merged = {}
+        for prop in props:
+            if prop:
+                merged.update(prop)
+        if not merged:
+            return None
+        key = tuple(sorted((name, repr(value)) for name, value in merged.items()))
+        if key not in self.formats:
+            self.formats[key] = self.workbook.add_format(merged)
+        return self.formats[key]
+
+
+def _row_rules(df: pd.DataFrame, spec: dict) -> List[Tuple[np.ndarray, dict]]:
+    rules = []
+    if spec.get('bands'):
+        rules.append((np.arange(len(df)) % 2 == 1, spec['bands'].get('format')))
+    for mask, fmt in spec.get('row_formats', []):
+        if callable(mask):
+            mask = mask(df)
+        mask = np.asarray(mask, dtype=bool)
+        if len(mask) != len(df):
+            raise ValueError(f"Row format mask has {len(mask)} rows, frame has {len(df)}")
+        rules.append((mask, fmt))
+    if len(rules) > 62:
+        raise ValueError("At most 62 row formats are supported")
+    return rules
+
+
+def _column_writer(worksheet, series: pd.Series):
+    """
+    (values, missing mask, write method) for one column
+    """
+    missing = series.isna().to_numpy()
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return series.tolist(), missing, worksheet.write_boolean
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy(dtype='float64', na_value=np.nan).tolist(), missing, worksheet.write_number
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return series.astype(object).tolist(), missing, worksheet.write_datetime
+    return series.tolist(), missing, worksheet.write
+
+
+def _autofit_width(series: pd.Series, header: str) -> float:
+    lengths = series.dropna().astype(str).str.len()
+    longest = int(lengths.max()) if not lengths.empty else 0
+    return max(longest, len(str(header))) + 2
+
+
+def write_sheet(workbook, sheet_name: str, df: pd.DataFrame, spec: Optional[dict] = None, formats: Optional[_FormatCache] = None):
+    """
+    Write one styled sheet into an open xlsxwriter Workbook.
+
+    Args:
+        workbook: xlsxwriter.Workbook (ideally opened with WORKBOOK_OPTIONS)
+        sheet_name (str): sheet name (at most 31 characters)
+        df (pd.DataFrame): data, written without its index
+        spec (dict): style spec (see module docstring)
+        formats: shared format cache when writing several sheets
+
+    Returns:
+        the xlsxwriter Worksheet
+    """
+    spec = spec or {}
+    formats = formats or _FormatCache(workbook)
+    worksheet = workbook.add_worksheet(sheet_name)
+
+    column_specs = spec.get('columns', {})
+    unknown = [name for name in list(column_specs) + list(spec.get('exclude', [])) if name not in df.columns]
+    if unknown:
+        raise ValueError(f"Columns not in frame: {unknown}")
+
+    rules = _row_rules(df, spec)
+    data = df.drop(columns=spec.get('exclude', []))
+    columns = list(data.columns)
+    base = spec.get('format')
+    date_default = {'num_format': spec.get('date_format', DEFAULT_DATE_FORMAT)}
+
+    # Column level: width and the format every cell of the column starts from
+    column_formats = []
+    for col_idx, name in enumerate(columns):
+        column_spec = column_specs.get(name, {})
+        is_date = pd.api.types.is_datetime64_any_dtype(data[name].dtype)
+        column_formats.append([base, date_default if is_date else None, column_spec.get('format')])
+
+        width = column_spec.get('width', spec.get('default_width'))
+        if width is None and spec.get('autofit'):
+            width = _autofit_width(data[name], name)
+        if width is not None:
+            worksheet.set_column(col_idx, col_idx, width)
+
+    # Rows are written top to bottom (constant_memory cannot go back)
+    start_row = spec.get('start_row', 0)
+    for cell in sorted(spec.get('preamble', []), key=lambda cell: (cell['row'], cell['col'])):
+        if cell['row'] >= start_row:
+            raise ValueError("Preamble cells must be above start_row")
+        worksheet.write(cell['row'], cell['col'], cell['value'], formats.get(base, cell.get('format')))
+
+    header = spec.get('header', {})
+    first_data_row = start_row
+    if header is not False:
+        if header.get('height') is not None:
+            worksheet.set_row(start_row, header['height'])
+        for col_idx, name in enumerate(columns):
+            header_format = formats.get(base, header.get('format'), column_specs.get(name, {}).get('header_format'))
+            worksheet.write_string(start_row, col_idx, str(name), header_format)
+        first_data_row += 1
+
+    # One code per combination of row rules, resolved to one format per column
+    codes = np.zeros(len(data), dtype='int64')
+    for bit, (mask, _) in enumerate(rules):
+        codes |= mask.astype('int64') << bit
+    row_formats = {}
+    for code in np.unique(codes).tolist():
+        applied = [fmt for bit, (_, fmt) in enumerate(rules) if code >> bit & 1]
+        row_formats[code] = [formats.get(*column_format, *applied) for column_format in column_formats]
+
+    writers = [_column_writer(worksheet, data[name]) for name in columns]
+    write_blank = worksheet.write_blank
+    for row_idx, code in enumerate(codes.tolist()):
+        excel_row = first_data_row + row_idx
+        cell_formats = row_formats[code]
+        for col_idx, (values, missing, write) in enumerate(writers):
+            if missing[row_idx]:
+                if cell_formats[col_idx] is not None:
+                    write_blank(excel_row, col_idx, None, cell_formats[col_idx])
+            else:
+                write(excel_row, col_idx, values[row_idx], cell_formats[col_idx])
+
+    totals = spec.get('totals')
+    if totals:
+        total_row = first_data_row + len(data)
+        label_column = totals.get('label_column', columns[0])
+        for col_idx, name in enumerate(columns):
+            total_format = formats.get(*column_formats[col_idx], totals.get('format'))
+            if name in totals.get('columns', []) and len(data) == 0:
+                # No rows to sum; a formula would reference its own cell
+                worksheet.write_number(total_row, col_idx, 0, total_format)
+            elif name in totals.get('columns', []):
+                first_cell = xl_rowcol_to_cell(first_data_row, col_idx)
+                last_cell = xl_rowcol_to_cell(total_row - 1, col_idx)
+                value = pd.to_numeric(data[name], errors='coerce').sum()
+                worksheet.write_formula(total_row, col_idx, f"=SUM({first_cell}:{last_cell})", total_format, value)
+            elif name == label_column:
+                worksheet.write_string(total_row, col_idx, totals.get('label', 'Total'), total_format)
+            elif total_format is not None:
+                write_blank(total_row, col_idx, None, total_format)
+
+    if spec.get('freeze_panes'):
+        worksheet.freeze_panes(*spec['freeze_panes'])
+
+    return worksheet
+
+
+def write_sheets(path, sheets: Dict[str, Tuple[pd.DataFrame, Optional[dict]]]) -> Path:
+    """
+    Write several styled sheets to one workbook, in dict order.
+
+    Args:
+        path: output .xlsx path (overwritten)
+        sheets (Dict[str, Tuple[pd.DataFrame, dict]]): sheet name -> (frame, spec)
+
+    Returns:
+        Path of the written file
+    """
+    path = Path(path)
+    workbook = xlsxwriter.Workbook(str(path), WORKBOOK_OPTIONS)
+    formats = _FormatCache(workbook)
+    try:
+        for sheet_name, (df, spec) in sheets.items():
+            write_sheet(workbook, sheet_name, df, spec, formats)
+    finally:
+        workbook.close()
+    return path
+
+
+def write_excel(path, df: pd.DataFrame, spec: Optional[dict] = None, sheet_name: str = 'Sheet1') -> Path:
+    """
+    Write one styled sheet (see module docstring for the spec).
+    """
+    return write_sheets(path, {sheet_name: (df, spec)})
@@ -1,33 +1,32 @@
 import pandas as pd
+import cdutils.enrichment
 import cdutils.input_cleansing
 import cdutils.deduplication
 
 
-def add_hh_nbr(df: pd.DataFrame, househldacct: pd.DataFrame) -> pd.DataFrame:
+def household_lookup(househldacct: pd.DataFrame) -> pd.DataFrame:
     """
-    After dropping duplicates from household acct (sorting in reverse chronological order), add householdnbr to any df
+    Latest household record per acctnbr (sorting in reverse chronological order), for cdutils.enrichment.AcctEnrichment.add
     """
-    assert df is not None, "df cannot be None"
-    assert not df.empty, "df cannot be empty"
-
     househldacct_sorted = househldacct.sort_values(by='datelastmaint', ascending=False)
 
     dedupe_list = [{'df':househldacct_sorted, 'field':'acctnbr'}]
     household_new = cdutils.deduplication.dedupe(dedupe_list)
 
     # Enforce schema
-    schema_df = {
-        'acctnbr': str,
-    }
-
-    df = cdutils.input_cleansing.enforce_schema(df, schema_df)
-
     schema_household = {
         'acctnbr': str,
     }
 
     household_new = cdutils.input_cleansing.enforce_schema(household_new, schema_household)
+    return household_new
+
 
-    merged_df = pd.merge(df, household_new, on='acctnbr', how='left')
+def add_hh_nbr(df: pd.DataFrame, househldacct: pd.DataFrame) -> pd.DataFrame:
+    """
+    After dropping duplicates from household acct (sorting in reverse chronological order), add householdnbr to any df
+    """
+    assert df is not None, "df cannot be None"
+    assert not df.empty, "df cannot be empty"
 
-    return merged_df
\ No newline at end of file
+    return cdutils.enrichment.AcctEnrichment(df).add(household_lookup(househldacct)).apply()
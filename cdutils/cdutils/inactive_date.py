@@ -1,45 +1,53 @@
 # Append inactive date
 import cdutils.deduplication # type: ignore
+import cdutils.enrichment # type: ignore
 import cdutils.database.connect # type: ignore
 import cdutils.input_cleansing # type: ignore
-from sqlalchemy import text # type: ignore
+from cdutils.database.query_template import QueryTemplate, key_filter # type: ignore
 import pandas as pd
 
-def fetch_data():
+def fetch_data(acctnbrs=None):
     """
-    Gets data from COCC
+    Gets the latest inactive date per account from COCC
+
+    The max is taken in the database so only one row per acctnbr is transferred.
+    Pass acctnbrs to restrict the pull to those accounts (ignored for very large key sets).
     """
-    acctloanlimithist = text("""
+    acctnbr_filter, params = key_filter('a.ACCTNBR', acctnbrs, name='acctnbrs')
+
+    acctloanlimithist = QueryTemplate(f"""
     SELECT 
-        *
+        a.ACCTNBR,
+        MAX(a.INACTIVEDATE) AS INACTIVEDATE
     FROM 
-        OSIBANK.ACCTLOANLIMITHIST
+        OSIBANK.ACCTLOANLIMITHIST a
+    WHERE
+        1=1
+        {acctnbr_filter}
+    GROUP BY
+        a.ACCTNBR
     """)
 
     queries = [
-        {'key':'acctloanlimithist', 'sql':acctloanlimithist, 'engine':1},
+        {'key':'acctloanlimithist', 'sql':acctloanlimithist, 'engine':1, 'params':params},
     ]
 
     data = cdutils.database.connect.retrieve_data(queries)
     return data
 
-def append_inactive_date(df: pd.DataFrame) -> pd.DataFrame:
+def inactive_date_lookup(acctnbrs=None) -> pd.DataFrame:
     """
-    Getting inactive date for each item and appending to dataframe
-    
-    Args: 
-        df: Takes in any dataframe 
+    acctnbr -> most recent inactivedate, for cdutils.enrichment.AcctEnrichment.add
 
-    Returns:
-        df: df with the most recent inactive date per product
-        
-    Operations:
-        - ensure inactivedate is a datetime field
-        - groupby acctnbr, take max inactive date
+    Args:
+        acctnbrs: accounts to pull (None pulls every account)
     """
-    data = fetch_data()
+    data = fetch_data(acctnbrs)
     acctloanlimithist = data['acctloanlimithist'].copy()
 
+    if acctloanlimithist.empty:
+        acctloanlimithist = pd.DataFrame(columns=['acctnbr','inactivedate'])
+
 
     acctloanlimithist['inactivedate'] = pd.to_datetime(acctloanlimithist['inactivedate'])
     inactive_df = acctloanlimithist.groupby('acctnbr')['inactivedate'].max().reset_index()
@@ -52,8 +60,22 @@ def append_inactive_date(df: pd.DataFrame) -> pd.DataFrame:
     }
 
     inactive_df = cdutils.input_cleansing.enforce_schema(inactive_df, inactive_df_schema)
+    return inactive_df
 
-    df = pd.merge(df, inactive_df, how='left', on='acctnbr')
-
-    return df
+def append_inactive_date(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Getting inactive date for each item and appending to dataframe
+    
+    Args: 
+        df: Takes in any dataframe 
 
+    Returns:
+        df: df with the most recent inactive date per product
+        
+    Operations:
+        - ensure inactivedate is a datetime field
+        - groupby acctnbr, take max inactive date
+    """
+    enrichment = cdutils.enrichment.AcctEnrichment(df)
+    enrichment.add(inactive_date_lookup(enrichment.keys()))
+    return enrichment.apply()
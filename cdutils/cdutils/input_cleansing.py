@@ -1,5 +1,83 @@
+import numpy as np
 import pandas as pd
-def enforce_schema(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# String columns produced by enforce_schema are Arrow-backed
+STRING_DTYPE = pd.StringDtype("pyarrow")
+
+
+def _copy_on_write_enabled() -> bool:
+    return bool(pd.options.mode.copy_on_write) or int(pd.__version__.split('.')[0]) >= 3
+
+
+def _copy_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy df without duplicating every column when it is safe to do so.
+
+    Under pandas copy-on-write a shallow copy is enough (columns are only copied
+    if someone writes to them). Without it, a shallow copy would let a caller's
+    .loc write leak back into the original frame, so fall back to a deep copy.
+    """
+    if _copy_on_write_enabled():
+        return df.copy(deep=False)
+    return df.copy()
+
+
+def _float_to_string(series: pd.Series) -> pd.Series:
+    """
+    10.0 -> "10", NaN -> <NA>, without a per-element Python call.
+
+    Rounds half to even like f"{x:.0f}" did.
+    """
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    missing = np.isnan(values)
+    present = values[~missing]
+    if np.isfinite(present).all() and (np.abs(present) < 2**63).all():
+        ints = np.where(missing, 0, np.round(values)).astype(np.int64)
+        return _arrow_to_series(pa.array(ints, mask=missing).cast(pa.string()), series)
+    # inf or values outside int64: format element-wise
+    return series.apply(lambda x: f"{x:.0f}" if pd.notnull(x) else None).astype(STRING_DTYPE)
+
+
+def _arrow_to_series(array: pa.Array, like: pd.Series) -> pd.Series:
+    return pd.Series(pd.arrays.ArrowStringArray(array), index=like.index, name=like.name)
+
+
+def _to_string(series: pd.Series) -> pd.Series:
+    if series.dtype == STRING_DTYPE:
+        return series
+    if pd.api.types.is_float_dtype(series):
+        return _float_to_string(series)
+    if pd.api.types.is_integer_dtype(series):
+        return _arrow_to_series(pa.array(series, from_pandas=True).cast(pa.string()), series)
+    if pd.api.types.is_bool_dtype(series):
+        return series.astype(STRING_DTYPE)
+    # Object / other string dtypes: convert once, then strip with Arrow compute
+    try:
+        array = pa.array(series, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Mixed objects (numbers, dates, ...): let pandas str() the non-string values
+        array = pa.array(series.astype(STRING_DTYPE))
+    return _arrow_to_series(pc.utf8_trim_whitespace(array), series)
+
+
+def _already_has_dtype(series: pd.Series, desired_dtype) -> bool:
+    """
+    True when converting series to desired_dtype would be a no-op.
+    """
+    if desired_dtype in (str, 'str', 'string'):
+        return series.dtype == STRING_DTYPE
+    if desired_dtype == int:
+        return isinstance(series.dtype, pd.Int64Dtype)
+    if desired_dtype == float:
+        return series.dtype == np.float64
+    if desired_dtype in ['datetime', pd.Timestamp]:
+        return pd.api.types.is_datetime64_any_dtype(series)
+    return False
+
+
+def enforce_schema(df: pd.DataFrame, schema: dict, inplace: bool = False) -> pd.DataFrame:
     """
     Enforce a given schema on the columns of a DataFrame.
     
@@ -15,6 +93,7 @@ def enforce_schema(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
            
       3. Whitespace in String Columns:
          - When converting to string, the function strips any extra whitespace.
+         - String output uses the Arrow-backed string dtype (STRING_DTYPE); missing values are <NA>.
          
       4. Numeric Conversion for int/float:
          - Uses `pd.to_numeric` with error coercion for columns needing numeric conversion.
@@ -27,11 +106,17 @@ def enforce_schema(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
            
       6. Fallback Conversion:
          - For any other desired type, it uses a simple astype conversion.
+
+    All conversions are vectorized. Columns that already have the target dtype are
+    left untouched, and only the converted columns are replaced (the rest of the
+    frame is not copied when pandas copy-on-write is on, or when inplace=True).
     
     :param df: The input DataFrame.
     :param schema: A dictionary where keys are column names and values are the desired types.
-                   Supported type indicators include: str, int, float, 'datetime' (or pd.Timestamp).
-    :return: A new DataFrame with the enforced schema.
+                   Supported type indicators include: str (or 'str'/'string'), int, float,
+                   'datetime' (or pd.Timestamp).
+    :param inplace: Convert the columns on df itself instead of a copy.
+    :return: A DataFrame with the enforced schema.
 
     Usage:
         schema_wh_org = {
@@ -41,22 +126,21 @@ def enforce_schema(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
 
         wh_org = cdutils.input_cleansing.enforce_schema(wh_org, schema_wh_org)
     """
-    df = df.copy()
+    if not inplace:
+        df = _copy_frame(df)
     
     for column, desired_dtype in schema.items():
         # Handle missing columns by creating them with default None values.
         if column not in df.columns:
             print(f"Column '{column}' not found. Creating it with default None values.")
             df[column] = None
+        elif _already_has_dtype(df[column], desired_dtype):
+            continue
         try:
             # When the desired type is str
-            if desired_dtype == str:
-                if pd.api.types.is_float_dtype(df[column]):
-                    # Format floats as strings with no decimals.
-                    df[column] = df[column].apply(lambda x: f"{x:.0f}" if pd.notnull(x) else None)
-                else:
-                    # Ensure all values are strings and strip whitespace.
-                    df[column] = df[column].astype(str).str.strip()
+            if desired_dtype in (str, 'str', 'string'):
+                df[column] = _to_string(df[column])
+
             # Convert to integer: use pd.to_numeric and then cast to Pandas' nullable integer type.
             elif desired_dtype == int:
                 df[column] = pd.to_numeric(df[column], errors='coerce').astype("Int64")
@@ -79,6 +163,89 @@ def enforce_schema(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
     return df
 
 
+# df.attrs entry recording which key columns normalize_key_columns already converted
+NORMALIZED_KEYS_ATTR = 'cdutils_normalized_keys'
+
+
+def normalize_key(series: pd.Series, as_int: bool = False, errors: str = 'raise') -> pd.Series:
+    """
+    Canonical form of a numeric key column (acctnbr, persnbr, orgnbr, addrnbr, ...).
+
+    Same result as .apply(lambda x: str(int(float(x))) if pd.notnull(x) else x) for the
+    whole column at once: floats are truncated (10.0 -> "10"), numeric strings are parsed
+    (" 0123 " -> "123"), ints / Decimals / mixed objects are accepted.
+
+    Args:
+        series (pd.Series): raw key column
+        as_int (bool): return nullable Int64 keys (cheaper to hash and join) instead of strings
+        errors (str): 'raise' on values that are not numbers, or 'coerce' them to missing
+
+    Returns:
+        pd.Series of STRING_DTYPE (or Int64 with as_int=True), missing where the input was missing
+    """
+    if as_int and isinstance(series.dtype, pd.Int64Dtype):
+        return series
+    if pd.api.types.is_bool_dtype(series.dtype):
+        raise ValueError(f"Key column '{series.name}' is boolean")
+
+    if pd.api.types.is_integer_dtype(series.dtype):
+        keys = series.astype('Int64')
+    else:
+        numeric = series if pd.api.types.is_float_dtype(series.dtype) else pd.to_numeric(series, errors='coerce')
+        values = np.trunc(numeric.to_numpy(dtype='float64', na_value=np.nan))
+        invalid = series.notna().to_numpy() & ~(np.abs(values) < 2**63)
+        if invalid.any():
+            if errors == 'raise':
+                examples = series[invalid].head(3).tolist()
+                raise ValueError(f"Key column '{series.name}' has {int(invalid.sum())} non-numeric values, e.g. {examples}")
+            values[invalid] = np.nan
+        missing = np.isnan(values)
+        keys = pd.Series(
+            pd.arrays.IntegerArray(np.where(missing, 0, values).astype(np.int64), missing),
+            index=series.index, name=series.name
+        )
+
+    if as_int:
+        return keys
+    return _arrow_to_series(pa.array(keys, from_pandas=True).cast(pa.string()), series)
+
+
+def normalize_key_columns(df: pd.DataFrame, columns, as_int: bool = False, inplace: bool = False) -> pd.DataFrame:
+    """
+    Normalize key columns (see normalize_key) once per frame.
+
+    Converted columns are recorded in df.attrs, which pandas carries through copies,
+    filters and column selections, so passing the same frame (or one derived from it)
+    again skips the conversion. A column replaced later with different values but the
+    same dtype is not detected; call normalize_key on it directly in that case.
+
+    Args:
+        df (pd.DataFrame): frame holding the keys
+        columns: key column name or list of names
+        as_int (bool): nullable Int64 keys instead of strings
+        inplace (bool): convert on df itself instead of a copy
+
+    Usage:
+        wh_org = cdutils.input_cleansing.normalize_key_columns(wh_org, 'orgnbr')
+        orgaddruse = cdutils.input_cleansing.normalize_key_columns(orgaddruse, ['orgnbr', 'addrnbr'])
+    """
+    columns = [columns] if isinstance(columns, str) else list(columns)
+    mode = 'int' if as_int else 'str'
+    target_dtype = pd.Int64Dtype() if as_int else STRING_DTYPE
+    done = df.attrs.get(NORMALIZED_KEYS_ATTR, {})
+
+    pending = [column for column in columns if not (done.get(column) == mode and df[column].dtype == target_dtype)]
+    if not pending:
+        return df
+
+    if not inplace:
+        df = _copy_frame(df)
+    for column in pending:
+        df[column] = normalize_key(df[column], as_int=as_int)
+    df.attrs[NORMALIZED_KEYS_ATTR] = {**done, **{column: mode for column in pending}}
+    return df
+
+
 def cast_columns(df, field_map):
     """
     Cast specified columns in a pd DataFrame to a new data type based on field map
@@ -0,0 +1,179 @@
+# Lakehouse (Delta table) reader with column and row filter pushdown
+
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from deltalake import DeltaTable
+
+# Local lakehouse root (bronze / silver / gold layers underneath)
+LAKEHOUSE_PATH = Path(os.getenv('LAKEHOUSE_PATH', r"C:\Users\w322800\Documents\lakehouse"))
+
+DTYPE_BACKENDS = ('pyarrow', 'numpy')
+
+# Layer holding every silver build as an effdate partition (Lakehouse_v1 src.silver.snapshots)
+HISTORY_LAYER = 'silver_history'
+SNAPSHOT_COLUMN = 'effdate'
+
+
+def table_path(name: Union[str, Path], root: Path = LAKEHOUSE_PATH) -> Path:
+    """
+    Location of a Delta table.
+
+    Args:
+        name: 'layer/table' (e.g. 'silver/account', 'bronze/wh_loans') under root,
+            or a Path to the table folder (e.g. src.config.SILVER / "account")
+        root (Path): lakehouse root for names
+    """
+    if isinstance(name, Path):
+        return name
+    parts = name.replace('\\', '/').split('/')
+    if len(parts) != 2 or not all(parts):
+        raise ValueError(f"Table name must look like 'silver/account', got {name!r}")
+    return Path(root) / parts[0] / parts[1]
+
+
+def _normalize_filters(filters):
+    """
+    Copy DNF filters as a list of AND groups, with collection values ('in' / 'not in') as lists.
+    """
+    if filters and not isinstance(filters[0], list):
+        filters = [filters]
+    return [
+        [(column, op, list(value) if isinstance(value, (set, tuple, pd.Series, pd.Index)) else value) for column, op, value in group]
+        for group in filters
+    ]
+
+
+def _filter_expression(filters, schema: pa.Schema) -> ds.Expression:
+    """
+    Row filter for normalized DNF filters; collection values are typed from the table
+    schema so an empty 'in' list still matches the column type.
+    """
+    typed = [
+        [(column, op, pa.array(value, type=schema.field(column).type) if isinstance(value, list) else value) for column, op, value in group]
+        for group in filters
+    ]
+    return pq.filters_to_expression(typed)
+
+
+def read_table(name: Union[str, Path], columns: Optional[List[str]] = None, filters=None, as_of: Optional[Union[int, str, datetime, date]] = None, root: Path = LAKEHOUSE_PATH, dtype_backend: str = 'pyarrow') -> pd.DataFrame:
+    """
+    Read a Delta table, reading only the columns and rows asked for.
+
+    Filters skip whole files using partition values and per-file min/max statistics
+    (before any file is opened), then row groups and rows are filtered in the scan,
+    so the result holds exactly the matching rows.
+
+    Args:
+        name: table name under root ('silver/account') or a Path to the table
+        columns (List[str]): columns to read (None: all)
+        filters: DNF filters in pyarrow form, e.g. [('acctnbr', 'in', acctnbrs)] (AND of
+            the tuples) or [[('a', '=', 1)], [('b', '>', 2)]] (OR of the inner lists),
+            or a pyarrow.dataset.Expression
+        as_of: table version (int), date / date string ('2025-01-01', end of that day) or
+            timestamp (datetime / ISO string) to time-travel to
+        root (Path): lakehouse root for names
+        dtype_backend (str): 'pyarrow' for Arrow-backed columns (no conversion copy),
+            'numpy' for the default pandas dtypes DeltaTable.to_pandas() gives
+
+    Returns:
+        pd.DataFrame
+
+    Usage:
+        accts = cdutils.lakehouse.read_table(
+            'silver/account',
+            columns=['acctnbr', 'product', 'notebal'],
+            filters=[('acctnbr', 'in', acctnbrs)],
+        )
+    """
+    if dtype_backend not in DTYPE_BACKENDS:
+        raise ValueError(f"dtype_backend must be one of {DTYPE_BACKENDS}")
+
+    path = table_path(name, root)
+    if isinstance(as_of, int):
+        dt = DeltaTable(path, version=as_of)
+    else:
+        dt = DeltaTable(path)
+        if as_of is not None:
+            if isinstance(as_of, str):
+                # deltalake only parses full RFC 3339 strings; a date-only string means that whole day, like a date
+                parsed = pd.Timestamp(as_of)
+                as_of = parsed.to_pydatetime() if ':' in as_of else parsed.date()
+            if isinstance(as_of, date) and not isinstance(as_of, datetime):
+                as_of = datetime.combine(as_of, datetime.max.time())
+            dt.load_as_version(as_of)
+
+    pruning_predicate = _normalize_filters(filters) if not isinstance(filters, ds.Expression) and filters else None
+    dataset = dt.to_pyarrow_dataset(file_pruning_predicate=pruning_predicate)
+
+    expression = filters if isinstance(filters, ds.Expression) else None
+    if pruning_predicate:
+        expression = _filter_expression(pruning_predicate, dataset.schema)
+    table = dataset.to_table(columns=columns, filter=expression)
+
+    if dtype_backend == 'pyarrow':
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas()
+
+
+def snapshot_dates(name: str, root: Path = LAKEHOUSE_PATH) -> List[pd.Timestamp]:
+    """
+    Effdates kept in the history of a silver table, oldest first.
+
+    Args:
+        name (str): silver table name (e.g. 'account')
+        root (Path): lakehouse root
+    """
+    dt = DeltaTable(table_path(f"{HISTORY_LAYER}/{name}", root))
+    return sorted(pd.Timestamp(partition[SNAPSHOT_COLUMN]) for partition in dt.partitions())
+
+
+def read_snapshots(name: str, effdates, columns: Optional[List[str]] = None, filters=None, root: Path = LAKEHOUSE_PATH, dtype_backend: str = 'pyarrow') -> pd.DataFrame:
+    """
+    Read past builds of a silver table from its effdate-partitioned history. Only the
+    partitions asked for are opened.
+
+    Args:
+        name (str): silver table name (e.g. 'account')
+        effdates: effdate or list of effdates (date / datetime / string), e.g. two month-ends
+        columns (List[str]): columns to read (None: all); effdate is always included
+        filters: further DNF filters (AND of tuples), as in read_table
+        root (Path): lakehouse root
+        dtype_backend (str): see read_table
+
+    Returns:
+        pd.DataFrame: rows of every requested snapshot, told apart by effdate
+
+    Usage:
+        month_ends = cdutils.lakehouse.read_snapshots(
+            'account',
+            ['2025-08-29', '2025-09-30'],
+            columns=['acctnbr', 'Net Balance'],
+        )
+    """
+    if isinstance(effdates, (str, date, datetime)):
+        effdates = [effdates]
+    effdates = [pd.Timestamp(effdate).normalize() for effdate in effdates]
+    if not effdates:
+        raise ValueError("read_snapshots needs at least one effdate")
+
+    if filters and isinstance(filters[0], list):
+        raise ValueError("read_snapshots filters must be a single AND group of tuples")
+    filters = [(SNAPSHOT_COLUMN, 'in', effdates)] + list(filters or [])
+    if columns is not None and SNAPSHOT_COLUMN not in columns:
+        columns = [SNAPSHOT_COLUMN] + list(columns)
+
+    path = table_path(f"{HISTORY_LAYER}/{name}", root)
+    result = read_table(path, columns=columns, filters=filters, dtype_backend=dtype_backend)
+
+    found = set(pd.DatetimeIndex(result[SNAPSHOT_COLUMN].astype('datetime64[us]')))
+    missing = sorted(set(effdates) - found)
+    if missing:
+        print(f"[WARNING] No {name} snapshot for {[f'{effdate:%Y-%m-%d}' for effdate in missing]}")
+    return result
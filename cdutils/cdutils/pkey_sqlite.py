@@ -2,11 +2,14 @@
 import sqlite3
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 import os
+import shutil
 
 from sqlalchemy import create_engine, inspect, text # type: ignore
 import pandas as pd # type: ignore
 
+import cdutils.enrichment
 import cdutils.input_cleansing
 
 def create_sqlite_engine(db_filename: str, use_default_dir: bool = True, base_dir: Path = None):
@@ -95,139 +98,233 @@ def append_records_to_historical_db(df: pd.DataFrame, engine, table_name: str='h
     df.to_sql(table_name, con=engine, if_exists='append', index=False)
 
 
-def add_pkey(df: pd.DataFrame) -> pd.DataFrame:
+# Shared R360 production assets directory (current.db, ownership.db, address.db)
+DB_PATH = Path(r"\\00-da1\Home\Share\Data & Analytics Initiatives\Project Management\Data_Analytics\R360\Production\assets")
+
+# Local copies of the key databases so repeat runs do not re-read the share
+MIRROR_DIR = Path(os.getenv('CDUTILS_PKEY_MIRROR_DIR', Path.home() / '.cdutils' / 'pkey_mirror'))
+
+# Output column -> R360 database holding it (each has a current_keys table of acctnbr, portfolio_key)
+KEY_DATABASES = {
+    'portfolio_key': 'current.db',
+    'ownership_key': 'ownership.db',
+    'address_key': 'address.db',
+}
+
+
+def read_key_table(db_path: Path, key_name: str = 'portfolio_key') -> pd.DataFrame:
     """
-    Add portfolio key from the R360 process to the dataframe that is passed in as an arguement
+    Read current_keys from one R360 key database as an acctnbr-indexed (str) lookup
+    """
+    conn = sqlite3.connect(str(db_path))
+    try:
+        pkey_df = pd.read_sql("SELECT acctnbr, portfolio_key FROM current_keys", con=conn)
+    finally:
+        conn.close()
 
-    Args:
-        df (pd.DataFrame): Any dataframe can be passed in as long as it has the "acctnbr" field
+    pkey_df = pkey_df.rename(columns={'portfolio_key': key_name})
 
-    Returns:
-        df (pd.DataFrame): Dataframe with pkey appended
+    pkey_df_schema = {
+        'acctnbr': str
+    }
+    pkey_df = cdutils.input_cleansing.enforce_schema(pkey_df, pkey_df_schema)
+    assert pd.api.types.is_string_dtype(pkey_df['acctnbr']), "acctnbr is not a string"
 
+    if not pkey_df['acctnbr'].is_unique:
+        print(f"[WARNING] {Path(db_path).name} has duplicate acctnbrs, keeping the first")
+        pkey_df = pkey_df.drop_duplicates(subset='acctnbr', keep='first')
 
-    Operations:
-    - extract pkey from the current.db (or Data Warehouse in future implementations)
-        - this is currently a sqlite.db that is updated on a daily basis to get the current groupings for all relationships
-    - append pkey to the dataframe by grouping on acctnbr and doing a left join
+    return pkey_df.set_index('acctnbr')
 
-    Tests/Asserts:
-    - Test that acctnbr exists in df
-    - Assert the datatypes of acctnbr are the same in both of the dataframes that are being joined
-    - current.db exists (if someone moved it or the drive is offline, this will fail)
+
+class KeyStore:
     """
+    In-process cache of the R360 key tables.
 
-    # Assert that df is not None
-    assert df is not None, "Dataframe must not be none"
-    assert 'portfolio_key' not in df.columns, "Portfolio Key already in the dataframe"
+    Each table is read once and kept as an acctnbr-indexed frame. Before a cached
+    table is reused the source file is stat'ed; a changed mtime or size (R360 has
+    rewritten it) triggers a reload. With a mirror_dir, the database file is first
+    copied to local disk and only re-copied when the share copy changes, so other
+    processes on the same machine also skip the network read.
+    """
+    def __init__(self, base_dir: Path = DB_PATH, mirror_dir: Optional[Path] = MIRROR_DIR):
+        """
+        Args:
+            base_dir (Path): directory holding current.db / ownership.db / address.db
+            mirror_dir (Path): local mirror directory, or None to always read from base_dir
+        """
+        self.base_dir = Path(base_dir)
+        self.mirror_dir = Path(mirror_dir) if mirror_dir is not None else None
+        self._tables: Dict[str, Tuple[Tuple[float, int], pd.DataFrame]] = {}
 
-    DB_PATH = Path(r"\\00-da1\Home\Share\Data & Analytics Initiatives\Project Management\Data_Analytics\R360\Production\assets")
+    def _source_path(self, key_name: str) -> Path:
+        if key_name not in KEY_DATABASES:
+            raise ValueError(f"Unknown key '{key_name}', expected one of {list(KEY_DATABASES)}")
 
-    # Asserts that the pkey database exists
-    assert DB_PATH.exists(), f"Directory that houses pkey not accessible"
-    assert (DB_PATH / "current.db").exists(), f"current.db does not exist or is not accesible"
+        # Asserts that the pkey database exists
+        assert self.base_dir.exists(), f"Directory that houses pkey not accessible"
+        source = self.base_dir / KEY_DATABASES[key_name]
+        assert source.exists(), f"{source.name} does not exist or is not accesible"
+        return source
 
-    engine = create_sqlite_engine('current.db', use_default_dir=False, base_dir=DB_PATH)
-    pkey_df = pd.read_sql("SELECT * FROM current_keys", con=engine)
+    def _local_path(self, source: Path, signature: Tuple[float, int]) -> Path:
+        """
+        Path to read from: the mirror copy (refreshed if stale) or the source itself.
+        """
+        if self.mirror_dir is None:
+            return source
+        mirror = self.mirror_dir / source.name
+        try:
+            stat = mirror.stat()
+            if (stat.st_mtime, stat.st_size) == signature:
+                return mirror
+        except OSError:
+            pass
+        try:
+            self.mirror_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = mirror.with_suffix(f'.{os.getpid()}.tmp')
+            shutil.copy2(source, tmp_path)
+            os.replace(tmp_path, mirror)
+            return mirror
+        except OSError as e:
+            print(f"[WARNING] Could not mirror {source.name} locally, reading from share: {e}")
+            return source
+
+    def get(self, key_name: str = 'portfolio_key') -> pd.DataFrame:
+        """
+        acctnbr-indexed frame with the single column key_name. Do not modify the result in place.
+        """
+        source = self._source_path(key_name)
+        stat = source.stat()
+        signature = (stat.st_mtime, stat.st_size)
 
-    pkey_df = pkey_df.drop(columns='timestamp').copy()
+        cached = self._tables.get(key_name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
 
-    pkey_df_schema = {
-        'acctnbr': str
-    }
-    pkey_df = cdutils.input_cleansing.enforce_schema(pkey_df, pkey_df_schema)
+        table = read_key_table(self._local_path(source, signature), key_name)
+        self._tables[key_name] = (signature, table)
+        return table
 
-    df_schema = {
-        'acctnbr': str
-    }
-    df = cdutils.input_cleansing.enforce_schema(df, df_schema)
+    def lookup(self, key_names: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        All requested keys side by side in one acctnbr-indexed frame, for a single join.
+        """
+        key_names = key_names or list(KEY_DATABASES)
+        tables = [self.get(key_name) for key_name in key_names]
+        if len(tables) == 1:
+            return tables[0]
+        return pd.concat(tables, axis=1, sort=False)
 
+    def invalidate(self, key_name: Optional[str] = None):
+        """
+        Drop one cached table (or all of them) so the next get re-reads it.
+        """
+        if key_name is None:
+            self._tables.clear()
+        else:
+            self._tables.pop(key_name, None)
 
-    # Assert 
-    assert pd.api.types.is_string_dtype(pkey_df['acctnbr']), "acctnbr is not a string"
-    assert pd.api.types.is_string_dtype(df['acctnbr']), "acctnbr is not a string"
 
-    df = pd.merge(df, pkey_df, on='acctnbr', how='left')
+_key_store = None
 
-    return df
 
-def add_ownership_key(df: pd.DataFrame) -> pd.DataFrame:
+def get_key_store() -> KeyStore:
     """
-    Same as add_pkey, but with address only key
+    Return the process-wide KeyStore, creating it on first use.
     """
+    global _key_store
+    if _key_store is None:
+        _key_store = KeyStore()
+    return _key_store
 
-    # Assert that df is not None
-    assert df is not None, "Dataframe must not be none"
-    assert 'ownership_key' not in df.columns, "Portfolio Key already in the dataframe"
 
-    DB_PATH = Path(r"\\00-da1\Home\Share\Data & Analytics Initiatives\Project Management\Data_Analytics\R360\Production\assets")
+def pkey_lookup() -> pd.DataFrame:
+    """
+    acctnbr -> portfolio_key (current.db)
+    """
+    return get_key_store().get('portfolio_key')
 
-    # Asserts that the pkey database exists
-    assert DB_PATH.exists(), f"Directory that houses pkey not accessible"
-    assert (DB_PATH / "ownership.db").exists(), f"current.db does not exist or is not accesible"
 
-    engine = create_sqlite_engine('ownership.db', use_default_dir=False, base_dir=DB_PATH)
-    pkey_df = pd.read_sql("SELECT * FROM current_keys", con=engine)
+def ownership_key_lookup() -> pd.DataFrame:
+    """
+    acctnbr -> ownership_key (ownership.db)
+    """
+    return get_key_store().get('ownership_key')
 
-    pkey_df = pkey_df.drop(columns='timestamp').copy()
 
-    pkey_df_schema = {
-        'acctnbr': str
-    }
-    pkey_df = cdutils.input_cleansing.enforce_schema(pkey_df, pkey_df_schema)
-    pkey_df = pkey_df.rename(columns={'portfolio_key':'ownership_key'}).copy()
+def address_key_lookup() -> pd.DataFrame:
+    """
+    acctnbr -> address_key (address.db)
+    """
+    return get_key_store().get('address_key')
 
-    df_schema = {
-        'acctnbr': str
-    }
-    df = cdutils.input_cleansing.enforce_schema(df, df_schema)
 
+def add_keys(df: pd.DataFrame, key_names: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Attach portfolio_key, ownership_key and address_key (or the subset in key_names) in one join
 
-    # Assert 
-    assert pd.api.types.is_string_dtype(pkey_df['acctnbr']), "acctnbr is not a string"
-    assert pd.api.types.is_string_dtype(df['acctnbr']), "acctnbr is not a string"
+    Usage:
+        raw_data = cdutils.pkey_sqlite.add_keys(raw_data)
+    """
+    assert df is not None, "Dataframe must not be none"
+    key_names = key_names or list(KEY_DATABASES)
+    present = [key_name for key_name in key_names if key_name in df.columns]
+    assert not present, f"{present} already in the dataframe"
 
-    df = pd.merge(df, pkey_df, on='acctnbr', how='left')
+    return cdutils.enrichment.AcctEnrichment(df).add(get_key_store().lookup(key_names)).apply()
 
-    return df
 
-def add_address_key(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Same as add_pkey, but with address only key
+def add_pkey(df: pd.DataFrame) -> pd.DataFrame:
     """
+    Add portfolio key from the R360 process to the dataframe that is passed in as an arguement
 
-    # Assert that df is not None
-    assert df is not None, "Dataframe must not be none"
-    assert 'address_key' not in df.columns, "Portfolio Key already in the dataframe"
+    Args:
+        df (pd.DataFrame): Any dataframe can be passed in as long as it has the "acctnbr" field
 
-    DB_PATH = Path(r"\\00-da1\Home\Share\Data & Analytics Initiatives\Project Management\Data_Analytics\R360\Production\assets")
+    Returns:
+        df (pd.DataFrame): Dataframe with pkey appended
 
-    # Asserts that the pkey database exists
-    assert DB_PATH.exists(), f"Directory that houses pkey not accessible"
-    assert (DB_PATH / "address.db").exists(), f"current.db does not exist or is not accesible"
 
-    engine = create_sqlite_engine('address.db', use_default_dir=False, base_dir=DB_PATH)
-    pkey_df = pd.read_sql("SELECT * FROM current_keys", con=engine)
+    Operations:
+    - extract pkey from the current.db (or Data Warehouse in future implementations)
+        - this is currently a sqlite.db that is updated on a daily basis to get the current groupings for all relationships
+    - append pkey to the dataframe by grouping on acctnbr and doing a left join
 
-    pkey_df = pkey_df.drop(columns='timestamp').copy()
+    Tests/Asserts:
+    - Test that acctnbr exists in df
+    - Assert the datatypes of acctnbr are the same in both of the dataframes that are being joined
+    - current.db exists (if someone moved it or the drive is offline, this will fail)
 
-    pkey_df_schema = {
-        'acctnbr': str
-    }
-    pkey_df = cdutils.input_cleansing.enforce_schema(pkey_df, pkey_df_schema)
-    pkey_df = pkey_df.rename(columns={'portfolio_key':'address_key'}).copy()
+    When appending several keys, use add_keys (or add
+    get_key_store().lookup() to a cdutils.enrichment.AcctEnrichment) so the frame is
+    only joined once. Key tables are cached per process, see KeyStore.
+    """
 
-    df_schema = {
-        'acctnbr': str
-    }
-    df = cdutils.input_cleansing.enforce_schema(df, df_schema)
+    # Assert that df is not None
+    assert df is not None, "Dataframe must not be none"
+    assert 'portfolio_key' not in df.columns, "Portfolio Key already in the dataframe"
 
+    return cdutils.enrichment.AcctEnrichment(df).add(pkey_lookup()).apply()
 
-    # Assert 
-    assert pd.api.types.is_string_dtype(pkey_df['acctnbr']), "acctnbr is not a string"
-    assert pd.api.types.is_string_dtype(df['acctnbr']), "acctnbr is not a string"
+def add_ownership_key(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Same as add_pkey, but with ownership key
+    """
 
-    df = pd.merge(df, pkey_df, on='acctnbr', how='left')
-    
-    return df
+    # Assert that df is not None
+    assert df is not None, "Dataframe must not be none"
+    assert 'ownership_key' not in df.columns, "Ownership Key already in the dataframe"
+
+    return cdutils.enrichment.AcctEnrichment(df).add(ownership_key_lookup()).apply()
+
+def add_address_key(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Same as add_pkey, but with address only key
+    """
+
+    # Assert that df is not None
+    assert df is not None, "Dataframe must not be none"
+    assert 'address_key' not in df.columns, "Address Key already in the dataframe"
 
+    return cdutils.enrichment.AcctEnrichment(df).add(address_key_lookup()).apply()
@@ -5,76 +5,72 @@ Usage:
     import src.cdutils.database
 """
 
-from sqlalchemy import text # type: ignore
 import pandas as pd # type: ignore
 
 import cdutils.database.connect
 import cdutils.input_cleansing # type: ignore
+from cdutils.database.query_template import QueryTemplate, key_filter # type: ignore
 
 
 def append_primary_address(df: pd.DataFrame) -> pd.DataFrame:
     """
     Take in a df with persnbr and append the primary address
+
+    Only the address columns are pulled, with PERSADDRUSE joined to WH_ADDR in
+    the database. When df is small, only its persnbrs are requested.
     """
-    def fetch_data():
-        # acctcommon
+    def fetch_data(persnbrs=None):
         # engine 1
+        persnbr_filter, params = key_filter('a.PERSNBR', persnbrs, name='persnbrs')
 
-        wh_addr = text("""
-        SELECT
-            *
-        FROM
-            OSIBANK.WH_ADDR
-        """)
-
-        persaddruse = text("""
+        primary_address = QueryTemplate(f"""
         SELECT
-            *
+            a.PERSNBR,
+            a.ADDRNBR,
+            b.TEXT1,
+            b.CITYNAME,
+            b.STATECD,
+            b.ZIPCD
         FROM
             OSIBANK.PERSADDRUSE a
+        LEFT JOIN
+            OSIBANK.WH_ADDR b
+            ON a.ADDRNBR = b.ADDRNBR
         WHERE
             a.ADDRUSECD = 'PRI'
-        """)    
+            {persnbr_filter}
+        """)
 
         queries = [
-            {'key':'wh_addr', 'sql':wh_addr, 'engine':1},
-            {'key':'persaddruse', 'sql':persaddruse, 'engine':1},
+            {'key':'primary_address', 'sql':primary_address, 'engine':1, 'params':params},
         ]
 
         data = cdutils.database.connect.retrieve_data(queries)
         return data
-    
-    data = fetch_data()
-
-    wh_addr = data['wh_addr'].copy()
-    persaddruse = data['persaddruse'].copy()
-
-    assert persaddruse['persnbr'].is_unique, "Fail"
 
-    schema_persaddruse = {
-        'addrnbr':'str',
+    schema_df = {
         'persnbr':'str'
     }
 
-    schema_wh_addr = {
-        'addrnbr':'str'
-    }
+    df = cdutils.input_cleansing.enforce_schema(df, schema_df)
 
-    persaddruse = cdutils.input_cleansing.enforce_schema(persaddruse, schema_persaddruse)
-    wh_addr = cdutils.input_cleansing.enforce_schema(wh_addr, schema_wh_addr)
+    data = fetch_data(df['persnbr'])
 
-    wh_addr = wh_addr[['addrnbr','text1','cityname','statecd','zipcd']].copy()
+    merged_address = data['primary_address'].copy()
 
-    merged_address = pd.merge(persaddruse, wh_addr, how='left', on='addrnbr')
+    if merged_address.empty:
+        merged_address = pd.DataFrame(columns=['persnbr','text1','cityname','statecd','zipcd'])
 
-    merged_address = merged_address[['persnbr','text1','cityname','statecd','zipcd']].copy()
+    assert merged_address['persnbr'].is_unique, "Fail"
 
-    schema_df = {
+    schema_merged_address = {
         'persnbr':'str'
     }
 
-    df = cdutils.input_cleansing.enforce_schema(df, schema_df)
+    merged_address = cdutils.input_cleansing.enforce_schema(merged_address, schema_merged_address)
+
+    merged_address = merged_address[['persnbr','text1','cityname','statecd','zipcd']].copy()
 
     df = pd.merge(df, merged_address, how='left', on='persnbr')
 
-    return df 
\ No newline at end of file
+    return df
@@ -0,0 +1,141 @@
+# Reconciliation between two record sets (funding vs vault, report vs mapping, ...)
+"""
+Vectorized record matching.
+
+Keys are normalized once per side and matched with a hash join instead of
+scanning one frame per row of the other. Each left row is paired with the
+first right row (in right order) carrying its key; right rows are not consumed,
+so several left rows may pair with the same right row.
+
+Usage:
+    result = cdutils.reconciliation.reconcile(
+        funding_df, vault_df,
+        left_key=cdutils.reconciliation.normalize_key(funding_df['Application Number']),
+        right_key=cdutils.reconciliation.normalize_key(vault_df['Application Number'], remove=['.0']),
+        left_amount='Amount Financed', right_amount='Amount',
+    )
+    result['matched'], result['mismatched'], result['unmatched_left'], result['unmatched_right']
+"""
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+KeySpec = Union[str, int, pd.Series]
+
+
+def normalize_key(series: pd.Series, strip: bool = True, remove: Optional[List[str]] = None, suffix: Optional[str] = None) -> pd.Series:
+    """
+    String key for matching, computed once for the whole column.
+
+    Args:
+        series (pd.Series): raw key column
+        strip (bool): trim surrounding whitespace
+        remove (List[str]): literal substrings to delete (e.g. ['.0'] for keys that went through float)
+        suffix (str): only keep values ending with suffix, with the suffix cut off; others become NA
+
+    Returns:
+        pd.Series of str (NA where the source was missing or lacked the suffix), same index as series
+    """
+    keys = series.astype(str).where(series.notna())
+    if strip:
+        keys = keys.str.strip()
+    for token in remove or []:
+        keys = keys.str.replace(token, '', regex=False)
+    if suffix:
+        keys = keys.where(keys.str.endswith(suffix, na=False)).str[:-len(suffix)]
+    return keys
+
+
+def _resolve_key(df: pd.DataFrame, key: KeySpec) -> pd.Series:
+    if isinstance(key, pd.Series):
+        assert key.index.equals(df.index), "Key series must share the frame's index"
+        return key
+    return df[key] if isinstance(key, str) else df.iloc[:, key]
+
+
+def _resolve_amount(df: pd.DataFrame, amount: KeySpec) -> np.ndarray:
+    amounts = pd.to_numeric(_resolve_key(df, amount), errors='coerce')
+    return amounts.to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _first_position_by_key(keys: pd.Series, match: str) -> pd.Series:
+    """
+    key -> position of the first right row carrying it.
+
+    For match='suffix' every suffix of every right key is indexed, so a left key
+    finds the first right row whose key ends with it.
+    """
+    keys = keys.reset_index(drop=True)
+    keys = keys[keys.notna()]
+    if match == 'exact':
+        candidates = keys
+    elif match == 'suffix':
+        max_len = int(keys.str.len().max()) if not keys.empty else 0
+        candidates = pd.concat([keys.str[offset:] for offset in range(max_len + 1)])
+    else:
+        raise ValueError("match must be 'exact' or 'suffix'")
+
+    positions = pd.Series(candidates.index, index=candidates.values)
+    positions = positions.sort_values(kind='stable')
+    return positions[~positions.index.duplicated(keep='first')]
+
+
+def _side_by_side(left: pd.DataFrame, right: pd.DataFrame, left_pos: np.ndarray, right_pos: np.ndarray) -> pd.DataFrame:
+    return pd.concat(
+        [left.iloc[left_pos].reset_index(drop=True), right.iloc[right_pos].reset_index(drop=True)],
+        axis=1
+    )
+
+
+def reconcile(left: pd.DataFrame, right: pd.DataFrame, left_key: KeySpec, right_key: KeySpec, left_amount: Optional[KeySpec] = None, right_amount: Optional[KeySpec] = None, match: str = 'exact', tolerance: float = 0.0, right_columns: Optional[List] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Match left rows to right rows on a key and compare amounts.
+
+    Args:
+        left (pd.DataFrame): records to reconcile (e.g. funding)
+        right (pd.DataFrame): records to reconcile against (e.g. vault)
+        left_key / right_key: column name, column position, or a pre-normalized Series
+            (see normalize_key) aligned with the frame
+        left_amount / right_amount: optional amount columns (name, position or Series).
+            Without them every key match counts as matched.
+        match (str): 'exact', or 'suffix' to match right keys that end with the left key
+        tolerance (float): largest absolute amount difference still counted as a match
+        right_columns (List): right columns to carry into the paired frames (default all)
+
+    Returns:
+        dict of frames:
+            'matched': key and amount agree (left columns then right columns, in left order)
+            'mismatched': key matched, amounts differ or are missing
+            'unmatched_left': left rows with no key match (original index kept)
+            'unmatched_right': right rows no left row paired with (original index kept)
+    """
+    left_keys = _resolve_key(left, left_key)
+    right_keys = _resolve_key(right, right_key)
+    first_position = _first_position_by_key(right_keys, match)
+
+    # Hash join: left key -> right position (-1 when absent)
+    right_pos = first_position.reindex(left_keys.values).fillna(-1).to_numpy(dtype='int64')
+    right_pos[left_keys.isna().to_numpy()] = -1
+    paired = right_pos >= 0
+    left_pos = np.flatnonzero(paired)
+    right_pos = right_pos[paired]
+
+    if left_amount is not None and right_amount is not None:
+        left_amounts = _resolve_amount(left, left_amount)[left_pos]
+        right_amounts = _resolve_amount(right, right_amount)[right_pos]
+        amounts_agree = np.abs(left_amounts - right_amounts) <= tolerance
+        amounts_agree &= ~np.isnan(left_amounts) & ~np.isnan(right_amounts)
+    else:
+        amounts_agree = np.ones(len(left_pos), dtype=bool)
+
+    carried = right if right_columns is None else right[right_columns]
+    used_right = np.zeros(len(right), dtype=bool)
+    used_right[right_pos] = True
+
+    return {
+        'matched': _side_by_side(left, carried, left_pos[amounts_agree], right_pos[amounts_agree]),
+        'mismatched': _side_by_side(left, carried, left_pos[~amounts_agree], right_pos[~amounts_agree]),
+        'unmatched_left': left[~paired],
+        'unmatched_right': right[~used_right],
+    }
@@ -0,0 +1,183 @@
+# Shared role lookup (WH_ALLROLES + WH_PERS)
+
+import cdutils.database.connect # type: ignore
+import cdutils.input_cleansing # type: ignore
+import cdutils.lakehouse # type: ignore
+from datetime import date
+from pathlib import Path
+from sqlalchemy import text # type: ignore
+from typing import Dict, List, Optional
+import pandas as pd
+
+# Default output column for each account role code
+ROLE_COLUMN_NAMES = {
+    'SELO': 'Secondary Lending Officer',
+    'CMOR': 'Cash Management Officer',
+    'PTMR': 'Portfolio Manager',
+}
+
+# Local bronze lakehouse (same location append_pm reads from)
+BRONZE = Path(r"C:\Users\w322800\Documents\lakehouse") / "bronze"
+
+
+def fetch_from_allroles() -> Dict[str, pd.DataFrame]:
+    """
+    Gets the role and person columns needed for the index from COCC
+    """
+    wh_allroles = text("""
+    SELECT
+        a.ACCTNBR,
+        a.ACCTROLECD,
+        a.PERSNBR,
+        a.DATELASTMAINT
+    FROM
+        OSIBANK.WH_ALLROLES a
+    """)
+
+    wh_pers = text("""
+    SELECT
+        a.PERSNBR,
+        a.PERSNAME,
+        a.PERSSORTNAME,
+        a.DATELASTMAINT
+    FROM
+        OSIBANK.WH_PERS a
+    """)
+
+    queries = [
+        {'key':'wh_allroles', 'sql':wh_allroles, 'engine':1},
+        {'key':'wh_pers', 'sql':wh_pers, 'engine':1},
+    ]
+
+    data = cdutils.database.connect.retrieve_data(queries)
+    return data
+
+
+class RoleIndex:
+    """
+    Per-role-code index of the latest persnbr on each acctnbr, plus person names.
+
+    Built once from WH_ALLROLES + WH_PERS (live or lakehouse bronze) and reused
+    for every role lookup in the process.
+    """
+    def __init__(self, allroles: pd.DataFrame, pers: pd.DataFrame):
+        """
+        Args:
+            allroles (pd.DataFrame): WH_ALLROLES with acctnbr, acctrolecd, persnbr, datelastmaint
+            pers (pd.DataFrame): WH_PERS with persnbr, name columns and datelastmaint
+        """
+        allroles = allroles[['acctnbr', 'acctrolecd', 'persnbr', 'datelastmaint']]
+        allroles = allroles[allroles['persnbr'].notna()]
+        allroles = cdutils.input_cleansing.enforce_schema(allroles, {'acctnbr': str, 'persnbr': str})
+
+        # Latest assignment wins when a role appears more than once on an account
+        allroles = allroles.sort_values(by='datelastmaint', ascending=False, kind='stable')
+        allroles = allroles.drop_duplicates(subset=['acctrolecd', 'acctnbr'], keep='first')
+
+        self.roles = {
+            role_code: group.set_index('acctnbr')['persnbr']
+            for role_code, group in allroles.groupby('acctrolecd', sort=False)
+        }
+
+        pers = cdutils.input_cleansing.enforce_schema(pers, {'persnbr': str})
+        if 'datelastmaint' in pers.columns:
+            pers = pers.sort_values(by='datelastmaint', ascending=False, kind='stable')
+        pers = pers.drop_duplicates(subset=['persnbr'], keep='first')
+        self.pers = pers.set_index('persnbr')
+
+        assert self.pers.index.is_unique, "pers not unique on persnbr"
+
+    @classmethod
+    def from_database(cls) -> 'RoleIndex':
+        data = fetch_from_allroles()
+        return cls(data['wh_allroles'], data['wh_pers'])
+
+    @classmethod
+    def from_lakehouse(cls, bronze_path: Path = BRONZE) -> 'RoleIndex':
+        allroles = cdutils.lakehouse.read_table(Path(bronze_path) / "wh_allroles", columns=['acctnbr', 'acctrolecd', 'persnbr', 'datelastmaint'], dtype_backend='numpy')
+        pers = cdutils.lakehouse.read_table(Path(bronze_path) / "wh_pers", columns=['persnbr', 'persname', 'perssortname', 'datelastmaint'], dtype_backend='numpy')
+        return cls(allroles, pers)
+
+    def has_role(self, role_code: str) -> bool:
+        return role_code in self.roles
+
+    def officer_names(self, role_code: str, name_field: str = 'perssortname') -> pd.Series:
+        """
+        acctnbr -> officer name for one role code (empty if the role is not present)
+        """
+        if role_code not in self.roles:
+            return pd.Series(dtype=object, index=pd.Index([], dtype=object, name='acctnbr'), name=role_code)
+        persnbr = self.roles[role_code]
+        names = persnbr.map(self.pers[name_field])
+        names.name = role_code
+        return names
+
+
+# (source, bronze_path) -> (day loaded, RoleIndex)
+_ROLE_INDEXES = {}
+
+
+def _today() -> date:
+    return date.today()
+
+
+def get_role_index(source: str = 'database', refresh: bool = False, bronze_path: Path = BRONZE) -> RoleIndex:
+    """
+    Return the process-wide RoleIndex, loading it on first use.
+
+    Indexes are kept per source and bronze_path, and reloaded on a new day so
+    long-lived (warm) workers do not keep yesterday's officer assignments.
+
+    Args:
+        source (str): 'database' (OSIBANK live tables) or 'lakehouse' (bronze Delta tables)
+        refresh (bool): reload even if an index is already loaded
+        bronze_path (Path): bronze location when source='lakehouse'
+    """
+    if source not in ('database', 'lakehouse'):
+        raise ValueError("source must be 'database' or 'lakehouse'")
+
+    key = (source, str(Path(bronze_path)) if source == 'lakehouse' else None)
+    loaded = _ROLE_INDEXES.get(key)
+    if refresh or loaded is None or loaded[0] != _today():
+        if source == 'database':
+            role_index = RoleIndex.from_database()
+        else:
+            role_index = RoleIndex.from_lakehouse(bronze_path)
+        _ROLE_INDEXES[key] = (_today(), role_index)
+    return _ROLE_INDEXES[key][1]
+
+
+def append_roles(df: pd.DataFrame, role_codes: List[str], column_names: Optional[Dict[str, str]] = None, name_field: str = 'perssortname', source: str = 'database', role_index: Optional[RoleIndex] = None) -> pd.DataFrame:
+    """
+    Attach one officer name column per role code to any dataframe keyed on acctnbr.
+
+    All requested roles are attached in a single join against the shared RoleIndex,
+    so WH_ALLROLES / WH_PERS are read once per process no matter how many roles or
+    callers need them.
+
+    Args:
+        df (pd.DataFrame): must contain acctnbr, unique
+        role_codes (List[str]): e.g. ['SELO', 'CMOR', 'PTMR']
+        column_names (Dict): role code -> output column (defaults to ROLE_COLUMN_NAMES, else the code)
+        name_field (str): WH_PERS column to use for the name (perssortname or persname)
+        source (str): 'database' or 'lakehouse'
+        role_index (RoleIndex): pre-built index (skips get_role_index)
+
+    Returns:
+        df with one new column per role code
+
+    Usage:
+        df = cdutils.roles.append_roles(df, ['SELO', 'CMOR'])
+    """
+    column_names = {**ROLE_COLUMN_NAMES, **(column_names or {})}
+    role_index = role_index or get_role_index(source)
+
+    df = cdutils.input_cleansing.enforce_schema(df, {'acctnbr': str})
+    assert df['acctnbr'].is_unique, "acctnbr not unique in df"
+
+    lookup = pd.concat(
+        [role_index.officer_names(role_code, name_field).rename(column_names.get(role_code, role_code)) for role_code in role_codes],
+        axis=1
+    )
+
+    return df.join(lookup, on='acctnbr')
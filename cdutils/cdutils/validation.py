@@ -0,0 +1,175 @@
+# Columnar schema validation
+"""
+Validate a DataFrame against a declared schema with whole-column operations.
+
+Building one pydantic model per row and dumping it back to a frame round-trips
+every value through Python objects. Here each column is converted and checked
+once with vectorized pandas operations. The result is the typed frame plus a
+small report with one row per (column, check) that failed.
+
+Schema: {output column: spec}, with spec keys:
+    'dtype': str, int, float, 'datetime' or 'date'
+             (str is the Arrow-backed STRING_DTYPE, text kept unstripped and numbers converted like
+             input_cleansing.enforce_schema; int is nullable Int64; 'date' is datetime64 at midnight)
+    'alias': source column name when it differs from the output name
+    'nullable': allow missing values (default False); a missing nullable column is created empty
+    'min' / 'max': inclusive bounds (numbers or dates)
+    'allowed': permitted values (codes)
+    'unique': values must not repeat
+
+Checks reported: 'missing' (column absent), 'type' (value present but not convertible),
+'null', 'range', 'allowed', 'unique'.
+
+Usage:
+    schema = {
+        'acctnbr': {'dtype': int, 'unique': True},
+        'loanofficer': {'dtype': str, 'nullable': True},
+        'ytd_30': {'dtype': int, 'alias': 'YTD Over 30', 'min': 0},
+        'nonaccrual': {'dtype': str, 'allowed': ['Yes', 'No']},
+        'nextpaymentdate': {'dtype': 'date', 'alias': 'currduedate', 'nullable': True},
+    }
+    df, report = cdutils.validation.validate(df, schema)
+    # or fail fast:
+    df, _ = cdutils.validation.validate(df, schema, raise_on_violation=True)
+"""
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+import cdutils.input_cleansing # type: ignore
+
+REPORT_COLUMNS = ['column', 'check', 'count', 'examples']
+
+# Offending source values listed per report row
+MAX_EXAMPLES = 3
+
+
+def _convert(series: pd.Series, dtype) -> Tuple[pd.Series, np.ndarray]:
+    """
+    Converted series and a mask of values that were present but could not be converted.
+    """
+    present = series.notna().to_numpy()
+    if dtype in (str, 'str', 'string'):
+        if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+            # Numbers become text the cdutils way (10.0 -> "10")
+            converted = cdutils.input_cleansing.enforce_schema(series.to_frame('value'), {'value': str})['value']
+            return converted.rename(series.name), np.zeros(len(series), dtype=bool)
+        # Text is kept as is (no stripping); other objects are type violations
+        if pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+            failed = np.zeros(len(series), dtype=bool)
+        else:
+            try:
+                failed = present & series.str.len().isna().to_numpy()
+            except AttributeError:
+                failed = present
+        converted = series.mask(failed).astype(cdutils.input_cleansing.STRING_DTYPE)
+        return converted, failed
+
+    if dtype in (int, float):
+        converted = pd.to_numeric(series, errors='coerce')
+        failed = present & converted.isna().to_numpy()
+        if dtype == int:
+            values = converted.to_numpy(dtype='float64', na_value=np.nan)
+            fractional = ~np.isnan(values) & (values != np.round(values))
+            failed |= fractional
+            converted = converted.mask(fractional)
+            converted = converted.round().astype('Int64')
+        else:
+            converted = converted.astype('float64')
+        return converted, failed
+
+    if dtype in ('datetime', 'date', pd.Timestamp):
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            converted = series
+        else:
+            converted = pd.to_datetime(series, errors='coerce')
+        failed = present & converted.isna().to_numpy()
+        if dtype == 'date':
+            # A date field takes only midnight timestamps
+            with_time = (converted.notna() & (converted != converted.dt.normalize())).to_numpy()
+            failed |= with_time
+            converted = converted.mask(with_time)
+        return converted, failed
+
+    raise ValueError(f"Unsupported dtype {dtype!r}")
+
+
+def _examples(values: pd.Series, mask: np.ndarray) -> list:
+    return values[mask].head(MAX_EXAMPLES).tolist()
+
+
+def validate(df: pd.DataFrame, schema: dict, keep_extra: bool = False, raise_on_violation: bool = False) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Convert and check df against schema, column by column.
+
+    Args:
+        df (pd.DataFrame): input frame (not modified)
+        schema (dict): output column -> spec (see module docstring)
+        keep_extra (bool): keep columns not in the schema after the schema columns
+        raise_on_violation (bool): raise ValueError listing the violations instead of returning them
+
+    Returns:
+        (typed, report)
+            typed: schema columns in schema order, renamed from their aliases, converted.
+                Values that failed the type check are missing; other violations are left as is.
+            report: one row per failed check with 'column', 'check', 'count' and up to
+                MAX_EXAMPLES offending 'examples' (empty when everything passed)
+    """
+    columns = {}
+    violations = []
+
+    def add_violation(column, check, mask, values):
+        count = int(mask.sum())
+        if count:
+            violations.append({'column': column, 'check': check, 'count': count, 'examples': _examples(values, mask)})
+
+    for column, spec in schema.items():
+        source = spec.get('alias', column)
+        nullable = spec.get('nullable', False)
+
+        if source not in df.columns:
+            if not nullable:
+                violations.append({'column': column, 'check': 'missing', 'count': len(df), 'examples': []})
+            columns[column], _ = _convert(pd.Series([None] * len(df), index=df.index, dtype=object), spec['dtype'])
+            continue
+
+        raw = df[source]
+        converted, failed = _convert(raw, spec['dtype'])
+        add_violation(column, 'type', failed, raw)
+
+        missing = converted.isna().to_numpy()
+        if not nullable:
+            add_violation(column, 'null', missing & ~failed, raw)
+
+        present = ~missing
+        if 'min' in spec or 'max' in spec:
+            low, high = spec.get('min'), spec.get('max')
+            if spec['dtype'] in ('datetime', 'date', pd.Timestamp):
+                low = pd.Timestamp(low) if low is not None else None
+                high = pd.Timestamp(high) if high is not None else None
+            out_of_range = np.zeros(len(df), dtype=bool)
+            if low is not None:
+                out_of_range |= present & (converted < low).fillna(False).to_numpy(dtype=bool)
+            if high is not None:
+                out_of_range |= present & (converted > high).fillna(False).to_numpy(dtype=bool)
+            add_violation(column, 'range', out_of_range, raw)
+
+        if 'allowed' in spec:
+            add_violation(column, 'allowed', present & ~converted.isin(list(spec['allowed'])).to_numpy(dtype=bool), raw)
+
+        if spec.get('unique'):
+            add_violation(column, 'unique', present & converted.duplicated(keep=False).to_numpy(), raw)
+
+        columns[column] = converted
+
+    typed = pd.DataFrame(columns, index=df.index)
+    if keep_extra:
+        sources = {spec.get('alias', column) for column, spec in schema.items()}
+        extra = [column for column in df.columns if column not in sources and column not in typed.columns]
+        typed = pd.concat([typed, df[extra]], axis=1)
+
+    report = pd.DataFrame(violations, columns=REPORT_COLUMNS)
+    if raise_on_violation and not report.empty:
+        raise ValueError(f"Schema validation failed:\n{report.to_string(index=False)}")
+    return typed, report
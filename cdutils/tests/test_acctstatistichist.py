@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+import cdutils.acctstatistichist
+
+
+def history(rows):
+    return pd.DataFrame(rows, columns=['ACCTNBR', 'STATISTICTYPCD', 'YEARNBR', 'MONTHCD', 'STATISTICCOUNT'])
+
+
+class FakeFetch:
+    """Stands in for the ACCTSTATISTICHIST pull and records the requested watermark."""
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __call__(self, from_period):
+        self.calls.append(from_period)
+        df = history(self.rows)
+        periods = df['YEARNBR'].astype(int) * 100 + df['MONTHCD'].astype(int)
+        return df[periods >= from_period].reset_index(drop=True)
+
+
+class TestAcctStatStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.fetch = FakeFetch([
+            (1, 'DOD', 2024, '10', 2),
+            (1, 'DOD', 2025, '1', 1),
+            (1, 'NSF', 2025, '2', 3),
+            (2, 'DOD', 2025, '3', 5),
+            (2, 'PD30', 2025, '3', 1),
+        ])
+        self.store = cdutils.acctstatistichist.AcctStatStore(Path(self.tmpdir.name), reload_months=2, fetch=self.fetch)
+
+    def test_incremental_refresh(self):
+        self.assertEqual(self.store.refresh(), 5)
+        self.assertEqual(self.store.periods(), [202410, 202501, 202502, 202503])
+
+        # Open month grows, a new month appears
+        self.fetch.rows[-1] = (2, 'PD30', 2025, '3', 2)
+        self.fetch.rows.append((2, 'DOD', 2025, '4', 1))
+        self.assertEqual(self.store.refresh(), 0)  # fresh, skipped
+        self.assertEqual(self.store.refresh(force=True), 4)
+
+        self.assertEqual(self.fetch.calls, [0, 202502])
+        self.assertEqual(self.store.periods(), [202410, 202501, 202502, 202503, 202504])
+        march = self.store.read(datetime(2025, 3, 1), datetime(2025, 3, 31), codes=['PD30'])
+        self.assertEqual(march['statisticcount'].tolist(), [2])
+
+    def test_window_counts_match_pandas_filter(self):
+        self.store.refresh()
+        as_of = datetime(2025, 10, 18)
+        ttm = self.store.ttm_counts(as_of, codes=['DOD', 'NSF'])
+        self.assertEqual(ttm.loc['1', 'DOD'], 3)  # Oct 2024 is inside the window that starts 2024-10-01
+        self.assertEqual(ttm.loc['2', 'DOD'], 5)
+        self.assertTrue(pd.isna(ttm.loc['2', 'NSF']))
+
+        ytd = self.store.ytd_counts(as_of, codes=['DOD'])
+        self.assertEqual(ytd.loc['1', 'DOD'], 1)
+
+        # Memoized until the next refresh
+        self.assertEqual(len(list((Path(self.tmpdir.name) / 'aggregates').glob('*.parquet'))), 2)
+        pd.testing.assert_frame_equal(self.store.ttm_counts(as_of, codes=['DOD', 'NSF']), ttm, check_index_type=False)
+
+    def test_empty_window(self):
+        self.store.refresh()
+        counts = self.store.window_counts(datetime(2030, 1, 1), None, codes=['DOD'])
+        self.assertTrue(counts.empty)
+        self.assertEqual(list(counts.columns), ['DOD'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import importlib.util
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from cdutils.database import connect
+from cdutils.database.batch_lookup import lookup_many
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "aiosqlite not installed")
+class TestLookupMany(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        db_path = Path(self.tmpdir.name) / "test.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE wh_acctcommon (acctnbr INTEGER, product TEXT, effdate TEXT)")
+        conn.executemany("INSERT INTO wh_acctcommon VALUES (?, ?, ?)", [
+            (1, 'Auto', '2023-01-31'), (1, 'Repossessed Collateral', '2024-01-31'),
+            (2, 'Boat', '2023-01-31'), (3, 'RV', '2023-01-31'), (4, 'Auto', '2023-01-31'), (5, 'Auto', '2023-01-31'),
+        ])
+        conn.commit()
+        conn.close()
+
+        url = f"sqlite+aiosqlite:///{db_path}"
+        self.registry = connect.EngineRegistry(tns_admin_path=Path(self.tmpdir.name), connection_strings={1: url, 2: url})
+        patcher = mock.patch.object(connect, '_registry', self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.registry.dispose)
+
+    def test_chunks_cover_all_keys(self):
+        with mock.patch.object(connect, 'retrieve_data', wraps=connect.retrieve_data) as retrieve:
+            result = lookup_many('main.wh_acctcommon', 'ACCTNBR', ['1', 2.0, 3, 4, 5, 99, None, 1], ['PRODUCT'], engine=2, chunk_size=2)
+        self.assertEqual(retrieve.call_count, 1)
+        self.assertEqual(len(retrieve.call_args[0][0]), 3)
+        self.assertEqual(list(result.columns), ['acctnbr', 'product'])
+        self.assertEqual(sorted(result['acctnbr']), ['1', '1', '2', '3', '4', '5'])
+
+    def test_extra_condition(self):
+        result = lookup_many('main.wh_acctcommon', 'ACCTNBR', [1], ['PRODUCT'], where="a.EFFDATE < :cutoff", params={'cutoff': '2024-01-01'})
+        self.assertEqual(result['product'].tolist(), ['Auto'])
+
+    def test_no_keys(self):
+        result = lookup_many('main.wh_acctcommon', 'ACCTNBR', [], ['PRODUCT'])
+        self.assertTrue(result.empty)
+        self.assertEqual(list(result.columns), ['acctnbr', 'product'])
+
+    def test_rejects_injected_identifier(self):
+        with self.assertRaises(ValueError):
+            lookup_many('main.wh_acctcommon; DROP TABLE x', 'ACCTNBR', [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
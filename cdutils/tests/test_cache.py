@@ -0,0 +1,105 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import date
+
+import pandas as pd
+from sqlalchemy import text
+
+from cdutils.database.cache import QueryCache, is_closed_month_end, table_schemas
+
+
+class TestQueryCachePolicy(unittest.TestCase):
+    def setUp(self):
+        self.cache = QueryCache(cache_dir=tempfile.mkdtemp(), live_ttl=60)
+
+    def test_closed_month_end_snapshot_is_immutable(self):
+        sql = text("""
+        SELECT a.ACCTNBR FROM COCCDM.WH_ACCTCOMMON a
+        WHERE a.EFFDATE = TO_DATE('2024-12-31 00:00:00', 'YYYY-MM-DD HH24:MI:SS')
+        """)
+        self.assertEqual(self.cache.ttl_for(sql), float('inf'))
+
+    def test_bound_effdate(self):
+        sql = text("SELECT * FROM COCCDM.WH_LOANS a WHERE a.RUNDATE = :effdate").bindparams(effdate=date(2024, 6, 30))
+        self.assertEqual(self.cache.ttl_for(sql), float('inf'))
+
+    def test_open_or_non_month_end_not_cached(self):
+        mid_month = text("SELECT * FROM COCCDM.WH_ACCTCOMMON a WHERE a.EFFDATE = TO_DATE('2024-06-14', 'YYYY-MM-DD')")
+        no_date = text("SELECT * FROM COCCDM.WH_ACCTCOMMON a")
+        self.assertIsNone(self.cache.ttl_for(mid_month))
+        self.assertIsNone(self.cache.ttl_for(no_date))
+
+    def test_comma_joined_live_table_not_cached_forever(self):
+        sql = text("""
+        SELECT a.ACCTNBR FROM COCCDM.WH_ACCTCOMMON a, OSIBANK.WH_ALLROLES b
+        WHERE a.ACCTNBR = b.ACCTNBR AND a.EFFDATE = TO_DATE('2024-12-31', 'YYYY-MM-DD')
+        """)
+        self.assertEqual(self.cache.ttl_for(sql), 60)
+        self.assertIsNone(QueryCache(cache_dir=tempfile.mkdtemp()).ttl_for(sql))
+
+    def test_table_schemas(self):
+        self.assertEqual(table_schemas(
+            "SELECT a.X, b.Y FROM COCCDM.WH_ACCTCOMMON a, COCCDM.WH_LOANS b "
+            "JOIN COCCDM.WH_ACCTLOAN c ON c.ACCTNBR = a.ACCTNBR "
+            "WHERE a.ACCTNBR IN (SELECT d.ACCTNBR FROM COCCDM.WH_ACCT d)"
+        ), {'COCCDM'})
+        self.assertIsNone(table_schemas("SELECT * FROM COCCDM.WH_ACCTCOMMON a, WH_LOCAL b"))
+        snapshot_with_unknown = text("SELECT * FROM COCCDM.WH_ACCTCOMMON a, OTHER_TABLE b WHERE a.EFFDATE = TO_DATE('2024-12-31', 'YYYY-MM-DD')")
+        self.assertIsNone(self.cache.ttl_for(snapshot_with_unknown))
+
+    def test_live_table_gets_ttl(self):
+        self.assertEqual(self.cache.ttl_for(text("SELECT * FROM OSIBANK.WH_ALLROLES a")), 60)
+
+    def test_live_table_not_cached_by_default(self):
+        cache = QueryCache(cache_dir=tempfile.mkdtemp())
+        self.assertIsNone(cache.ttl_for(text("SELECT * FROM OSIBANK.WH_ALLROLES a")))
+
+    def test_is_closed_month_end(self):
+        self.assertTrue(is_closed_month_end('2024-02-29'))
+        self.assertFalse(is_closed_month_end('2024-02-28'))
+        self.assertFalse(is_closed_month_end(date(2999, 1, 31)))
+        self.assertTrue(is_closed_month_end('08/31/2025'))
+        self.assertTrue(is_closed_month_end('2024-02-29 00:00:00'))
+        self.assertFalse(is_closed_month_end('not a date'))
+
+    def test_unparseable_bind_not_cached(self):
+        sql = text("SELECT * FROM COCCDM.WH_LOANS a WHERE a.RUNDATE = :effdate").bindparams(effdate='last month')
+        self.assertIsNone(self.cache.ttl_for(sql))
+
+
+class TestQueryCacheStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = QueryCache(cache_dir=self.tmpdir.name)
+        self.df = pd.DataFrame({'acctnbr': ['1', '2'], 'bal': [1.5, 2.5]})
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_key_ignores_whitespace(self):
+        a = self.cache.make_key(text("SELECT *  FROM OSIBANK.WH_PERS"), 1)
+        b = self.cache.make_key(text("SELECT *\n    FROM OSIBANK.WH_PERS"), 1)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, self.cache.make_key(text("SELECT * FROM OSIBANK.WH_PERS"), 2))
+
+    def test_round_trip_and_expiry(self):
+        self.cache.put('fresh', self.df, ttl=60)
+        self.cache.put('stale', self.df, ttl=-1)
+        pd.testing.assert_frame_equal(self.cache.get('fresh'), self.df)
+        self.assertIsNone(self.cache.get('stale'))
+
+    def test_lru_eviction(self):
+        self.cache.put('old', self.df, ttl=float('inf'))
+        self.cache.put('new', self.df, ttl=float('inf'))
+        old_path = self.cache._paths('old')[0]
+        os.utime(old_path, (time.time() - 100, time.time() - 100))
+        self.cache.max_bytes = self.cache._paths('new')[0].stat().st_size
+        self.cache.evict()
+        self.assertIsNone(self.cache.get('old'))
+        self.assertIsNotNone(self.cache.get('new'))
+
+
+if __name__ == '__main__':
+    unittest.main()
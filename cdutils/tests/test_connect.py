@@ -0,0 +1,197 @@
+import asyncio
+import importlib.util
+import os
+import signal
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+from sqlalchemy import text
+
+from cdutils.database import connect
+from cdutils.database.cache import QueryCache
+
+
+@unittest.skipUnless(importlib.util.find_spec("aiosqlite"), "aiosqlite not installed")
+class TestEngineRegistry(unittest.TestCase):
+    def setUp(self):
+        """Build a registry against a throwaway SQLite file in place of the Oracle engines."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        db_path = Path(self.tmpdir.name) / "test.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE wh_acctcommon (acctnbr INTEGER, ownersortname TEXT)")
+        conn.executemany("INSERT INTO wh_acctcommon VALUES (?, ?)", [(1, "SMITH"), (2, "JONES")])
+        conn.commit()
+        conn.close()
+
+        url = f"sqlite+aiosqlite:///{db_path}"
+        self.registry = connect.EngineRegistry(
+            tns_admin_path=Path(self.tmpdir.name),
+            connection_strings={1: url, 2: url},
+        )
+
+    def tearDown(self):
+        self.registry.dispose()
+        self.tmpdir.cleanup()
+
+    def test_engine_reused_across_calls(self):
+        """The same pooled engine is handed out on every call."""
+        first = self.registry.get_engine(1)
+        df = self.registry.run(self.registry.query(text("SELECT * FROM wh_acctcommon"), engine=1))
+        self.assertEqual(len(df), 2)
+        self.assertIs(self.registry.get_engine(1), first)
+
+    def test_invalid_engine(self):
+        with self.assertRaises(ValueError):
+            self.registry.get_engine(3)
+
+    def test_dispose_then_reuse(self):
+        """After dispose the registry rebuilds engines lazily."""
+        self.registry.run(self.registry.query(text("SELECT 1 AS x"), engine=2))
+        self.registry.dispose()
+        df = self.registry.run(self.registry.query(text("SELECT 1 AS x"), engine=2))
+        self.assertEqual(df['x'].tolist(), [1])
+
+    def test_query_arrow_matches_query(self):
+        """Streaming fetch returns the same rows as the default path, with Arrow dtypes."""
+        sql = text("SELECT * FROM wh_acctcommon ORDER BY acctnbr")
+        df = self.registry.run(self.registry.query(sql, engine=1))
+        streamed = self.registry.run(self.registry.query_arrow(sql, engine=1, chunk_rows=1))
+        self.assertEqual(streamed['acctnbr'].tolist(), df['acctnbr'].tolist())
+        self.assertIsInstance(streamed['ownersortname'].dtype, pd.ArrowDtype)
+
+    def test_query_arrow_empty(self):
+        streamed = self.registry.run(self.registry.query_arrow(text("SELECT * FROM wh_acctcommon WHERE 0"), engine=1))
+        self.assertTrue(streamed.empty)
+
+
+class SleepRegistry(connect.EngineRegistry):
+    """Registry whose queries sleep for sql seconds instead of hitting a database."""
+    def __init__(self, concurrency):
+        super().__init__(tns_admin_path=Path("."), connection_strings={}, concurrency=concurrency)
+        self.started = []
+        self.running = 0
+        self.max_running = 0
+
+    async def query(self, sql_query, engine=1):
+        self.started.append(sql_query)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            if sql_query == 'fail':
+                raise RuntimeError("boom")
+            await asyncio.sleep(float(sql_query))
+            return pd.DataFrame({'x': [1]})
+        finally:
+            self.running -= 1
+
+
+class TestScheduler(unittest.TestCase):
+    def setUp(self):
+        self.registry = SleepRegistry(concurrency={1: 1, 2: 2})
+        patcher = mock.patch.object(connect, '_registry', self.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.registry.dispose)
+
+    def test_priority_order_and_limit(self):
+        """Lower priority starts first and engine 1 never runs more than one query."""
+        queries = [
+            {'key': 'big', 'sql': '0.02', 'engine': 1},
+            {'key': 'lookup', 'sql': '0.01', 'engine': 1, 'priority': -1},
+        ]
+        data, timings = connect.retrieve_data(queries, return_timings=True)
+        self.assertEqual(list(data), ['big', 'lookup'])
+        self.assertEqual(self.registry.started, ['0.01', '0.02'])
+        self.assertEqual(self.registry.max_running, 1)
+        self.assertEqual(timings['big']['status'], 'ok')
+        self.assertEqual(timings['big']['rows'], 1)
+        self.assertGreater(timings['big']['wait_seconds'], 0)
+
+    def test_cache_is_opt_in(self):
+        """Results only reach the local query cache when cache=True is passed."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            query_cache = QueryCache(cache_dir=cache_dir)
+            query_cache.ttl_for = lambda sql_query: 60
+            with mock.patch.object(connect, 'get_cache', return_value=query_cache):
+                connect.retrieve_data([{'key': 'a', 'sql': '0', 'engine': 1}])
+                self.assertEqual(list(Path(cache_dir).iterdir()), [])
+                connect.retrieve_data([{'key': 'a', 'sql': '0', 'engine': 1}], cache=True)
+                self.assertEqual(len(list(Path(cache_dir).glob('*.parquet'))), 1)
+
+    def test_timeout(self):
+        with self.assertRaises(TimeoutError):
+            connect.retrieve_data([{'key': 'slow', 'sql': '1', 'engine': 2, 'timeout': 0.01}])
+
+    def test_failure_cancels_siblings(self):
+        queries = [
+            {'key': 'slow', 'sql': '5', 'engine': 2},
+            {'key': 'bad', 'sql': 'fail', 'engine': 2},
+        ]
+        with self.assertRaises(RuntimeError):
+            connect.retrieve_data(queries)
+        self.assertEqual(self.registry.running, 0)
+
+
+
+class TestLoopRecovery(unittest.TestCase):
+    def setUp(self):
+        self.registry = SleepRegistry(concurrency={1: 1})
+        self.addCleanup(self.registry.dispose)
+
+    def test_dead_loop_thread_is_replaced(self):
+        self.registry.run(self.registry.query('0', engine=1))
+        old_loop = self.registry._loop
+        old_loop.call_soon_threadsafe(old_loop.stop)
+        self.registry._thread.join(timeout=5)
+
+        df = self.registry.run(self.registry.query('0', engine=1))
+        self.assertEqual(df['x'].tolist(), [1])
+        self.assertIsNot(self.registry._loop, old_loop)
+
+    def _exit_code_in_child(self, child):
+        """Fork, run child() in the child (exit 0 if it returns True), and return its exit code (None if it hung)."""
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = 0 if child() else 1
+            finally:
+                os._exit(code)
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if done:
+                return os.waitstatus_to_exitcode(status)
+            time.sleep(0.05)
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        return None
+
+    def _query_then_dispose(self):
+        ok = self.registry.run(self.registry.query('0', engine=1))['x'].tolist() == [1]
+        self.registry.dispose()
+        return ok
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "fork not available")
+    def test_forked_child_does_not_hang(self):
+        """A child inherits the loop object but not its thread; run() and dispose() must still return."""
+        self.registry.run(self.registry.query('0', engine=1))
+        self.assertEqual(self._exit_code_in_child(self._query_then_dispose), 0)
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "fork not available")
+    def test_at_fork_hook_resets_registry(self):
+        self.registry.run(self.registry.query('0', engine=1))
+
+        def child():
+            self.registry._after_fork_in_child()
+            return self.registry._loop is None and self._query_then_dispose()
+
+        self.assertEqual(self._exit_code_in_child(child), 0)
+
+if __name__ == '__main__':
+    unittest.main()
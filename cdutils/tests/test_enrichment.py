@@ -0,0 +1,57 @@
+import unittest
+
+import pandas as pd
+
+import cdutils.enrichment
+import cdutils.hhnbr
+
+
+class TestAcctEnrichment(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({'acctnbr': [3.0, 1.0, 2.0], 'bal': [300, 100, 200]}, index=[10, 11, 12])
+        self.pkey = pd.DataFrame({'acctnbr': ['1', '2'], 'portfolio_key': [7, 8]})
+        self.househldacct = pd.DataFrame({
+            'acctnbr': [1, 1, 3],
+            'householdnbr': [50, 51, 52],
+            'datelastmaint': pd.to_datetime(['2024-01-01', '2024-02-01', '2024-01-01']),
+        })
+
+    def test_matches_sequential_merges(self):
+        """One join gives the columns, row order and RangeIndex of the old chain of pd.merge calls."""
+        household = cdutils.hhnbr.household_lookup(self.househldacct)
+        inactive = pd.Series(pd.to_datetime(['2023-05-01']), index=pd.Index([2], name='acctnbr'), name='inactivedate')
+
+        result = (
+            cdutils.enrichment.AcctEnrichment(self.df)
+            .add(self.pkey)
+            .add(household)
+            .add(inactive)
+            .apply()
+        )
+
+        self.assertEqual(list(result.columns), ['acctnbr', 'bal', 'portfolio_key', 'householdnbr', 'datelastmaint', 'inactivedate'])
+        self.assertEqual(result['acctnbr'].tolist(), ['3', '1', '2'])
+        self.assertEqual(result['householdnbr'].iloc[:2].tolist(), [52, 51])
+        self.assertEqual(result['portfolio_key'].iloc[1:].tolist(), [7, 8])
+        self.assertEqual(result['inactivedate'].iloc[2], pd.Timestamp('2023-05-01'))
+        self.assertTrue(result.index.equals(pd.RangeIndex(3)))
+
+    def test_repeated_keys_fan_out(self):
+        """A lookup with repeated keys multiplies rows like pd.merge and keeps column order."""
+        repeated = pd.DataFrame({'acctnbr': ['1', '1'], 'tag': ['a', 'b']})
+        result = cdutils.enrichment.AcctEnrichment(self.df).add(repeated).add(self.pkey).apply()
+        self.assertEqual(len(result), 4)
+        self.assertEqual(list(result.columns), ['acctnbr', 'bal', 'tag', 'portfolio_key'])
+
+    def test_overlapping_columns_rejected(self):
+        enrichment = cdutils.enrichment.AcctEnrichment(self.df)
+        with self.assertRaises(ValueError):
+            enrichment.add(pd.DataFrame({'acctnbr': ['1'], 'bal': [1]}))
+
+    def test_keys(self):
+        enrichment = cdutils.enrichment.AcctEnrichment(self.df)
+        self.assertEqual(sorted(enrichment.keys()), ['1', '2', '3'])
+
+
+if __name__ == '__main__':
+    unittest.main()
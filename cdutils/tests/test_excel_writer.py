@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import load_workbook
+
+import cdutils.excel_writer
+
+
+class TestExcelWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = Path(self.tmpdir.name) / "out.xlsx"
+        self.df = pd.DataFrame({
+            'acctnbr': [1, 2, None, 3],
+            'name': ['A', '=cmd()', None, 'Total'],
+            'balance': [1000.5, 20.25, None, 1020.75],
+            'duedate': pd.to_datetime(['2025-01-31', None, None, '2025-03-31']),
+            'Tag Type': ['data', 'data', 'blank', 'sum'],
+        })
+
+    def test_styles_resolved_in_one_pass(self):
+        spec = {
+            'format': {'font_name': 'Arial', 'font_size': 10},
+            'start_row': 4,
+            'preamble': [{'row': 0, 'col': 0, 'value': 'REPORT', 'format': {'bold': True, 'font_size': 14}}],
+            'header': {'format': {'bold': True, 'text_wrap': True}, 'height': 44},
+            'columns': {'balance': {'width': 12, 'format': {'num_format': '#,##0.00'}}},
+            'exclude': ['Tag Type'],
+            'row_formats': [(self.df['Tag Type'].eq('sum'), {'bold': True, 'bottom': 6})],
+            'freeze_panes': (5, 0),
+        }
+        cdutils.excel_writer.write_excel(self.path, self.df, spec)
+
+        ws = load_workbook(self.path).active
+        self.assertEqual(ws['A1'].value, 'REPORT')
+        self.assertEqual(ws['A1'].font.sz, 14)
+        self.assertEqual([cell.value for cell in ws[5]], ['acctnbr', 'name', 'balance', 'duedate'])
+        self.assertEqual(ws.row_dimensions[5].height, 44)
+        self.assertEqual(ws['B7'].value, '=cmd()')  # text, not a formula
+        self.assertEqual(ws['C6'].number_format, '#,##0.00')
+        self.assertEqual(ws['D6'].number_format, 'mm/dd/yyyy')
+        self.assertIsNone(ws['A8'].value)
+        self.assertTrue(ws['C9'].font.b)
+        self.assertEqual(ws['C9'].border.bottom.style, 'double')
+        self.assertEqual(ws['C9'].number_format, '#,##0.00')
+        self.assertFalse(ws['C6'].font.b)
+        self.assertEqual(ws['C6'].font.name, 'Arial')
+        self.assertAlmostEqual(ws.column_dimensions['C'].width, 12.71, places=2)  # xlsxwriter stores width + padding
+        self.assertEqual(ws.freeze_panes, 'A6')
+
+    def test_bands_totals_and_multiple_sheets(self):
+        spec = {
+            'header': False,
+            'bands': {'format': {'bg_color': '#F2F2F2'}},
+            'totals': {'columns': ['balance'], 'label_column': 'name', 'format': {'bold': True}},
+            'exclude': ['Tag Type'],
+        }
+        cdutils.excel_writer.write_sheets(self.path, {'First': (self.df, spec), 'Second': (self.df.iloc[:0], None)})
+
+        wb = load_workbook(self.path)
+        self.assertEqual(wb.sheetnames, ['First', 'Second'])
+        ws = wb['First']
+        self.assertEqual(ws['A1'].value, 1)
+        self.assertEqual(ws['A2'].fill.fgColor.rgb, 'FFF2F2F2')
+        self.assertNotEqual(ws['A1'].fill.fgColor.rgb, 'FFF2F2F2')
+        self.assertEqual(ws['B5'].value, 'Total')
+        self.assertEqual(ws['C5'].value, '=SUM(C1:C4)')
+        self.assertEqual([cell.value for cell in wb['Second'][1]], list(self.df.columns))
+
+    def test_totals_of_empty_frame(self):
+        spec = {'totals': {'columns': ['balance'], 'label_column': 'name'}, 'exclude': ['Tag Type']}
+        cdutils.excel_writer.write_excel(self.path, self.df.iloc[:0], spec)
+
+        ws = load_workbook(self.path).active
+        self.assertEqual(ws['B2'].value, 'Total')
+        self.assertEqual(ws['C2'].value, 0)
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            cdutils.excel_writer.write_excel(self.path, self.df, {'columns': {'missing': {'width': 5}}})
+
+
+if __name__ == '__main__':
+    unittest.main()
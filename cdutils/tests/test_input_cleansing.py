@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cdutils.input_cleansing import STRING_DTYPE, enforce_schema, normalize_key, normalize_key_columns
+
+
+class TestEnforceSchema(unittest.TestCase):
+    def test_float_to_str_drops_decimals(self):
+        df = pd.DataFrame({'acctnbr': [10.0, np.nan, 2.5, 1e20]})
+        result = enforce_schema(df, {'acctnbr': str})
+        self.assertEqual(result['acctnbr'].dtype, STRING_DTYPE)
+        self.assertEqual(result['acctnbr'].tolist()[0], '10')
+        self.assertTrue(pd.isna(result['acctnbr'].iloc[1]))
+        # Rounds half to even, same as f"{x:.0f}"
+        self.assertEqual(result['acctnbr'].tolist()[2:], ['2', '100000000000000000000'])
+
+    def test_object_to_str_strips(self):
+        df = pd.DataFrame({'orgname': [' Org A ', 5, None]})
+        result = enforce_schema(df, {'orgname': 'str'})
+        self.assertEqual(result['orgname'].tolist()[:2], ['Org A', '5'])
+        self.assertTrue(pd.isna(result['orgname'].iloc[2]))
+
+    def test_input_not_modified(self):
+        df = pd.DataFrame({'acctnbr': [1.0, 2.0], 'bal': [1, 2]})
+        enforce_schema(df, {'acctnbr': str, 'bal': float})
+        self.assertEqual(df['acctnbr'].dtype, np.float64)
+        self.assertEqual(df['bal'].dtype, np.int64)
+
+    def test_noop_when_dtype_matches(self):
+        df = enforce_schema(pd.DataFrame({'acctnbr': [1, 2]}), {'acctnbr': str})
+        array = df['acctnbr'].array
+        enforce_schema(df, {'acctnbr': str}, inplace=True)
+        self.assertIs(df['acctnbr'].array, array)
+
+    def test_numeric_datetime_and_missing(self):
+        df = pd.DataFrame({'n': ['1', 'x'], 'd': ['2024-01-31', 'bad']})
+        result = enforce_schema(df, {'n': int, 'd': 'datetime', 'new': float})
+        self.assertEqual(str(result['n'].dtype), 'Int64')
+        self.assertTrue(pd.isna(result['d'].iloc[1]))
+        self.assertIn('new', result.columns)
+
+
+class TestNormalizeKey(unittest.TestCase):
+    def test_matches_str_int_float(self):
+        raw = pd.Series([10.0, '12', '7.0', 3, np.nan, None], dtype=object)
+        result = normalize_key(raw)
+        self.assertEqual(result.dtype, STRING_DTYPE)
+        self.assertEqual(result.tolist()[:4], [str(int(float(x))) for x in raw[:4]])
+        self.assertTrue(result.iloc[4:].isna().all())
+
+    def test_as_int_and_bad_values(self):
+        self.assertEqual(str(normalize_key(pd.Series([1.0, np.nan]), as_int=True).dtype), 'Int64')
+        with self.assertRaises(ValueError):
+            normalize_key(pd.Series(['1', 'abc']))
+        self.assertTrue(pd.isna(normalize_key(pd.Series(['1', 'abc']), errors='coerce').iloc[1]))
+
+    def test_columns_skip_already_normalized(self):
+        df = normalize_key_columns(pd.DataFrame({'persnbr': [1.0, 2.0]}), 'persnbr')
+        array = df['persnbr'].array
+        normalize_key_columns(df, ['persnbr'], inplace=True)
+        self.assertIs(df['persnbr'].array, array)
+
+
+if __name__ == '__main__':
+    unittest.main()
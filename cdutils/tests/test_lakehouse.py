@@ -0,0 +1,101 @@
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.dataset as ds
+from deltalake import DeltaTable, write_deltalake
+
+import cdutils.lakehouse
+
+
+class TestReadTable(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.path = self.root / "silver" / "account"
+        # Two appends -> two files (versions 0 and 1) with disjoint acctnbr ranges
+        write_deltalake(str(self.path), pd.DataFrame({
+            'acctnbr': ['100', '101', '102'],
+            'mjaccttypcd': ['CML', 'MTG', 'CK'],
+            'notebal': [1.0, 2.0, 3.0],
+        }))
+        time.sleep(0.05)
+        write_deltalake(str(self.path), pd.DataFrame({
+            'acctnbr': ['200', '201'],
+            'mjaccttypcd': ['CML', 'SAV'],
+            'notebal': [4.0, None],
+        }), mode='append')
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_columns_and_filters(self):
+        result = cdutils.lakehouse.read_table('silver/account', columns=['acctnbr', 'notebal'], filters=[('acctnbr', 'in', {'101', '200'})], root=self.root)
+        self.assertEqual(list(result.columns), ['acctnbr', 'notebal'])
+        self.assertEqual(sorted(result['acctnbr']), ['101', '200'])
+        self.assertIsInstance(result['notebal'].dtype, pd.ArrowDtype)
+
+    def test_or_filters_and_numpy_backend(self):
+        result = cdutils.lakehouse.read_table(self.path, filters=[[('mjaccttypcd', '=', 'MTG')], [('notebal', '>', 3.5)]], dtype_backend='numpy')
+        self.assertEqual(sorted(result['acctnbr']), ['101', '200'])
+        self.assertEqual(result['notebal'].dtype, 'float64')
+
+    def test_empty_in_list_and_expression(self):
+        result = cdutils.lakehouse.read_table('silver/account', filters=[('acctnbr', 'in', [])], root=self.root)
+        self.assertEqual(len(result), 0)
+        result = cdutils.lakehouse.read_table('silver/account', filters=ds.field('mjaccttypcd') == 'CML', root=self.root)
+        self.assertEqual(sorted(result['acctnbr']), ['100', '200'])
+
+    def test_file_statistics_prune_files(self):
+        dt = DeltaTable(str(self.path))
+        self.assertEqual(len(dt.file_uris(file_pruning_predicate=[('acctnbr', '=', '200')])), 1)
+
+    def test_as_of_version(self):
+        result = cdutils.lakehouse.read_table('silver/account', as_of=0, root=self.root)
+        self.assertEqual(len(result), 3)
+
+    def test_as_of_strings(self):
+        today = date.today().isoformat()
+        self.assertEqual(len(cdutils.lakehouse.read_table('silver/account', as_of=today, root=self.root)), 5)
+        self.assertEqual(len(cdutils.lakehouse.read_table('silver/account', as_of=f"{today} 23:59:59", root=self.root)), 5)
+
+    def test_invalid_name(self):
+        with self.assertRaises(ValueError):
+            cdutils.lakehouse.read_table('account', root=self.root)
+
+
+
+class TestReadSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        path = self.root / "silver_history" / "account"
+        for effdate, acctnbrs in [('2025-08-29', ['100', '101']), ('2025-09-30', ['100']), ('2025-10-01', ['100', '102'])]:
+            write_deltalake(str(path), pd.DataFrame({
+                'acctnbr': acctnbrs,
+                'notebal': [1.0] * len(acctnbrs),
+                'effdate': pd.Timestamp(effdate),
+            }), mode='append', partition_by=['effdate'])
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_snapshot_dates(self):
+        self.assertEqual(cdutils.lakehouse.snapshot_dates('account', root=self.root), [pd.Timestamp('2025-08-29'), pd.Timestamp('2025-09-30'), pd.Timestamp('2025-10-01')])
+
+    def test_month_ends(self):
+        result = cdutils.lakehouse.read_snapshots('account', ['2025-08-29', '2025-09-30'], columns=['acctnbr'], root=self.root, dtype_backend='numpy')
+        self.assertEqual(list(result.columns), ['effdate', 'acctnbr'])
+        self.assertEqual(sorted(zip(result['effdate'].dt.strftime('%Y-%m-%d'), result['acctnbr'])), [('2025-08-29', '100'), ('2025-08-29', '101'), ('2025-09-30', '100')])
+
+    def test_filters_and_missing_snapshot(self):
+        result = cdutils.lakehouse.read_snapshots('account', [date(2025, 10, 1), date(2025, 7, 31)], filters=[('acctnbr', '=', '102')], root=self.root)
+        self.assertEqual(list(result['acctnbr']), ['102'])
+        with self.assertRaises(ValueError):
+            cdutils.lakehouse.read_snapshots('account', [], root=self.root)
+
+
+if __name__ == '__main__':
+    unittest.main()
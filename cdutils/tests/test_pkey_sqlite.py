@@ -0,0 +1,68 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+import cdutils.pkey_sqlite
+
+
+def write_keys(path: Path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute("DROP TABLE IF EXISTS current_keys")
+    conn.execute("CREATE TABLE current_keys (acctnbr INTEGER, portfolio_key TEXT, timestamp TEXT)")
+    conn.executemany("INSERT INTO current_keys VALUES (?, ?, '2024-01-01 00:00:00')", rows)
+    conn.commit()
+    conn.close()
+
+
+class TestKeyStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.share = Path(self.tmpdir.name) / "share"
+        self.share.mkdir()
+        self.mirror = Path(self.tmpdir.name) / "mirror"
+        write_keys(self.share / "current.db", [(1, 'P1'), (2, 'P2')])
+        write_keys(self.share / "ownership.db", [(1, 'O1')])
+        write_keys(self.share / "address.db", [(2, 'A2')])
+        self.store = cdutils.pkey_sqlite.KeyStore(base_dir=self.share, mirror_dir=self.mirror)
+
+    def test_loaded_once_and_mirrored(self):
+        with mock.patch.object(cdutils.pkey_sqlite, 'read_key_table', wraps=cdutils.pkey_sqlite.read_key_table) as reader:
+            first = self.store.get('portfolio_key')
+            second = self.store.get('portfolio_key')
+        self.assertIs(first, second)
+        self.assertEqual(reader.call_count, 1)
+        self.assertEqual(reader.call_args[0][0], self.mirror / "current.db")
+        self.assertEqual(first.loc['1', 'portfolio_key'], 'P1')
+
+    def test_reload_when_source_changes(self):
+        self.store.get('portfolio_key')
+        write_keys(self.share / "current.db", [(1, 'P9')])
+        stat = (self.share / "current.db").stat()
+        os.utime(self.share / "current.db", (stat.st_atime, stat.st_mtime + 10))
+        table = self.store.get('portfolio_key')
+        self.assertEqual(table['portfolio_key'].tolist(), ['P9'])
+        self.assertEqual((self.mirror / "current.db").stat().st_mtime, stat.st_mtime + 10)
+
+    def test_add_keys_single_join(self):
+        df = pd.DataFrame({'acctnbr': [2.0, 1.0, 3.0]})
+        with mock.patch.object(cdutils.pkey_sqlite, '_key_store', self.store):
+            result = cdutils.pkey_sqlite.add_keys(df)
+        self.assertEqual(list(result.columns), ['acctnbr', 'portfolio_key', 'ownership_key', 'address_key'])
+        self.assertEqual(result['portfolio_key'].tolist()[:2], ['P2', 'P1'])
+        self.assertEqual(result['ownership_key'].iloc[1], 'O1')
+        self.assertEqual(result['address_key'].iloc[0], 'A2')
+        self.assertTrue(result.iloc[2, 1:].isna().all())
+
+    def test_unknown_key(self):
+        with self.assertRaises(ValueError):
+            self.store.get('household_key')
+
+
+if __name__ == '__main__':
+    unittest.main()
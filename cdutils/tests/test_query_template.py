@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from cdutils.database.query_template import ORACLE_IN_LIMIT, QueryTemplate, bind_query, key_filter, normalize_keys
+
+
+class TestQueryTemplate(unittest.TestCase):
+    def setUp(self):
+        self.template = QueryTemplate("""
+        SELECT a.ACCTNBR
+        FROM COCCDM.WH_ACCTCOMMON a
+        WHERE a.EFFDATE = :effdate
+          AND a.CURRACCTSTATCD IN :statuses
+        """)
+
+    def test_scalar_and_list_binds(self):
+        clause = self.template.bind(effdate=pd.Timestamp('2024-12-31'), statuses=['ACT', 'NPFM', 'DORM'])
+        params = clause.compile().params
+        self.assertIsInstance(params['effdate'], datetime)
+        self.assertNotIsInstance(params['effdate'], pd.Timestamp)
+        # 3 values are padded up to the 4 bucket by repeating the last value
+        self.assertEqual([params[f'statuses_0_{i}'] for i in range(4)], ['ACT', 'NPFM', 'DORM', 'DORM'])
+
+    def test_statement_text_stable_within_bucket(self):
+        a = str(self.template.bind(effdate=datetime(2024, 1, 31), statuses=['ACT', 'NPFM', 'DORM']))
+        b = str(self.template.bind(effdate=datetime(2024, 2, 29), statuses=['ACT', 'NPFM', 'DORM', 'CLS']))
+        self.assertEqual(a, b)
+
+    def test_in_list_chunked_above_oracle_limit(self):
+        template = QueryTemplate("SELECT * FROM OSIBANK.WH_ACCT a WHERE a.ACCTNBR NOT IN (:accts)")
+        sql = str(template.bind(accts=list(range(ORACLE_IN_LIMIT + 5))))
+        self.assertEqual(sql.count('NOT IN ('), 2)
+        self.assertIn(') AND a.ACCTNBR NOT IN (', sql)
+
+    def test_empty_list(self):
+        sql = str(self.template.bind(effdate=datetime(2024, 1, 31), statuses=[]))
+        self.assertIn('1=0', sql)
+
+    def test_missing_and_unknown_params(self):
+        with self.assertRaises(ValueError):
+            self.template.bind(effdate=datetime(2024, 1, 31))
+        with self.assertRaises(ValueError):
+            self.template.bind(effdate=datetime(2024, 1, 31), statuses=['ACT'], extra=1)
+
+    def test_oracle_format_masks_are_not_binds(self):
+        template = QueryTemplate("SELECT TO_CHAR(a.EFFDATE, 'YYYY-MM-DD HH24:MI:SS') FROM COCCDM.WH_ACCT a WHERE a.ACCTNBR = :acctnbr")
+        self.assertEqual(template.bind_names, {'acctnbr'})
+
+    def test_bind_query_passthrough(self):
+        self.assertEqual(bind_query('SELECT 1'), 'SELECT 1')
+
+
+class TestKeyFilter(unittest.TestCase):
+    def test_normalize_mixed_keys(self):
+        keys = [3, '1', 2.0, '2', '0004', 1.5, 'abc', None, np.nan, pd.NA]
+        self.assertEqual(normalize_keys(keys), [1, 2, 3, 4])
+
+    def test_normalize_series_with_nan(self):
+        self.assertEqual(normalize_keys(pd.Series([10.0, np.nan, 10.0, 7.0])), [7, 10])
+        self.assertEqual(normalize_keys(pd.Series([np.nan, None])), [])
+
+    def test_key_filter(self):
+        fragment, params = key_filter('a.PERSNBR', pd.Series(['5', 5, 6.0]), name='persnbrs')
+        self.assertEqual(fragment, 'AND a.PERSNBR IN :persnbrs')
+        self.assertEqual(params, {'persnbrs': [5, 6]})
+
+    def test_no_keys_or_too_many_keys_means_no_filter(self):
+        self.assertEqual(key_filter('a.PERSNBR', None), ("", {}))
+        self.assertEqual(key_filter('a.PERSNBR', range(10), max_keys=5), ("", {}))
+
+    def test_empty_filter_matches_nothing(self):
+        fragment, params = key_filter('a.PERSNBR', [])
+        self.assertEqual(params, {'keys': []})
+        sql = str(QueryTemplate(f"SELECT a.PERSNBR FROM OSIBANK.PERS a WHERE 1=1 {fragment}").bind(**params))
+        self.assertIn('1=0', sql)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+import pandas as pd
+
+import cdutils.reconciliation
+
+
+class TestReconcile(unittest.TestCase):
+    def setUp(self):
+        self.funding = pd.DataFrame({
+            'app': ['100', ' 200 ', '300', '400', '500'],
+            'amount': ['10.0', '20.0', '30.0', '40.0', ''],
+        })
+        self.vault = pd.DataFrame({
+            'app': [100.0, 200.0, 200.0, 900.0, 500.0],
+            'amount': [10.0, 25.0, 20.0, 90.0, 50.0],
+        })
+
+    def test_exact_match(self):
+        result = cdutils.reconciliation.reconcile(
+            self.funding, self.vault,
+            left_key=cdutils.reconciliation.normalize_key(self.funding['app']),
+            right_key=cdutils.reconciliation.normalize_key(self.vault['app'], remove=['.0']),
+            left_amount='amount', right_amount='amount',
+        )
+        # First vault row per key wins, so 200 pairs with the 25.0 row and is a mismatch
+        self.assertEqual(result['matched'].iloc[:, 0].tolist(), ['100'])
+        self.assertEqual(result['mismatched'].iloc[:, 0].tolist(), [' 200 ', '500'])
+        self.assertEqual(result['unmatched_left'].index.tolist(), [2, 3])
+        self.assertEqual(result['unmatched_right'].index.tolist(), [2, 3])
+        self.assertEqual(list(result['matched'].columns), ['app', 'amount', 'app', 'amount'])
+
+    def test_suffix_match(self):
+        vault = pd.DataFrame({'id': ['X-1_300_DT_BCS', 'Y_400_DT_BCS', '400_OTHER'], 'amount': [30, 41, 40]})
+        result = cdutils.reconciliation.reconcile(
+            self.funding, vault,
+            left_key=cdutils.reconciliation.normalize_key(self.funding['app']),
+            right_key=cdutils.reconciliation.normalize_key(vault['id'], strip=False, suffix='_DT_BCS'),
+            left_amount='amount', right_amount='amount', match='suffix', tolerance=1.0,
+        )
+        self.assertEqual(result['matched'].iloc[:, 0].tolist(), ['300', '400'])
+        self.assertEqual(result['unmatched_right']['id'].tolist(), ['400_OTHER'])
+
+    def test_key_only(self):
+        result = cdutils.reconciliation.reconcile(self.funding, self.vault.astype({'app': str}), 'app', 'app', right_columns=['amount'])
+        self.assertTrue(result['matched'].empty)
+        self.assertEqual(len(result['unmatched_left']), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
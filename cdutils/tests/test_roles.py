@@ -0,0 +1,70 @@
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+import cdutils.roles
+
+
+class TestAppendRoles(unittest.TestCase):
+    def setUp(self):
+        allroles = pd.DataFrame({
+            'acctnbr': [1.0, 1.0, 2.0, 2.0, 3.0],
+            'acctrolecd': ['SELO', 'SELO', 'SELO', 'CMOR', 'PTMR'],
+            'persnbr': [10.0, 11.0, 12.0, 10.0, None],
+            'datelastmaint': pd.to_datetime(['2024-01-01', '2024-02-01', '2024-01-01', '2024-01-01', '2024-01-01']),
+        })
+        pers = pd.DataFrame({
+            'persnbr': [10, 11, 12],
+            'perssortname': ['SMITH JOHN', 'DOE JANE', 'ROE RICHARD'],
+            'persname': ['John Smith', 'Jane Doe', 'Richard Roe'],
+            'datelastmaint': pd.to_datetime(['2024-01-01'] * 3),
+        })
+        self.role_index = cdutils.roles.RoleIndex(allroles, pers)
+        self.df = pd.DataFrame({'acctnbr': [1, 2, 3, 4], 'bal': [100, 200, 300, 400]})
+
+    def test_multiple_roles_one_pass(self):
+        result = cdutils.roles.append_roles(self.df, ['SELO', 'CMOR'], role_index=self.role_index)
+        self.assertEqual(len(result), 4)
+        self.assertEqual(result['Secondary Lending Officer'].tolist()[:2], ['DOE JANE', 'ROE RICHARD'])
+        self.assertEqual(result['Cash Management Officer'].tolist()[1], 'SMITH JOHN')
+        self.assertTrue(result['Cash Management Officer'].iloc[[0, 2, 3]].isna().all())
+
+    def test_missing_role_adds_empty_column(self):
+        result = cdutils.roles.append_roles(self.df, ['PTMR'], role_index=self.role_index)
+        self.assertTrue(result['Portfolio Manager'].isna().all())
+        self.assertFalse(self.role_index.has_role('PTMR'))
+
+    def test_duplicate_acctnbr_rejected(self):
+        with self.assertRaises(AssertionError):
+            cdutils.roles.append_roles(pd.DataFrame({'acctnbr': [1, 1]}), ['SELO'], role_index=self.role_index)
+
+
+
+class TestGetRoleIndex(unittest.TestCase):
+    def setUp(self):
+        cdutils.roles._ROLE_INDEXES.clear()
+        self.addCleanup(cdutils.roles._ROLE_INDEXES.clear)
+        patcher = mock.patch.object(cdutils.roles.RoleIndex, 'from_lakehouse', side_effect=lambda bronze_path: object())
+        self.from_lakehouse = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_keyed_by_bronze_path(self):
+        first = cdutils.roles.get_role_index('lakehouse', bronze_path=Path('a'))
+        second = cdutils.roles.get_role_index('lakehouse', bronze_path=Path('b'))
+        self.assertIsNot(first, second)
+        self.assertIs(cdutils.roles.get_role_index('lakehouse', bronze_path=Path('a')), first)
+        self.assertEqual(self.from_lakehouse.call_count, 2)
+
+    def test_reloaded_on_a_new_day(self):
+        with mock.patch.object(cdutils.roles, '_today', return_value=date(2025, 10, 1)):
+            first = cdutils.roles.get_role_index('lakehouse', bronze_path=Path('a'))
+            self.assertIs(cdutils.roles.get_role_index('lakehouse', bronze_path=Path('a')), first)
+        with mock.patch.object(cdutils.roles, '_today', return_value=date(2025, 10, 2)):
+            self.assertIsNot(cdutils.roles.get_role_index('lakehouse', bronze_path=Path('a')), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+
+import cdutils.validation
+
+
+class TestValidate(unittest.TestCase):
+    def setUp(self):
+        self.schema = {
+            'acctnbr': {'dtype': int, 'unique': True},
+            'product': {'dtype': str},
+            'loanofficer': {'dtype': str, 'nullable': True},
+            'ytd_30': {'dtype': int, 'alias': 'YTD Over 30', 'min': 0},
+            'bookbalance': {'dtype': float},
+            'nonaccrual': {'dtype': str, 'allowed': ['Yes', 'No']},
+            'nextpaymentdate': {'dtype': 'date', 'alias': 'currduedate', 'nullable': True},
+        }
+
+    def test_clean_frame(self):
+        df = pd.DataFrame({
+            'acctnbr': [101.0, Decimal('102')],
+            'product': ['TMLP Saves Loan ', 'Auto'],
+            'loanofficer': [None, 'Smith'],
+            'YTD Over 30': [0, 2],
+            'bookbalance': ['10.5', 3],
+            'nonaccrual': ['No', 'Yes'],
+            'currduedate': [pd.Timestamp('2025-01-31'), None],
+            'extra': [1, 2],
+        })
+        typed, report = cdutils.validation.validate(df, self.schema)
+        self.assertTrue(report.empty)
+        self.assertEqual(list(typed.columns), list(self.schema))
+        self.assertEqual(str(typed['acctnbr'].dtype), 'Int64')
+        self.assertEqual(typed['acctnbr'].tolist(), [101, 102])
+        self.assertEqual(typed['product'][0], 'TMLP Saves Loan ')  # not stripped
+        self.assertEqual(typed['bookbalance'].tolist(), [10.5, 3.0])
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(typed['nextpaymentdate']))
+
+        kept, _ = cdutils.validation.validate(df, self.schema, keep_extra=True)
+        self.assertEqual(list(kept.columns), list(self.schema) + ['extra'])
+
+    def test_violations_reported_per_column(self):
+        df = pd.DataFrame({
+            'acctnbr': [1, 1, 2.5, None],
+            'product': ['A', 5, 'B', 'C'],
+            'YTD Over 30': [0, -1, 1, 2],
+            'bookbalance': [1.0, 'x', 2.0, 3.0],
+            'nonaccrual': ['No', 'Maybe', 'Yes', None],
+            'currduedate': [pd.Timestamp('2025-01-31 10:30'), date(2025, 2, 1), None, None],
+        })
+        typed, report = cdutils.validation.validate(df, self.schema)
+        checks = {(row.column, row.check): row.count for row in report.itertuples()}
+        self.assertEqual(checks, {
+            ('acctnbr', 'type'): 1,
+            ('acctnbr', 'null'): 1,
+            ('acctnbr', 'unique'): 2,
+            ('product', 'type'): 1,
+            ('ytd_30', 'range'): 1,
+            ('bookbalance', 'type'): 1,
+            ('nonaccrual', 'null'): 1,
+            ('nonaccrual', 'allowed'): 1,
+            ('nextpaymentdate', 'type'): 1,
+        })
+        self.assertNotIn(('loanofficer', 'missing'), checks)  # nullable, created empty
+        self.assertEqual(report.set_index(['column', 'check']).loc[('nonaccrual', 'allowed'), 'examples'], ['Maybe'])
+        self.assertTrue(pd.isna(typed['acctnbr'][2]))
+
+    def test_raise_on_violation(self):
+        with self.assertRaisesRegex(ValueError, 'missing'):
+            cdutils.validation.validate(pd.DataFrame({'x': [1]}), {'acctnbr': {'dtype': int}}, raise_on_violation=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
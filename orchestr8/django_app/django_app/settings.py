@@ -141,6 +141,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Celery Configuration
 CELERY_BROKER_URL = 'sqlalchemy+sqlite:///celerydb.sqlite'  # Already set, just confirming
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+# Chords (myapp.tasks.run_dag) need a result backend to know when every step of a wave finished.
+# Only the chord header task (run_dag_node) stores results; every other task sets ignore_result.
+CELERY_RESULT_BACKEND = 'db+sqlite:///celery_results.sqlite'
 
 CACHES = {
     'default': {
@@ -149,6 +152,20 @@ CACHES = {
     }
 }
 
+# Report execution for myapp.tasks
+#   'subprocess' -> a fresh `python -m <module>` process per job
+#   'warm'       -> pre-started workers (myapp.warm_pool) with pandas / SQLAlchemy / oracledb imported
+#                   and the cdutils DB engines created; each worker is replaced after
+#                   max_jobs jobs or once it passes max_memory_mb
+ORCHESTR8_EXECUTION_MODE = os.getenv('ORCHESTR8_EXECUTION_MODE', 'subprocess')
+ORCHESTR8_WARM_POOL = {
+    'size': 1,  # Matches the solo worker: one report at a time
+    'max_jobs': 25,
+    'max_memory_mb': 2048,
+}
+# Seconds a report job may run before it is killed (either mode); unset means no limit
+ORCHESTR8_JOB_TIMEOUT = float(os.getenv('ORCHESTR8_JOB_TIMEOUT')) if os.getenv('ORCHESTR8_JOB_TIMEOUT') else None
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -171,5 +188,10 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'myapp.warm_pool': {
+            'handlers': ['file', 'console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
\ No newline at end of file
@@ -1,6 +1,14 @@
 from django.contrib import admin
+from myapp.models import DagNodeRun
 
 # Register your models here.
 admin.site.site_header = "Data & Analytics Admin Panel"
 admin.site.site_title = "Admin Panel"
-admin.site.index_title = "Data & Analytics Admin Panel"
\ No newline at end of file
+admin.site.index_title = "Data & Analytics Admin Panel"
+
+
+@admin.register(DagNodeRun)
+class DagNodeRunAdmin(admin.ModelAdmin):
+    list_display = ('run_id', 'node', 'module', 'status', 'started_at', 'duration_seconds')
+    list_filter = ('status',)
+    search_fields = ('run_id', 'node', 'module')
@@ -0,0 +1,81 @@
+"""
+DAG definitions for run_dag (myapp.tasks).
+
+A DAG is a list of steps, each a module to run from a cwd plus the names of the
+steps it waits for:
+
+    {
+        "name": "dealer_reserve_recon",
+        "steps": [
+            {"name": "early_payoff", "module": "src.early_payoff_report", "cwd": "...", "upstream": []},
+            {"name": "daily_processing", "module": "src.daily_processing", "cwd": "...", "upstream": []},
+            {"name": "report", "module": "src.report_generator", "cwd": "...", "upstream": ["early_payoff", "daily_processing"]}
+        ]
+    }
+
+Only the standard library is used here, so DAGs can be checked without Django or Celery.
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+REQUIRED_STEP_FIELDS = ('name', 'module', 'cwd')
+
+
+def dag_nodes(steps: List[dict]) -> Dict[str, dict]:
+    """
+    Validate steps and index them by name (upstream defaults to []).
+
+    Raises:
+        ValueError: missing fields, duplicate names, unknown upstream steps or a cycle
+    """
+    nodes = {}
+    for step in steps:
+        missing = [field for field in REQUIRED_STEP_FIELDS if not step.get(field)]
+        if missing:
+            raise ValueError(f"DAG step {step} is missing {missing}")
+        if step['name'] in nodes:
+            raise ValueError(f"Duplicate DAG step name: {step['name']}")
+        nodes[step['name']] = {**step, 'upstream': list(step.get('upstream', []))}
+
+    for name, node in nodes.items():
+        unknown = [upstream for upstream in node['upstream'] if upstream not in nodes]
+        if unknown:
+            raise ValueError(f"DAG step {name} has unknown upstream steps: {unknown}")
+
+    # Cycle check: repeatedly remove steps whose upstreams are all removed
+    remaining = dict(nodes)
+    while remaining:
+        removable = [name for name, node in remaining.items() if not any(upstream in remaining for upstream in node['upstream'])]
+        if not removable:
+            raise ValueError(f"DAG has a cycle between steps: {sorted(remaining)}")
+        for name in removable:
+            del remaining[name]
+
+    return nodes
+
+
+def ready_nodes(nodes: Dict[str, dict], completed: Iterable[str]) -> List[str]:
+    """
+    Steps not yet completed whose upstream steps all are, in definition order.
+    """
+    completed = set(completed)
+    return [
+        name for name, node in nodes.items()
+        if name not in completed and all(upstream in completed for upstream in node['upstream'])
+    ]
+
+
+def default_run_id(steps: List[dict], name: Optional[str] = None, started: Optional[datetime] = None) -> str:
+    """
+    Checkpoint id for a new DAG run: the DAG name (or a hash of its steps) and the time
+    the run started, to the second.
+
+    Every run gets its own id, so a DAG scheduled several times a day (or re-run after it
+    succeeded) runs every step again. To resume a failed run from the steps that have not
+    succeeded yet, pass its run_id explicitly.
+    """
+    if not name:
+        name = hashlib.sha1(json.dumps(steps, sort_keys=True).encode()).hexdigest()[:12]
+    return f"{name}:{(started or datetime.now()).isoformat(timespec='seconds')}"
@@ -3,3 +3,33 @@ from django.db import models
 class BeatHealth(models.Model):
     last_heartbeat = models.DateTimeField()
 
+
+
+class DagNodeRun(models.Model):
+    """
+    Checkpoint and timing of one step of a run_dag run (myapp.tasks).
+
+    A retry with the same run_id skips the steps that already succeeded.
+    """
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('success', 'Success'),
+        ('failed', 'Failed'),
+    ]
+
+    run_id = models.CharField(max_length=200)
+    node = models.CharField(max_length=200)
+    module = models.CharField(max_length=200)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_seconds = models.FloatField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['run_id', 'node'], name='unique_dag_node_per_run'),
+        ]
+
+    def __str__(self):
+        return f"{self.run_id} | {self.node} | {self.status}"
@@ -1,17 +1,56 @@
 import subprocess
 import os
 import sys
+import time
 from pathlib import Path
-from celery import shared_task
+from celery import shared_task, chord, group
+from celery.signals import worker_ready, worker_shutdown
+from django.conf import settings
 from django.utils import timezone
-from myapp.models import BeatHealth
+from myapp.models import BeatHealth, DagNodeRun
+from myapp import dag, warm_pool
 from django.core.cache import cache
 import logging
 import json
 
 logger = logging.getLogger(__name__)
 
-@shared_task
+
+def _warm_mode() -> bool:
+    return getattr(settings, 'ORCHESTR8_EXECUTION_MODE', 'subprocess') == 'warm'
+
+
+def run_module(module, cwd_path, args=()):
+    """
+    Run `python -m module args` from cwd_path with the configured execution mode
+    (settings.ORCHESTR8_EXECUTION_MODE). The worker's own cwd is never changed.
+    A job running past settings.ORCHESTR8_JOB_TIMEOUT seconds is killed.
+
+    Raises subprocess.CalledProcessError when the module fails, subprocess.TimeoutExpired
+    when it times out.
+    """
+    timeout = getattr(settings, 'ORCHESTR8_JOB_TIMEOUT', None)
+    if _warm_mode():
+        result = warm_pool.get_pool(**settings.ORCHESTR8_WARM_POOL).run(module, cwd_path, args, timeout=timeout)
+        logger.info(f"Ran {module} at {cwd_path} in a warm worker in {result['seconds']}s")
+    else:
+        # Use the same Python environment as the Celery worker
+        subprocess.run([sys.executable, '-m', module, *[str(arg) for arg in args]], check=True, cwd=str(cwd_path), timeout=timeout)
+
+
+@worker_ready.connect
+def start_warm_pool(**kwargs):
+    """Start the warm workers with the Celery worker so the first job does not wait for imports."""
+    if _warm_mode():
+        warm_pool.get_pool(**settings.ORCHESTR8_WARM_POOL)
+
+
+@worker_shutdown.connect
+def stop_warm_pool(**kwargs):
+    warm_pool.close_pool()
+
+
+@shared_task(ignore_result=True)
 def run_module_task(module, cwd):
     """
     Run a Python module from a specified cwd with cross-platform compatibility.
@@ -29,16 +68,9 @@ def run_module_task(module, cwd):
         logger.error(f"Task failed: Invalid cwd {cwd}")
         raise ValueError(f"Invalid cwd: {cwd}")
     
-    # Use the same Python environment as the Celery worker
-    python_exe = sys.executable
-    
-    # Store the original cwd to restore later
-    original_cwd = Path.cwd()
     try:
-        # Change to the specified cwd using Path
-        os.chdir(cwd_path)
-        # Run the module (e.g., python -m src.main)
-        subprocess.run([python_exe, '-m', module], check=True)
+        # Run the module (e.g., python -m src.main) from cwd
+        run_module(module, cwd_path)
         logger.info(f"Finished task at {cwd}: {module} at {timezone.localtime()} with success")
     except subprocess.CalledProcessError as e:
         logger.error(f"Task at {cwd}: {module} failed at {timezone.localtime()} with error: {e}")
@@ -46,11 +78,8 @@ def run_module_task(module, cwd):
     except Exception as e:
         logger.error(f"Task at {cwd}: {module} failed at {timezone.localtime()} with error: {e}")
         raise
-    finally:
-        # Restore the original cwd
-        os.chdir(original_cwd)
     
-@shared_task
+@shared_task(ignore_result=True)
 def run_modules_in_sequence(tasks):
     """
     Expects a JSON list of objects, each with module and cwd:
@@ -67,14 +96,95 @@ def run_modules_in_sequence(tasks):
 
     for task in tasks:
         run_module_task(**task)
-        
+
+
+@shared_task(ignore_result=True)
+def run_dag(steps, name=None, run_id=None):
+    """
+    Run steps as a DAG: each step runs once its upstream steps succeeded, and steps
+    that are ready together are dispatched as separate tasks (a chord per wave).
+
+    Example:
+    {
+        "name": "dealer_reserve_recon",
+        "steps": [
+            {"name": "early_payoff", "module": "src.early_payoff_report", "cwd": "\\\\00-da1\\Path\\To\\Project", "upstream": []},
+            {"name": "daily_processing", "module": "src.daily_processing", "cwd": "\\\\00-da1\\Path\\To\\Project", "upstream": []},
+            {"name": "report", "module": "src.report_generator", "cwd": "\\\\00-da1\\Path\\To\\Project", "upstream": ["early_payoff", "daily_processing"]}
+        ]
+    }
+
+    Each step is checkpointed in DagNodeRun under run_id (default: name and the start
+    time, so every scheduled run is a new run), with its duration. Running the DAG again
+    with a failed run's run_id (shown in the log and the admin panel) skips the steps that
+    already succeeded and resumes from the failed one.
+    """
+    dag.dag_nodes(steps)  # Fail fast on a malformed DAG
+    run_id = run_id or dag.default_run_id(steps, name, timezone.localtime().replace(tzinfo=None))
+    logger.info(f"Starting DAG {run_id} ({len(steps)} steps) at {timezone.localtime()}")
+    continue_dag(steps, run_id)
+    return run_id
+
+
+@shared_task(ignore_result=True)
+def continue_dag(steps, run_id):
+    """
+    Dispatch every step of run_id that is ready, with another continue_dag as the chord
+    callback. The callback only runs when all dispatched steps succeeded.
+    """
+    nodes = dag.dag_nodes(steps)
+    completed = set(DagNodeRun.objects.filter(run_id=run_id, status='success').values_list('node', flat=True))
+    ready = dag.ready_nodes(nodes, completed)
+    if not ready:
+        if completed.issuperset(nodes):
+            logger.info(f"Finished DAG {run_id} at {timezone.localtime()} with success")
+        return
+
+    logger.info(f"DAG {run_id}: dispatching {', '.join(ready)}")
+    chord(group(run_dag_node.si(run_id, nodes[name]) for name in ready))(continue_dag.si(steps, run_id))
+
+
 @shared_task
+def run_dag_node(run_id, step):
+    """
+    Run one DAG step, recording its status and duration in DagNodeRun.
+
+    The only task whose result is stored: it is a chord header (see continue_dag).
+    """
+    checkpoint, _ = DagNodeRun.objects.get_or_create(run_id=run_id, node=step['name'], defaults={'module': step['module']})
+    if checkpoint.status == 'success':
+        logger.info(f"DAG {run_id}: {step['name']} already succeeded, skipping")
+        return
+
+    checkpoint.module = step['module']
+    checkpoint.status = 'running'
+    checkpoint.started_at = timezone.now()
+    checkpoint.finished_at = None
+    checkpoint.error = ''
+    checkpoint.save()
+
+    start = time.perf_counter()
+    try:
+        run_module_task(step['module'], step['cwd'])
+        checkpoint.status = 'success'
+    except Exception as e:
+        checkpoint.status = 'failed'
+        checkpoint.error = str(e)
+        raise
+    finally:
+        checkpoint.finished_at = timezone.now()
+        checkpoint.duration_seconds = round(time.perf_counter() - start, 3)
+        checkpoint.save()
+        logger.info(f"DAG {run_id}: {step['name']} {checkpoint.status} in {checkpoint.duration_seconds}s")
+
+
+@shared_task(ignore_result=True)
 def update_beat_heartbeat():
     now = timezone.now()
     cache.set('beat_heartbeat', now, timeout=300)  # 5-minute timeout
     # logger.info(f"Updated beat_heartbeat to {now}")
 
-@shared_task
+@shared_task(ignore_result=True)
 def run_on_demand_task(email, key, additions, deletes):
     """Run the on-demand Python script with the provided parameters."""
     module = "src.main"  # Adjust to your script's module
@@ -87,25 +197,17 @@ def run_on_demand_task(email, key, additions, deletes):
         logger.error(f"Invalid cwd: {cwd}")
         raise ValueError(f"Invalid cwd: {cwd}")
 
-    # Use the same Python executable as the worker
-    python_exe = sys.executable
-
-    # Construct the command
-    command = [python_exe, "-m", module, "--email", email, "--key", str(key)]
+    # Construct the arguments
+    args = ["--email", email, "--key", str(key)]
     if additions:
-        command += ["--additions"] + [str(x) for x in additions]
+        args += ["--additions"] + [str(x) for x in additions]
     if deletes:
-        command += ["--deletes"] + [str(x) for x in deletes]
+        args += ["--deletes"] + [str(x) for x in deletes]
 
-    # Store and change cwd
-    original_cwd = Path.cwd()
     try:
-        os.chdir(cwd_path)
-        subprocess.run(command, check=True)
+        run_module(module, cwd_path, args)
         logger.info(f"Successfully ran status_page for email: {email}, key: {key}, additions: {additions}, deletes: {deletes}")
         logger.info(f"Finished task at {cwd}: {module} at {timezone.localtime()} with success")
     except subprocess.CalledProcessError as e:
         logger.error(f"Task at {cwd}: {module} failed at {timezone.localtime()} with error: {e}")
-        raise
-    finally:
-        os.chdir(original_cwd)
\ No newline at end of file
+        raise
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Tests for myapp.dag. It only uses the standard library, so these run without Django:
+
+    cd orchestr8/django_app
+    python -m unittest myapp.test_dag
+"""
+import unittest
+from datetime import datetime
+
+from myapp import dag
+
+STEPS = [
+    {"name": "early_payoff", "module": "src.early_payoff_report", "cwd": "proj", "upstream": []},
+    {"name": "daily_processing", "module": "src.daily_processing", "cwd": "proj"},
+    {"name": "report", "module": "src.report_generator", "cwd": "proj", "upstream": ["early_payoff", "daily_processing"]},
+    {"name": "email", "module": "src.email", "cwd": "proj", "upstream": ["report"]},
+]
+
+
+def waves(nodes, fail=()):
+    """Steps dispatched together by each continue_dag, stopping like a chord when a step fails"""
+    completed = set()
+    dispatched = []
+    while True:
+        ready = dag.ready_nodes(nodes, completed)
+        if not ready:
+            return dispatched
+        dispatched.append(ready)
+        if set(ready) & set(fail):
+            return dispatched
+        completed.update(ready)
+
+
+class TestDagNodes(unittest.TestCase):
+    def test_upstream_defaults_to_empty(self):
+        nodes = dag.dag_nodes(STEPS)
+        self.assertEqual(list(nodes), ["early_payoff", "daily_processing", "report", "email"])
+        self.assertEqual(nodes["daily_processing"]["upstream"], [])
+
+    def test_invalid_dags(self):
+        with self.assertRaisesRegex(ValueError, "missing"):
+            dag.dag_nodes([{"name": "a", "module": "src.main"}])
+        with self.assertRaisesRegex(ValueError, "Duplicate"):
+            dag.dag_nodes([STEPS[0], STEPS[0]])
+        with self.assertRaisesRegex(ValueError, "unknown upstream"):
+            dag.dag_nodes([{**STEPS[0], "upstream": ["nope"]}])
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            dag.dag_nodes([
+                {"name": "a", "module": "m", "cwd": "c", "upstream": ["b"]},
+                {"name": "b", "module": "m", "cwd": "c", "upstream": ["a"]},
+            ])
+
+
+class TestReadyNodes(unittest.TestCase):
+    def setUp(self):
+        self.nodes = dag.dag_nodes(STEPS)
+
+    def test_wave_order(self):
+        self.assertEqual(waves(self.nodes), [["early_payoff", "daily_processing"], ["report"], ["email"]])
+
+    def test_failure_stops_downstream(self):
+        self.assertEqual(waves(self.nodes, fail={"daily_processing"}), [["early_payoff", "daily_processing"]])
+
+    def test_resume_after_failure(self):
+        # early_payoff succeeded, daily_processing failed: only the failed step is ready again
+        self.assertEqual(dag.ready_nodes(self.nodes, {"early_payoff"}), ["daily_processing"])
+        self.assertEqual(dag.ready_nodes(self.nodes, {"early_payoff", "daily_processing"}), ["report"])
+        self.assertEqual(dag.ready_nodes(self.nodes, set(self.nodes)), [])
+
+
+class TestDefaultRunId(unittest.TestCase):
+    def test_runs_on_the_same_day_get_their_own_id(self):
+        morning = dag.default_run_id(STEPS, "recon", datetime(2025, 10, 1, 8, 0))
+        afternoon = dag.default_run_id(STEPS, "recon", datetime(2025, 10, 1, 14, 0))
+        self.assertEqual(morning, "recon:2025-10-01T08:00:00")
+        self.assertNotEqual(morning, afternoon)
+
+    def test_same_start_same_id(self):
+        started = datetime(2025, 10, 1, 8, 0, 0, 500)
+        self.assertEqual(dag.default_run_id(STEPS, "recon", started), dag.default_run_id(STEPS, "recon", started))
+
+    def test_unnamed_dag_uses_a_hash_of_its_steps(self):
+        started = datetime(2025, 10, 1, 8, 0)
+        reordered = [dict(reversed(list(step.items()))) for step in STEPS]
+        self.assertEqual(dag.default_run_id(STEPS, started=started), dag.default_run_id(reordered, started=started))
+        self.assertNotEqual(dag.default_run_id(STEPS, started=started), dag.default_run_id(STEPS[:2], started=started))
+
+
+if __name__ == "__main__":
+    unittest.main()
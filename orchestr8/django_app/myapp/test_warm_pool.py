@@ -0,0 +1,97 @@
+"""
+Tests for myapp.warm_pool. It only uses the standard library, so these run without Django:
+
+    cd orchestr8/django_app
+    python -m unittest myapp.test_warm_pool
+"""
+import json
+import subprocess
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+from myapp import warm_pool
+
+MAIN = """
+import json
+import os
+import sys
+
+from src import helper
+
+with open('job.json', 'w') as f:
+    json.dump({'cwd': os.getcwd(), 'argv': sys.argv[1:], 'helper': helper.NAME}, f)
+
+if '--exit' in sys.argv:
+    sys.exit(int(sys.argv[sys.argv.index('--exit') + 1]))
+"""
+
+
+def make_report(root: Path, name: str) -> Path:
+    """A report folder with src/main.py and a src/helper.py naming the report"""
+    report = root / name
+    (report / 'src').mkdir(parents=True)
+    (report / 'src' / '__init__.py').write_text('')
+    (report / 'src' / 'helper.py').write_text(f"NAME = {name!r}\n")
+    (report / 'src' / 'main.py').write_text(textwrap.dedent(MAIN))
+    return report
+
+
+def read_job(report: Path) -> dict:
+    return json.loads((report / 'job.json').read_text())
+
+
+class TestWarmPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        root = Path(cls.tmp.name)
+        cls.first = make_report(root, 'first')
+        cls.second = make_report(root, 'second')
+        # One worker, so every job runs in the same process
+        cls.pool = warm_pool.WarmPool(size=1, preload=[], warm_db=False, max_jobs=100)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+        cls.tmp.cleanup()
+
+    def test_cwd_and_argv_per_job(self):
+        result = self.pool.run('src.main', self.first, ['--email', 'a@b.com', '--key', 1])
+        self.assertEqual(result['returncode'], 0)
+        job = read_job(self.first)
+        self.assertEqual(Path(job['cwd']), self.first.resolve())
+        self.assertEqual(job['argv'], ['--email', 'a@b.com', '--key', '1'])
+
+        self.pool.run('src.main', self.second)
+        job = read_job(self.second)
+        self.assertEqual(Path(job['cwd']), self.second.resolve())
+        self.assertEqual(job['argv'], [])
+
+    def test_report_modules_unloaded_between_jobs(self):
+        self.pool.run('src.main', self.first)
+        self.pool.run('src.main', self.second)
+        self.pool.run('src.main', self.first)
+        self.assertEqual(read_job(self.second)['helper'], 'second')
+        self.assertEqual(read_job(self.first)['helper'], 'first')
+
+    def test_system_exit_code_raises(self):
+        with self.assertRaises(subprocess.CalledProcessError) as raised:
+            self.pool.run('src.main', self.first, ['--exit', 3])
+        self.assertEqual(raised.exception.returncode, 3)
+        # A clean exit is not an error, and the pool keeps working after a failure
+        self.assertEqual(self.pool.run('src.main', self.first, ['--exit', 0])['returncode'], 0)
+
+    def test_timeout_replaces_worker(self):
+        slow = Path(self.tmp.name) / 'slow'
+        (slow / 'src').mkdir(parents=True)
+        (slow / 'src' / '__init__.py').write_text('')
+        (slow / 'src' / 'main.py').write_text("import time\ntime.sleep(30)\n")
+        with self.assertRaises(subprocess.TimeoutExpired):
+            self.pool.run('src.main', slow, timeout=1)
+        self.assertEqual(self.pool.run('src.main', self.first)['returncode'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
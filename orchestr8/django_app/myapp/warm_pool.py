@@ -0,0 +1,334 @@
+"""
+Warm report workers.
+
+Running `python -m src.main` as a fresh subprocess makes every job pay for
+interpreter startup, the pandas / SQLAlchemy / oracledb imports and the
+credential decryption in cdutils.database.connect. A WarmPool keeps worker
+processes alive with those already imported (and the DB engines created), and
+runs each report's entry point inside a worker:
+
+- cwd, sys.path and sys.argv are set for the job and restored afterwards
+- the report's own modules (its `src` package, anything loaded from its folder)
+  are unloaded after the job, so the next report's `src` is imported fresh
+- a worker is replaced after max_jobs jobs, or once its memory passes max_memory_mb
+
+Each job runs in a worker process, never in the caller, so the caller's cwd is
+never changed. Reports that ship their own copy of a preloaded package (e.g. a
+local cdutils) would see the preloaded one; run those in subprocess mode.
+
+Usage:
+    pool = WarmPool(size=1)
+    pool.run('src.main', r'C:\\Reports\\Status Page', ['--email', 'a@b.com', '--key', '1'])
+    pool.close()
+
+Only the standard library is used here, plus psutil for memory readings (a project
+dependency; without it, memory is read from the resource module where it exists, and on
+Windows max_memory_mb cannot be applied, which is logged once).
+"""
+import logging
+import multiprocessing
+import os
+import runpy
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Imported by every worker before its first job
+DEFAULT_PRELOAD = [
+    'numpy',
+    'pandas',
+    'sqlalchemy',
+    'oracledb',
+    'openpyxl',
+    'cdutils.database.connect',
+]
+
+# Jobs a worker runs before it is replaced
+DEFAULT_MAX_JOBS = 25
+
+# Resident memory (MB) above which a worker is replaced after its current job
+DEFAULT_MAX_MEMORY_MB = 2048
+
+
+def _memory_mb() -> Optional[float]:
+    """
+    Resident memory of this process in MB (peak resident memory without psutil), None if unknown.
+    """
+    try:
+        import psutil # type: ignore
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        return None
+
+
+def _warm_up(preload: Sequence[str], warm_db: bool):
+    for module in preload:
+        try:
+            __import__(module)
+        except Exception as e:
+            logger.warning(f"Warm worker {os.getpid()} could not preload {module}: {e}")
+
+    if warm_db and 'cdutils.database.connect' in sys.modules:
+        # Decrypt credentials and create both pooled engines up front
+        registry = sys.modules['cdutils.database.connect'].get_registry()
+        for engine in (1, 2):
+            try:
+                registry.get_engine(engine)
+            except Exception as e:
+                logger.warning(f"Warm worker {os.getpid()} could not create engine {engine}: {e}")
+
+
+def _is_report_module(module, cwd: Path) -> bool:
+    module_file = getattr(module, '__file__', None)
+    if not module_file:
+        return False
+    try:
+        Path(module_file).resolve().relative_to(cwd)
+        return True
+    except ValueError:
+        return False
+
+
+def _run_job(module: str, cwd: str, args: List[str]) -> dict:
+    """
+    Run one report entry point in this process (as `python -m module args` from cwd would).
+    """
+    saved_cwd, saved_path, saved_argv = os.getcwd(), list(sys.path), list(sys.argv)
+    saved_modules = set(sys.modules)
+    cwd_path = Path(cwd).resolve()
+    start = time.perf_counter()
+    returncode, error = 0, None
+    try:
+        os.chdir(cwd_path)
+        sys.path.insert(0, str(cwd_path))
+        sys.argv = [module] + list(args)
+        try:
+            runpy.run_module(module, run_name='__main__', alter_sys=True)
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                returncode = e.code if isinstance(e.code, int) else 1
+                error = str(e.code)
+        except BaseException:
+            returncode, error = 1, traceback.format_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.chdir(saved_cwd)
+        sys.path[:] = saved_path
+        sys.argv = saved_argv
+        # Unload the report's own modules; third-party imports stay warm
+        for name in set(sys.modules) - saved_modules:
+            if name == 'src' or name.startswith('src.') or _is_report_module(sys.modules[name], cwd_path):
+                del sys.modules[name]
+
+    return {
+        'returncode': returncode,
+        'error': error,
+        'seconds': round(time.perf_counter() - start, 3),
+        'memory_mb': _memory_mb(),
+    }
+
+
+def _worker_main(conn, preload: Sequence[str], warm_db: bool):
+    """
+    Worker process loop: warm up, then run jobs received on conn until None arrives.
+    """
+    _warm_up(preload, warm_db)
+    conn.send({'ready': os.getpid(), 'memory_mb': _memory_mb()})
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        conn.send(_run_job(**job))
+    conn.close()
+
+
+class _Worker:
+    """
+    One warm worker process and the parent end of its pipe
+    """
+    def __init__(self, context, preload: Sequence[str], warm_db: bool):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, list(preload), warm_db), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+        self.ready = False
+
+    def wait_ready(self, timeout: Optional[float] = None):
+        if not self.ready:
+            if not self.conn.poll(timeout):
+                raise subprocess.TimeoutExpired('warm worker startup', timeout)
+            try:
+                self.conn.recv()
+            except EOFError:
+                self.process.join(1)
+                raise subprocess.CalledProcessError(self.process.exitcode or 1, 'warm worker startup', output="Warm worker exited during startup")
+            self.ready = True
+
+    def stop(self, timeout: float = 10, kill: bool = False):
+        """
+        Ask the worker to exit (or kill it right away, e.g. when stuck in a job), terminating it after timeout
+        """
+        if not kill:
+            try:
+                self.conn.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        self.conn.close()
+
+
+class WarmPool:
+    """
+    Pre-started report workers with preloaded imports and warm DB engines.
+    """
+    def __init__(self, size: int = 1, preload: Sequence[str] = DEFAULT_PRELOAD, warm_db: bool = True, max_jobs: int = DEFAULT_MAX_JOBS, max_memory_mb: Optional[float] = DEFAULT_MAX_MEMORY_MB, startup_timeout: float = 300):
+        """
+        Args:
+            size (int): worker processes kept warm (jobs beyond this wait for a free worker)
+            preload (Sequence[str]): modules imported by each worker before its first job
+            warm_db (bool): create the cdutils engines (credential decryption) at startup
+            max_jobs (int): jobs per worker before it is replaced
+            max_memory_mb (float): memory per worker after which it is replaced (None: no limit)
+            startup_timeout (float): seconds to wait for a new worker to finish warming up
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self.preload = list(preload)
+        self.warm_db = warm_db
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+        self.startup_timeout = startup_timeout
+        # spawn on every platform: workers never inherit the caller's threads or DB connections
+        self._context = multiprocessing.get_context('spawn')
+        self._idle = [self._spawn() for _ in range(size)]
+        self._available = threading.Condition()
+        self._closed = False
+        self._warned_memory = False
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, self.preload, self.warm_db)
+
+    def _checkout(self) -> _Worker:
+        with self._available:
+            while not self._idle:
+                if self._closed:
+                    raise ValueError("WarmPool is closed")
+                self._available.wait()
+            if self._closed:
+                raise ValueError("WarmPool is closed")
+            return self._idle.pop()
+
+    def _checkin(self, worker: _Worker, replace: bool, kill: bool = False):
+        if replace:
+            worker.stop(kill=kill)
+            worker = self._spawn()
+        with self._available:
+            if self._closed:
+                worker.stop()
+                return
+            self._idle.append(worker)
+            self._available.notify()
+
+    def run(self, module: str, cwd, args: Sequence[str] = (), timeout: Optional[float] = None) -> dict:
+        """
+        Run `python -m module args` from cwd in a warm worker.
+
+        Args:
+            module (str): entry point module, e.g. 'src.main'
+            cwd: report folder (becomes cwd and the first sys.path entry for the job)
+            args (Sequence[str]): command line arguments for the report
+            timeout (float): seconds before the job is killed (None: no limit)
+
+        Returns:
+            dict: returncode, error, seconds, memory_mb of the job
+
+        Raises:
+            subprocess.CalledProcessError: the report exited non-zero or raised
+            subprocess.TimeoutExpired: the report ran past timeout (its worker is replaced)
+        """
+        command = [module] + [str(arg) for arg in args]
+        worker = self._checkout()
+        replace, kill = True, False
+        try:
+            worker.wait_ready(self.startup_timeout)
+            worker.conn.send({'module': module, 'cwd': str(cwd), 'args': command[1:]})
+            if not worker.conn.poll(timeout):
+                kill = True # Still running the job, so it would never read a stop request
+                raise subprocess.TimeoutExpired(command, timeout)
+            try:
+                result = worker.conn.recv()
+            except EOFError:
+                raise subprocess.CalledProcessError(worker.process.exitcode or 1, command, output="Warm worker exited during the job")
+
+            worker.jobs += 1
+            if self.max_memory_mb is not None and result['memory_mb'] is None and not self._warned_memory:
+                self._warned_memory = True
+                logger.warning(f"Warm worker memory cannot be measured (install psutil); max_memory_mb={self.max_memory_mb} is not applied, workers are only replaced after max_jobs={self.max_jobs}")
+            over_memory = self.max_memory_mb is not None and result['memory_mb'] is not None and result['memory_mb'] > self.max_memory_mb
+            replace = worker.jobs >= self.max_jobs or over_memory
+            if over_memory:
+                logger.info(f"Recycling warm worker {worker.process.pid}: {result['memory_mb']:.0f} MB after {worker.jobs} jobs")
+
+            if result['returncode'] != 0:
+                raise subprocess.CalledProcessError(result['returncode'], command, output=result['error'])
+            return result
+        finally:
+            self._checkin(worker, replace, kill)
+
+    def close(self):
+        """
+        Stop every idle worker; workers running a job stop when they are returned.
+        """
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for worker in idle:
+            worker.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(**settings) -> WarmPool:
+    """
+    Return the process-wide pool, creating it with settings (WarmPool arguments) on first use.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WarmPool(**settings)
+        return _pool
+
+
+def close_pool():
+    """
+    Stop the process-wide pool if one was started.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
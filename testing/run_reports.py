@@ -12,6 +12,7 @@ USAGE:
     python testing/run_reports.py --as-needed               # Run as-needed reports
     python testing/run_reports.py --business-line "Retail"  # Run by business line
     python testing/run_reports.py --name "Rate Scraping"    # Run specific report
+    python testing/run_reports.py --daily --jobs 4          # Run daily reports 4 at a time
     python testing/run_reports.py --help                    # Show this help
 
 DESCRIPTION:
@@ -32,6 +33,25 @@ FEATURES:
     • Error Handling: Proper timeout management and detailed error reporting
     • Progress Tracking: Shows real-time progress during batch runs
     • Environment Management: Automatically sets REPORT_ENV=dev for execution
+    • Parallel Runs: --jobs N runs up to N reports at once, in dependency order
+    • Run Manifest: every batch writes per-report logs and a manifest.json with timings
+
+PARALLEL RUNS AND DEPENDENCIES:
+    --jobs N        run up to N reports at a time (default 1, one after another)
+    --db-jobs M     at most M of them may be database-heavy (default 2)
+
+    A report runs only after the reports it depends on (within the same batch) succeeded;
+    if one of them fails it is skipped (with or without --jobs). Dependencies come from src/config.py:
+        DEPENDS_ON = ['R360']                         # report folder names (or 'Business Line/Report'
+                                                      # when the name repeats) to run first
+        PROVIDES = ['cdutils.pkey_sqlite']            # modules fed by this report's output;
+                                                      # any report whose src imports one, or a
+                                                      # cdutils module that (indirectly) imports
+                                                      # it, depends on it
+        DB_HEAVY = False                              # report does not query COCC (default True)
+
+    Each report's output is streamed to testing/logs/runs/<timestamp>/<report>.log and the
+    batch is summarized in testing/logs/runs/<timestamp>/manifest.json.
 
 EXAMPLES:
     # Show just the statistics without running anything
@@ -49,6 +69,9 @@ EXAMPLES:
     # Run all reports (be careful - this takes a long time!)
     python testing/run_reports.py --all
 
+    # Run all daily reports, 4 at a time with at most 2 hitting the database
+    python testing/run_reports.py --daily --jobs 4 --db-jobs 2
+
 OUTPUT:
     The utility provides detailed output including:
     - Discovery phase showing total reports found
@@ -66,14 +89,26 @@ REQUIREMENTS:
 
 import os
 import sys
+import json
+import re
 import subprocess
 import importlib.util
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
 
+# Per-run report logs and manifests
+RUNS_DIR = Path(__file__).parent / "logs" / "runs"
+
+# Shared package reports import; PROVIDES modules are followed through its internal imports
+CDUTILS_DIR = Path(__file__).parent.parent / "cdutils"
+
+# Database-heavy reports allowed at once in a parallel run
+DEFAULT_DB_JOBS = 2
+
 
 def setup_logging() -> logging.Logger:
     """Setup logging configuration based on environment."""
@@ -167,6 +202,11 @@ def discover_reports() -> List[Dict]:
         prod_ready = getattr(config, 'PROD_READY', False)
         report_title = getattr(config, 'REPORT_NAME', report_name)
         
+        # Scheduling metadata (see PARALLEL RUNS AND DEPENDENCIES)
+        depends_on = list(getattr(config, 'DEPENDS_ON', []))
+        provides = list(getattr(config, 'PROVIDES', []))
+        db_heavy = getattr(config, 'DB_HEAVY', True)
+        
         # Check if main.py exists
         main_py = report_path / "src" / "main.py"
         has_main = main_py.exists()
@@ -181,7 +221,10 @@ def discover_reports() -> List[Dict]:
             'prod_ready': prod_ready,
             'has_main': has_main,
             'config_path': config_path,
-            'main_path': main_py if has_main else None
+            'main_path': main_py if has_main else None,
+            'depends_on': depends_on,
+            'provides': provides,
+            'db_heavy': db_heavy
         })
     
     return sorted(reports, key=lambda x: (x['business_line'], x['name']))
@@ -386,8 +429,313 @@ def run_report(report: Dict, logger: logging.Logger) -> Tuple[bool, str]:
         return False, f"Exception: {str(e)}"
 
 
-def run_reports_by_filter(reports: List[Dict], filter_type: str, filter_value: str, logger: logging.Logger) -> List[Dict]:
-    """Filter and run reports based on criteria."""
+def report_imports_module(report: Dict, module: str) -> bool:
+    """Check whether any .py file under the report's src/ imports the given module."""
+    package, _, name = module.rpartition('.')
+    patterns = [rf"^\s*import\s+{re.escape(module)}\b", rf"^\s*from\s+{re.escape(module)}\s+import\b"]
+    if package:
+        patterns.append(rf"^\s*from\s+{re.escape(package)}\s+import\s+.*\b{re.escape(name)}\b")
+    pattern = re.compile("|".join(patterns), re.MULTILINE)
+
+    for source_file in (report['path'] / "src").rglob("*.py"):
+        try:
+            if pattern.search(source_file.read_text(encoding='utf-8', errors='ignore')):
+                return True
+        except OSError:
+            continue
+    return False
+
+
+def cdutils_importers(module: str) -> List[str]:
+    """
+    The module plus every cdutils module importing it, directly or through other cdutils
+    modules (e.g. cdutils.acct_file_creation.core reads cdutils.pkey_sqlite).
+    Modules outside cdutils are returned alone.
+    """
+    if not module.startswith('cdutils.'):
+        return [module]
+
+    # Import graph of the cdutils package: module -> cdutils modules it imports
+    imports = {}
+    package_dir = CDUTILS_DIR / "cdutils"
+    import_pattern = re.compile(r"^\s*(?:import\s+(cdutils(?:\.\w+)*)|from\s+(cdutils(?:\.\w+)*)\s+import\s+([\w\s,()]+))", re.MULTILINE)
+    for source_file in package_dir.rglob("*.py"):
+        parts = source_file.relative_to(CDUTILS_DIR).with_suffix('').parts
+        name = ".".join(parts[:-1] if parts[-1] == '__init__' else parts)
+        try:
+            text = source_file.read_text(encoding='utf-8', errors='ignore')
+        except OSError:
+            continue
+        imported = set()
+        for imported_module, from_module, names in import_pattern.findall(text):
+            if imported_module:
+                imported.add(imported_module)
+            else:
+                imported.add(from_module)
+                imported.update(f"{from_module}.{n.strip()}" for n in names.replace('(', ' ').replace(')', ' ').split(',') if n.strip())
+        imports[name] = imported
+
+    found = {module}
+    changed = True
+    while changed:
+        changed = False
+        for name, imported in imports.items():
+            if name not in found and imported & found:
+                found.add(name)
+                changed = True
+    return sorted(found)
+
+
+def report_key(report: Dict) -> str:
+    """Unique key of a report, 'Business Line/Report' (the same folder name can appear in several business lines)."""
+    return f"{report['business_line']}/{report['name']}"
+
+
+def resolve_dependencies(reports: List[Dict]) -> Dict[str, List[str]]:
+    """
+    Map each report key (see report_key) to the keys of the reports it must run after.
+
+    Combines DEPENDS_ON from each config with PROVIDES: a report whose src imports a
+    module another report provides (or a cdutils module reading it, see cdutils_importers)
+    depends on that report. A DEPENDS_ON entry is either
+    'Business Line/Report' or a report folder name; a folder name found in several business
+    lines means the one in the report's own business line, otherwise all of them.
+    """
+    keys = {report_key(report): report for report in reports}
+    keys_by_name = defaultdict(list)
+    for report in reports:
+        keys_by_name[report['name']].append(report_key(report))
+    dependencies = {key: set() for key in keys}
+
+    for report in reports:
+        key = report_key(report)
+        for dependency in report['depends_on']:
+            if dependency in keys:
+                matches = [dependency]
+            else:
+                matches = keys_by_name.get(dependency, [])
+                same_line = [match for match in matches if keys[match]['business_line'] == report['business_line']]
+                if same_line:
+                    matches = same_line
+                elif len(matches) > 1:
+                    print(f"Warning: {key} depends on '{dependency}', found in several business lines: {', '.join(matches)}")
+            if not matches:
+                print(f"Warning: {key} depends on unknown report '{dependency}'")
+            dependencies[key].update(match for match in matches if match != key)
+
+    providers = [(report, cdutils_importers(module)) for report in reports for module in report['provides']]
+    for report in reports:
+        for provider, modules in providers:
+            if report_key(provider) != report_key(report) and any(report_imports_module(report, module) for module in modules):
+                dependencies[report_key(report)].add(report_key(provider))
+
+    return {key: sorted(deps) for key, deps in dependencies.items()}
+
+
+def order_by_dependencies(reports: List[Dict], dependencies: Dict[str, List[str]]) -> List[Dict]:
+    """
+    Order reports so each comes after its dependencies in the list (otherwise keeping the given order).
+    Dependencies outside the list are ignored.
+    """
+    remaining = list(reports)
+    selected = {report_key(report) for report in reports}
+    done = set()
+    ordered = []
+    while remaining:
+        ready = [r for r in remaining if all(d in done or d not in selected for d in dependencies.get(report_key(r), []))]
+        if not ready:
+            cycle = ", ".join(report_key(r) for r in remaining)
+            raise ValueError(f"Dependency cycle between reports: {cycle}")
+        for report in ready:
+            ordered.append(report)
+            done.add(report_key(report))
+        remaining = [r for r in remaining if report_key(r) not in done]
+    return ordered
+
+
+def failed_dependencies(report: Dict, dependencies: Dict[str, List[str]], status: Dict[str, str]) -> List[str]:
+    """Dependencies of report that failed or were skipped in this batch."""
+    return [d for d in dependencies.get(report_key(report), []) if status.get(d) in ('failed', 'skipped')]
+
+
+def skipped_result(report: Dict, failed: List[str], logger: logging.Logger) -> Dict:
+    """Result of a report not run because its dependencies failed."""
+    message = f"Skipped: dependency failed ({', '.join(failed)})"
+    logger.warning(f"SKIPPED | {report['title']} | {message}")
+    return {'report': report, 'success': False, 'message': message, 'status': 'skipped',
+            'returncode': None, 'start': None, 'end': None, 'log': None}
+
+
+def _tail(log_path: Path, limit: int = 200) -> str:
+    """Last characters of a report log, for the run summary."""
+    try:
+        text = log_path.read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return ""
+    text = text.split('\n', 1)[1].strip() if text.startswith('# ') and '\n' in text else text.strip()
+    return "..." + text[-limit:] if len(text) > limit else text
+
+
+def report_log_path(run_dir: Path, report: Dict) -> Path:
+    """Log file of a report within a batch's run directory."""
+    return run_dir / f"{report['business_line']}__{report['name']}.log"
+
+
+def run_report_to_log(report: Dict, logger: logging.Logger, log_path: Path) -> Tuple[bool, str, Optional[int]]:
+    """
+    Run a single report, streaming its stdout and stderr into log_path as it runs.
+
+    Returns:
+        (success, message, return code)
+    """
+    if not report['has_main']:
+        error_msg = "No main.py file found"
+        logger.warning(f"SKIPPED | {report['title']} | {error_msg}")
+        return False, error_msg, None
+
+    env = os.getenv('REPORT_ENV', 'dev')
+    python_executable = get_venv_python()
+    start_time = datetime.now()
+
+    logger.info(f"START | {report['title']} | Business Line: {report['business_line']} | Environment: {env.upper()}")
+    logger.info(f"DEBUG | Log file: {log_path}")
+
+    try:
+        env_vars = os.environ.copy()
+        env_vars['REPORT_ENV'] = env
+        env_vars['PYTHONIOENCODING'] = 'utf-8'
+        env_vars['PYTHONUNBUFFERED'] = '1'  # Flush report output to the log as it is printed
+
+        with open(log_path, 'w', encoding='utf-8') as log_file:
+            log_file.write(f"# {report['title']} | {python_executable} -m src.main | cwd: {report['path']}\n")
+            log_file.flush()
+            process = subprocess.Popen(
+                [python_executable, "-m", "src.main"],
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                env=env_vars,
+                cwd=str(report['path']),
+            )
+            returncode = process.wait()
+
+        runtime_minutes = round((datetime.now() - start_time).total_seconds() / 60, 2)
+        if returncode == 0:
+            logger.info(f"SUCCESS | {report['title']} | Runtime: {runtime_minutes} minutes")
+            return True, "Success", returncode
+
+        logger.error(f"FAILED | {report['title']} | Runtime: {runtime_minutes} minutes | Return code: {returncode} | Log: {log_path}")
+        return False, f"Error: {_tail(log_path) or 'Unknown error'}", returncode
+
+    except Exception as e:
+        runtime_minutes = round((datetime.now() - start_time).total_seconds() / 60, 2)
+        logger.error(f"EXCEPTION | {report['title']} | Runtime: {runtime_minutes} minutes | Exception: {str(e)}")
+        return False, f"Exception: {str(e)}", None
+
+
+def run_reports_parallel(reports: List[Dict], dependencies: Dict[str, List[str]], jobs: int, db_jobs: int, run_dir: Path, logger: logging.Logger) -> List[Dict]:
+    """
+    Run reports in a pool of `jobs` workers.
+
+    A report starts once its dependencies in the batch succeeded and, if it is DB_HEAVY,
+    fewer than `db_jobs` database-heavy reports are running. Reports whose dependency
+    failed are skipped.
+    """
+    selected = {report_key(report) for report in reports}
+    pending = order_by_dependencies(reports, dependencies)
+    status = {}
+    results = {}
+    running = {}
+    db_running = 0
+    total = len(reports)
+
+    def blocked_by(report):
+        return [d for d in dependencies.get(report_key(report), []) if d in selected and status.get(d) != 'success']
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            # Skip reports whose dependencies failed
+            for report in list(pending):
+                failed = failed_dependencies(report, dependencies, status)
+                if failed:
+                    pending.remove(report)
+                    status[report_key(report)] = 'skipped'
+                    results[report_key(report)] = skipped_result(report, failed, logger)
+                    print(f"[{len(results)}/{total}] Skipped: {report['title']} - {results[report_key(report)]['message']}")
+
+            # Start every report that is ready and fits the limits
+            for report in list(pending):
+                if len(running) >= jobs:
+                    break
+                if blocked_by(report):
+                    continue
+                if report['db_heavy'] and db_running >= db_jobs:
+                    continue
+                pending.remove(report)
+                log_path = report_log_path(run_dir, report)
+                start = datetime.now()
+                future = pool.submit(run_report_to_log, report, logger, log_path)
+                running[future] = (report, start, log_path)
+                db_running += 1 if report['db_heavy'] else 0
+                print(f"   Started: {report['title']} ({report['business_line']})")
+
+            if not running:
+                continue
+
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                report, start, log_path = running.pop(future)
+                db_running -= 1 if report['db_heavy'] else 0
+                success, message, returncode = future.result()
+                end = datetime.now()
+                status[report_key(report)] = 'success' if success else 'failed'
+                results[report_key(report)] = {'report': report, 'success': success, 'message': message, 'status': status[report_key(report)],
+                                           'returncode': returncode, 'start': start, 'end': end, 'log': log_path}
+                runtime_minutes = round((end - start).total_seconds() / 60, 2)
+                outcome = "Success" if success else message
+                print(f"[{len(results)}/{total}] {report['title']} ({runtime_minutes} min) - {outcome}")
+
+    # Summary in the original report order
+    return [results[report_key(report)] for report in reports]
+
+
+def write_run_manifest(run_dir: Path, results: List[Dict], filter_type: str, filter_value: str, jobs: int, db_jobs: int, batch_start: datetime, batch_end: datetime, dependencies: Dict[str, List[str]]) -> Path:
+    """Write manifest.json describing the batch and each report's outcome and timing."""
+    def timestamp(value):
+        return value.isoformat(timespec='seconds') if value else None
+
+    manifest = {
+        'environment': os.getenv('REPORT_ENV', 'dev'),
+        'filter': {'type': filter_type, 'value': filter_value},
+        'jobs': jobs,
+        'db_jobs': db_jobs,
+        'start': timestamp(batch_start),
+        'end': timestamp(batch_end),
+        'runtime_seconds': round((batch_end - batch_start).total_seconds(), 1),
+        'reports': [
+            {
+                'name': result['report']['name'],
+                'title': result['report']['title'],
+                'business_line': result['report']['business_line'],
+                'status': result['status'],
+                'returncode': result['returncode'],
+                'message': result['message'],
+                'depends_on': dependencies.get(report_key(result['report']), []),
+                'db_heavy': result['report']['db_heavy'],
+                'start': timestamp(result['start']),
+                'end': timestamp(result['end']),
+                'runtime_seconds': round((result['end'] - result['start']).total_seconds(), 1) if result['start'] and result['end'] else None,
+                'log': str(result['log']) if result['log'] else None,
+            }
+            for result in results
+        ],
+    }
+    manifest_path = run_dir / "manifest.json"
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    return manifest_path
+
+
+def run_reports_by_filter(reports: List[Dict], filter_type: str, filter_value: str, logger: logging.Logger, jobs: int = 1, db_jobs: int = DEFAULT_DB_JOBS) -> List[Dict]:
+    """Filter and run reports based on criteria (jobs > 1 runs them in parallel, see run_reports_parallel)."""
     filtered_reports = []
     
     if filter_type == "schedule":
@@ -406,35 +754,67 @@ def run_reports_by_filter(reports: List[Dict], filter_type: str, filter_value: s
         logger.warning(f"NO REPORTS FOUND | Filter: {filter_type} = {filter_value}")
         return []
     
+    # Dependencies are resolved against every report, then ordered within the batch
+    dependencies = resolve_dependencies(reports)
+    try:
+        filtered_reports = order_by_dependencies(filtered_reports, dependencies)
+    except ValueError as e:
+        print(str(e))
+        logger.error(f"INVALID DEPENDENCIES | {e}")
+        return []
+    
     # Log batch start
     env = os.getenv('REPORT_ENV', 'dev')
-    batch_start_msg = f"BATCH START | {len(filtered_reports)} reports | Filter: {filter_type} = {filter_value} | Environment: {env.upper()}"
+    batch_start_msg = f"BATCH START | {len(filtered_reports)} reports | Filter: {filter_type} = {filter_value} | Environment: {env.upper()} | Jobs: {jobs}"
     logger.info(batch_start_msg)
     
     print(f"\nRunning {len(filtered_reports)} reports matching {filter_type}: {filter_value}\n")
     
     batch_start_time = datetime.now()
+    run_dir = RUNS_DIR / batch_start_time.strftime('%Y%m%d_%H%M%S')
+    run_dir.mkdir(parents=True, exist_ok=True)
     results = []
     
-    for i, report in enumerate(filtered_reports, 1):
-        print(f"[{i}/{len(filtered_reports)}] Running: {report['title']} ({report['business_line']})")
-        
-        success, message = run_report(report, logger)
-        
-        result = {
-            'report': report,
-            'success': success,
-            'message': message
-        }
-        results.append(result)
-        
-        if success:
-            print(f"   Success: {message}")
-        else:
-            print(f"   Error: {message}")
+    if jobs > 1:
+        print(f"Parallel run: {jobs} jobs, at most {db_jobs} database-heavy | Logs: {run_dir}\n")
+        results = run_reports_parallel(filtered_reports, dependencies, jobs, db_jobs, run_dir, logger)
+    else:
+        status = {}
+        for i, report in enumerate(filtered_reports, 1):
+            failed = failed_dependencies(report, dependencies, status)
+            if failed:
+                status[report_key(report)] = 'skipped'
+                results.append(skipped_result(report, failed, logger))
+                print(f"[{i}/{len(filtered_reports)}] Skipped: {report['title']} - {results[-1]['message']}")
+                continue
+
+            print(f"[{i}/{len(filtered_reports)}] Running: {report['title']} ({report['business_line']})")
+            
+            start = datetime.now()
+            log_path = report_log_path(run_dir, report)
+            success, message, returncode = run_report_to_log(report, logger, log_path)
+            
+            result = {
+                'report': report,
+                'success': success,
+                'message': message,
+                'status': 'success' if success else 'failed',
+                'returncode': returncode,
+                'start': start,
+                'end': datetime.now(),
+                'log': log_path
+            }
+            results.append(result)
+            status[report_key(report)] = result['status']
+            
+            if success:
+                print(f"   Success: {message}")
+            else:
+                print(f"   Error: {message}")
     
     # Calculate batch runtime
     batch_end_time = datetime.now()
+    manifest_path = write_run_manifest(run_dir, results, filter_type, filter_value, jobs, db_jobs, batch_start_time, batch_end_time, dependencies)
     batch_runtime_seconds = (batch_end_time - batch_start_time).total_seconds()
     batch_runtime_minutes = round(batch_runtime_seconds / 60, 2)
     
@@ -451,16 +831,29 @@ def run_reports_by_filter(reports: List[Dict], filter_type: str, filter_value: s
     print(f"   Successful: {successful}")
     print(f"   Failed: {failed}")
     print(f"   Total Runtime: {batch_runtime_minutes} minutes")
+    print(f"   Manifest: {manifest_path}")
     
     if failed > 0:
         print(f"\nFailed Reports:")
         for result in results:
             if not result['success']:
-                print(f"   {result['report']['name']}: {result['message']}")
+                print(f"   {report_key(result['report'])}: {result['message']}")
     
     return results
 
 
+def _pop_int_option(args: List[str], option: str, default: int) -> int:
+    """Remove `option N` from args and return N (default when absent)."""
+    if option not in args:
+        return default
+    index = args.index(option)
+    if index + 1 >= len(args) or not args[index + 1].isdigit() or int(args[index + 1]) < 1:
+        raise ValueError(f"{option} needs a positive number")
+    value = int(args[index + 1])
+    del args[index:index + 2]
+    return value
+
+
 # Global flag to prevent multiple executions
 _script_running = False
 
@@ -487,6 +880,15 @@ def main():
         
         args = sys.argv[1:]
         
+        # Parallel run options may appear anywhere after the command
+        try:
+            jobs = _pop_int_option(args, "--jobs", 1)
+            db_jobs = _pop_int_option(args, "--db-jobs", DEFAULT_DB_JOBS)
+        except ValueError as e:
+            print(str(e))
+            logger.error(f"INVALID COMMAND | {e}")
+            return
+        
         if not args:
             print(__doc__)
             print("\nUsage:")
@@ -499,6 +901,7 @@ def main():
             print("  python testing/run_reports.py --as-needed               # Run as-needed reports")
             print("  python testing/run_reports.py --business-line \"Commercial Lending\"  # Run by business line")
             print("  python testing/run_reports.py --name \"Rate Scraping\"    # Run specific report")
+            print("  python testing/run_reports.py --daily --jobs 4          # Run daily reports 4 at a time")
             print("  python testing/run_reports.py --help                    # Show this help")
             return
         
@@ -532,27 +935,27 @@ def main():
             logger.info("LIST ONLY | No reports executed")
             return
         elif command == "--all":
-            run_reports_by_filter(reports, "all", "", logger)
+            run_reports_by_filter(reports, "all", "", logger, jobs, db_jobs)
         elif command == "--daily":
-            run_reports_by_filter(reports, "schedule", "daily", logger)
+            run_reports_by_filter(reports, "schedule", "daily", logger, jobs, db_jobs)
         elif command == "--weekly":
-            run_reports_by_filter(reports, "schedule", "weekly", logger)
+            run_reports_by_filter(reports, "schedule", "weekly", logger, jobs, db_jobs)
         elif command == "--monthly":
-            run_reports_by_filter(reports, "schedule", "monthly", logger)
+            run_reports_by_filter(reports, "schedule", "monthly", logger, jobs, db_jobs)
         elif command == "--as-needed":
-            run_reports_by_filter(reports, "schedule", "as-needed", logger)
+            run_reports_by_filter(reports, "schedule", "as-needed", logger, jobs, db_jobs)
         elif command == "--business-line":
             if len(args) < 2:
                 print("Please specify business line name")
                 logger.error("INVALID COMMAND | Missing business line name")
                 return
-            run_reports_by_filter(reports, "business_line", args[1], logger)
+            run_reports_by_filter(reports, "business_line", args[1], logger, jobs, db_jobs)
         elif command == "--name":
             if len(args) < 2:
                 print("Please specify report name")
                 logger.error("INVALID COMMAND | Missing report name")
                 return
-            run_reports_by_filter(reports, "name", args[1], logger)
+            run_reports_by_filter(reports, "name", args[1], logger, jobs, db_jobs)
         else:
             print(f"Unknown command: {command}")
             print("Use --help for usage information")
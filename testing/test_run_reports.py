@@ -0,0 +1,157 @@
+"""
+Unit tests for the report runner's dependency handling.
+
+Run with:
+    python -m pytest testing/test_run_reports.py
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import run_reports
+
+
+def make_report(tmp_path, business_line, name, depends_on=(), db_heavy=False):
+    return {
+        'name': name,
+        'title': f"{name} ({business_line})",
+        'path': tmp_path / business_line / name,
+        'business_line': business_line,
+        'schedule': 'daily',
+        'has_main': True,
+        'depends_on': list(depends_on),
+        'provides': [],
+        'db_heavy': db_heavy,
+    }
+
+
+@pytest.fixture
+def logger():
+    return logging.getLogger('test_run_reports')
+
+
+@pytest.fixture
+def fake_runs(tmp_path, monkeypatch):
+    """Run reports without subprocesses: a report fails when its name is in `failing`; every run is recorded"""
+    ran = []
+    failing = set()
+
+    def run_report(report, logger):
+        ran.append(run_reports.report_key(report))
+        return (False, "Error: boom") if report['name'] in failing else (True, "Success")
+
+    def run_report_to_log(report, logger, log_path):
+        success, message = run_report(report, logger)
+        log_path.write_text(message)
+        return success, message, 0 if success else 1
+
+    monkeypatch.setattr(run_reports, 'RUNS_DIR', tmp_path / 'runs')
+    monkeypatch.setattr(run_reports, 'run_report', run_report)
+    monkeypatch.setattr(run_reports, 'run_report_to_log', run_report_to_log)
+    return ran, failing
+
+
+def test_same_name_in_two_business_lines(tmp_path):
+    reports = [
+        make_report(tmp_path, 'Credit Loan Review', 'SBA_Loans'),
+        make_report(tmp_path, 'Operations', 'SBA_Loans'),
+        make_report(tmp_path, 'Credit Loan Review', 'Summary', depends_on=['SBA_Loans']),
+        make_report(tmp_path, 'Retail', 'Digest', depends_on=['Operations/SBA_Loans']),
+    ]
+    dependencies = run_reports.resolve_dependencies(reports)
+    assert dependencies == {
+        'Credit Loan Review/SBA_Loans': [],
+        'Operations/SBA_Loans': [],
+        'Credit Loan Review/Summary': ['Credit Loan Review/SBA_Loans'],
+        'Retail/Digest': ['Operations/SBA_Loans'],
+    }
+
+
+@pytest.mark.parametrize('jobs', [1, 3])
+def test_same_name_reports_both_run(tmp_path, logger, fake_runs, jobs):
+    ran, failing = fake_runs
+    reports = [
+        make_report(tmp_path, 'Credit Loan Review', 'SBA_Loans'),
+        make_report(tmp_path, 'Operations', 'SBA_Loans'),
+    ]
+    results = run_reports.run_reports_by_filter(reports, 'all', '', logger, jobs=jobs)
+    assert sorted(ran) == ['Credit Loan Review/SBA_Loans', 'Operations/SBA_Loans']
+    assert [result['report']['business_line'] for result in results] == ['Credit Loan Review', 'Operations']
+    assert all(result['success'] for result in results)
+
+
+@pytest.mark.parametrize('jobs', [1, 3])
+def test_dependents_of_failed_report_skipped(tmp_path, logger, fake_runs, jobs):
+    ran, failing = fake_runs
+    failing.add('Extract')
+    reports = [
+        make_report(tmp_path, 'Data Analytics', 'Extract'),
+        make_report(tmp_path, 'Data Analytics', 'Load', depends_on=['Extract']),
+        make_report(tmp_path, 'Retail', 'Digest', depends_on=['Data Analytics/Load']),
+        make_report(tmp_path, 'Retail', 'Independent'),
+    ]
+    results = run_reports.run_reports_by_filter(reports, 'all', '', logger, jobs=jobs)
+    assert sorted(ran) == ['Data Analytics/Extract', 'Retail/Independent']
+    statuses = {run_reports.report_key(result['report']): result['status'] for result in results}
+    assert statuses == {
+        'Data Analytics/Extract': 'failed',
+        'Data Analytics/Load': 'skipped',
+        'Retail/Digest': 'skipped',
+        'Retail/Independent': 'success',
+    }
+
+
+@pytest.mark.parametrize('jobs', [1, 3])
+def test_every_run_writes_report_logs_and_manifest(tmp_path, logger, fake_runs, jobs):
+    ran, failing = fake_runs
+    failing.add('Broken')
+    reports = [make_report(tmp_path, 'Retail', 'Working'), make_report(tmp_path, 'Retail', 'Broken')]
+    run_reports.run_reports_by_filter(reports, 'all', '', logger, jobs=jobs)
+
+    [run_dir] = (tmp_path / 'runs').iterdir()
+    manifest = json.loads((run_dir / 'manifest.json').read_text())
+    entries = {entry['name']: entry for entry in manifest['reports']}
+    assert entries['Working']['returncode'] == 0
+    assert entries['Broken']['returncode'] == 1
+    for entry in entries.values():
+        assert Path(entry['log']).parent == run_dir
+        assert Path(entry['log']).exists()
+
+
+def test_dependency_cycle_rejected(tmp_path):
+    reports = [
+        make_report(tmp_path, 'Retail', 'A', depends_on=['B']),
+        make_report(tmp_path, 'Retail', 'B', depends_on=['A']),
+    ]
+    with pytest.raises(ValueError):
+        run_reports.order_by_dependencies(reports, run_reports.resolve_dependencies(reports))
+
+
+def test_provided_module_followed_through_cdutils(tmp_path, monkeypatch):
+    package = tmp_path / 'cdutils' / 'cdutils'
+    (package / 'acct_file_creation').mkdir(parents=True)
+    (package / 'pkey_sqlite.py').write_text("import sqlite3\n")
+    (package / 'acct_file_creation' / 'core.py').write_text("import cdutils.pkey_sqlite # type: ignore\n")
+    (package / 'summary.py').write_text("from cdutils.acct_file_creation import core\n")
+    monkeypatch.setattr(run_reports, 'CDUTILS_DIR', tmp_path / 'cdutils')
+
+    provider = make_report(tmp_path, 'Data Analytics', 'R360')
+    provider['provides'] = ['cdutils.pkey_sqlite']
+    direct = make_report(tmp_path, 'Retail', 'Direct')
+    indirect = make_report(tmp_path, 'Retail', 'Indirect')
+    unrelated = make_report(tmp_path, 'Retail', 'Unrelated')
+    for report, source in [(direct, "import cdutils.pkey_sqlite\n"), (indirect, "import cdutils.summary # type: ignore\n"),
+                           (unrelated, "import cdutils.input_cleansing\n")]:
+        (report['path'] / 'src').mkdir(parents=True)
+        (report['path'] / 'src' / 'main.py').write_text(source)
+
+    dependencies = run_reports.resolve_dependencies([provider, direct, indirect, unrelated])
+    assert dependencies['Retail/Direct'] == ['Data Analytics/R360']
+    assert dependencies['Retail/Indirect'] == ['Data Analytics/R360']
+    assert dependencies['Retail/Unrelated'] == []